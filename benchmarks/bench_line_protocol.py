@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Point 빌더 vs 전용 line protocol 직렬화기 벤치마크
+
+코어 수가 많은 호스트를 흉내 낸 합성 샘플을 두 경로로 반복 직렬화해
+초당 Point 수와 샘플당 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_line_protocol.py [--cores 128] [--iterations 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_sample
+from src.storage.influxdb_client import InfluxDBClient
+from src.storage.line_protocol import LineProtocolSerializer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="line protocol serializer benchmark")
+    parser.add_argument("--cores", type=int, default=128, help="합성 샘플의 코어 수")
+    parser.add_argument("--iterations", type=int, default=2000, help="경로별 반복 횟수")
+    args = parser.parse_args()
+
+    client = InfluxDBClient(token="benchmark")
+    serializer = LineProtocolSerializer(tags=client.tags)
+    sample = make_sample(args.cores)
+
+    def point_path():
+        return [point.to_line_protocol() for point in client._convert_to_points(sample)]
+
+    def serializer_path():
+        return serializer.serialize(sample)
+
+    expected = [line for line in point_path() if line]
+    if serializer_path() != expected:
+        print("serializer output differs from Point output")
+        return 1
+
+    points = len(expected)
+    results = {}
+    for name, func in (("Point builder", point_path), ("LineProtocolSerializer", serializer_path)):
+        elapsed = timeit.timeit(func, number=args.iterations)
+        results[name] = elapsed / args.iterations
+
+    print("=" * 64)
+    print(f"{args.cores} cores, {points} points/sample, {len(serializer.to_bytes(sample))} bytes/sample")
+    print("=" * 64)
+    print(f"{'path':<26}{'us/sample':>12}{'points/s':>14}{'speedup':>10}")
+    base = results["Point builder"]
+    for name, per_sample in results.items():
+        print(f"{name:<26}{per_sample * 1e6:>12.1f}{points / per_sample:>14,.0f}{base / per_sample:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+procfs 백엔드 vs psutil 수집 경로 마이크로 벤치마크
+
+각 수집 함수를 백엔드별로 반복 호출해 호출당 평균 시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_procfs.py [--iterations 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.collector import procfs
+from src.collector.cpu import get_cpu_metrics, get_cpu_times
+from src.collector.memory import get_memory_metrics
+from src.collector.disk import get_disk_io
+from src.collector.network import get_network_io
+
+COLLECTORS = {
+    "get_cpu_metrics": get_cpu_metrics,
+    "get_cpu_times": get_cpu_times,
+    "get_memory_metrics": get_memory_metrics,
+    "get_network_io": get_network_io,
+    "get_disk_io": get_disk_io,
+}
+
+
+def measure(iterations: int) -> dict:
+    """백엔드별 호출당 평균 시간(us) 측정"""
+    results = {}
+    for backend in ("psutil", "procfs"):
+        procfs.set_backend(backend)
+        for name, func in COLLECTORS.items():
+            func()  # 리더 생성 및 워밍업
+            elapsed = timeit.timeit(func, number=iterations)
+            results[(name, backend)] = elapsed / iterations * 1e6
+    procfs.set_backend("psutil")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="procfs backend micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=2000, help="함수별 반복 횟수")
+    args = parser.parse_args()
+
+    if not sys.platform.startswith("linux"):
+        print("procfs backend is only available on Linux")
+        return 1
+
+    results = measure(args.iterations)
+
+    print("=" * 60)
+    print(f"{'collector':<22}{'psutil (us)':>12}{'procfs (us)':>12}{'speedup':>10}")
+    print("=" * 60)
+    for name in COLLECTORS:
+        base = results[(name, "psutil")]
+        fast = results[(name, "procfs")]
+        print(f"{name:<22}{base:>12.1f}{fast:>12.1f}{base / fast:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
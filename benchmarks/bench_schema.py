@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+코어별 값 스키마(wide vs narrow) InfluxDB 벤치마크
+
+스키마마다 전용 버킷을 만들어 같은 합성 샘플을 쓰고, 쓰기 처리량, 시리즈 수,
+디스크 사용량(InfluxDB /metrics의 shard/WAL 크기), 대표 조회의 지연 시간을 비교합니다.
+로컬 InfluxDB 컨테이너(docker-compose up -d influxdb)에 대해 실행합니다.
+
+사용법:
+    python benchmarks/bench_schema.py [--cores 128] [--samples 3600] [--url http://localhost:8086]
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from influxdb_client import InfluxDBClient as InfluxClient, WritePrecision
+from influxdb_client.client.write_api import SYNCHRONOUS
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import make_sample
+from src.storage.line_protocol import SCHEMAS, LineProtocolSerializer
+
+# 스키마별 대표 조회의 filter 조건 (1분 평균으로 집계)
+QUERIES = {
+    "total cpu_percent": {
+        "wide": 'r._measurement == "cpu" and r._field == "cpu_percent"',
+        "narrow": 'r._measurement == "cpu" and r._field == "cpu_percent"',
+    },
+    "all cores": {
+        "wide": 'r._measurement == "cpu" and r._field =~ /^cpu_percent_per_core_core[0-9]+$/',
+        "narrow": 'r._measurement == "cpu_core" and r._field == "cpu_percent"',
+    },
+    "one core": {
+        "wide": 'r._measurement == "cpu" and r._field == "cpu_percent_per_core_core7"',
+        "narrow": 'r._measurement == "cpu_core" and r._field == "cpu_percent" and r.core == "7"',
+    },
+}
+
+DISK_METRICS = re.compile(r'^(storage_shard_disk_size|storage_wal_size)\{([^}]*)\} ([0-9.e+]+)$', re.M)
+
+
+def generate(serializer: LineProtocolSerializer, cores: int, samples: int, start: datetime):
+    """1초 간격 합성 샘플을 line protocol 줄로 생성 (코어별 값은 무작위 보행)"""
+    rng = random.Random(42)
+    per_core = [rng.uniform(0, 100) for _ in range(cores)]
+    for i in range(samples):
+        per_core = [min(max(v + rng.uniform(-5, 5), 0.0), 100.0) for v in per_core]
+        sample = make_sample(cores)
+        sample["timestamp"] = start + timedelta(seconds=i)
+        sample["cpu"]["cpu_percent"] = round(sum(per_core) / cores, 1)
+        sample["cpu"]["cpu_percent_per_core"] = [round(v, 1) for v in per_core]
+        yield from serializer.serialize(sample)
+
+
+def recreate_bucket(client: InfluxClient, org: str, name: str):
+    """벤치마크용 버킷을 비운 상태로 다시 생성"""
+    buckets = client.buckets_api()
+    existing = buckets.find_bucket_by_name(name)
+    if existing is not None:
+        buckets.delete_bucket(existing)
+    return buckets.create_bucket(bucket_name=name, org=org)
+
+
+def disk_bytes(url: str, bucket_id: str) -> float:
+    """InfluxDB /metrics에서 버킷의 shard + WAL 크기 합계 (없으면 NaN)"""
+    try:
+        text = httpx.get(f"{url}/metrics", timeout=10).text
+    except httpx.HTTPError:
+        return float("nan")
+    sizes = [float(value) for _, labels, value in DISK_METRICS.findall(text) if f'bucket="{bucket_id}"' in labels]
+    return sum(sizes) if sizes else float("nan")
+
+
+def run_schema(client: InfluxClient, args, schema: str, start: datetime) -> dict:
+    """스키마 하나에 대해 쓰기/크기/조회 측정"""
+    bucket = recreate_bucket(client, args.org, f"schema-bench-{schema}")
+    write_api = client.write_api(write_options=SYNCHRONOUS)
+    serializer = LineProtocolSerializer(tags={"host": "bench"}, schema=schema)
+
+    lines = list(generate(serializer, args.cores, args.samples, start))
+    points = sum(line.count(",", line.index(" ")) + 1 for line in lines)  # 필드 값 수 (문자열 값 없음)
+
+    begin = time.perf_counter()
+    for i in range(0, len(lines), args.batch):
+        body = "\n".join(lines[i:i + args.batch]).encode()
+        write_api.write(bucket=bucket.name, record=body, write_precision=WritePrecision.NS)
+    write_seconds = time.perf_counter() - begin
+
+    query_api = client.query_api()
+    cardinality = query_api.query(
+        f'import "influxdata/influxdb"\ninfluxdb.cardinality(bucket: "{bucket.name}", start: 0)'
+    )
+    series = next((record.get_value() for table in cardinality for record in table.records), None)
+
+    stop = start + timedelta(seconds=args.samples)
+    latencies = {}
+    for name, predicates in QUERIES.items():
+        flux = (
+            f'from(bucket: "{bucket.name}") |> range(start: {start.isoformat()}Z, stop: {stop.isoformat()}Z)'
+            f" |> filter(fn: (r) => {predicates[schema]})"
+            f' |> aggregateWindow(every: 1m, fn: mean, createEmpty: false)'
+        )
+        query_api.query(flux)  # 워밍업
+        elapsed = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            query_api.query(flux)
+            elapsed.append(time.perf_counter() - t)
+        latencies[name] = statistics.median(elapsed) * 1000
+
+    return {
+        "lines": len(lines),
+        "points": points,
+        "body_bytes": sum(len(line) + 1 for line in lines),
+        "write_seconds": write_seconds,
+        "series": series,
+        "disk_bytes": disk_bytes(args.url, bucket.id),
+        "latencies": latencies,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="wide vs narrow per-core schema benchmark")
+    parser.add_argument("--url", default=os.getenv("INFLUXDB_URL", "http://localhost:8086"))
+    parser.add_argument("--token", default=os.getenv("INFLUXDB_TOKEN", "my-super-secret-auth-token"))
+    parser.add_argument("--org", default=os.getenv("INFLUXDB_ORG", "my-org"))
+    parser.add_argument("--cores", type=int, default=128, help="합성 샘플의 코어 수")
+    parser.add_argument("--samples", type=int, default=3600, help="스키마별 샘플 수 (1초 간격)")
+    parser.add_argument("--batch", type=int, default=5000, help="쓰기 요청당 줄 수")
+    parser.add_argument("--repeat", type=int, default=5, help="조회별 반복 횟수 (중앙값 보고)")
+    args = parser.parse_args()
+
+    client = InfluxClient(url=args.url, token=args.token, org=args.org, timeout=120_000)
+    if not client.ping():
+        print(f"InfluxDB not reachable at {args.url}")
+        return 1
+
+    start = datetime.utcnow().replace(microsecond=0) - timedelta(seconds=args.samples)
+    results = {schema: run_schema(client, args, schema, start) for schema in SCHEMAS}
+    client.close()
+
+    print("=" * 72)
+    print(f"{args.cores} cores, {args.samples} samples, batch {args.batch} lines")
+    print("=" * 72)
+    print(f"{'':<28}" + "".join(f"{schema:>22}" for schema in SCHEMAS))
+    rows = [
+        ("lines", lambda r: f"{r['lines']:,}"),
+        ("field values", lambda r: f"{r['points']:,}"),
+        ("request bytes", lambda r: f"{r['body_bytes']:,}"),
+        ("write values/s", lambda r: f"{r['points'] / r['write_seconds']:,.0f}"),
+        ("write seconds", lambda r: f"{r['write_seconds']:.2f}"),
+        ("series", lambda r: f"{r['series']}"),
+        ("disk bytes (shard+WAL)", lambda r: f"{r['disk_bytes']:,.0f}"),
+    ]
+    rows += [
+        (f"{name} ms (p50)", lambda r, name=name: f"{r['latencies'][name]:.1f}")
+        for name in QUERIES
+    ]
+    for label, fmt in rows:
+        print(f"{label:<28}" + "".join(f"{fmt(results[schema]):>22}" for schema in SCHEMAS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+쓰기 경로 벤치마크 (변환 -> 직렬화 -> 배치 writer -> HTTP)
+
+합성 호스트 샘플을 두 단계로 측정합니다.
+1. 변환: _convert_to_points(Point 빌더)와 LineProtocolSerializer의 points/s, CPU us/point
+2. 전송: 호스트마다 InfluxDBClient.write_metrics를 1초 tick 순서로 호출하고, 로컬 대체
+   InfluxDB(별도 프로세스, 지연/실패 주입)까지의 points/s, bytes/s, flush 지연 p50/p99,
+   CPU us/point(이 프로세스의 직렬화/배치/HTTP 클라이언트 비용)를 보고
+
+네트워크 없이 저장소 코드만으로 실행되므로 직렬화기나 배치 설정 변경 전후를 비교할 수 있습니다.
+
+사용법:
+    python benchmarks/bench_write_path.py [--hosts 4] [--cores 64] [--partitions 8] [--nics 4]
+                                          [--ticks 300] [--latency-ms 2] [--failure-rate 0.0]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.influxdb_standin import InfluxDBStandin
+from benchmarks.synthetic import SyntheticFleet
+from src.storage.influxdb_client import InfluxDBClient
+from src.storage.line_protocol import LineProtocolSerializer
+
+
+def percentile(values: List[float], q: float) -> float:
+    """정렬 기준 최근접 순위 백분위수"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def bench_convert(fleet: SyntheticFleet, ticks: int, schema: str) -> Dict[str, Dict[str, float]]:
+    """Point 빌더와 직렬화기의 변환 처리량/CPU 비용 측정"""
+    samples = [sample for tick in fleet.ticks(ticks) for _, sample in tick]
+    client = InfluxDBClient(token="benchmark", tags={"host": "bench"}, schema=schema)
+    serializer = LineProtocolSerializer(tags=client.tags, schema=schema)
+
+    paths = {
+        "Point builder": lambda s: [p.to_line_protocol() for p in client._convert_to_points(s)],
+        "LineProtocolSerializer": serializer.serialize,
+    }
+    results = {}
+    for name, func in paths.items():
+        points = 0
+        wall, cpu = time.perf_counter(), time.process_time()
+        for sample in samples:
+            points += len(func(sample))
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        results[name] = {"points": points, "points_per_s": points / wall, "cpu_us_per_point": cpu / points * 1e6}
+    return results
+
+
+async def bench_write(fleet: SyntheticFleet, args, url: str) -> Dict[str, float]:
+    """호스트별 클라이언트로 write_metrics를 호출하고 flush 지연/처리량 측정"""
+    flushes: List[float] = []
+    failed = [0]
+
+    def on_flush(elapsed: float, points: int, error: bool):
+        flushes.append(elapsed)
+        failed[0] += error
+
+    clients = []
+    for host in fleet.hosts:
+        client = InfluxDBClient(
+            url=url,
+            token="benchmark",
+            batch_size=args.batch_size,
+            flush_interval=args.flush_interval,
+            enable_gzip=args.gzip,
+            tags={"host": host.name},
+            schema=args.schema,
+        )
+        client.writer.on_flush = on_flush
+        clients.append(client)
+    by_host = dict(zip((host.name for host in fleet.hosts), clients))
+
+    submitted = 0
+    wall, cpu = time.perf_counter(), time.process_time()
+    for tick in fleet.ticks(args.ticks):
+        for name, sample in tick:
+            submitted += await by_host[name].write_metrics(sample)
+        # 수집 루프처럼 tick 사이에 이벤트 루프를 양보 (tick 간격은 기다리지 않음)
+        await asyncio.sleep(0)
+    for client in clients:
+        await client.close()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    dropped = sum(client.writer.points_dropped for client in clients)
+    return {
+        "submitted": submitted,
+        "dropped": dropped,
+        "wall": wall,
+        "cpu": cpu,
+        "flushes": len(flushes),
+        "failed_flushes": failed[0],
+        "flush_p50_ms": percentile(flushes, 0.5) * 1000,
+        "flush_p99_ms": percentile(flushes, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="write path benchmark against a local InfluxDB stand-in")
+    parser.add_argument("--hosts", type=int, default=4, help="합성 호스트 수")
+    parser.add_argument("--cores", type=int, default=64, help="호스트당 코어 수")
+    parser.add_argument("--partitions", type=int, default=8, help="호스트당 파티션 수")
+    parser.add_argument("--nics", type=int, default=4, help="호스트당 NIC 수")
+    parser.add_argument("--devices", type=int, default=4, help="호스트당 블록 장치 수")
+    parser.add_argument("--ticks", type=int, default=300, help="호스트당 샘플 수")
+    parser.add_argument("--schema", choices=("wide", "narrow"), default="wide", help="코어별 값 스키마")
+    parser.add_argument("--batch-size", type=int, default=5000, help="writer 배치 최대 줄 수")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="writer 최대 대기 시간 (초)")
+    parser.add_argument("--gzip", action="store_true", help="쓰기 요청 본문 gzip 압축")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="대체 서버 요청당 지연 (ms)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="대체 서버 503 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    fleet_args = dict(hosts=args.hosts, cores=args.cores, partitions=args.partitions, nics=args.nics,
+                      devices=args.devices)
+
+    print("=" * 72)
+    print(f"{args.hosts} hosts x {args.ticks} ticks, {args.cores} cores, {args.partitions} partitions, "
+          f"{args.nics} NICs, schema {args.schema}")
+    print("=" * 72)
+
+    convert = bench_convert(SyntheticFleet(**fleet_args), min(args.ticks, 200), args.schema)
+    print(f"{'convert path':<26}{'points/s':>14}{'CPU us/point':>16}")
+    for name, result in convert.items():
+        print(f"{name:<26}{result['points_per_s']:>14,.0f}{result['cpu_us_per_point']:>16.2f}")
+
+    with InfluxDBStandin(latency_ms=args.latency_ms, failure_rate=args.failure_rate) as standin:
+        result = asyncio.run(bench_write(SyntheticFleet(**fleet_args), args, standin.url))
+        received = standin.stats()
+
+    print("-" * 72)
+    print(f"write path (stand-in latency {args.latency_ms}ms, failure rate {args.failure_rate:.1%}, "
+          f"batch {args.batch_size}, gzip {'on' if args.gzip else 'off'})")
+    print(f"  submitted points      {result['submitted']:>14,}")
+    print(f"  delivered points      {received['lines']:>14,}   dropped {result['dropped']:,}")
+    print(f"  points/s              {received['lines'] / result['wall']:>14,.0f}")
+    print(f"  bytes/s (body)        {received['bytes'] / result['wall']:>14,.0f}")
+    print(f"  bytes/s (wire)        {received['wire_bytes'] / result['wall']:>14,.0f}")
+    print(f"  flushes               {result['flushes']:>14,}   failed {result['failed_flushes']:,} "
+          f"(server 503s: {received['failures']:,})")
+    print(f"  flush latency p50/p99 {result['flush_p50_ms']:>11.2f} / {result['flush_p99_ms']:.2f} ms")
+    print(f"  CPU us/point          {result['cpu'] / max(result['submitted'], 1) * 1e6:>14.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+벤치마크용 InfluxDB /api/v2/write 대체 서버
+
+표준 라이브러리 HTTP 서버로 쓰기 요청을 받아 줄/바이트 수만 세고 버립니다.
+요청마다 지연 시간과 실패(503)를 주입할 수 있고, 별도 프로세스로 띄워 벤치마크 프로세스의
+CPU 시간에 섞이지 않게 합니다. 127.0.0.1의 임의 포트만 사용하므로 네트워크가 필요 없습니다.
+"""
+import gzip
+import json
+import multiprocessing
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.request import urlopen
+
+
+class _WriteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: bytes = b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        if self.path.startswith("/stats"):
+            self._reply(200, json.dumps(server.stats).encode())
+        elif self.path.startswith(("/ping", "/health")):
+            self._reply(204)
+        else:
+            self._reply(404)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.startswith("/api/v2/write"):
+            self._reply(404)
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+        with server.lock:
+            server.stats["requests"] += 1
+            fail = server.rng.random() < server.failure_rate
+            if fail:
+                server.stats["failures"] += 1
+        if fail:
+            self._reply(503, b'{"code":"unavailable","message":"injected failure"}')
+            return
+
+        wire_bytes = len(body)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        lines = body.count(b"\n") + (1 if body and not body.endswith(b"\n") else 0)
+        with server.lock:
+            server.stats["lines"] += lines
+            server.stats["bytes"] += len(body)
+            server.stats["wire_bytes"] += wire_bytes
+        self._reply(204)
+
+
+def _serve(port_queue, latency: float, failure_rate: float, seed: int):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _WriteHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.failure_rate = failure_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.stats = {"requests": 0, "failures": 0, "lines": 0, "bytes": 0, "wire_bytes": 0}
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class InfluxDBStandin:
+    """
+    대체 서버 프로세스 관리
+
+    Example:
+        with InfluxDBStandin(latency_ms=5, failure_rate=0.01) as standin:
+            client = InfluxDBClient(url=standin.url, token="bench")
+            ...
+            print(standin.stats())
+    """
+
+    def __init__(self, latency_ms: float = 0.0, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.seed = seed
+        self.url: Optional[str] = None
+        self._process: Optional[multiprocessing.Process] = None
+
+    def start(self) -> "InfluxDBStandin":
+        queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve, args=(queue, self.latency, self.failure_rate, self.seed), daemon=True,
+        )
+        self._process.start()
+        self.url = f"http://127.0.0.1:{queue.get(timeout=10)}"
+        return self
+
+    def stats(self) -> Dict[str, int]:
+        """수신 요청/실패/줄/바이트 수"""
+        with urlopen(f"{self.url}/stats", timeout=5) as response:
+            return json.loads(response.read())
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+    def __enter__(self) -> "InfluxDBStandin":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,129 @@
+"""
+벤치마크용 합성 메트릭 샘플 생성기
+
+collect_all_metrics와 같은 형태의 샘플을 코어/파티션/NIC/호스트 수에 맞춰 만듭니다.
+값은 시드 고정 무작위 보행이라 실행마다 같은 입력으로 비교할 수 있습니다.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def make_sample(
+    cores: int,
+    devices: int = 8,
+    interfaces: int = 8,
+    partitions: int = 0,
+    timestamp: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """코어/장치/인터페이스/파티션 수에 맞춘 고정 값 샘플 생성"""
+    return {
+        "timestamp": timestamp or datetime.utcnow(),
+        "cpu": {
+            "cpu_percent": 37.5,
+            "cpu_percent_per_core": [(i * 7.3) % 100 for i in range(cores)],
+            "cpu_freq_current": 2893.2,
+            "cpu_user_percent": 20.1,
+            "cpu_system_percent": 9.4,
+            "cpu_iowait_percent": 0.7,
+            "cpu_steal_percent": 0.0,
+        },
+        "memory": {
+            "memory_used": 12884901888,
+            "memory_available": 4294967296,
+            "memory_percent": 75.0,
+            "swap_used": 0,
+            "swap_percent": 0.0,
+        },
+        "disk_usage": [
+            {"device": f"/dev/sdb{i}", "mountpoint": f"/data{i}", "total": 1 << 40, "used": 1 << 39,
+             "free": 1 << 39, "percent": 50.0}
+            for i in range(partitions)
+        ],
+        "disk_devices": [
+            {"device": f"nvme{i}n1", "read_bytes_per_sec": 1048576.0, "write_bytes_per_sec": 524288.0,
+             "read_iops": 120.0, "write_iops": 80.0, "await_ms": 0.4, "util_percent": 3.1}
+            for i in range(devices)
+        ],
+        "network_io": {"bytes_sent": 123456789, "bytes_recv": 987654321, "packets_sent": 12345, "packets_recv": 54321},
+        "network_interfaces": [
+            {"interface": f"eth{i}", "bytes_sent_per_sec": 2048.0, "bytes_recv_per_sec": 4096.0,
+             "packets_sent_per_sec": 12.0, "packets_recv_per_sec": 20.0}
+            for i in range(interfaces)
+        ],
+    }
+
+
+class SyntheticHost:
+    """호스트 하나의 샘플 시퀀스 (값은 이전 tick에서 조금씩 움직임)"""
+
+    def __init__(self, name: str, cores: int, partitions: int, nics: int, devices: int, seed: int):
+        self.name = name
+        self.rng = random.Random(seed)
+        self.template = make_sample(cores, devices=devices, interfaces=nics, partitions=partitions)
+        self.per_core = [self.rng.uniform(0, 100) for _ in range(cores)]
+        self.counters = dict(self.template["network_io"])
+
+    def sample(self, timestamp: datetime) -> Dict[str, Any]:
+        """다음 tick 샘플"""
+        rng = self.rng
+        self.per_core = [min(max(v + rng.uniform(-5, 5), 0.0), 100.0) for v in self.per_core]
+        for key in self.counters:
+            self.counters[key] += rng.randint(0, 10000)
+
+        sample = dict(self.template)
+        sample["timestamp"] = timestamp
+        sample["cpu"] = {
+            **self.template["cpu"],
+            "cpu_percent": round(sum(self.per_core) / max(len(self.per_core), 1), 1),
+            "cpu_percent_per_core": [round(v, 1) for v in self.per_core],
+        }
+        sample["memory"] = {**self.template["memory"], "memory_percent": round(rng.uniform(40, 90), 1)}
+        sample["network_io"] = dict(self.counters)
+        sample["network_interfaces"] = [
+            {**nic, "bytes_recv_per_sec": float(rng.randint(0, 1 << 20))} for nic in self.template["network_interfaces"]
+        ]
+        sample["disk_devices"] = [
+            {**device, "util_percent": round(rng.uniform(0, 100), 1)} for device in self.template["disk_devices"]
+        ]
+        return sample
+
+
+class SyntheticFleet:
+    """
+    여러 호스트의 1초 tick 샘플 생성기
+
+    Args:
+        hosts: 호스트 수
+        cores: 호스트당 코어 수
+        partitions: 호스트당 파티션(disk_usage 항목) 수
+        nics: 호스트당 네트워크 인터페이스 수
+        devices: 호스트당 블록 장치 수
+        seed: 난수 시드
+    """
+
+    def __init__(
+        self,
+        hosts: int = 1,
+        cores: int = 16,
+        partitions: int = 4,
+        nics: int = 4,
+        devices: int = 4,
+        seed: int = 42,
+    ):
+        self.hosts: List[SyntheticHost] = [
+            SyntheticHost(f"host-{i:04d}", cores, partitions, nics, devices, seed + i) for i in range(hosts)
+        ]
+
+    def ticks(self, count: int, start: Optional[datetime] = None) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+        """
+        tick마다 (호스트 이름, 샘플) 목록 생성
+
+        Args:
+            count: tick 수
+            start: 첫 tick 시각 (None이면 count초 전)
+        """
+        start = start or datetime.utcnow().replace(microsecond=0) - timedelta(seconds=count)
+        for i in range(count):
+            timestamp = start + timedelta(seconds=i)
+            yield [(host.name, host.sample(timestamp)) for host in self.hosts]
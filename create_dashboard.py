@@ -252,7 +252,7 @@ dashboard = {
             "targets": [
                 {
                     "datasource": {"type": "influxdb", "uid": "influxdb"},
-                    "query": 'from(bucket: "system-metrics")\\n  |> range(start: v.timeRangeStart, stop: v.timeRangeStop)\\n  |> filter(fn: (r) => r["_measurement"] == "network_io")\\n  |> filter(fn: (r) => r["_field"] == "network_bytes_sent" or r["_field"] == "network_bytes_recv")\\n  |> derivative(unit: 1s, nonNegative: true)\\n  |> aggregateWindow(every: v.windowPeriod, fn: mean, createEmpty: false)\\n  |> yield(name: "mean")',
+                    "query": 'from(bucket: "system-metrics")\\n  |> range(start: v.timeRangeStart, stop: v.timeRangeStop)\\n  |> filter(fn: (r) => r["_measurement"] == "network_interface")\\n  |> filter(fn: (r) => r["_field"] == "bytes_sent_per_sec" or r["_field"] == "bytes_recv_per_sec")\\n  |> aggregateWindow(every: v.windowPeriod, fn: mean, createEmpty: false)\\n  |> group(columns: ["_field", "_time"])\\n  |> sum()\\n  |> group(columns: ["_field"])\\n  |> yield(name: "mean")',
                     "refId": "A"
                 }
             ],
@@ -0,0 +1,130 @@
+"""/history 응답 형식 협상 및 열(columnar) 형식 인코딩 모듈"""
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # msgpack은 선택 의존성
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow는 선택 의존성
+    pa = None
+
+JSON_MEDIA_TYPE = "application/json"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.metrics.columnar+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Accept 값 -> 응답 형식 (별칭 포함)
+MEDIA_TYPES = {
+    JSON_MEDIA_TYPE: JSON_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE: NDJSON_MEDIA_TYPE,
+    COLUMNAR_JSON_MEDIA_TYPE: COLUMNAR_JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE: MSGPACK_MEDIA_TYPE,
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    ARROW_MEDIA_TYPE: ARROW_MEDIA_TYPE,
+}
+
+# 시리즈별 time/value 배열로 응답하는 형식
+COLUMNAR_MEDIA_TYPES = (COLUMNAR_JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, ARROW_MEDIA_TYPE)
+
+
+def negotiate(accept: str) -> str:
+    """
+    Accept 헤더에서 응답 형식 선택
+
+    q 값이 가장 큰(같으면 먼저 나온) 지원 형식을 고르고, 지원 형식이 없으면 JSON 레코드 형식.
+
+    Args:
+        accept: Accept 헤더 값
+
+    Returns:
+        str: MEDIA_TYPES의 값 중 하나
+    """
+    best, best_q = JSON_MEDIA_TYPE, 0.0
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        selected = MEDIA_TYPES.get(media_type.lower())
+        if selected is None:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = selected, q
+    return best
+
+
+def is_available(media_type: str) -> bool:
+    """응답 형식의 인코딩 라이브러리 설치 여부"""
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack is not None
+    if media_type == ARROW_MEDIA_TYPE:
+        return pa is not None
+    return True
+
+
+def encode_columns(payload: Dict[str, Any], media_type: str) -> bytes:
+    """
+    열 형식 응답 인코딩
+
+    payload["series"]는 시리즈마다 field, tags, time(epoch 밀리초 정수), value 배열을 가진다.
+    JSON/MessagePack은 payload 구조를 그대로 쓰고, Arrow IPC는 field/태그(dictionary),
+    time(timestamp[ms, UTC]), value(float64) 열의 긴 형식 테이블 하나로 쓰며 나머지 키는
+    스키마 메타데이터에 넣는다.
+
+    Args:
+        payload: metric, interval 등 메타데이터와 series 목록
+        media_type: COLUMNAR_MEDIA_TYPES 중 하나
+
+    Returns:
+        bytes: 응답 본문
+
+    Raises:
+        ValueError: 지원하지 않거나 라이브러리가 없는 형식인 경우
+    """
+    if not is_available(media_type):
+        raise ValueError(f"{media_type} is not available (encoder library not installed)")
+    if media_type == COLUMNAR_JSON_MEDIA_TYPE:
+        return json.dumps(payload, separators=(",", ":"), allow_nan=False).encode()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb(payload, use_bin_type=True)
+    if media_type == ARROW_MEDIA_TYPE:
+        return _encode_arrow(payload)
+    raise ValueError(f"Unsupported columnar media type: {media_type}")
+
+
+def _encode_arrow(payload: Dict[str, Any]) -> bytes:
+    series: List[Dict[str, Any]] = payload["series"]
+    tag_names = sorted({name for item in series for name in item["tags"]})
+    lengths = [len(item["time"]) for item in series]
+
+    def dictionary_column(labels: List[Optional[str]]) -> "pa.DictionaryArray":
+        # 시리즈별 라벨을 점 수만큼 반복한 인덱스 (값 문자열은 시리즈당 한 번만 저장)
+        indices = [i for i, length in enumerate(lengths) for _ in range(length)]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, pa.int32()), pa.array(labels, pa.string()))
+
+    columns = {"field": dictionary_column([item["field"] for item in series])}
+    for name in tag_names:
+        columns[name] = dictionary_column([item["tags"].get(name) for item in series])
+    columns["time"] = pa.array(
+        [t for item in series for t in item["time"]], pa.timestamp("ms", tz="UTC"),
+    )
+    columns["value"] = pa.array(
+        [None if v is None else float(v) for item in series for v in item["value"]], pa.float64(),
+    )
+
+    metadata = {key: json.dumps(value) for key, value in payload.items() if key != "series"}
+    table = pa.table(columns).replace_schema_metadata(metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -4,10 +4,12 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import make_asgi_app
+from prometheus_client import REGISTRY, make_asgi_app
 
 from src.api.routes import metrics, health
-from src.storage.influxdb_client import InfluxDBClient
+from src.storage.base import MetricsStorage
+from src.storage.cache import CachedStorage, QueryCacheInstrumentation
+from src.storage.factory import create_storage
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,28 +17,34 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# InfluxDB 클라이언트 전역 인스턴스
-influxdb_client = None
+# 메트릭 저장소 전역 인스턴스
+storage = None
+
+# 조회 캐시 지표 (기본 레지스트리, /metrics로 노출)
+cache_instrumentation = QueryCacheInstrumentation(registry=REGISTRY)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
-    global influxdb_client
+    global storage
     # 시작 시
     logger.info("Starting FastAPI application")
     try:
-        influxdb_client = InfluxDBClient()
-        logger.info("InfluxDB client initialized successfully")
+        # embedded 백엔드는 수집기가 쓰는 디렉터리를 조회 전용으로 공유
+        storage = create_storage(read_only=True)
+        # 반복되는 대시보드 조회를 시간 버킷 캐시로 흡수 (API_QUERY_CACHE_MB=0이면 끔)
+        storage = CachedStorage.from_env(storage, instrumentation=cache_instrumentation)
+        logger.info("Metrics storage initialized successfully")
     except Exception as e:
-        logger.warning(f"Failed to initialize InfluxDB client: {e}")
-        logger.warning("API server will run without InfluxDB connection")
-        influxdb_client = None
+        logger.warning(f"Failed to initialize metrics storage: {e}")
+        logger.warning("API server will run without metrics storage")
+        storage = None
     yield
     # 종료 시
     logger.info("Shutting down FastAPI application")
-    if influxdb_client:
-        await influxdb_client.close()
+    if storage:
+        await storage.close()
 
 
 app = FastAPI(
@@ -74,6 +82,6 @@ async def root():
     }
 
 
-def get_influxdb_client() -> InfluxDBClient:
-    """InfluxDB 클라이언트 의존성"""
-    return influxdb_client
+def get_storage() -> MetricsStorage:
+    """메트릭 저장소 의존성"""
+    return storage
@@ -1,18 +1,37 @@
 """메트릭 조회 라우터"""
-from typing import Optional, Dict, Any
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
-from src.storage.influxdb_client import InfluxDBClient
+from src.api.formats import COLUMNAR_MEDIA_TYPES, NDJSON_MEDIA_TYPE, encode_columns, is_available, negotiate
+from src.storage.base import AGGREGATES, MetricsStorage, format_duration, resolve_window
 from src.collector.cpu import get_cpu_metrics, get_cpu_times
 from src.collector.memory import get_memory_metrics
 from src.collector.disk import get_disk_usage, get_disk_io
 from src.collector.network import get_network_io
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# 조회 중 클라이언트 연결 종료 확인 간격 (초)
+DISCONNECT_POLL_INTERVAL = 0.5
+
+# /history 시리즈당 최대 점 수 (interval 생략 시 이 값에 맞춰 집계 간격 자동 선택)
+HISTORY_MAX_POINTS = int(os.getenv("API_HISTORY_MAX_POINTS", "1000"))
+
+# /history NDJSON 스트리밍 전송 청크 크기 (바이트)
+NDJSON_CHUNK_BYTES = 64 * 1024
+
+T = TypeVar("T")
+
 
 class MetricsResponse(BaseModel):
     """메트릭 응답 모델"""
@@ -46,100 +65,293 @@ async def get_current_metrics():
         raise HTTPException(status_code=500, detail=f"Failed to collect metrics: {str(e)}")
 
 
+async def run_query(request: Request, query: Awaitable[T]) -> T:
+    """
+    저장소 조회를 실행하면서 클라이언트 연결 종료를 감시
+
+    클라이언트가 먼저 연결을 끊으면 조회 task를 취소해 저장소 요청도 중단한다.
+    반환/예외 전에 취소된 task가 정리될 때까지 기다리므로, 호출자는 조회가 쓰던 자원
+    (스트림 제너레이터 등)을 바로 닫을 수 있다.
+
+    Raises:
+        HTTPException: 조회 시간 초과(504) 또는 클라이언트 연결 종료(499)
+    """
+    task = asyncio.ensure_future(query)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling query: {request.url.path}")
+                task.cancel()
+                raise HTTPException(status_code=499, detail="Client closed request")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Metrics query timed out")
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
 def get_db_client():
-    """InfluxDB 클라이언트 의존성 (순환 import 방지)"""
-    from src.api.main import influxdb_client
-    return influxdb_client
+    """메트릭 저장소 의존성 (순환 import 방지)"""
+    from src.api.main import storage
+    return storage
 
 
 @router.get("/history")
 async def get_metrics_history(
+    request: Request,
     metric: str = Query(..., description="메트릭 이름 (cpu, memory, disk_io, network_io)"),
     start_time: Optional[str] = Query("-1h", description="시작 시간 (예: -1h, -30m)"),
     end_time: Optional[str] = Query("now()", description="종료 시간"),
-    interval: Optional[str] = Query(None, description="집계 간격 (예: 1m, 5m)"),
-    db_client: InfluxDBClient = Depends(get_db_client),
+    interval: Optional[str] = Query(None, description="집계 간격 (예: 1m, 5m, 생략 시 자동)"),
+    fn: str = Query("mean", pattern=f"^({'|'.join(AGGREGATES)})$", description="집계 함수"),
+    max_points: int = Query(HISTORY_MAX_POINTS, ge=1, le=100000, description="시리즈당 최대 점 수"),
+    db_client: MetricsStorage = Depends(get_db_client),
 ):
     """
-    히스토리 메트릭 조회
+    히스토리 메트릭 조회 (저장소에서 창별 집계)
+
+    interval이 시리즈당 max_points를 넘는 점을 만들면 더 큰 간격으로 늘린다.
+    Accept: application/x-ndjson 요청은 레코드를 한 줄씩 스트리밍하며(export용), 이때는
+    max_points를 적용하지 않고 interval을 지정한 경우에만 집계한다.
+    열 형식(COLUMNAR_MEDIA_TYPES)을 요청하면 시리즈마다 field/tags를 한 번만 쓰고
+    time(epoch 밀리초)/value 배열로 응답한다. 인코딩 라이브러리가 없는 형식은 406.
 
     Args:
         metric: 조회할 메트릭 이름
         start_time: 시작 시간
         end_time: 종료 시간
         interval: 집계 간격
+        fn: 집계 함수 (mean, max, min, last)
+        max_points: 시리즈당 최대 점 수
 
     Returns:
-        히스토리 메트릭 데이터
+        히스토리 메트릭 데이터 (interval은 실제 사용한 집계 간격)
     """
+    media_type = negotiate(request.headers.get("accept", ""))
+    if not is_available(media_type):
+        raise HTTPException(status_code=406, detail=f"{media_type} is not available on this server")
+    streaming = media_type == NDJSON_MEDIA_TYPE
+    try:
+        window = resolve_window(start_time, end_time, interval, None if streaming else max_points)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    step = format_duration(window) if window else None
+
+    if streaming:
+        return await stream_history(request, db_client, metric, start_time, end_time, step, fn)
+
     try:
-        records = await db_client.query_metrics(
+        if media_type in COLUMNAR_MEDIA_TYPES:
+            series = await run_query(request, db_client.query_columns(
+                measurement=metric,
+                start=start_time,
+                stop=end_time,
+                every=step,
+                fn=fn,
+            ))
+            payload = {
+                "metric": metric,
+                "start_time": start_time,
+                "end_time": end_time,
+                "interval": step,
+                "fn": fn,
+                "time_unit": "ms",
+                "series": series,
+            }
+            return Response(content=encode_columns(payload, media_type), media_type=media_type)
+
+        records = await run_query(request, db_client.query_metrics(
             measurement=metric,
             start=start_time,
             stop=end_time,
-        )
+            every=step,
+            fn=fn,
+        ))
         return {
             "metric": metric,
             "start_time": start_time,
             "end_time": end_time,
+            "interval": step,
+            "fn": fn,
             "data": records,
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query metrics: {str(e)}")
+
+
+async def stream_history(
+    request: Request,
+    db_client: MetricsStorage,
+    metric: str,
+    start_time: str,
+    end_time: str,
+    step: Optional[str],
+    fn: str,
+) -> StreamingResponse:
+    """
+    /history NDJSON 스트리밍 응답
+
+    첫 레코드까지는 일반 조회처럼 기다려 시간 초과/오류를 상태 코드로 돌려준다. 이후 오류는
+    응답이 이미 시작되었으므로 마지막 줄에 {"error": ...}를 쓰고 끝낸다. StreamingResponse는
+    청크를 보낼 때마다 전송 완료를 기다리므로 느린 클라이언트가 저장소 읽기 속도를 제한한다.
+    """
+    stream = db_client.stream_metrics(metric, start_time, end_time, every=step, fn=fn)
+
+    async def first_record():
+        async for record in stream:
+            return record
+        return None
+
+    try:
+        first = await run_query(request, first_record())
+    except HTTPException:
+        await stream.aclose()
+        raise
     except Exception as e:
+        await stream.aclose()
         raise HTTPException(status_code=500, detail=f"Failed to query metrics: {str(e)}")
 
+    async def body():
+        lines: List[str] = []
+        size = 0
+        try:
+            if first is not None:
+                async for record in _chain(first, stream):
+                    line = json.dumps(record, default=_json_default)
+                    lines.append(line)
+                    size += len(line) + 1
+                    if size >= NDJSON_CHUNK_BYTES:
+                        yield "\n".join(lines) + "\n"
+                        lines, size = [], 0
+            if lines:
+                yield "\n".join(lines) + "\n"
+        except Exception as e:
+            logger.error(f"History stream failed after the response started: {e}")
+            if lines:
+                yield "\n".join(lines) + "\n"
+            yield json.dumps({"error": f"Failed to query metrics: {str(e)}"}) + "\n"
+        finally:
+            await stream.aclose()
+
+    headers = {"X-Metrics-Fn": fn}
+    if step:
+        headers["X-Metrics-Interval"] = step
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+async def _chain(first: Dict, stream: AsyncIterator[Dict]) -> AsyncIterator[Dict]:
+    yield first
+    async for record in stream:
+        yield record
+
+
+def _json_default(value: Any) -> Any:
+    """json.dumps가 모르는 값 변환 (datetime -> ISO 8601)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
 
 @router.get("/summary")
 async def get_metrics_summary(
+    request: Request,
     metric: str = Query(..., description="메트릭 이름"),
     period: str = Query("-1h", description="조회 기간"),
-    db_client: InfluxDBClient = Depends(get_db_client),
+    field: Optional[str] = Query(None, description="필드 이름 (생략 시 전체 필드)"),
+    db_client: MetricsStorage = Depends(get_db_client),
 ):
     """
-    메트릭 통계 요약 조회 (평균, 최소, 최대, P95)
+    필드별 메트릭 통계 요약 조회 (평균, 최소, 최대, 개수, P95)
+
+    통계는 저장소에서 계산하므로 API 메모리/지연이 원본 점 수와 무관하다.
 
     Args:
         metric: 메트릭 이름
         period: 조회 기간
+        field: 필드 이름
 
     Returns:
-        메트릭 통계 요약
+        필드별 메트릭 통계 요약
     """
     try:
-        records = await db_client.query_metrics(
+        summary = await run_query(request, db_client.summarize_metrics(
             measurement=metric,
             start=period,
             stop="now()",
-        )
-
-        if not records:
-            return {
-                "metric": metric,
-                "period": period,
-                "summary": "No data available",
-            }
+            filters={"_field": field} if field else None,
+            quantile=0.95,
+        ))
 
-        # 간단한 통계 계산
-        values = [r["value"] for r in records if isinstance(r["value"], (int, float))]
-        if not values:
+        if not summary:
             return {
                 "metric": metric,
                 "period": period,
                 "summary": "No numeric data available",
             }
 
-        sorted_values = sorted(values)
-        p95_index = int(len(sorted_values) * 0.95)
-
         return {
             "metric": metric,
             "period": period,
             "summary": {
-                "count": len(values),
-                "avg": sum(values) / len(values),
-                "min": min(values),
-                "max": max(values),
-                "p95": sorted_values[p95_index] if p95_index < len(sorted_values) else sorted_values[-1],
+                name: {
+                    "count": stats["count"],
+                    "avg": stats["mean"],
+                    "min": stats["min"],
+                    "max": stats["max"],
+                    "p95": stats["quantile"],
+                }
+                for name, stats in sorted(summary.items())
             },
         }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate summary: {str(e)}")
+
+
+@router.get("/per-core")
+async def get_per_core_history(
+    request: Request,
+    field: str = Query("cpu_percent", description="코어별 값 이름 (예: cpu_percent)"),
+    start_time: Optional[str] = Query("-1h", description="시작 시간 (예: -1h, -30m)"),
+    end_time: Optional[str] = Query("now()", description="종료 시간"),
+    core: Optional[int] = Query(None, ge=0, description="코어 번호 (생략 시 전체)"),
+    db_client: MetricsStorage = Depends(get_db_client),
+):
+    """
+    코어별 히스토리 조회 (wide/narrow 스키마 공통)
+
+    Args:
+        field: 코어별 값 이름
+        start_time: 시작 시간
+        end_time: 종료 시간
+        core: 코어 번호
+
+    Returns:
+        코어 번호별 히스토리 데이터
+    """
+    try:
+        cores = await run_query(
+            request, db_client.query_per_core(field=field, start=start_time, stop=end_time, core=core),
+        )
+        return {
+            "field": field,
+            "schema": db_client.schema,
+            "start_time": start_time,
+            "end_time": end_time,
+            "cores": cores,
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query per-core metrics: {str(e)}")
@@ -0,0 +1,207 @@
+"""저장소 상태 기반 backpressure 및 우선순위 부하 차단 모듈"""
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 프로브 그룹 우선순위 (0이 가장 중요, 0은 차단하지 않음)
+DEFAULT_PRIORITIES = {
+    "cpu": 0,
+    "cpu_times": 0,
+    "memory": 0,
+    "network_io": 1,
+    "network_interfaces": 1,
+    "disk_io": 1,
+    "disk_devices": 2,
+    "disk_usage": 3,
+    "network_connections": 3,
+}
+
+# 차단 단계 진입 기준 (쓰기 큐/스풀 사용률)
+DEFAULT_WATERMARKS = (0.5, 0.75, 0.9)
+
+
+def parse_priorities(spec: str) -> Dict[str, int]:
+    """
+    "그룹=우선순위,그룹=우선순위" 형식 설정 파싱
+
+    Args:
+        spec: 예) "disk_usage=3,network_connections=2"
+    """
+    priorities = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        group, value = item.split("=", 1)
+        priorities[group.strip()] = int(value)
+    return priorities
+
+
+def storage_pressure(storage: Any) -> float:
+    """
+    저장소 부하 (0~1): 쓰기 큐 사용률과 디스크 스풀 사용률 중 큰 값
+
+    InfluxDB 장애 중에는 실패한 배치가 스풀로 빠지므로 큐는 비어 있어도 스풀이 차오른다.
+    writer/spool이 없는 저장소(read_only EmbeddedStorage 등)는 0이다.
+    """
+    pressure = 0.0
+    writer = getattr(storage, "writer", None)
+    if writer is not None and writer.max_queue:
+        pressure = writer.depth / writer.max_queue
+    spool = getattr(storage, "spool", None)
+    if spool is not None and spool.max_bytes:
+        pressure = max(pressure, spool.pending_bytes / spool.max_bytes)
+    return min(pressure, 1.0)
+
+
+class BackpressurePolicy:
+    """
+    저장소 부하에 따라 낮은 우선순위 그룹의 샘플링 간격을 늘리는 정책
+
+    부하가 watermarks[i]를 넘으면 단계 i+1로 올라가고, 단계 L에서는 우선순위가
+    (최대 단계 - L)보다 큰 그룹을 shed_factor ** (초과분) 수집 주기마다 한 번만 수집한다.
+    수집 주기는 그룹 자체 주기(CadenceGate, 예: disk_usage 30초)이고 없으면 base_interval이다.
+    우선순위 0 그룹(cpu, memory)은 항상 매 주기 수집한다.
+    장치/인터페이스별 변화율 그룹은 두 번 읽은 카운터 차이로 계산되므로, 간격이 늘어나면
+    그 구간 평균 변화율 한 점으로 합쳐져 기록된다.
+
+    단계는 부하가 해당 watermark * release 아래로 내려가면 한 단계씩 자동 복귀한다.
+    """
+
+    def __init__(
+        self,
+        priorities: Optional[Dict[str, int]] = None,
+        watermarks: Sequence[float] = DEFAULT_WATERMARKS,
+        shed_factor: int = 4,
+        release: float = 0.8,
+        base_interval: float = 1,
+    ):
+        """
+        Args:
+            priorities: 그룹 이름 -> 우선순위 (DEFAULT_PRIORITIES를 덮어씀, 없는 그룹은 1)
+            watermarks: 단계별 진입 부하 (오름차순, 0~1)
+            shed_factor: 차단 단계가 하나 올라갈 때 샘플링 간격 배수
+            release: 단계 복귀 기준 (watermark 대비 비율)
+            base_interval: 기본 수집 주기 (초)
+        """
+        if list(watermarks) != sorted(watermarks):
+            raise ValueError("watermarks must be ascending")
+        self.priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+        self.watermarks = tuple(watermarks)
+        self.shed_factor = shed_factor
+        self.release = release
+        self.base_interval = base_interval
+
+        self.level = 0
+        self.pressure = 0.0
+        self._last_bucket: Dict[str, int] = {}
+        self._last_slot: Dict[str, int] = {}
+        self.shed_samples: Dict[str, int] = {}
+        self.transitions = 0
+
+        self.on_level_change = None
+        self.on_shed = None
+
+    @classmethod
+    def from_env(cls, base_interval: float = 1) -> "BackpressurePolicy":
+        """환경 변수로 정책 생성"""
+        spec = os.getenv("COLLECTOR_PRIORITIES")
+        watermarks = os.getenv("COLLECTOR_SHED_WATERMARKS")
+        return cls(
+            priorities=parse_priorities(spec) if spec else None,
+            watermarks=tuple(float(w) for w in watermarks.split(",")) if watermarks else DEFAULT_WATERMARKS,
+            shed_factor=int(os.getenv("COLLECTOR_SHED_FACTOR", "4")),
+            base_interval=base_interval,
+        )
+
+    @property
+    def max_level(self) -> int:
+        return len(self.watermarks)
+
+    def update(self, pressure: float) -> int:
+        """
+        저장소 부하로 차단 단계 갱신
+
+        Args:
+            pressure: 0~1 부하 (storage_pressure 결과)
+
+        Returns:
+            int: 갱신된 차단 단계 (0이면 정상)
+        """
+        self.pressure = pressure
+        level = self.level
+        while level < self.max_level and pressure >= self.watermarks[level]:
+            level += 1
+        while level > 0 and pressure < self.watermarks[level - 1] * self.release:
+            level -= 1
+
+        if level != self.level:
+            previous, self.level = self.level, level
+            self.transitions += 1
+            self._last_bucket.clear()
+            shed = ", ".join(f"{group} x{self.stride(group)}" for group in self.shed_groups()) or "none"
+            log = logger.warning if level > previous else logger.info
+            log(f"Backpressure level {previous} -> {level} (storage load {pressure:.0%}), shedding: {shed}")
+            if self.on_level_change is not None:
+                self.on_level_change(level)
+        return level
+
+    def stride(self, group: str) -> int:
+        """현재 단계에서 그룹의 샘플링 간격 (그룹 수집 주기 수)"""
+        priority = self.priorities.get(group, 1)
+        severity = self.level - (self.max_level - priority)
+        if priority <= 0 or severity <= 0:
+            return 1
+        return self.shed_factor ** severity
+
+    def shed_groups(self) -> List[str]:
+        """현재 단계에서 간격이 늘어난 그룹 목록"""
+        return [group for group in self.priorities if self.stride(group) > 1]
+
+    def is_due(self, group: str, tick_time: float, cadence: Optional[float] = None) -> bool:
+        """
+        이번 tick에 그룹을 수집할지 판정 (차단 중이면 간격 경계의 첫 수집 주기만 수집)
+
+        CadenceGate와 같은 epoch 경계의 주기 슬롯으로 판정하므로 CadenceGate보다 먼저
+        호출해도 되며, 생략 샘플은 주기 슬롯마다 한 번만 센다.
+
+        Args:
+            group: 그룹 이름
+            tick_time: tick deadline (epoch 초)
+            cadence: 그룹 수집 주기 (초, None이면 base_interval)
+        """
+        stride = self.stride(group)
+        if stride == 1:
+            return True
+
+        period = cadence or self.base_interval
+        slot = math.floor(tick_time / period + 1e-9)
+        if self._last_slot.get(group) == slot:
+            # 이번 주기 슬롯은 이미 판정함 (수집했으면 CadenceGate가 다음 슬롯까지 막음)
+            return False
+        self._last_slot[group] = slot
+
+        bucket = slot // stride
+        if self._last_bucket.get(group) == bucket:
+            self.shed_samples[group] = self.shed_samples.get(group, 0) + 1
+            if self.on_shed is not None:
+                self.on_shed(group)
+            return False
+        self._last_bucket[group] = bucket
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        정책 통계 조회
+
+        Returns:
+            Dict[str, Any]: 현재 단계, 부하, 단계 전환 수, 그룹별 생략 샘플 수
+        """
+        return {
+            "level": self.level,
+            "pressure": self.pressure,
+            "transitions": self.transitions,
+            "shed_samples": dict(self.shed_samples),
+        }
@@ -0,0 +1,296 @@
+"""최근 샘플 보관용 컬럼형 링 버퍼 모듈"""
+import logging
+import math
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+NAN = float("nan")
+# 정수 컬럼의 빈 값
+MISSING = -2 ** 63
+
+# 리스트 형태 그룹에서 컬럼 이름에 사용할 태그 키
+TAG_KEYS = {
+    "disk_usage": "mountpoint",
+    "disk_devices": "device",
+    "network_interfaces": "interface",
+}
+
+
+def to_ns(timestamp: datetime) -> int:
+    """naive UTC datetime을 epoch 나노초로 변환"""
+    return (timestamp - EPOCH) // timedelta(microseconds=1) * 1000
+
+
+class SampleBuffer:
+    """
+    고정 용량 컬럼형 링 버퍼 (수집기의 샘플 저장소)
+
+    메트릭마다 미리 할당한 array 컬럼 하나와 정수 나노초 타임스탬프 컬럼을 유지한다.
+    컬럼 이름은 "그룹.필드" 형태이며(예: "cpu.cpu_percent", "cpu.cpu_percent_per_core.3",
+    "disk_devices.sda.util_percent"), 정수 값은 array('q'), 실수 값은 array('d') 컬럼에 담는다.
+    값이 없는 tick은 실수 컬럼은 NaN, 정수 컬럼은 MISSING으로 채운다.
+    문자열 값(태그, host_info 문자열, stale 목록)과 컬럼 형식에 맞지 않는 값은 tick별 extras에 둔다.
+    """
+
+    def __init__(self, capacity: int, max_columns: int = 4096):
+        """
+        Args:
+            capacity: 보관할 샘플 수
+            max_columns: 최대 컬럼 수 (초과 시 새 메트릭은 extras에 보관)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.max_columns = max_columns
+        self.timestamps = array("q", bytes(8 * capacity))
+        self.columns: Dict[str, array] = {}
+        self.extras: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.size = 0
+        self._head = 0
+        self._overflow_logged = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼 버퍼가 차지하는 바이트 수"""
+        return (len(self.columns) + 1) * self.capacity * 8
+
+    def append(self, timestamp_ns: int, values: Dict[str, Any], extras: Optional[Dict[str, Any]] = None):
+        """
+        샘플 한 건 추가 (가장 오래된 샘플을 덮어씀)
+
+        Args:
+            timestamp_ns: epoch 나노초 타임스탬프
+            values: 컬럼 이름 -> 숫자 값
+            extras: 컬럼에 담지 않는 값 (unflatten_sample 이름 규칙)
+        """
+        index = self._head
+        self.timestamps[index] = timestamp_ns
+        extras = dict(extras) if extras else {}
+
+        for column in self.columns.values():
+            column[index] = NAN if column.typecode == "d" else MISSING
+
+        for name, value in values.items():
+            column = self.columns.get(name)
+            if column is None:
+                column = self._add_column(name, value)
+            if column is not None and _fits(column, value):
+                column[index] = value
+            else:
+                extras[name] = value
+
+        self.extras[index] = extras or None
+        self._head = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _add_column(self, name: str, value: Any) -> Optional[array]:
+        """값 형식에 맞는 컬럼 생성 (한도 초과 시 None)"""
+        if len(self.columns) >= self.max_columns:
+            if not self._overflow_logged:
+                logger.warning(f"Sample buffer column limit reached ({self.max_columns}), keeping new metrics uncompressed")
+                self._overflow_logged = True
+            return None
+        if isinstance(value, int):
+            column = array("q", [MISSING]) * self.capacity
+        else:
+            column = array("d", [NAN]) * self.capacity
+        self.columns[name] = column
+        return column
+
+    def append_sample(self, metrics: Dict[str, Any]):
+        """
+        수집기 메트릭 딕셔너리를 평탄화해 추가 (기존 dict 형태 입력용 어댑터)
+
+        Args:
+            metrics: collect_all_metrics 형태의 샘플
+        """
+        timestamp = metrics.get("timestamp") or datetime.utcnow()
+        extras: Dict[str, Any] = {}
+        values = flatten_sample(metrics, extras)
+        self.append(to_ns(timestamp), values, extras)
+
+    def _slice(self, data: array, count: int) -> array:
+        """최근 count개 샘플을 시간순으로 반환"""
+        count = min(count, self.size)
+        start = (self._head - count) % self.capacity
+        end = start + count
+        if end <= self.capacity:
+            return data[start:end]
+        return data[start:] + data[:end - self.capacity]
+
+    def _count_since(self, seconds: Optional[float]) -> int:
+        """최신 샘플 기준 seconds 이내의 샘플 수"""
+        if seconds is None or self.size == 0:
+            return self.size
+        threshold = self.timestamps[(self._head - 1) % self.capacity] - int(seconds * 1e9)
+        # 타임스탬프는 시간순이므로 이진 탐색
+        return self.size - bisect_left(self._slice(self.timestamps, self.size), threshold)
+
+    def window(self, column: str, seconds: Optional[float] = None) -> Tuple[array, array]:
+        """
+        컬럼의 최근 구간 조회
+
+        Args:
+            column: 컬럼 이름
+            seconds: 최신 샘플 기준 조회 구간 (None이면 전체)
+
+        Returns:
+            (타임스탬프(ns), 값) 시간순 array 튜플
+
+        Raises:
+            KeyError: 컬럼이 없는 경우
+        """
+        data = self.columns[column]
+        count = self._count_since(seconds)
+        return self._slice(self.timestamps, count), self._slice(data, count)
+
+    def stats(self, column: str, seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        컬럼의 최근 구간 통계 (빈 값 제외)
+
+        Returns:
+            Dict[str, float]: count, min, max, mean
+        """
+        _, values = self.window(column, seconds)
+        if values.typecode == "d":
+            valid = [value for value in values if value == value]
+        else:
+            valid = [value for value in values if value != MISSING]
+        if not valid:
+            return {"count": 0, "min": NAN, "max": NAN, "mean": NAN}
+        return {
+            "count": len(valid),
+            "min": min(valid),
+            "max": max(valid),
+            "mean": math.fsum(valid) / len(valid),
+        }
+
+    def min(self, column: str, seconds: Optional[float] = None) -> float:
+        return self.stats(column, seconds)["min"]
+
+    def max(self, column: str, seconds: Optional[float] = None) -> float:
+        return self.stats(column, seconds)["max"]
+
+    def mean(self, column: str, seconds: Optional[float] = None) -> float:
+        return self.stats(column, seconds)["mean"]
+
+    def to_metrics(self, offset: int = 0) -> Dict[str, Any]:
+        """
+        저장된 샘플을 collect_all_metrics와 같은 중첩 dict로 복원 (기존 호출자용 어댑터)
+
+        Args:
+            offset: 최신 샘플 기준 오프셋 (0이 최신)
+
+        Returns:
+            Dict[str, Any]: timestamp와 그룹별 메트릭
+        """
+        if offset >= self.size:
+            raise IndexError("sample offset out of range")
+
+        index = (self._head - 1 - offset) % self.capacity
+        values: Dict[str, Any] = {}
+        for name, column in self.columns.items():
+            value = column[index]
+            if (value == value) if column.typecode == "d" else (value != MISSING):
+                values[name] = value
+        if self.extras[index]:
+            values.update(self.extras[index])
+        metrics = unflatten_sample(values)
+        metrics["timestamp"] = EPOCH + timedelta(microseconds=self.timestamps[index] // 1000)
+        return metrics
+
+
+def _fits(column: array, value: Any) -> bool:
+    """값을 형식 변경 없이 컬럼에 담을 수 있는지 여부"""
+    if column.typecode == "d":
+        return type(value) is float
+    return type(value) is int and MISSING < value < 2 ** 63
+
+
+def flatten_sample(metrics: Dict[str, Any], extras: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    """
+    수집기 메트릭 딕셔너리를 "그룹.필드" 컬럼 값으로 평탄화
+
+    Args:
+        metrics: collect_all_metrics 결과
+        extras: 숫자가 아닌 값을 같은 이름 규칙으로 받을 dict (None이면 버림)
+
+    Returns:
+        Dict[str, float]: 컬럼 이름 -> 숫자 값
+    """
+    if extras is None:
+        extras = {}
+    values: Dict[str, float] = {}
+    for group, data in metrics.items():
+        if group == "timestamp":
+            continue
+        if not data and isinstance(data, (dict, list)):
+            # 값이 없는 그룹도 수집 여부가 드러나도록 빈 컨테이너로 보관
+            extras[group] = data
+        elif isinstance(data, dict):
+            for key, value in data.items():
+                if isinstance(value, list) and value:
+                    for i, item in enumerate(value):
+                        _put(values, extras, f"{group}.{key}.{i}", item)
+                else:
+                    _put(values, extras, f"{group}.{key}", value)
+        elif isinstance(data, list) and group in TAG_KEYS:
+            tag_key = TAG_KEYS[group]
+            for item in data:
+                tag = item.get(tag_key)
+                for key, value in item.items():
+                    if key != tag_key:
+                        _put(values, extras, f"{group}.{tag}.{key}", value)
+        else:
+            # stale 목록 등 컬럼으로 나눌 수 없는 그룹은 그대로 보관
+            extras[group] = data
+    return values
+
+
+def _put(values: Dict[str, float], extras: Dict[str, Any], name: str, value: Any):
+    """숫자는 컬럼 값으로, 나머지는 extras로 분류"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        values[name] = value
+    else:
+        extras[name] = value
+
+
+def unflatten_sample(values: Dict[str, float]) -> Dict[str, Any]:
+    """flatten_sample의 역변환 (extras를 합친 값도 받음)"""
+    metrics: Dict[str, Any] = {}
+    tagged: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    for name, value in values.items():
+        if "." not in name:
+            metrics[name] = value
+            continue
+        group, rest = name.split(".", 1)
+        if group in TAG_KEYS:
+            tag, key = rest.rsplit(".", 1)
+            tagged.setdefault(group, {}).setdefault(tag, {})[key] = value
+            continue
+
+        parts = rest.rsplit(".", 1)
+        fields = metrics.setdefault(group, {})
+        if len(parts) == 2 and parts[1].isdigit():
+            items = fields.setdefault(parts[0], [])
+            index = int(parts[1])
+            items.extend([NAN] * (index + 1 - len(items)))
+            items[index] = value
+        else:
+            fields[rest] = value
+
+    for group, items in tagged.items():
+        tag_key = TAG_KEYS[group]
+        metrics[group] = [{tag_key: tag, **fields} for tag, fields in items.items()]
+
+    return metrics
@@ -1,24 +1,157 @@
 """CPU 메트릭 수집 모듈"""
 import psutil
-from typing import Dict
+from array import array
+from typing import Dict, Optional, Sequence
+
+from src.collector import procfs
+from src.collector.metadata import get_host_metadata
+
+# 사용률 계산에서 제외하는 필드 (guest 시간은 user/nice에 이미 포함됨)
+_EXCLUDED_FIELDS = ("guest", "guest_nice")
+# idle로 간주하는 필드
+_IDLE_FIELDS = ("idle", "iowait")
+# 비율(%)로 노출하는 세부 시간 필드
+_BREAKDOWN_FIELDS = ("user", "system", "iowait", "steal")
+
+
+class CPUSampler:
+    """
+    cpu_times 델타 기반 CPU 사용률 샘플러
+
+    이전 tick의 코어별 cpu_times 스냅샷을 보관하고, 현재 스냅샷과의 차이로
+    전체/코어별 사용률을 계산한다. sleep 없이 즉시 반환된다.
+    첫 호출은 이전 스냅샷이 없으므로 부팅 이후 누적값 기준으로 계산한다.
+    """
+
+    def __init__(self):
+        self._previous: Optional[array] = None
+        self._fields: Optional[Sequence[str]] = None
+
+    def sample(self) -> Dict[str, object]:
+        """
+        현재 CPU 시간을 읽어 사용률 계산
+
+        Returns:
+            Dict[str, object]: 전체 사용률, 코어별 사용률, 세부 시간 비율
+        """
+        reader = procfs.get_reader("cpu_sampler", procfs.StatReader)
+        if reader is not None:
+            cores = reader.read()
+            return self.update_values(reader.fields, reader.values, cores, offset=reader.width)
+        return self.update(psutil.cpu_times(percpu=True))
+
+    def update(self, per_cpu_times: Sequence[Sequence[float]]) -> Dict[str, object]:
+        """
+        코어별 cpu_times 스냅샷으로 사용률 계산
+
+        Args:
+            per_cpu_times: psutil.cpu_times(percpu=True) 형식의 스냅샷
+
+        Returns:
+            Dict[str, object]: 전체 사용률, 코어별 사용률, 세부 시간 비율
+        """
+        if not per_cpu_times:
+            return {}
+        values = [value for times in per_cpu_times for value in times]
+        return self.update_values(per_cpu_times[0]._fields, values, len(per_cpu_times))
+
+    def update_values(
+        self,
+        fields: Sequence[str],
+        values: Sequence[float],
+        cores: int,
+        offset: int = 0,
+    ) -> Dict[str, object]:
+        """
+        코어별 CPU 시간을 평탄화한 배열로 사용률 계산
+
+        Args:
+            fields: 코어당 필드 이름 (cpu_times 필드 순서)
+            values: 코어 순서로 이어 붙인 CPU 시간 (초)
+            cores: 코어 수
+            offset: values에서 첫 코어가 시작하는 위치
+
+        Returns:
+            Dict[str, object]: 전체 사용률, 코어별 사용률, 세부 시간 비율
+        """
+        if cores <= 0:
+            return {}
+
+        width = len(fields)
+        current = values[offset:offset + cores * width]
+        if not isinstance(current, array):
+            current = array("d", current)
+        previous = self._previous
+
+        # 첫 호출이거나 코어 수가 바뀐 경우 (CPU hotplug) 부팅 이후 기준으로 계산
+        if previous is None or len(previous) != len(current) or fields != self._fields:
+            previous = array("d", bytes(8 * len(current)))
+
+        self._previous = current
+        self._fields = fields
+
+        excluded = [i for i, name in enumerate(fields) if name in _EXCLUDED_FIELDS]
+        idle = [i for i, name in enumerate(fields) if name in _IDLE_FIELDS]
+        breakdown = {name: fields.index(name) for name in _BREAKDOWN_FIELDS if name in fields}
+
+        total_deltas = [0.0] * width
+        deltas = [0.0] * width
+        per_core = []
+        for base in range(0, cores * width, width):
+            for i in range(width):
+                delta = current[base + i] - previous[base + i]
+                deltas[i] = delta if delta > 0 else 0.0
+                total_deltas[i] += deltas[i]
+            per_core.append(self._busy_percent(deltas, excluded, idle))
+
+        metrics: Dict[str, object] = {
+            "cpu_percent": self._busy_percent(total_deltas, excluded, idle),
+            "cpu_percent_per_core": per_core,
+        }
+
+        elapsed = sum(total_deltas) - sum(total_deltas[i] for i in excluded)
+        for name in _BREAKDOWN_FIELDS:
+            index = breakdown.get(name)
+            value = total_deltas[index] / elapsed * 100 if index is not None and elapsed > 0 else 0.0
+            metrics[f"cpu_{name}_percent"] = round(value, 1)
+
+        return metrics
+
+    @staticmethod
+    def _busy_percent(deltas: Sequence[float], excluded: Sequence[int], idle: Sequence[int]) -> float:
+        """델타 값으로 busy 비율 계산"""
+        elapsed = sum(deltas) - sum(deltas[i] for i in excluded)
+        if elapsed <= 0:
+            return 0.0
+        busy = elapsed - sum(deltas[i] for i in idle)
+        return round(min(max(busy / elapsed * 100, 0.0), 100.0), 1)
+
+
+# 모듈 기본 샘플러 (get_cpu_metrics 호출 간 상태 유지)
+_sampler = CPUSampler()
 
 
 def get_cpu_metrics() -> Dict[str, float]:
     """
     CPU 메트릭 수집
 
+    이전 호출 이후의 cpu_times 델타로 사용률을 계산하므로 블로킹하지 않는다.
+    코어 수와 주파수 범위는 HostMetadata 캐시에서 가져온다.
+
     Returns:
         Dict[str, float]: CPU 사용률 및 관련 메트릭
     """
-    return {
-        "cpu_percent": psutil.cpu_percent(interval=1),
-        "cpu_percent_per_core": psutil.cpu_percent(interval=1, percpu=True),
-        "cpu_count_logical": psutil.cpu_count(logical=True),
-        "cpu_count_physical": psutil.cpu_count(logical=False),
-        "cpu_freq_current": psutil.cpu_freq().current if psutil.cpu_freq() else 0,
-        "cpu_freq_min": psutil.cpu_freq().min if psutil.cpu_freq() else 0,
-        "cpu_freq_max": psutil.cpu_freq().max if psutil.cpu_freq() else 0,
-    }
+    facts = get_host_metadata().facts
+    freq = psutil.cpu_freq()
+    metrics = _sampler.sample()
+    metrics.update({
+        "cpu_count_logical": facts["cpu_count_logical"],
+        "cpu_count_physical": facts["cpu_count_physical"],
+        "cpu_freq_current": freq.current if freq else 0,
+        "cpu_freq_min": facts["cpu_freq_min"],
+        "cpu_freq_max": facts["cpu_freq_max"],
+    })
+    return metrics
 
 
 def get_cpu_times() -> Dict[str, float]:
@@ -28,6 +161,16 @@ def get_cpu_times() -> Dict[str, float]:
     Returns:
         Dict[str, float]: CPU 시간 메트릭 (user, system, idle 등)
     """
+    reader = procfs.get_reader("cpu_times", procfs.StatReader)
+    if reader is not None:
+        reader.read()
+        values = reader.values
+        return {
+            "cpu_time_user": values[0],
+            "cpu_time_system": values[2],
+            "cpu_time_idle": values[3],
+        }
+
     cpu_times = psutil.cpu_times()
     return {
         "cpu_time_user": cpu_times.user,
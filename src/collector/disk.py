@@ -1,16 +1,31 @@
 """디스크 메트릭 수집 모듈"""
+import os
+import sys
+
 import psutil
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from src.collector import procfs
+from src.collector.metadata import get_host_metadata
+from src.collector.rates import CounterRates, DeviceFilter
+
+# 기본 제외 블록 장치 (loop, 램디스크, 광학 드라이브) - COLLECTOR_EXCLUDE_DEVICES로 변경
+DEFAULT_EXCLUDED_DEVICES = "loop*,ram*,zram*,sr*,fd*"
+
+# 장치 카운터 필드 (psutil sdiskio, procfs.DiskStatsReader.DISK_FIELDS 순서)
+_DEVICE_FIELDS = ("read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time", "busy_time")
 
 
 def get_disk_usage() -> List[Dict[str, float]]:
     """
     디스크 사용량 메트릭 수집
 
+    파티션 목록은 HostMetadata 캐시(마운트 변경 시 갱신)를 사용한다.
+
     Returns:
         List[Dict[str, float]]: 각 파티션별 디스크 사용량
     """
-    partitions = psutil.disk_partitions()
+    partitions = get_host_metadata().partitions
     disk_usage_list = []
 
     for partition in partitions:
@@ -38,6 +53,19 @@ def get_disk_io() -> Dict[str, int]:
     Returns:
         Dict[str, int]: 디스크 읽기/쓰기 카운트 및 바이트
     """
+    reader = procfs.get_reader("disk_io", procfs.DiskStatsReader)
+    if reader is not None:
+        reader.read()
+        totals = reader.totals
+        return {
+            "disk_read_count": totals[0],
+            "disk_write_count": totals[1],
+            "disk_read_bytes": totals[2],
+            "disk_write_bytes": totals[3],
+            "disk_read_time": totals[4],
+            "disk_write_time": totals[5],
+        }
+
     disk_io = psutil.disk_io_counters()
     if disk_io is None:
         return {}
@@ -50,3 +78,99 @@ def get_disk_io() -> Dict[str, int]:
         "disk_read_time": disk_io.read_time,
         "disk_write_time": disk_io.write_time,
     }
+
+
+class DeviceIOSampler:
+    """
+    블록 장치별 I/O 카운터를 초당 변화율로 변환하는 샘플러
+
+    Linux에서는 파티션을 제외한 물리 장치(/sys/block 항목)만 수집해 시리즈 수를 제한한다.
+    """
+
+    def __init__(self, exclude: Optional[DeviceFilter] = None):
+        """
+        Args:
+            exclude: 제외할 장치 필터 (None이면 COLLECTOR_EXCLUDE_DEVICES)
+        """
+        self.exclude = exclude or DeviceFilter.from_env("COLLECTOR_EXCLUDE_DEVICES", DEFAULT_EXCLUDED_DEVICES)
+        self.rates = CounterRates()
+        self._whole_devices: Dict[str, bool] = {}
+
+    def _is_whole_device(self, name: str) -> bool:
+        """파티션이 아닌 장치 여부 (Linux 외 환경은 항상 True)"""
+        if not sys.platform.startswith("linux"):
+            return True
+        whole = self._whole_devices.get(name)
+        if whole is None:
+            whole = os.path.exists(f"/sys/block/{name.replace('/', '!')}")
+            self._whole_devices[name] = whole
+        return whole
+
+    def read_counters(self) -> Dict[str, Dict[str, int]]:
+        """장치별 누적 카운터 조회"""
+        reader = procfs.get_reader("disk_devices", procfs.DiskStatsReader)
+        if reader is not None:
+            reader.read()
+            width = reader.width
+            return {
+                name: dict(zip(_DEVICE_FIELDS, reader.counters[i * width:(i + 1) * width]))
+                for i, name in enumerate(reader.names)
+                if reader.is_storage_device(name) and not self.exclude.excluded(name)
+            }
+
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        return {
+            name: {field: getattr(io, field, 0) for field in _DEVICE_FIELDS}
+            for name, io in counters.items()
+            if self._is_whole_device(name) and not self.exclude.excluded(name)
+        }
+
+    def sample(self, now: Optional[float] = None) -> List[Dict[str, float]]:
+        """
+        장치별 처리량, IOPS, 평균 대기 시간, 사용률 계산
+
+        Args:
+            now: 스냅샷 시각 (초), None이면 monotonic 시계
+
+        Returns:
+            List[Dict[str, float]]: 장치별 I/O 변화율
+        """
+        counters = self.read_counters()
+        self.rates.prune(counters)
+
+        results = []
+        for name, values in counters.items():
+            delta = self.rates.update(name, values, now)
+            if delta is None:
+                continue
+            deltas, elapsed = delta
+            operations = deltas["read_count"] + deltas["write_count"]
+            io_time = deltas["read_time"] + deltas["write_time"]
+            results.append({
+                "device": name,
+                "read_bytes_per_sec": deltas["read_bytes"] / elapsed,
+                "write_bytes_per_sec": deltas["write_bytes"] / elapsed,
+                "read_iops": deltas["read_count"] / elapsed,
+                "write_iops": deltas["write_count"] / elapsed,
+                "await_ms": io_time / operations if operations else 0.0,
+                "util_percent": min(deltas["busy_time"] / (elapsed * 1000) * 100, 100.0),
+            })
+        return results
+
+
+_device_sampler: Optional[DeviceIOSampler] = None
+
+
+def get_disk_io_per_device() -> List[Dict[str, float]]:
+    """
+    블록 장치별 디스크 I/O 변화율 수집
+
+    첫 호출은 기준 스냅샷만 저장하므로 빈 리스트를 반환한다.
+
+    Returns:
+        List[Dict[str, float]]: 장치별 초당 바이트, IOPS, await(ms), 사용률(%)
+    """
+    global _device_sampler
+    if _device_sampler is None:
+        _device_sampler = DeviceIOSampler()
+    return _device_sampler.sample()
@@ -0,0 +1,302 @@
+"""데드밴드 및 적응형 해상도 기반 전송 정책 모듈"""
+import fnmatch
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 필터를 거치지 않고 그대로 전달하는 키
+PASSTHROUGH_KEYS = ("timestamp", "stale", "host_info")
+
+# 리스트 형태 그룹의 항목 식별 태그
+ITEM_TAG_KEYS = {
+    "disk_usage": "mountpoint",
+    "disk_devices": "device",
+    "network_interfaces": "interface",
+}
+
+# 알림 규칙 메트릭 이름 -> 수집 필드 이름
+RULE_FIELD_ALIASES = {
+    "disk_percent": "percent",
+}
+
+# 기본 데드밴드 (필드 이름 패턴 -> 절대 변화량). 일치하지 않는 필드는 값이 바뀌면 전송
+DEFAULT_DEADBANDS = {
+    "*percent*": 0.5,
+}
+
+
+def parse_deadbands(spec: str) -> Dict[str, float]:
+    """
+    "패턴=값,패턴=값" 형식 데드밴드 설정 파싱
+
+    Args:
+        spec: 예) "cpu_percent=1,*_per_sec=1024"
+    """
+    deadbands = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        pattern, value = item.split("=", 1)
+        deadbands[pattern.strip()] = float(value)
+    return deadbands
+
+
+def thresholds_from_rules(rules: Iterable[Any]) -> Dict[str, float]:
+    """
+    알림 규칙에서 필드별 가장 낮은 임계값 추출 (">", ">=" 조건만)
+
+    Args:
+        rules: AlertRule 목록
+    """
+    thresholds: Dict[str, float] = {}
+    for rule in rules:
+        if rule.condition not in (">", ">="):
+            continue
+        field = RULE_FIELD_ALIASES.get(rule.metric, rule.metric)
+        thresholds[field] = min(rule.threshold, thresholds.get(field, rule.threshold))
+    return thresholds
+
+
+class EmissionPolicy:
+    """
+    collect_all_metrics와 저장소 사이의 전송 필터
+
+    - 데드밴드: 마지막으로 전송한 값보다 deadband 이상 변했을 때만 필드를 전송하고,
+      변화가 없어도 heartbeat 초마다 한 번은 전송한다.
+    - 적응형 해상도: 그룹 값이 안정적이면 샘플링 간격을 max_interval까지 두 배씩 늘리고,
+      변동이 생기거나 알림 임계값 근처(threshold_margin 이내)면 즉시 기본 주기로 돌아간다.
+
+    cpu_percent_per_core 같은 리스트 값과 디스크/인터페이스 항목은 한 단위로 판정한다.
+    """
+
+    def __init__(
+        self,
+        deadbands: Optional[Dict[str, float]] = None,
+        heartbeat: float = 60,
+        base_interval: float = 1,
+        max_interval: float = 30,
+        thresholds: Optional[Dict[str, float]] = None,
+        threshold_margin: float = 0.1,
+        adaptive: bool = True,
+    ):
+        """
+        Args:
+            deadbands: 필드 이름 패턴 -> 절대 변화량
+            heartbeat: 값이 변하지 않아도 전송하는 최대 간격 (초)
+            base_interval: 기본 수집 주기 (초)
+            max_interval: 안정 상태에서 늘어날 수 있는 최대 샘플링 간격 (초)
+            thresholds: 필드 이름 -> 알림 임계값
+            threshold_margin: 임계값 대비 근접 판정 비율
+            adaptive: 적응형 해상도 사용 여부
+        """
+        self.deadbands = dict(DEFAULT_DEADBANDS if deadbands is None else deadbands)
+        self.heartbeat = heartbeat
+        self.base_interval = base_interval
+        self.max_interval = min(max_interval, heartbeat)
+        self.thresholds = thresholds or {}
+        self.threshold_margin = threshold_margin
+        self.adaptive = adaptive
+
+        self._last: Dict[Tuple[str, ...], Tuple[Any, float]] = {}
+        self._deadband_cache: Dict[str, float] = {}
+        self._backoff: Dict[str, float] = {}
+        self._next_due: Dict[str, float] = {}
+
+        self.fields_collected = 0
+        self.fields_emitted = 0
+
+    @classmethod
+    def from_env(cls, base_interval: float = 1) -> "EmissionPolicy":
+        """환경 변수와 기본 알림 규칙으로 정책 생성"""
+        from src.alert.alertmanager import AlertManager
+
+        spec = os.getenv("COLLECTOR_DEADBANDS")
+        return cls(
+            deadbands=parse_deadbands(spec) if spec else None,
+            heartbeat=float(os.getenv("COLLECTOR_HEARTBEAT", "60")),
+            base_interval=base_interval,
+            max_interval=float(os.getenv("COLLECTOR_MAX_BACKOFF", "30")),
+            thresholds=thresholds_from_rules(AlertManager().rules),
+        )
+
+    @property
+    def compression_ratio(self) -> float:
+        """수집 필드 수 / 전송 필드 수"""
+        if not self.fields_emitted:
+            return float(self.fields_collected) if self.fields_collected else 1.0
+        return self.fields_collected / self.fields_emitted
+
+    def deadband(self, field: str) -> float:
+        """필드의 데드밴드 값 조회"""
+        value = self._deadband_cache.get(field)
+        if value is None:
+            value = next(
+                (band for pattern, band in self.deadbands.items() if fnmatch.fnmatchcase(field, pattern)),
+                0.0,
+            )
+            self._deadband_cache[field] = value
+        return value
+
+    def is_due(self, group: str, now: Optional[float] = None) -> bool:
+        """
+        적응형 해상도에 따라 이번 tick에 그룹을 샘플링할지 판정
+
+        Args:
+            group: 그룹 이름
+            now: tick 시각 (epoch 초)
+        """
+        if not self.adaptive:
+            return True
+        if now is None:
+            now = time.time()
+        return now >= self._next_due.get(group, 0.0) - 1e-6
+
+    def filter(self, metrics: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        전송할 필드만 남긴 메트릭 반환
+
+        Args:
+            metrics: collect_all_metrics 결과
+            now: tick 시각 (epoch 초)
+
+        Returns:
+            Dict[str, Any]: 변경/heartbeat 대상 필드만 포함한 메트릭
+        """
+        if now is None:
+            now = time.time()
+
+        emitted: Dict[str, Any] = {}
+        for group, data in metrics.items():
+            if group in PASSTHROUGH_KEYS:
+                emitted[group] = data
+                continue
+
+            if isinstance(data, dict):
+                fields, volatile = self._filter_fields(group, data, now)
+                if fields:
+                    emitted[group] = fields
+            elif isinstance(data, list) and group in ITEM_TAG_KEYS:
+                items, volatile = self._filter_items(group, data, now)
+                if items:
+                    emitted[group] = items
+            else:
+                emitted[group] = data
+                continue
+
+            self._update_resolution(group, volatile, now)
+
+        return emitted
+
+    def _filter_fields(self, group: str, data: Dict[str, Any], now: float):
+        """평면 그룹의 필드별 데드밴드 판정"""
+        fields = {}
+        volatile = False
+        for key, value in data.items():
+            size = len(value) if isinstance(value, list) else 1
+            self.fields_collected += size
+            changed, near = self._check((group, key), key, value, now)
+            volatile = volatile or changed or near
+            if changed or near or self._heartbeat_due((group, key), now):
+                fields[key] = value
+                self._last[(group, key)] = (value, now)
+                self.fields_emitted += size
+        return fields, volatile
+
+    def _filter_items(self, group: str, data: list, now: float):
+        """장치/인터페이스 항목 단위 데드밴드 판정"""
+        tag_key = ITEM_TAG_KEYS[group]
+        items = []
+        volatile = False
+        for item in data:
+            tag = item.get(tag_key)
+            size = len(item) - 1
+            self.fields_collected += size
+            item_changed = False
+            for key, value in item.items():
+                if key == tag_key:
+                    continue
+                changed, near = self._check((group, tag, key), key, value, now)
+                item_changed = item_changed or changed or near
+            volatile = volatile or item_changed
+            if item_changed or self._heartbeat_due((group, tag), now):
+                items.append(item)
+                for key, value in item.items():
+                    self._last[(group, tag, key)] = (value, now)
+                self._last[(group, tag)] = (None, now)
+                self.fields_emitted += size
+        return items, volatile
+
+    def _check(self, state_key: Tuple[str, ...], field: str, value: Any, now: float) -> Tuple[bool, bool]:
+        """
+        값 변화 및 임계값 근접 여부 판정
+
+        Returns:
+            (데드밴드 초과 여부, 임계값 근접 여부) 튜플
+        """
+        previous = self._last.get(state_key)
+        near = self._near_threshold(field, value)
+        if previous is None:
+            return True, near
+
+        last_value = previous[0]
+        band = self.deadband(field)
+        if isinstance(value, list):
+            if not isinstance(last_value, list) or len(value) != len(last_value):
+                return True, near
+            changed = any(self._moved(v, p, band) for v, p in zip(value, last_value))
+        else:
+            changed = self._moved(value, last_value, band)
+        return changed, near
+
+    @staticmethod
+    def _moved(value: Any, previous: Any, band: float) -> bool:
+        """데드밴드를 넘는 변화 여부"""
+        if isinstance(value, (int, float)) and isinstance(previous, (int, float)):
+            if band <= 0:
+                return value != previous
+            return abs(value - previous) >= band
+        return value != previous
+
+    def _near_threshold(self, field: str, value: Any) -> bool:
+        """알림 임계값 근접 여부"""
+        threshold = self.thresholds.get(field)
+        if threshold is None or not isinstance(value, (int, float)):
+            return False
+        return value >= threshold * (1 - self.threshold_margin)
+
+    def _heartbeat_due(self, state_key: Tuple[str, ...], now: float) -> bool:
+        """마지막 전송 후 heartbeat 간격이 지났는지 확인"""
+        previous = self._last.get(state_key)
+        return previous is None or now - previous[1] >= self.heartbeat - 1e-6
+
+    def _update_resolution(self, group: str, volatile: bool, now: float):
+        """그룹 변동 여부에 따라 다음 샘플링 시각 조정"""
+        if not self.adaptive:
+            return
+
+        if volatile:
+            backoff = 0.0
+        else:
+            backoff = min(max(self._backoff.get(group, 0.0) * 2, self.base_interval * 2), self.max_interval)
+            if backoff != self._backoff.get(group):
+                logger.debug(f"Group {group} is stable, sampling every {backoff:.0f}s")
+
+        self._backoff[group] = backoff
+        self._next_due[group] = now + backoff
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        전송 정책 통계 조회
+
+        Returns:
+            Dict[str, float]: 수집/전송 필드 수, 압축률, 백오프 중인 그룹 수
+        """
+        return {
+            "fields_collected": self.fields_collected,
+            "fields_emitted": self.fields_emitted,
+            "compression_ratio": self.compression_ratio,
+            "backed_off_groups": sum(1 for backoff in self._backoff.values() if backoff > 0),
+        }
@@ -0,0 +1,174 @@
+"""수집기 자체 계측 (Prometheus) 모듈"""
+import logging
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.process_collector import ProcessCollector
+
+logger = logging.getLogger(__name__)
+
+# PRD 수집 예산(100ms) 주변을 세밀하게 나눈 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CollectorInstrumentation:
+    """
+    수집기 오버헤드 지표
+
+    인스턴스마다 별도 CollectorRegistry를 사용하므로 API 서버의 기본 레지스트리나
+    테스트의 다른 인스턴스와 충돌하지 않는다. 프로세스 RSS/CPU 시간은
+    ProcessCollector(process_resident_memory_bytes, process_cpu_seconds_total)로 노출된다.
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None):
+        self.registry = registry or CollectorRegistry()
+        registry = self.registry
+
+        self.probe_duration = Histogram(
+            "collector_probe_duration_seconds", "Probe execution time",
+            ["probe"], buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.probe_timeouts = Counter(
+            "collector_probe_timeouts_total", "Probes that missed their deadline",
+            ["probe"], registry=registry,
+        )
+        self.probe_errors = Counter(
+            "collector_probe_errors_total", "Probes that raised an exception",
+            ["probe"], registry=registry,
+        )
+        self.collection_duration = Histogram(
+            "collector_collection_duration_seconds", "Time to collect one sample",
+            buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.write_duration = Histogram(
+            "collector_write_duration_seconds", "Time to hand one sample to the write queue",
+            buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.flush_duration = Histogram(
+            "collector_flush_duration_seconds", "Time to flush one batch to storage",
+            buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.write_batch_points = Histogram(
+            "collector_write_batch_points", "Points per storage flush",
+            buckets=BATCH_SIZE_BUCKETS, registry=registry,
+        )
+        self.write_errors = Counter(
+            "collector_write_errors_total", "Failed storage writes", registry=registry,
+        )
+        self.tick_jitter = Histogram(
+            "collector_tick_jitter_seconds", "Delay between tick deadline and wake-up",
+            buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.missed_ticks = Counter(
+            "collector_missed_ticks_total", "Ticks skipped because the previous tick overran",
+            registry=registry,
+        )
+        self.queue_depth = Gauge(
+            "collector_write_queue_depth", "Points waiting to be written", registry=registry,
+        )
+        self.dropped_samples = Counter(
+            "collector_dropped_samples_total", "Samples or points discarded before storage",
+            registry=registry,
+        )
+        self.spool_pending_bytes = Gauge(
+            "collector_spool_pending_bytes", "Bytes of unsent batches held in the disk spool",
+            registry=registry,
+        )
+        self.spool_replayed_points = Counter(
+            "collector_spool_replayed_points_total", "Spooled points replayed to storage",
+            registry=registry,
+        )
+        self.emission_compression_ratio = Gauge(
+            "collector_emission_compression_ratio", "Collected fields per emitted field (deadband policy)",
+            registry=registry,
+        )
+        self.backpressure_level = Gauge(
+            "collector_backpressure_level", "Load shedding level driven by storage queue/spool usage",
+            registry=registry,
+        )
+        self.shed_samples = Counter(
+            "collector_shed_samples_total", "Group samples skipped by backpressure load shedding",
+            ["group"], registry=registry,
+        )
+        self.samples_collected = Counter(
+            "collector_samples_total", "Samples collected", registry=registry,
+        )
+        ProcessCollector(registry=registry)
+
+    def observe_probe(
+        self,
+        probe: str,
+        elapsed: Optional[float] = None,
+        timed_out: bool = False,
+        failed: bool = False,
+    ):
+        """프로브 실행 결과 기록"""
+        if elapsed is not None:
+            self.probe_duration.labels(probe=probe).observe(elapsed)
+        if timed_out:
+            self.probe_timeouts.labels(probe=probe).inc()
+        if failed:
+            self.probe_errors.labels(probe=probe).inc()
+
+    def observe_tick(self, jitter: float, missed: int = 0):
+        """tick jitter 및 누락 tick 기록"""
+        self.tick_jitter.observe(jitter)
+        if missed:
+            self.missed_ticks.inc(missed)
+
+    def observe_write(self, elapsed: float, points: Optional[int] = None):
+        """샘플 전달 지연 시간 및 배치 크기 기록"""
+        self.write_duration.observe(elapsed)
+        if points is not None:
+            self.write_batch_points.observe(points)
+
+    def observe_flush(self, elapsed: float, points: int, failed: bool = False):
+        """배치 flush 지연 시간 및 크기 기록"""
+        self.flush_duration.observe(elapsed)
+        self.write_batch_points.observe(points)
+        if failed:
+            self.write_errors.inc()
+
+    def attach_writer(self, writer):
+        """
+        BatchWriter의 flush/drop 결과와 큐 깊이를 지표로 연결
+
+        Args:
+            writer: BatchWriter 인스턴스
+        """
+        writer.on_flush = self.observe_flush
+        writer.on_drop = self.dropped_samples.inc
+        self.queue_depth.set_function(lambda: writer.depth)
+
+    def attach_spool(self, spool, replayer):
+        """
+        디스크 스풀 깊이와 재전송 진행 상황을 지표로 연결
+
+        Args:
+            spool: WriteSpool 인스턴스
+            replayer: SpoolReplayer 인스턴스
+        """
+        self.spool_pending_bytes.set_function(lambda: spool.pending_bytes)
+        replayer.on_replay = self.spool_replayed_points.inc
+
+    def attach_backpressure(self, policy):
+        """
+        backpressure 차단 단계와 그룹별 생략 샘플 수를 지표로 연결
+
+        Args:
+            policy: BackpressurePolicy 인스턴스
+        """
+        policy.on_level_change = self.backpressure_level.set
+        policy.on_shed = lambda group: self.shed_samples.labels(group=group).inc()
+
+    def start_http_server(self, port: int, addr: str = "0.0.0.0"):
+        """
+        별도 HTTP 포트로 /metrics 노출
+
+        Args:
+            port: 리슨 포트
+            addr: 리슨 주소
+        """
+        start_http_server(port, addr=addr, registry=self.registry)
+        logger.info(f"Collector self-metrics exposed on {addr}:{port}")
@@ -3,14 +3,22 @@ import asyncio
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, List, Optional
 
 from src.collector.cpu import get_cpu_metrics, get_cpu_times
 from src.collector.memory import get_memory_metrics
-from src.collector.disk import get_disk_usage, get_disk_io
-from src.collector.network import get_network_io, get_network_connections
-from src.storage.influxdb_client import InfluxDBClient
+from src.collector.disk import get_disk_usage, get_disk_io, get_disk_io_per_device
+from src.collector.network import get_network_io, get_network_io_per_interface, get_network_connections
+from src.collector.backpressure import BackpressurePolicy, storage_pressure
+from src.collector.buffer import SampleBuffer
+from src.collector.emission import EmissionPolicy
+from src.collector.instrumentation import CollectorInstrumentation
+from src.collector.metadata import get_host_metadata
+from src.collector.scheduler import CadenceGate, TickScheduler
+from src.storage.base import MetricsStorage
+from src.storage.factory import create_storage
 
 # 환경 변수에서 로그 레벨 가져오기
 log_level = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -24,63 +32,159 @@ logger = logging.getLogger(__name__)
 class MetricsCollector:
     """시스템 메트릭 수집 및 저장 클래스"""
 
-    def __init__(self, influxdb_client: Optional[InfluxDBClient] = None, dry_run: bool = False):
+    # 그룹별 수집 주기 (초). 명시되지 않은 그룹은 매 tick 수집
+    DEFAULT_CADENCES: Dict[str, float] = {
+        "disk_io": 5,
+        "disk_devices": 5,
+        "disk_usage": 30,
+        "host_info": 300,
+    }
+
+    # 프로브별 타임아웃 (초). 초과 시 해당 그룹은 stale로 표시되고 tick은 지연되지 않음
+    DEFAULT_PROBE_TIMEOUTS: Dict[str, float] = {
+        "cpu": 0.5,
+        "cpu_times": 0.5,
+        "memory": 0.5,
+        "network_io": 0.5,
+        "network_interfaces": 0.5,
+        "disk_io": 1.0,
+        "disk_devices": 1.0,
+        "disk_usage": 2.0,
+        "network_connections": 2.0,
+    }
+
+    def __init__(
+        self,
+        storage: Optional[MetricsStorage] = None,
+        dry_run: bool = False,
+        cadences: Optional[Dict[str, float]] = None,
+        probe_timeouts: Optional[Dict[str, float]] = None,
+        max_workers: Optional[int] = None,
+        buffer_capacity: Optional[int] = None,
+        instrumentation: Optional[CollectorInstrumentation] = None,
+        emission_policy: Optional[EmissionPolicy] = None,
+        backpressure: Optional[BackpressurePolicy] = None,
+    ):
         """
         Args:
-            influxdb_client: InfluxDB 클라이언트 (None이면 dry-run 모드)
+            storage: 메트릭 저장소 (InfluxDBClient 또는 EmbeddedStorage, None이면 dry-run 모드)
             dry_run: True면 데이터를 저장하지 않고 로그만 출력
+            cadences: 그룹별 수집 주기 (초), DEFAULT_CADENCES를 덮어씀
+            probe_timeouts: 프로브별 타임아웃 (초), DEFAULT_PROBE_TIMEOUTS를 덮어씀
+            max_workers: 프로브 실행 스레드 수 (None이면 COLLECTOR_MAX_WORKERS 환경 변수)
+            buffer_capacity: 최근 샘플 보관 수 (None이면 COLLECTOR_BUFFER_SECONDS / COLLECTOR_INTERVAL, 최소 1)
+            instrumentation: 자체 계측 지표 (None이면 전용 레지스트리로 생성)
+            emission_policy: 데드밴드/적응형 해상도 전송 정책 (None이면 모든 필드 전송)
+            backpressure: 저장소 부하에 따른 우선순위 부하 차단 정책 (None이면 사용 안 함)
         """
-        self.influxdb_client = influxdb_client
-        self.dry_run = dry_run or influxdb_client is None
+        self.storage = storage
+        self.dry_run = dry_run or storage is None
         self.running = False
         self.metrics_collected = 0
-        self.last_disk_check = 0
-        self.last_disk_usage_check = 0
+        self.cadence_gate = CadenceGate({**self.DEFAULT_CADENCES, **(cadences or {})})
+        self.scheduler: Optional[TickScheduler] = None
+        self.metadata = get_host_metadata()
+
+        self.probes: Dict[str, Callable[[], Any]] = {
+            "cpu": get_cpu_metrics,
+            "cpu_times": get_cpu_times,
+            "memory": get_memory_metrics,
+            "network_io": get_network_io,
+            "network_interfaces": get_network_io_per_interface,
+            "disk_io": get_disk_io,
+            "disk_devices": get_disk_io_per_device,
+            "disk_usage": get_disk_usage,
+            "network_connections": get_network_connections,
+        }
+        self.probe_timeouts = {**self.DEFAULT_PROBE_TIMEOUTS, **(probe_timeouts or {})}
+        self.probe_stats: Dict[str, Dict[str, float]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        if max_workers is None:
+            max_workers = int(os.getenv("COLLECTOR_MAX_WORKERS", "4"))
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="collector-probe")
+
+        # 샘플 저장소 - 매 tick 샘플을 컬럼형 링 버퍼에 기록하고, 저장소에는 to_metrics 어댑터로 전달.
+        # InfluxDB 조회 없이 최근 구간 통계(recent_stats)를 제공
+        if buffer_capacity is None:
+            buffer_seconds = float(os.getenv("COLLECTOR_BUFFER_SECONDS", "3600"))
+            interval = float(os.getenv("COLLECTOR_INTERVAL", "1"))
+            buffer_capacity = int(buffer_seconds / interval)
+        self.buffer = SampleBuffer(max(buffer_capacity, 1))
+        self.instrumentation = instrumentation or CollectorInstrumentation()
+        self.emission_policy = emission_policy
+        self.backpressure = backpressure
+        if backpressure is not None:
+            self.instrumentation.attach_backpressure(backpressure)
+
+        # 백그라운드 writer의 flush 지연 시간/배치 크기/큐 깊이를 자체 계측 지표로 노출
+        writer = getattr(storage, "writer", None)
+        if writer is not None:
+            self.instrumentation.attach_writer(writer)
+        if getattr(storage, "spool", None) is not None:
+            self.instrumentation.attach_spool(storage.spool, storage.replayer)
 
         if self.dry_run:
-            logger.warning("Running in DRY-RUN mode - metrics will not be saved to InfluxDB")
+            logger.warning("Running in DRY-RUN mode - metrics will not be saved")
 
-    async def collect_all_metrics(self) -> Dict[str, Any]:
+    async def collect_all_metrics(self, tick_time: Optional[float] = None) -> Dict[str, Any]:
         """
         모든 메트릭 수집
 
-        수집 주기:
-        - CPU, Memory, Network: 매번 수집 (1초)
-        - Disk I/O: 5초마다
+        수집 주기 (DEFAULT_CADENCES, tick 시계 기준):
+        - CPU, Memory, Network (인터페이스별 변화율 포함): 매 tick
+        - Disk I/O (장치별 변화율 포함): 5초마다
         - Disk Usage: 30초마다
+        - Host info (정적 정보): 변경 감지 시 + 300초마다
+
+        프로브는 스레드 풀에서 동시에 실행된다. 타임아웃을 넘긴 프로브는 결과에서
+        제외되고 metrics["stale"]에 이름이 기록된다.
+        샘플은 self.buffer에 기록되고, 반환값은 버퍼의 최신 샘플을 복원한 dict이다.
+
+        Args:
+            tick_time: 스케줄러 tick deadline (epoch 초), None이면 현재 시각
         """
         start_time = time.time()
-        current_time = time.time()
-
-        metrics = {
-            "timestamp": datetime.utcnow(),
-            "cpu": get_cpu_metrics(),
-            "cpu_times": get_cpu_times(),
-            "memory": get_memory_metrics(),
-            "network_io": get_network_io(),
+        if tick_time is None:
+            tick_time = start_time
+
+        sample: Dict[str, Any] = {
+            "timestamp": datetime.utcfromtimestamp(tick_time),
         }
 
-        # Disk I/O: 5초마다 수집
-        if current_time - self.last_disk_check >= 5:
-            metrics["disk_io"] = get_disk_io()
-            self.last_disk_check = current_time
-            logger.debug("Collected disk I/O metrics")
+        # 정적 정보는 변경되었거나 주기가 돌아왔을 때만 별도 measurement로 기록
+        metadata_changed = self.metadata.check()
+        if self.cadence_gate.is_due("host_info", tick_time) or metadata_changed:
+            sample["host_info"] = self.metadata.to_fields()
 
-        # Disk Usage: 30초마다 수집
-        if current_time - self.last_disk_usage_check >= 30:
-            metrics["disk_usage"] = get_disk_usage()
-            self.last_disk_usage_check = current_time
-            logger.debug("Collected disk usage metrics")
+        # backpressure는 그룹 주기 단위로 간격을 늘리므로 주기 버킷을 소비하기 전에 판정
+        names = [
+            name for name in self.probes
+            if (self.backpressure is None
+                or self.backpressure.is_due(name, tick_time, self.cadence_gate.cadences.get(name)))
+            and self.cadence_gate.is_due(name, tick_time)
+            and (self.emission_policy is None or self.emission_policy.is_due(name, tick_time))
+        ]
+        results = await asyncio.gather(*(self._run_probe(name) for name in names))
 
-        # Network connections (에러 발생 가능)
-        try:
-            network_connections = get_network_connections()
-            metrics["network_connections"] = network_connections
-        except Exception as e:
-            logger.warning(f"Failed to get network connections: {e}")
-            metrics["network_connections"] = {}
+        stale: List[str] = []
+        for name, (status, value) in zip(names, results):
+            if status == "ok":
+                sample[name] = value
+            elif status == "stale":
+                stale.append(name)
+
+        if stale:
+            sample["stale"] = stale
+            logger.warning(f"Probes missed their deadline: {', '.join(stale)}")
+
+        # 프로브 결과는 버퍼 컬럼에 기록하고, 기존 호출자에는 dict 어댑터로 반환
+        self.buffer.append_sample(sample)
+        metrics = self.buffer.to_metrics()
 
         # 수집 시간 측정
+        self.instrumentation.collection_duration.observe(time.time() - start_time)
+        self.instrumentation.samples_collected.inc()
         collection_time = (time.time() - start_time) * 1000
         logger.debug(f"Metrics collection took {collection_time:.2f}ms")
 
@@ -89,61 +193,230 @@ class MetricsCollector:
 
         return metrics
 
-    async def collect_loop(self, interval: int = 1):
-        """메트릭 수집 루프"""
+    def recent_stats(self, column: str, seconds: Optional[float] = None) -> Dict[str, float]:
+        """
+        샘플 버퍼에서 최근 구간 통계 조회 (InfluxDB 조회 없음)
+
+        Args:
+            column: "그룹.필드" 컬럼 이름 (예: "cpu.cpu_percent", "disk_devices.sda.util_percent")
+            seconds: 최신 샘플 기준 조회 구간 (None이면 보관 중인 전체)
+
+        Returns:
+            Dict[str, float]: count, min, max, mean (값이 없으면 count 0, 나머지 NaN)
+        """
+        if column not in self.buffer.columns:
+            return {"count": 0, "min": float("nan"), "max": float("nan"), "mean": float("nan")}
+        return self.buffer.stats(column, seconds)
+
+    async def _run_probe(self, name: str):
+        """
+        프로브를 스레드 풀에서 실행
+
+        Returns:
+            (상태, 결과) 튜플. 상태는 "ok", "stale", "error" 중 하나
+        """
+        previous = self._inflight.get(name)
+        if previous is not None and not previous.done():
+            # 이전 tick의 호출이 아직 실행 중이면 중복 제출하지 않음
+            self._record_probe(name, timed_out=True)
+            return "stale", None
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._timed_call, name, self.probes[name])
+        # 타임아웃 이후 늦게 실패한 프로브의 예외가 미처리 경고로 남지 않도록 소비
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[name] = future
+
+        timeout = self.probe_timeouts.get(name)
+        if timeout is not None and self.scheduler is not None:
+            timeout = min(timeout, self.scheduler.interval)
+
+        try:
+            value, elapsed = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._record_probe(name, timed_out=True)
+            return "stale", None
+        except Exception as e:
+            logger.warning(f"Probe {name} failed: {e}")
+            self._record_probe(name, failed=True)
+            return "error", None
+
+        self._record_probe(name, elapsed=elapsed)
+        return "ok", value
+
+    @staticmethod
+    def _timed_call(name: str, probe: Callable[[], Any]):
+        """프로브 호출 및 소요 시간 측정 (워커 스레드에서 실행)"""
+        start = time.perf_counter()
+        value = probe()
+        return value, time.perf_counter() - start
+
+    def _record_probe(
+        self,
+        name: str,
+        elapsed: Optional[float] = None,
+        timed_out: bool = False,
+        failed: bool = False,
+    ):
+        """프로브별 지연 시간 통계 갱신"""
+        self.instrumentation.observe_probe(name, elapsed=elapsed, timed_out=timed_out, failed=failed)
+        stats = self.probe_stats.setdefault(name, {
+            "count": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "last_ms": 0.0,
+            "max_ms": 0.0,
+            "total_ms": 0.0,
+        })
+        if timed_out:
+            stats["timeouts"] += 1
+        if failed:
+            stats["errors"] += 1
+        if elapsed is not None:
+            elapsed_ms = elapsed * 1000
+            stats["count"] += 1
+            stats["last_ms"] = elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["total_ms"] += elapsed_ms
+
+    async def collect_loop(self, interval: float = 1):
+        """
+        메트릭 수집 루프
+
+        TickScheduler로 interval 경계에 정렬된 절대 deadline마다 수집한다.
+        수집/저장이 deadline을 넘기면 밀린 tick은 건너뛰고 missed_ticks로 집계한다.
+        """
         self.running = True
+        self.scheduler = TickScheduler(interval)
         logger.info(f"Starting metrics collection loop (interval: {interval}s, dry_run: {self.dry_run})")
 
         while self.running:
+            missed_before = self.scheduler.missed_ticks
+            tick_time = await self.scheduler.wait_next()
+            self.instrumentation.observe_tick(
+                self.scheduler.last_jitter, self.scheduler.missed_ticks - missed_before
+            )
+            if not self.running:
+                break
+
             try:
-                metrics = await self.collect_all_metrics()
+                # 저장소 쓰기 큐/스풀이 차오르면 낮은 우선순위 그룹의 수집 간격을 늘림
+                if self.backpressure is not None:
+                    self.backpressure.update(storage_pressure(self.storage))
+
+                metrics = await self.collect_all_metrics(tick_time)
 
                 if self.dry_run:
                     # Dry-run 모드: 수집된 메트릭 로그 출력
-                    logger.info(f"[DRY-RUN] Collected metrics: CPU={metrics['cpu'].get('cpu_percent', 0):.1f}%, "
-                                f"Memory={metrics['memory'].get('memory_percent', 0):.1f}%")
+                    cpu_1m = self.recent_stats("cpu.cpu_percent", 60)["mean"]
+                    logger.info(f"[DRY-RUN] Collected metrics: CPU={metrics.get('cpu', {}).get('cpu_percent', 0):.1f}% "
+                                f"(1m avg {cpu_1m:.1f}%), "
+                                f"Memory={metrics.get('memory', {}).get('memory_percent', 0):.1f}%")
                 else:
-                    # 실제로 InfluxDB에 저장
-                    await self.influxdb_client.write_metrics(metrics)
+                    # 전송 정책으로 변하지 않은 필드를 걸러낸 뒤 InfluxDB에 저장
+                    if self.emission_policy is not None:
+                        metrics = self.emission_policy.filter(metrics, tick_time)
+                        self.instrumentation.emission_compression_ratio.set(self.emission_policy.compression_ratio)
+                    await self.write_metrics(metrics)
                     logger.debug("Metrics collected and written successfully")
 
                 self.metrics_collected += 1
 
                 # 10회마다 통계 출력
                 if self.metrics_collected % 10 == 0:
-                    logger.info(f"Total metrics collected: {self.metrics_collected}")
+                    stats = self.scheduler.get_stats()
+                    logger.info(f"Total metrics collected: {self.metrics_collected}, "
+                                f"missed ticks: {stats['missed_ticks']}, overruns: {stats['overruns']}, "
+                                f"jitter avg/max: {stats['jitter_avg_ms']:.2f}/{stats['jitter_max_ms']:.2f}ms")
+                    if self.emission_policy is not None:
+                        logger.info(f"Emission compression ratio: {self.emission_policy.compression_ratio:.2f}x")
+                    writer = getattr(self.storage, "writer", None)
+                    if writer is not None:
+                        write_stats = writer.get_stats()
+                        logger.info(f"Write queue depth: {write_stats['queue_depth']}, "
+                                    f"flush avg/max: {write_stats['flush_avg_ms']:.2f}/{write_stats['flush_max_ms']:.2f}ms, "
+                                    f"last batch: {write_stats['last_batch_size']} points, "
+                                    f"dropped: {write_stats['points_dropped']}")
+                    if self.backpressure is not None and self.backpressure.level:
+                        bp_stats = self.backpressure.get_stats()
+                        logger.info(f"Backpressure level {bp_stats['level']} "
+                                    f"(storage load {bp_stats['pressure']:.0%}), "
+                                    f"shed samples: {bp_stats['shed_samples']}")
+                    spool = getattr(self.storage, "spool", None)
+                    if spool is not None and spool.pending_bytes:
+                        spool_stats = spool.get_stats()
+                        logger.info(f"Write spool pending: {spool_stats['pending_bytes']} bytes "
+                                    f"in {spool_stats['segments']} segments, "
+                                    f"replayed: {spool_stats['replayed_lines']} lines")
 
             except Exception as e:
                 logger.error(f"Error collecting metrics: {e}", exc_info=True)
 
-            await asyncio.sleep(interval)
+    async def write_metrics(self, metrics: Dict[str, Any]):
+        """
+        샘플을 저장소 쓰기 큐에 전달하고 전달 지연 시간 기록
+
+        배치 flush 지연 시간과 크기는 BatchWriter가 attach_writer로 연결된 지표에 기록한다.
+
+        Args:
+            metrics: collect_all_metrics 결과
+        """
+        start = time.perf_counter()
+        try:
+            await self.storage.write_metrics(metrics)
+        except Exception:
+            self.instrumentation.write_errors.inc()
+            self.instrumentation.dropped_samples.inc()
+            raise
+        self.instrumentation.observe_write(time.perf_counter() - start)
 
     def stop(self):
         """수집 중지"""
         logger.info("Stopping metrics collection")
         self.running = False
 
+    def close(self):
+        """프로브 스레드 풀 종료 (실행 중인 프로브는 기다리지 않음)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
 
 async def main():
     """메인 실행 함수"""
     # 환경 변수에서 설정 읽기
-    interval = int(os.getenv("COLLECTOR_INTERVAL", "1"))
+    interval = float(os.getenv("COLLECTOR_INTERVAL", "1"))
     dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
 
-    influxdb_client = None
+    storage = None
 
-    # InfluxDB 클라이언트 초기화 시도
+    # 저장소 초기화 시도 (STORAGE_BACKEND: influxdb 또는 embedded)
     if not dry_run:
         try:
-            influxdb_client = InfluxDBClient()
-            logger.info("InfluxDB client initialized successfully")
+            storage = create_storage()
+            logger.info("Metrics storage initialized successfully")
         except Exception as e:
-            logger.warning(f"Failed to initialize InfluxDB client: {e}")
+            logger.warning(f"Failed to initialize metrics storage: {e}")
             logger.warning("Switching to DRY-RUN mode")
             dry_run = True
 
+    # 데드밴드/적응형 해상도 전송 정책 (선택)
+    emission_policy = None
+    if os.getenv("COLLECTOR_DEADBAND_ENABLED", "false").lower() == "true":
+        emission_policy = EmissionPolicy.from_env(base_interval=interval)
+
+    # 저장소 부하 기반 우선순위 부하 차단 (기본 사용)
+    backpressure = None
+    if os.getenv("COLLECTOR_BACKPRESSURE_ENABLED", "true").lower() == "true":
+        backpressure = BackpressurePolicy.from_env(base_interval=interval)
+
     # 메트릭 수집기 생성 및 실행
-    collector = MetricsCollector(influxdb_client, dry_run=dry_run)
+    collector = MetricsCollector(
+        storage, dry_run=dry_run, emission_policy=emission_policy, backpressure=backpressure,
+    )
+
+    # 자체 계측 지표 HTTP 노출 (0이면 비활성화)
+    metrics_port = int(os.getenv("COLLECTOR_METRICS_PORT", "9101"))
+    if metrics_port:
+        collector.instrumentation.start_http_server(metrics_port)
 
     try:
         await collector.collect_loop(interval=interval)
@@ -151,8 +424,9 @@ async def main():
         logger.info("Received shutdown signal")
         collector.stop()
     finally:
-        if influxdb_client:
-            await influxdb_client.close()
+        collector.close()
+        if storage:
+            await storage.close()
 
 
 if __name__ == "__main__":
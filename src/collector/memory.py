@@ -2,6 +2,8 @@
 import psutil
 from typing import Dict
 
+from src.collector import procfs
+
 
 def get_memory_metrics() -> Dict[str, float]:
     """
@@ -10,6 +12,10 @@ def get_memory_metrics() -> Dict[str, float]:
     Returns:
         Dict[str, float]: 메모리 사용률 및 관련 메트릭
     """
+    reader = procfs.get_reader("memory", procfs.MemInfoReader)
+    if reader is not None:
+        return reader.read()
+
     mem = psutil.virtual_memory()
     swap = psutil.swap_memory()
 
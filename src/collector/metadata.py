@@ -0,0 +1,187 @@
+"""정적 호스트 메타데이터 캐시 모듈"""
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+
+# host_info measurement로만 저장되는 필드 (저장소 스키마에서 정의, 수집기 쪽 import 경로로 재노출)
+from src.storage.line_protocol import STATIC_FIELDS  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+class HostMetadata:
+    """
+    정적 호스트 정보 캐시
+
+    코어 수, 주파수 범위, 메모리/스왑 총량, 파티션 목록, 인터페이스 목록을 한 번만 조회하고
+    다음 변경 신호가 있을 때만 다시 조회한다.
+    - /proc/self/mounts poll 이벤트 (마운트 변경)
+    - /sys/class/net 항목 변화 (인터페이스 hotplug)
+    - revalidate_interval 경과 (주기적 재검증)
+    """
+
+    def __init__(
+        self,
+        revalidate_interval: float = 300,
+        mounts_path: str = "/proc/self/mounts",
+        net_class_path: str = "/sys/class/net",
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            revalidate_interval: 변경 신호가 없어도 다시 조회하는 주기 (초)
+            mounts_path: 마운트 테이블 경로 (poll 이벤트 감시)
+            net_class_path: 인터페이스 목록 디렉터리
+            clock: 시계 함수
+        """
+        self.revalidate_interval = revalidate_interval
+        self._net_class_path = net_class_path
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self.facts: Dict[str, Any] = {}
+        self.partitions: List[Any] = []
+        self.interfaces: List[str] = []
+        self.version = 0
+        self.refreshed_at = 0.0
+
+        self._mounts_file = None
+        self._mounts_poll = None
+        if sys.platform.startswith("linux") and hasattr(select, "poll"):
+            try:
+                self._mounts_file = open(mounts_path, "rb")
+                self._mounts_poll = select.poll()
+                self._mounts_poll.register(self._mounts_file, select.POLLERR | select.POLLPRI)
+                self._mounts_file.read()
+            except OSError as e:
+                logger.debug(f"Mount table polling unavailable: {e}")
+                self._mounts_file = None
+                self._mounts_poll = None
+
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """
+        정적 정보 다시 조회
+
+        Returns:
+            bool: 이전 값과 달라졌으면 True
+        """
+        freq = psutil.cpu_freq()
+        memory = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        partitions = psutil.disk_partitions()
+        interfaces = self._list_interfaces()
+
+        facts = {
+            "cpu_count_logical": psutil.cpu_count(logical=True),
+            "cpu_count_physical": psutil.cpu_count(logical=False),
+            "cpu_freq_min": freq.min if freq else 0,
+            "cpu_freq_max": freq.max if freq else 0,
+            "memory_total": memory.total,
+            "swap_total": swap.total,
+            "partition_count": len(partitions),
+            "interface_count": len(interfaces),
+        }
+
+        with self._lock:
+            changed = (
+                facts != self.facts
+                or [p.mountpoint for p in partitions] != [p.mountpoint for p in self.partitions]
+                or interfaces != self.interfaces
+            )
+            self.facts = facts
+            self.partitions = partitions
+            self.interfaces = interfaces
+            self.refreshed_at = self._clock()
+            if changed:
+                self.version += 1
+
+        if changed and self.version > 1:
+            logger.info(f"Host metadata changed (version {self.version})")
+        return changed
+
+    def check(self) -> bool:
+        """
+        변경 신호 확인 후 필요한 경우에만 다시 조회
+
+        Returns:
+            bool: 정적 정보가 바뀌었으면 True
+        """
+        reason = None
+        if self._mounts_changed():
+            reason = "mount table changed"
+        elif self._list_interfaces() != self.interfaces:
+            reason = "network interfaces changed"
+        elif self._clock() - self.refreshed_at >= self.revalidate_interval:
+            reason = "periodic revalidation"
+
+        if reason is None:
+            return False
+
+        logger.debug(f"Refreshing host metadata: {reason}")
+        return self.refresh()
+
+    def to_fields(self) -> Dict[str, Any]:
+        """
+        host_info measurement 필드 생성
+
+        Returns:
+            Dict[str, Any]: 정적 정보 필드 (인터페이스/마운트 목록은 쉼표 구분 문자열)
+        """
+        with self._lock:
+            fields = dict(self.facts)
+            fields["interfaces"] = ",".join(self.interfaces)
+            fields["mountpoints"] = ",".join(p.mountpoint for p in self.partitions)
+        return fields
+
+    def _mounts_changed(self) -> bool:
+        """/proc/self/mounts poll 이벤트 확인 (이벤트를 소비하도록 파일을 다시 읽음)"""
+        if self._mounts_poll is None:
+            return False
+        if not self._mounts_poll.poll(0):
+            return False
+        self._mounts_file.seek(0)
+        self._mounts_file.read()
+        return True
+
+    def _list_interfaces(self) -> List[str]:
+        """인터페이스 목록 조회"""
+        try:
+            return sorted(os.listdir(self._net_class_path))
+        except OSError:
+            return sorted(psutil.net_if_addrs())
+
+    def close(self):
+        """마운트 테이블 파일 닫기"""
+        if self._mounts_file is not None:
+            self._mounts_poll.unregister(self._mounts_file)
+            self._mounts_file.close()
+            self._mounts_file = None
+            self._mounts_poll = None
+
+
+_metadata: Optional[HostMetadata] = None
+_metadata_lock = threading.Lock()
+
+
+def get_host_metadata() -> HostMetadata:
+    """
+    프로세스 공용 호스트 메타데이터 캐시 조회 (지연 생성)
+
+    Returns:
+        HostMetadata: 공용 인스턴스
+    """
+    global _metadata
+    if _metadata is None:
+        with _metadata_lock:
+            if _metadata is None:
+                revalidate = float(os.getenv("COLLECTOR_METADATA_REVALIDATE", "300"))
+                _metadata = HostMetadata(revalidate_interval=revalidate)
+    return _metadata
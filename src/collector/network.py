@@ -1,6 +1,15 @@
 """네트워크 메트릭 수집 모듈"""
 import psutil
-from typing import Dict
+from typing import Dict, List, Optional
+
+from src.collector import procfs
+from src.collector.rates import CounterRates, DeviceFilter
+
+# 기본 제외 인터페이스 (루프백, 컨테이너/가상 브리지) - COLLECTOR_EXCLUDE_INTERFACES로 변경
+DEFAULT_EXCLUDED_INTERFACES = "lo,veth*,docker*,br-*,virbr*,cni*,flannel*,cali*,vxlan*,tun*,tap*,ifb*,dummy*"
+
+# 인터페이스 카운터 필드 (psutil snetio, procfs.NetDevReader.NET_FIELDS 순서)
+_INTERFACE_FIELDS = ("bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout")
 
 
 def get_network_io() -> Dict[str, int]:
@@ -10,6 +19,21 @@ def get_network_io() -> Dict[str, int]:
     Returns:
         Dict[str, int]: 네트워크 송수신 바이트 및 패킷
     """
+    reader = procfs.get_reader("network_io", procfs.NetDevReader)
+    if reader is not None:
+        reader.read()
+        totals = reader.totals
+        return {
+            "network_bytes_sent": totals[0],
+            "network_bytes_recv": totals[1],
+            "network_packets_sent": totals[2],
+            "network_packets_recv": totals[3],
+            "network_errin": totals[4],
+            "network_errout": totals[5],
+            "network_dropin": totals[6],
+            "network_dropout": totals[7],
+        }
+
     net_io = psutil.net_io_counters()
 
     return {
@@ -24,28 +48,98 @@ def get_network_io() -> Dict[str, int]:
     }
 
 
+class InterfaceIOSampler:
+    """인터페이스별 송수신 카운터를 초당 변화율로 변환하는 샘플러"""
+
+    def __init__(self, exclude: Optional[DeviceFilter] = None):
+        """
+        Args:
+            exclude: 제외할 인터페이스 필터 (None이면 COLLECTOR_EXCLUDE_INTERFACES)
+        """
+        self.exclude = exclude or DeviceFilter.from_env("COLLECTOR_EXCLUDE_INTERFACES", DEFAULT_EXCLUDED_INTERFACES)
+        self.rates = CounterRates()
+
+    def read_counters(self) -> Dict[str, Dict[str, int]]:
+        """인터페이스별 누적 카운터 조회"""
+        reader = procfs.get_reader("network_interfaces", procfs.NetDevReader)
+        if reader is not None:
+            reader.read()
+            width = reader.width
+            return {
+                name: dict(zip(_INTERFACE_FIELDS, reader.counters[i * width:(i + 1) * width]))
+                for i, name in enumerate(reader.names)
+                if not self.exclude.excluded(name)
+            }
+
+        return {
+            name: counters._asdict()
+            for name, counters in psutil.net_io_counters(pernic=True).items()
+            if not self.exclude.excluded(name)
+        }
+
+    def sample(self, now: Optional[float] = None) -> List[Dict[str, float]]:
+        """
+        인터페이스별 초당 변화율 계산
+
+        Args:
+            now: 스냅샷 시각 (초), None이면 monotonic 시계
+
+        Returns:
+            List[Dict[str, float]]: 인터페이스별 초당 바이트/패킷/에러/드롭
+        """
+        counters = self.read_counters()
+        self.rates.prune(counters)
+
+        results = []
+        for name, values in counters.items():
+            delta = self.rates.update(name, values, now)
+            if delta is None:
+                continue
+            deltas, elapsed = delta
+            result = {"interface": name}
+            for field in _INTERFACE_FIELDS:
+                result[f"{field}_per_sec"] = deltas.get(field, 0) / elapsed
+            results.append(result)
+        return results
+
+
+_interface_sampler: Optional[InterfaceIOSampler] = None
+
+
+def get_network_io_per_interface() -> List[Dict[str, float]]:
+    """
+    인터페이스별 네트워크 I/O 변화율 수집
+
+    첫 호출은 기준 스냅샷만 저장하므로 빈 리스트를 반환한다.
+
+    Returns:
+        List[Dict[str, float]]: 인터페이스별 초당 송수신 바이트 및 패킷
+    """
+    global _interface_sampler
+    if _interface_sampler is None:
+        _interface_sampler = InterfaceIOSampler()
+    return _interface_sampler.sample()
+
+
 def get_network_connections() -> Dict[str, int]:
     """
     네트워크 연결 수 통계
 
+    Linux에서는 /proc/net/tcp(6)의 상태 열만 스트리밍으로 집계하므로 소켓 수와 무관하게
+    메모리 사용량이 일정하고 PID 조회 권한이 필요 없다. 그 외 환경에서는 psutil을 사용한다.
+
     Returns:
-        Dict[str, int]: 연결 상태별 개수
+        Dict[str, int]: TCP 연결 상태별 개수
     """
-    connections = psutil.net_connections(kind='inet')
-    stats = {
-        "ESTABLISHED": 0,
-        "LISTEN": 0,
-        "TIME_WAIT": 0,
-        "CLOSE_WAIT": 0,
-    }
+    stats = {state: 0 for state in procfs.TCP_STATES.values()}
 
-    for conn in connections:
-        if conn.status in stats:
-            stats[conn.status] += 1
+    try:
+        counts = procfs.count_tcp_states()
+        for code, state in procfs.TCP_STATES.items():
+            stats[state] = counts[code]
+    except OSError:
+        for conn in psutil.net_connections(kind="tcp"):
+            if conn.status in stats:
+                stats[conn.status] += 1
 
-    return {
-        "network_conn_established": stats["ESTABLISHED"],
-        "network_conn_listen": stats["LISTEN"],
-        "network_conn_time_wait": stats["TIME_WAIT"],
-        "network_conn_close_wait": stats["CLOSE_WAIT"],
-    }
+    return {f"network_conn_{state.lower()}": count for state, count in stats.items()}
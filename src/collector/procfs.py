@@ -0,0 +1,487 @@
+"""
+Linux /proc 직접 읽기 백엔드
+
+psutil은 매 호출마다 /proc 파일을 새로 열고 전체를 파싱해 namedtuple을 만든다.
+이 모듈의 리더는 파일을 열어 둔 채 seek(0) + readinto()로 미리 할당한 버퍼에 다시 읽고,
+필요한 필드만 재사용하는 숫자 배열(array)에 파싱한다.
+
+COLLECTOR_BACKEND=procfs 환경 변수(또는 set_backend("procfs"))로 활성화하며,
+Linux가 아니거나 /proc을 읽을 수 없으면 psutil 경로로 돌아간다.
+리더 인스턴스는 스레드 안전하지 않으므로 소비자(수집 함수)마다 별도 인스턴스를 사용한다.
+"""
+import logging
+import os
+import sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROCFS_PATH = "/proc"
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+DISK_SECTOR_SIZE = 512
+
+# /proc/stat cpu 행의 필드 순서 (psutil scputimes와 동일)
+CPU_TIME_FIELDS = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal", "guest", "guest_nice")
+
+_backend = os.getenv("COLLECTOR_BACKEND", "psutil").lower()
+_readers: Dict[str, object] = {}
+
+
+def set_backend(name: str):
+    """
+    수집 백엔드 선택
+
+    Args:
+        name: "psutil" 또는 "procfs"
+    """
+    global _backend
+    if name not in ("psutil", "procfs"):
+        raise ValueError(f"Unknown collector backend: {name}")
+    _backend = name
+    close_readers()
+
+
+def procfs_enabled() -> bool:
+    """procfs 백엔드 사용 가능 여부"""
+    return _backend == "procfs" and sys.platform.startswith("linux")
+
+
+def get_reader(name: str, factory):
+    """
+    소비자별 리더 인스턴스 조회 (지연 생성)
+
+    Args:
+        name: 소비자 이름 (리더 캐시 키)
+        factory: 리더 생성 함수
+
+    Returns:
+        리더 인스턴스, procfs 백엔드가 비활성이거나 열 수 없으면 None
+    """
+    if not procfs_enabled():
+        return None
+
+    reader = _readers.get(name)
+    if reader is None:
+        try:
+            reader = factory()
+        except OSError as e:
+            logger.warning(f"procfs reader {name} unavailable, falling back to psutil: {e}")
+            return None
+        _readers[name] = reader
+    return reader
+
+
+def close_readers():
+    """열려 있는 모든 리더 닫기"""
+    for reader in _readers.values():
+        reader.close()
+    _readers.clear()
+
+
+class ProcFile:
+    """열어 둔 /proc 파일을 미리 할당한 버퍼로 다시 읽는 헬퍼"""
+
+    def __init__(self, path: str, size: int = 4096):
+        self.path = path
+        self._file = open(path, "rb", buffering=0)
+        self.buffer = bytearray(size)
+        self._view = memoryview(self.buffer)
+        self.length = 0
+
+    def read(self) -> int:
+        """
+        파일 전체를 버퍼로 다시 읽기
+
+        Returns:
+            int: 읽은 바이트 수 (self.buffer[:length]가 유효한 내용)
+        """
+        while True:
+            self._file.seek(0)
+            total = 0
+            while total < len(self.buffer):
+                count = self._file.readinto(self._view[total:])
+                if not count:
+                    break
+                total += count
+            if total < len(self.buffer):
+                self.length = total
+                return total
+            # 버퍼가 가득 찼으면 크기를 늘려 다시 읽음
+            self._view.release()
+            self.buffer = bytearray(len(self.buffer) * 2)
+            self._view = memoryview(self.buffer)
+
+    def find_int(self, key: bytes, start: int = 0) -> Tuple[int, int]:
+        """
+        key 다음에 오는 정수 값 파싱
+
+        Returns:
+            (값, 다음 검색 위치) 튜플, key가 없으면 (-1, start)
+        """
+        buf = self.buffer
+        pos = buf.find(key, start, self.length)
+        if pos < 0:
+            return -1, start
+        pos += len(key)
+        end = buf.find(b"\n", pos, self.length)
+        if end < 0:
+            end = self.length
+        return int(buf[pos:end].split(None, 1)[0]), end
+
+    def close(self):
+        """파일 닫기"""
+        self._view.release()
+        self._file.close()
+
+
+class StatReader:
+    """
+    /proc/stat CPU 시간 리더
+
+    values 배열에 [전체, cpu0, cpu1, ...] 순서로 행마다 CPU_TIME_FIELDS 길이만큼
+    초 단위 값을 저장한다.
+    """
+
+    def __init__(self, procfs_path: str = PROCFS_PATH):
+        self._proc = ProcFile(f"{procfs_path}/stat", size=16384)
+        self.fields = CPU_TIME_FIELDS
+        self.width = len(CPU_TIME_FIELDS)
+        self.values = array("d")
+        self.rows = 0
+
+    def read(self) -> int:
+        """
+        CPU 시간 다시 읽기
+
+        Returns:
+            int: 코어 수 (전체 행 제외)
+        """
+        proc = self._proc
+        proc.read()
+        buf = proc.buffer
+        width = self.width
+        rows = 0
+        pos = 0
+
+        while buf.startswith(b"cpu", pos, proc.length):
+            end = buf.find(b"\n", pos, proc.length)
+            if end < 0:
+                end = proc.length
+            columns = buf[pos:end].split()
+            if len(self.values) < (rows + 1) * width:
+                self.values.extend([0.0] * width)
+            base = rows * width
+            count = min(len(columns) - 1, width)
+            for i in range(count):
+                self.values[base + i] = int(columns[i + 1]) / CLOCK_TICKS
+            rows += 1
+            pos = end + 1
+
+        self.rows = rows
+        return rows - 1
+
+    def total(self) -> Dict[str, float]:
+        """전체 CPU 행을 필드 이름 -> 초 딕셔너리로 반환"""
+        return {name: self.values[i] for i, name in enumerate(self.fields)}
+
+    def close(self):
+        self._proc.close()
+
+
+class MemInfoReader:
+    """/proc/meminfo 리더 (psutil virtual_memory/swap_memory와 동일한 계산)"""
+
+    def __init__(self, procfs_path: str = PROCFS_PATH):
+        self._proc = ProcFile(f"{procfs_path}/meminfo", size=8192)
+
+    def read(self) -> Dict[str, float]:
+        """
+        메모리 메트릭 다시 읽기
+
+        Returns:
+            Dict[str, float]: get_memory_metrics와 같은 형태의 메트릭
+        """
+        proc = self._proc
+        proc.read()
+
+        # 키는 /proc/meminfo에 나오는 순서대로 검색해 버퍼를 한 번만 훑는다
+        total, pos = proc.find_int(b"MemTotal:")
+        free, pos = proc.find_int(b"MemFree:", pos)
+        avail, pos = proc.find_int(b"MemAvailable:", pos)
+        buffers, pos = proc.find_int(b"Buffers:", pos)
+        cached, pos = proc.find_int(b"Cached:", pos)
+        swap_total, pos = proc.find_int(b"SwapTotal:", pos)
+        swap_free, pos = proc.find_int(b"SwapFree:", pos)
+        reclaimable, _ = proc.find_int(b"SReclaimable:", pos)
+
+        total *= 1024
+        free *= 1024
+        buffers = max(buffers, 0) * 1024
+        cached = (max(cached, 0) + max(reclaimable, 0)) * 1024
+        swap_total = max(swap_total, 0) * 1024
+        swap_free = max(swap_free, 0) * 1024
+
+        used = total - free - cached - buffers
+        if used < 0:
+            used = total - free
+
+        if avail <= 0:
+            avail = free + cached + buffers
+        else:
+            avail *= 1024
+        if avail > total:
+            avail = free
+
+        swap_used = swap_total - swap_free
+
+        return {
+            "memory_total": total,
+            "memory_available": avail,
+            "memory_used": used,
+            "memory_free": free,
+            "memory_percent": _percent(total - avail, total),
+            "swap_total": swap_total,
+            "swap_used": swap_used,
+            "swap_free": swap_free,
+            "swap_percent": _percent(swap_used, swap_total),
+        }
+
+    def close(self):
+        self._proc.close()
+
+
+class NetDevReader:
+    """
+    /proc/net/dev 리더
+
+    인터페이스별 카운터를 counters 배열에 NET_FIELDS 순서로 저장한다.
+    """
+
+    # /proc/net/dev 열 인덱스 -> 수집 필드
+    NET_FIELDS = (
+        ("bytes_sent", 8),
+        ("bytes_recv", 0),
+        ("packets_sent", 9),
+        ("packets_recv", 1),
+        ("errin", 2),
+        ("errout", 10),
+        ("dropin", 3),
+        ("dropout", 11),
+    )
+
+    def __init__(self, procfs_path: str = PROCFS_PATH):
+        self._proc = ProcFile(f"{procfs_path}/net/dev", size=8192)
+        self.width = len(self.NET_FIELDS)
+        self.names: List[str] = []
+        self.counters = array("Q")
+        self.totals = array("Q", [0] * self.width)
+
+    def read(self) -> int:
+        """
+        인터페이스 카운터 다시 읽기
+
+        Returns:
+            int: 인터페이스 수
+        """
+        proc = self._proc
+        proc.read()
+        buf = proc.buffer
+        width = self.width
+        totals = self.totals
+        for i in range(width):
+            totals[i] = 0
+
+        rows = 0
+        # 앞의 두 줄은 헤더
+        pos = buf.find(b"\n", buf.find(b"\n", 0, proc.length) + 1, proc.length) + 1
+        while 0 < pos < proc.length:
+            end = buf.find(b"\n", pos, proc.length)
+            if end < 0:
+                end = proc.length
+            colon = buf.rfind(b":", pos, end)
+            if colon > 0:
+                name = buf[pos:colon].strip().decode()
+                columns = buf[colon + 1:end].split()
+                if rows < len(self.names):
+                    if self.names[rows] != name:
+                        self.names[rows] = name
+                else:
+                    self.names.append(name)
+                    self.counters.extend([0] * width)
+                base = rows * width
+                for i, (_, column) in enumerate(self.NET_FIELDS):
+                    value = int(columns[column])
+                    self.counters[base + i] = value
+                    totals[i] += value
+                rows += 1
+            pos = end + 1
+
+        del self.names[rows:]
+        del self.counters[rows * width:]
+        return rows
+
+    def close(self):
+        self._proc.close()
+
+
+class DiskStatsReader:
+    """
+    /proc/diskstats 리더
+
+    장치별 카운터를 counters 배열에 DISK_FIELDS 순서로 저장한다.
+    totals는 psutil disk_io_counters()처럼 파티션을 제외한 물리 장치만 합산한다.
+    """
+
+    DISK_FIELDS = (
+        "read_count",
+        "write_count",
+        "read_bytes",
+        "write_bytes",
+        "read_time",
+        "write_time",
+        "busy_time",
+    )
+
+    def __init__(self, procfs_path: str = PROCFS_PATH, sysfs_path: str = "/sys"):
+        self._proc = ProcFile(f"{procfs_path}/diskstats", size=16384)
+        self._sysfs_path = sysfs_path
+        self._storage_devices: Dict[str, bool] = {}
+        self.width = len(self.DISK_FIELDS)
+        self.names: List[str] = []
+        self.counters = array("Q")
+        self.totals = array("Q", [0] * self.width)
+
+    def is_storage_device(self, name: str) -> bool:
+        """파티션이 아닌 물리 장치 여부 (/sys/block 존재 여부, 결과 캐시)"""
+        storage = self._storage_devices.get(name)
+        if storage is None:
+            storage = os.path.exists(f"{self._sysfs_path}/block/{name.replace('/', '!')}")
+            self._storage_devices[name] = storage
+        return storage
+
+    def read(self) -> int:
+        """
+        장치 카운터 다시 읽기
+
+        Returns:
+            int: 장치 수
+        """
+        proc = self._proc
+        proc.read()
+        buf = proc.buffer
+        width = self.width
+        totals = self.totals
+        for i in range(width):
+            totals[i] = 0
+
+        rows = 0
+        pos = 0
+        while pos < proc.length:
+            end = buf.find(b"\n", pos, proc.length)
+            if end < 0:
+                end = proc.length
+            columns = buf[pos:end].split()
+            pos = end + 1
+            if len(columns) < 14:
+                continue
+
+            name = columns[2].decode()
+            if rows < len(self.names):
+                if self.names[rows] != name:
+                    self.names[rows] = name
+            else:
+                self.names.append(name)
+                self.counters.extend([0] * width)
+
+            base = rows * width
+            counters = self.counters
+            counters[base] = int(columns[3])
+            counters[base + 1] = int(columns[7])
+            counters[base + 2] = int(columns[5]) * DISK_SECTOR_SIZE
+            counters[base + 3] = int(columns[9]) * DISK_SECTOR_SIZE
+            counters[base + 4] = int(columns[6])
+            counters[base + 5] = int(columns[10])
+            counters[base + 6] = int(columns[12])
+
+            if self.is_storage_device(name):
+                for i in range(width):
+                    totals[i] += counters[base + i]
+            rows += 1
+
+        del self.names[rows:]
+        del self.counters[rows * width:]
+        return rows
+
+    def close(self):
+        self._proc.close()
+
+
+# /proc/net/tcp st 열 (커널 include/net/tcp_states.h) -> 상태 이름
+TCP_STATES = {
+    0x01: "ESTABLISHED",
+    0x02: "SYN_SENT",
+    0x03: "SYN_RECV",
+    0x04: "FIN_WAIT1",
+    0x05: "FIN_WAIT2",
+    0x06: "TIME_WAIT",
+    0x07: "CLOSE",
+    0x08: "CLOSE_WAIT",
+    0x09: "LAST_ACK",
+    0x0A: "LISTEN",
+    0x0B: "CLOSING",
+}
+
+# "sl:" 뒤 st 열까지의 고정 오프셋 (" local:port remote:port ")
+_TCP_STATE_OFFSETS = {
+    "tcp": 2 + 13 + 1 + 13 + 1,
+    "tcp6": 2 + 37 + 1 + 37 + 1,
+}
+
+
+def count_tcp_states(procfs_path: str = PROCFS_PATH) -> List[int]:
+    """
+    /proc/net/tcp, /proc/net/tcp6의 상태 열만 집계
+
+    파일을 한 줄씩 스트리밍으로 읽어 상태 코드별 개수만 센다. 소켓 객체를 만들거나
+    PID를 찾지 않으므로 소켓 수와 무관하게 메모리 사용량이 일정하다.
+
+    Returns:
+        List[int]: 상태 코드(인덱스)별 소켓 수
+
+    Raises:
+        OSError: /proc/net/tcp를 읽을 수 없는 경우
+    """
+    counts = [0] * 16
+    found = False
+
+    for name, offset in _TCP_STATE_OFFSETS.items():
+        try:
+            f = open(f"{procfs_path}/net/{name}", "rb", buffering=65536)
+        except FileNotFoundError:
+            # IPv6가 비활성화된 커널에는 tcp6가 없음
+            continue
+
+        found = True
+        with f:
+            f.readline()  # 헤더
+            for line in f:
+                pos = line.find(b":") + offset
+                if line[pos - 1:pos] == b" ":
+                    state = int(line[pos:pos + 2], 16)
+                else:
+                    # 주소 형식이 예상과 다르면 공백 기준으로 나눈 상태 열을 직접 파싱
+                    state = int(line.split(None, 4)[3], 16)
+                counts[state & 0x0F] += 1
+
+    if not found:
+        raise FileNotFoundError(f"{procfs_path}/net/tcp")
+    return counts
+
+
+def _percent(used: float, total: float) -> float:
+    """psutil usage_percent(round_=1)과 같은 비율 계산"""
+    try:
+        return round(used / total * 100, 1)
+    except ZeroDivisionError:
+        return 0.0
@@ -0,0 +1,101 @@
+"""누적 카운터 변화율 계산 모듈"""
+import fnmatch
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+COUNTER32_MAX = 2 ** 32
+
+
+class CounterRates:
+    """
+    키(장치/인터페이스)별 누적 카운터의 이전 스냅샷을 보관하고 tick 간 변화량을 계산
+
+    카운터가 감소하면 32비트 래핑으로 설명 가능한 경우 보정하고, 그렇지 않으면
+    재설정(드라이버 재로드, 장치 재연결 등)으로 보고 해당 tick은 버린 뒤 다시 기준을 잡는다.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._previous: Dict[str, Tuple[float, Dict[str, int]]] = {}
+
+    def update(
+        self,
+        key: str,
+        counters: Dict[str, int],
+        now: Optional[float] = None,
+    ) -> Optional[Tuple[Dict[str, int], float]]:
+        """
+        새 스냅샷으로 변화량 계산
+
+        Args:
+            key: 장치/인터페이스 이름
+            counters: 필드 이름 -> 누적 카운터
+            now: 스냅샷 시각 (초), None이면 monotonic 시계
+
+        Returns:
+            (필드별 변화량, 경과 시간(초)) 튜플. 첫 스냅샷이거나 카운터가 재설정되면 None
+        """
+        if now is None:
+            now = self._clock()
+
+        previous = self._previous.get(key)
+        self._previous[key] = (now, counters)
+        if previous is None:
+            return None
+
+        previous_time, previous_counters = previous
+        elapsed = now - previous_time
+        if elapsed <= 0:
+            return None
+
+        deltas = {}
+        for name, value in counters.items():
+            delta = value - previous_counters.get(name, value)
+            if delta < 0:
+                wrapped = delta + COUNTER32_MAX
+                if previous_counters[name] < COUNTER32_MAX and 0 <= wrapped < COUNTER32_MAX // 2:
+                    delta = wrapped
+                else:
+                    return None
+            deltas[name] = delta
+
+        return deltas, elapsed
+
+    def prune(self, keys: Iterable[str]):
+        """이번 tick에 보이지 않은 키(제거된 장치) 정리"""
+        alive = set(keys)
+        for key in list(self._previous):
+            if key not in alive:
+                del self._previous[key]
+
+
+class DeviceFilter:
+    """fnmatch 패턴 기반 장치/인터페이스 제외 필터"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [pattern.strip() for pattern in patterns if pattern.strip()]
+        self._cache: Dict[str, bool] = {}
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "DeviceFilter":
+        """
+        쉼표로 구분된 패턴 환경 변수로 필터 생성
+
+        Args:
+            name: 환경 변수 이름
+            default: 환경 변수가 없을 때 사용할 패턴
+        """
+        return cls(os.getenv(name, default).split(","))
+
+    def excluded(self, name: str) -> bool:
+        """이름이 제외 패턴과 일치하는지 확인"""
+        result = self._cache.get(name)
+        if result is None:
+            result = any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+            self._cache[name] = result
+        return result
+
+    def select(self, names: Iterable[str]) -> List[str]:
+        """제외되지 않은 이름만 반환"""
+        return [name for name in names if not self.excluded(name)]
@@ -0,0 +1,140 @@
+"""고정 주기 수집 스케줄러 모듈"""
+import asyncio
+import math
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class TickScheduler:
+    """
+    드리프트 보정 고정 주기 스케줄러
+
+    수집 소요 시간과 무관하게 절대 시각 기준 deadline(예: 매 정각 초)에 tick을 발생시킨다.
+    이전 tick 처리가 다음 deadline을 넘기면 밀린 tick을 몰아서 실행하지 않고
+    건너뛴 뒤 missed_ticks로 집계한다.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        align: bool = True,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        """
+        Args:
+            interval: tick 간격 (초)
+            align: True면 interval 배수의 wall-clock 경계에 정렬
+            clock: 현재 시각 함수 (epoch 초)
+            sleep: 비동기 sleep 함수
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.interval = interval
+        self.align = align
+        self._clock = clock
+        self._sleep = sleep
+        self._next_deadline: Optional[float] = None
+
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.overruns = 0
+        self.last_jitter = 0.0
+        self.max_jitter = 0.0
+        self._jitter_total = 0.0
+
+    def _first_deadline(self, now: float) -> float:
+        """첫 deadline 계산"""
+        if not self.align:
+            return now
+        return math.ceil(now / self.interval) * self.interval
+
+    async def wait_next(self) -> float:
+        """
+        다음 tick deadline까지 대기
+
+        Returns:
+            float: 이번 tick의 deadline (epoch 초)
+        """
+        now = self._clock()
+
+        if self._next_deadline is None:
+            deadline = self._first_deadline(now)
+        else:
+            deadline = self._next_deadline
+            if now > deadline:
+                # 이전 tick이 deadline을 넘김: 지나간 tick은 건너뛰고 다음 경계로 이동
+                skipped = math.floor((now - deadline) / self.interval) + 1
+                deadline += skipped * self.interval
+                self.missed_ticks += skipped
+                self.overruns += 1
+
+        delay = deadline - now
+        if delay > 0:
+            await self._sleep(delay)
+
+        jitter = max(self._clock() - deadline, 0.0)
+        self.last_jitter = jitter
+        self.max_jitter = max(self.max_jitter, jitter)
+        self._jitter_total += jitter
+        self.ticks += 1
+
+        self._next_deadline = deadline + self.interval
+        return deadline
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        스케줄러 통계 조회
+
+        Returns:
+            Dict[str, float]: tick 수, 누락 tick 수, 초과 횟수, jitter(ms)
+        """
+        return {
+            "ticks": self.ticks,
+            "missed_ticks": self.missed_ticks,
+            "overruns": self.overruns,
+            "jitter_last_ms": self.last_jitter * 1000,
+            "jitter_max_ms": self.max_jitter * 1000,
+            "jitter_avg_ms": (self._jitter_total / self.ticks * 1000) if self.ticks else 0.0,
+        }
+
+
+class CadenceGate:
+    """
+    그룹별 수집 주기 판정
+
+    tick deadline을 주기(cadence) 단위 버킷으로 나눠, 새 버킷에 진입한 첫 tick에만
+    해당 그룹을 수집한다. 모든 그룹이 같은 시계를 공유하므로 여러 호스트에서도
+    같은 경계(예: 매 5초, 매 30초)에 수집된다.
+    """
+
+    def __init__(self, cadences: Dict[str, float]):
+        """
+        Args:
+            cadences: 그룹 이름 -> 수집 주기 (초)
+        """
+        self.cadences = dict(cadences)
+        self._last_bucket: Dict[str, int] = {}
+
+    def is_due(self, group: str, tick_time: float) -> bool:
+        """
+        그룹 수집 여부 판정
+
+        Args:
+            group: 그룹 이름
+            tick_time: tick deadline (epoch 초)
+
+        Returns:
+            bool: 이번 tick에 수집해야 하면 True
+        """
+        cadence = self.cadences.get(group)
+        if not cadence:
+            return True
+
+        bucket = math.floor(tick_time / cadence + 1e-9)
+        if self._last_bucket.get(group) == bucket:
+            return False
+
+        self._last_bucket[group] = bucket
+        return True
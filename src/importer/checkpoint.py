@@ -0,0 +1,105 @@
+"""가져오기 재시작 지점(checkpoint) 관리 모듈"""
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ImportCheckpoint:
+    """
+    파일별로 끝까지 저장된 위치(바이트 오프셋)를 JSON 파일에 기록
+
+    청크는 워커에서 순서 없이 끝나므로 파일마다 연속으로 완료된 청크까지만 오프셋을 올린다.
+    실패한 청크가 있으면 그 파일의 오프셋은 거기서 멈추고, 다음 실행은 그 청크부터 다시 쓴다.
+    같은 시리즈/타임스탬프의 점은 InfluxDB에서 덮어써지므로 재전송해도 중복되지 않는다.
+    """
+
+    def __init__(self, path: Optional[str], save_interval: float = 1.0, clock=time.monotonic):
+        """
+        Args:
+            path: checkpoint 파일 경로 (None이면 기록하지 않음)
+            save_interval: 파일 저장 최소 간격 (초)
+        """
+        self.path = path
+        self.save_interval = save_interval
+        self._clock = clock
+        self._last_save = 0.0
+        self._dirty = False
+        self.files: Dict[str, Dict] = {}
+        # 파일별 (다음에 확정할 청크 번호, 완료됐지만 앞 청크를 기다리는 청크)
+        self._pending: Dict[str, Tuple[int, Dict[int, Optional[int]]]] = {}
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.files = json.load(f).get("files", {})
+            logger.info(f"Loaded import checkpoint {path} ({len(self.files)} files)")
+
+    def start_offset(self, key: str, size: int, mtime: float) -> Optional[int]:
+        """
+        파일의 재시작 오프셋 조회
+
+        Args:
+            key: 파일 경로 (절대 경로)
+            size: 현재 파일 크기
+            mtime: 현재 수정 시각
+
+        Returns:
+            Optional[int]: 재시작 오프셋 (이미 끝난 파일이면 None)
+        """
+        entry = self.files.get(key)
+        if entry is not None and (entry.get("size") != size or entry.get("mtime") != mtime):
+            logger.warning(f"{key} changed since the last import, starting over")
+            entry = None
+        if entry is None:
+            entry = self.files[key] = {"size": size, "mtime": mtime, "offset": 0, "points": 0, "done": False}
+            self._dirty = True
+        if entry["done"]:
+            return None
+        self._pending[key] = (0, {})
+        return entry["offset"]
+
+    def complete(self, key: str, seq: int, end_offset: Optional[int], points: int = 0):
+        """
+        청크 완료 기록
+
+        Args:
+            key: 파일 경로
+            seq: 파일 안의 청크 번호 (0부터)
+            end_offset: 청크 끝 오프셋 (실패한 청크는 None)
+            points: 저장한 점 수
+        """
+        next_seq, done = self._pending[key]
+        done[seq] = end_offset
+        entry = self.files[key]
+        entry["points"] += points
+        while next_seq in done and done[next_seq] is not None:
+            entry["offset"] = done.pop(next_seq)
+            next_seq += 1
+        self._pending[key] = (next_seq, done)
+        self._dirty = True
+        self.save()
+
+    def finish(self, key: str, chunks: int):
+        """파일의 모든 청크가 저장됐으면 완료 표시"""
+        next_seq, _ = self._pending.get(key, (0, {}))
+        if next_seq == chunks:
+            self.files[key]["done"] = True
+            self._dirty = True
+        self.save(force=True)
+
+    def save(self, force: bool = False):
+        """checkpoint 파일 저장 (임시 파일 + rename)"""
+        if not self.path or not self._dirty:
+            return
+        now = self._clock()
+        if not force and now - self._last_save < self.save_interval:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.files}, f, indent=1)
+        os.replace(tmp_path, self.path)
+        self._last_save = now
+        self._dirty = False
@@ -0,0 +1,162 @@
+"""가져오기 입력 형식 판별 및 레코드 -> line protocol 변환 모듈"""
+import csv
+import gzip
+import json
+import math
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, List, Optional
+
+from src.collector.buffer import unflatten_sample
+from src.storage.line_protocol import LineProtocolSerializer
+
+EPOCH = datetime(1970, 1, 1)
+
+# 확장자 -> 형식 (.gz 압축은 확장자 앞부분으로 판별)
+FORMATS = {
+    ".lp": "lp",
+    ".line": "lp",
+    ".txt": "lp",
+    ".csv": "csv",
+    ".json": "jsonl",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+# CSV 타임스탬프 컬럼 후보
+TIME_COLUMNS = ("timestamp", "time", "_time")
+
+
+def detect_format(path: str) -> str:
+    """
+    파일 확장자로 입력 형식 판별
+
+    Raises:
+        ValueError: 알 수 없는 확장자인 경우
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    fmt = FORMATS.get(os.path.splitext(name)[1].lower())
+    if fmt is None:
+        raise ValueError(f"Cannot detect input format of {path} (use --format)")
+    return fmt
+
+
+def open_input(path: str) -> BinaryIO:
+    """입력 파일을 바이너리 모드로 열기 (.gz는 스트리밍 압축 해제)"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def parse_timestamp(value: Any) -> int:
+    """
+    타임스탬프를 epoch 나노초로 변환
+
+    숫자는 크기로 단위를 추정한다(초/밀리초/마이크로초/나노초). 문자열은 숫자 또는 RFC3339.
+
+    Raises:
+        ValueError: 해석할 수 없는 값인 경우
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            value = float(text) if any(c in text for c in ".eE") else int(text)
+        except ValueError:
+            parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return (parsed - EPOCH) // timedelta(microseconds=1) * 1000
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"Invalid timestamp: {value!r}")
+
+    magnitude = abs(value)
+    if magnitude < 1e11:
+        return int(round(value * 1e9))
+    if magnitude < 1e14:
+        return int(round(value * 1e6))
+    if magnitude < 1e17:
+        return int(round(value * 1e3))
+    return int(value)
+
+
+class RecordConverter:
+    """
+    입력 레코드(한 줄)를 line protocol 줄로 변환
+
+    - lp: 그대로 전달 (빈 줄/주석 제외)
+    - csv: 헤더가 SampleBuffer 컬럼 이름("cpu.cpu_percent", "disk_devices.sda.util_percent")인
+      행을 수집 샘플로 복원해 LineProtocolSerializer로 직렬화
+    - jsonl: collect_all_metrics 형태 샘플 또는 Telegraf JSON({"name", "tags", "fields", "timestamp"})
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        header: Optional[List[str]] = None,
+        tags: Optional[Dict[str, str]] = None,
+        schema: str = "wide",
+    ):
+        """
+        Args:
+            fmt: "lp", "csv", "jsonl"
+            header: CSV 헤더 컬럼 목록
+            tags: csv/jsonl 레코드에 붙일 공통 태그 (예: 이전 시스템의 host)
+            schema: 코어별 값 스키마 ("wide" 또는 "narrow")
+        """
+        if fmt not in set(FORMATS.values()):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.fmt = fmt
+        self.serializer = LineProtocolSerializer(tags=tags, schema=schema)
+        self.header = header
+        self._time_index = None
+        if fmt == "csv":
+            if not header:
+                raise ValueError("CSV input requires a header row")
+            self._time_index = next((i for i, name in enumerate(header) if name in TIME_COLUMNS), None)
+            if self._time_index is None:
+                raise ValueError(f"CSV header has no timestamp column ({', '.join(TIME_COLUMNS)})")
+
+    def convert(self, raw: bytes) -> List[str]:
+        """
+        레코드 하나 변환
+
+        Raises:
+            ValueError: 레코드를 해석할 수 없는 경우
+        """
+        text = raw.decode("utf-8").strip()
+        if not text or text.startswith("#"):
+            return []
+        if self.fmt == "lp":
+            if " " not in text:
+                raise ValueError(f"Invalid line protocol: {text[:80]}")
+            return [text]
+        if self.fmt == "csv":
+            return self._convert_csv(text)
+        return self._convert_json(text)
+
+    def _convert_csv(self, text: str) -> List[str]:
+        row = next(csv.reader([text]))
+        if len(row) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} columns, got {len(row)}")
+        values = {}
+        for i, (name, cell) in enumerate(zip(self.header, row)):
+            if i == self._time_index or cell == "" or "." not in name:
+                continue
+            values[name] = float(cell)
+        sample = unflatten_sample(values)
+        sample["timestamp"] = parse_timestamp(row[self._time_index])
+        return self.serializer.serialize(sample)
+
+    def _convert_json(self, text: str) -> List[str]:
+        record = json.loads(text)
+        if not isinstance(record, dict):
+            raise ValueError("JSON record must be an object")
+        if "name" in record and "fields" in record:
+            line = self.serializer.encode(
+                record["name"], record.get("tags") or {}, record["fields"], parse_timestamp(record["timestamp"]),
+            )
+            return [line] if line else []
+
+        sample = dict(record)
+        sample["timestamp"] = parse_timestamp(sample["timestamp"])
+        return self.serializer.serialize(sample)
@@ -0,0 +1,344 @@
+"""과거 데이터 일괄 가져오기(backfill) CLI
+
+CSV, line protocol, JSON lines(이전 수집 스택의 Telegraf JSON 포함) 파일을 스트리밍으로 읽어
+청크 단위로 워커 프로세스에 나눠 주고, 워커가 line protocol로 변환해 큰 gzip 배치로 InfluxDB에
+쓴다. 파일별 진행 위치는 checkpoint 파일에 기록되어 중단 후 같은 명령으로 이어서 실행된다.
+
+사용법:
+    python -m src.importer.main export/*.csv.gz --workers 8 --rate 500000 \\
+        --checkpoint backfill.ckpt --tags host=db-01
+"""
+import argparse
+import gzip
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from src.importer.checkpoint import ImportCheckpoint
+from src.importer.formats import RecordConverter, detect_format, open_input
+
+# 환경 변수에서 로그 레벨 가져오기
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(
+    level=getattr(logging, log_level),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("ns", "us", "ms", "s")
+
+# 재시도하지 않는 응답 (잘못된 데이터/인증 오류는 다시 보내도 실패함)
+PERMANENT_STATUS = (400, 401, 403, 404, 413, 422)
+
+
+class RateLimiter:
+    """
+    초당 점 수 제한 (누적 전송량 기준 일정 맞추기)
+
+    acquire(n)은 지금까지 보낸 점 수가 rate * 경과 시간을 넘지 않도록 잠든다.
+    rate가 0이면 제한하지 않는다.
+    """
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self._clock = clock
+        self._sleep = sleep
+        self._start: Optional[float] = None
+        self._sent = 0
+
+    def acquire(self, points: int):
+        """points개를 보내기 전에 호출"""
+        if self.rate <= 0:
+            return
+        now = self._clock()
+        if self._start is None:
+            self._start = now
+        delay = self._start + self._sent / self.rate - now
+        if delay > 0:
+            self._sleep(delay)
+        self._sent += points
+
+
+# 워커 프로세스 상태 (initializer에서 설정)
+_worker: Dict = {}
+
+
+def _init_worker(url: str, token: str, org: str, bucket: str, rate: float, gzip_level: int, dry_run: bool):
+    """워커 프로세스 초기화 (HTTP 연결과 속도 제한은 프로세스마다 하나)"""
+    _worker.clear()
+    _worker.update(bucket=bucket, org=org, gzip_level=gzip_level, limiter=RateLimiter(rate), converters={})
+    if not dry_run:
+        _worker["client"] = httpx.Client(
+            base_url=url,
+            timeout=60.0,
+            headers={"Authorization": f"Token {token}", "Content-Type": "text/plain; charset=utf-8"},
+        )
+
+
+def _write_batch(lines: List[str], precision: str, retries: int) -> Optional[str]:
+    """배치 하나를 재시도하며 쓰기 (실패 시 마지막 오류 메시지 반환)"""
+    client = _worker.get("client")
+    if client is None:
+        return None
+    body = "\n".join(lines).encode("utf-8")
+    headers = {}
+    if _worker["gzip_level"]:
+        body = gzip.compress(body, _worker["gzip_level"])
+        headers["Content-Encoding"] = "gzip"
+    params = {"org": _worker["org"], "bucket": _worker["bucket"], "precision": precision}
+
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1), 30))
+        try:
+            response = client.post("/api/v2/write", params=params, content=body, headers=headers)
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+            continue
+        if response.status_code < 300:
+            return None
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        if response.status_code in PERMANENT_STATUS:
+            break
+    return error
+
+
+def import_chunk(
+    fmt: str,
+    header: Optional[List[str]],
+    tags: Dict[str, str],
+    schema: str,
+    precision: str,
+    data: bytes,
+    batch_size: int,
+    retries: int,
+) -> Dict:
+    """
+    청크 하나를 변환하고 batch_size 줄씩 나눠 쓰기 (워커 프로세스에서 실행)
+
+    Returns:
+        Dict: points(저장), invalid(변환 실패 레코드), failed(쓰기 실패 점), error(첫 쓰기 오류)
+    """
+    key = (fmt, tuple(header or ()))
+    converter = _worker["converters"].get(key)
+    if converter is None:
+        converter = _worker["converters"][key] = RecordConverter(fmt, header=header, tags=tags, schema=schema)
+
+    result = {"points": 0, "invalid": 0, "failed": 0, "error": None}
+    lines: List[str] = []
+    for raw in data.splitlines():
+        try:
+            lines.extend(converter.convert(raw))
+        except (ValueError, KeyError, TypeError) as e:
+            result["invalid"] += 1
+            if result["invalid"] == 1:
+                logger.debug(f"Skipping invalid record: {e}")
+
+    for i in range(0, len(lines), batch_size):
+        batch = lines[i:i + batch_size]
+        _worker["limiter"].acquire(len(batch))
+        error = _write_batch(batch, precision, retries)
+        if error is None:
+            result["points"] += len(batch)
+        else:
+            result["failed"] += len(batch)
+            result["error"] = result["error"] or error
+    return result
+
+
+def read_chunks(path: str, fmt: str, offset: int, chunk_lines: int) -> Iterator[Tuple[Optional[List[str]], bytes, int]]:
+    """
+    파일을 offset부터 chunk_lines 줄씩 읽기
+
+    Yields:
+        Tuple: (CSV 헤더, 청크 바이트, 청크 끝 오프셋)
+    """
+    with open_input(path) as f:
+        header = None
+        if fmt == "csv":
+            header_line = f.readline().decode("utf-8").strip()
+            header = [name.strip() for name in header_line.split(",")]
+            offset = max(offset, f.tell())
+        f.seek(offset)
+        while True:
+            lines = []
+            for line in f:
+                lines.append(line)
+                if len(lines) >= chunk_lines:
+                    break
+            if not lines:
+                return
+            yield header, b"".join(lines), f.tell()
+
+
+class ImportJob:
+    """입력 파일들을 워커 풀로 가져오고 진행 상황/통계를 집계"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        # 드라이런은 저장하지 않으므로 checkpoint를 읽거나 쓰지 않음 (이후 실제 가져오기를 막지 않도록)
+        if args.dry_run and args.checkpoint:
+            logger.warning(f"Dry run does not read or update checkpoint {args.checkpoint}")
+        self.checkpoint = ImportCheckpoint(None if args.dry_run else args.checkpoint)
+        if args.restart:
+            self.checkpoint.files = {}
+        # 끝까지 읽은 파일의 청크 수 (남은 청크가 모두 끝나면 checkpoint에 완료 표시)
+        self._read_files: Dict[str, int] = {}
+        self.tags = dict(tag.split("=", 1) for tag in args.tags)
+        self.schema = os.getenv("STORAGE_SCHEMA", "wide")
+        self.stats = {"points": 0, "invalid": 0, "failed": 0, "bytes": 0, "chunks": 0, "failed_chunks": 0, "files": 0}
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    def run(self) -> int:
+        """
+        가져오기 실행
+
+        Returns:
+            int: 종료 코드 (쓰기 실패나 실패한 청크가 있으면 1)
+        """
+        args = self.args
+        url = os.getenv("INFLUXDB_URL", "http://localhost:8086")
+        initargs = (
+            url,
+            os.getenv("INFLUXDB_TOKEN", ""),
+            os.getenv("INFLUXDB_ORG", "my-org"),
+            args.bucket,
+            args.rate / args.workers,
+            args.gzip_level,
+            args.dry_run,
+        )
+        logger.info(
+            f"Importing {len(args.inputs)} files into {url} bucket {args.bucket} "
+            f"({args.workers} workers{', dry run' if args.dry_run else ''})"
+        )
+
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=initargs) as pool:
+            in_flight: Dict[Future, Tuple[str, int, int, int]] = {}
+            for path in args.inputs:
+                self._import_file(pool, in_flight, path)
+            while in_flight:
+                self._drain(in_flight)
+
+        self._report(final=True)
+        return 1 if self.stats["failed"] or self.stats["failed_chunks"] else 0
+
+    def _import_file(self, pool: ProcessPoolExecutor, in_flight: Dict, path: str):
+        args = self.args
+        key = os.path.abspath(path)
+        fmt = args.format or detect_format(path)
+        stat = os.stat(path)
+        offset = self.checkpoint.start_offset(key, stat.st_size, stat.st_mtime)
+        if offset is None:
+            logger.info(f"Skipping {path} (already imported)")
+            return
+        if offset:
+            logger.info(f"Resuming {path} at byte {offset:,}")
+
+        precision = args.precision if fmt == "lp" else "ns"
+        seq = 0
+        for header, data, end_offset in read_chunks(path, fmt, offset, args.chunk_lines):
+            # 메모리에 올라가는 청크 수 제한
+            while len(in_flight) >= args.workers * 2:
+                self._drain(in_flight)
+            future = pool.submit(
+                import_chunk, fmt, header, self.tags, self.schema, precision, data, args.batch_size, args.retries,
+            )
+            in_flight[future] = (key, seq, end_offset, len(data))
+            seq += 1
+
+        self._read_files[key] = seq
+        self._finish_idle(in_flight)
+
+    def _drain(self, in_flight: Dict):
+        done, _ = wait(list(in_flight), timeout=self.args.progress, return_when=FIRST_COMPLETED)
+        for future in done:
+            key, seq, end_offset, size = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # 청크 하나의 실패(헤더 오류, 워커 종료 등)로 전체 가져오기를 멈추지 않음
+                logger.error(f"{key} chunk {seq}: import failed ({e!r})")
+                self.stats["failed_chunks"] += 1
+                self.checkpoint.complete(key, seq, None)
+                continue
+            for name in ("points", "invalid", "failed"):
+                self.stats[name] += result[name]
+            self.stats["bytes"] += size
+            self.stats["chunks"] += 1
+            if result["error"]:
+                logger.warning(f"{key} chunk {seq}: {result['failed']} points failed ({result['error']})")
+            self.checkpoint.complete(key, seq, None if result["failed"] else end_offset, result["points"])
+        self._finish_idle(in_flight)
+        self._report()
+
+    def _finish_idle(self, in_flight: Dict):
+        busy = {item[0] for item in in_flight.values()}
+        for key in [key for key in self._read_files if key not in busy]:
+            chunks = self._read_files.pop(key)
+            self.checkpoint.finish(key, chunks)
+            self.stats["files"] += 1
+            logger.info(f"Finished {key} ({chunks} chunks)")
+
+    def _report(self, final: bool = False):
+        now = time.monotonic()
+        if not final and now - self._last_report < self.args.progress:
+            return
+        self._last_report = now
+        elapsed = max(now - self._started, 1e-9)
+        stats = self.stats
+        logger.info(
+            f"{'Done' if final else 'Progress'}: {stats['points']:,} points "
+            f"({stats['points'] / elapsed:,.0f} points/s, {stats['bytes'] / elapsed / 1e6:.1f} MB/s input), "
+            f"{stats['chunks']:,} chunks, {stats['files']} files, "
+            f"invalid {stats['invalid']:,}, failed {stats['failed']:,} points / {stats['failed_chunks']:,} chunks"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="bulk import historical metrics into InfluxDB")
+    parser.add_argument("inputs", nargs="+", help="입력 파일 (.csv, .lp, .jsonl, .gz 압축 가능)")
+    parser.add_argument("--format", choices=("lp", "csv", "jsonl"), help="입력 형식 (기본: 확장자로 판별)")
+    parser.add_argument("--bucket", default=os.getenv("INFLUXDB_BUCKET", "system-metrics"), help="대상 버킷")
+    parser.add_argument("--precision", choices=PRECISIONS, default="ns", help="line protocol 입력의 타임스탬프 정밀도")
+    parser.add_argument("--tags", nargs="*", default=[], help="csv/jsonl 레코드에 붙일 태그 (key=value)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="워커 프로세스 수")
+    parser.add_argument("--chunk-lines", type=int, default=50000, help="워커에 넘길 청크당 입력 줄 수")
+    parser.add_argument("--batch-size", type=int, default=10000, help="쓰기 요청당 최대 점 수")
+    parser.add_argument("--rate", type=float, default=0, help="전체 초당 최대 점 수 (0이면 제한 없음)")
+    parser.add_argument("--retries", type=int, default=5, help="쓰기 실패 시 재시도 횟수")
+    parser.add_argument("--gzip-level", type=int, default=6, help="요청 본문 gzip 압축 수준 (0이면 압축 안 함)")
+    parser.add_argument("--checkpoint", help="재시작 위치를 기록할 파일")
+    parser.add_argument("--restart", action="store_true", help="checkpoint를 무시하고 처음부터 가져오기")
+    parser.add_argument("--progress", type=float, default=10, help="진행 상황 로그 간격 (초)")
+    parser.add_argument("--dry-run", action="store_true", help="변환만 하고 쓰지 않음 (checkpoint도 기록하지 않음)")
+    args = parser.parse_args(argv)
+
+    for tag in args.tags:
+        if "=" not in tag:
+            parser.error(f"Invalid tag {tag!r} (expected key=value)")
+    if args.workers < 1 or args.chunk_lines < 1 or args.batch_size < 1:
+        parser.error("--workers, --chunk-lines and --batch-size must be positive")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI 진입점"""
+    args = parse_args(argv)
+    job = ImportJob(args)
+    try:
+        return job.run()
+    except KeyboardInterrupt:
+        job.checkpoint.save(force=True)
+        logger.warning("Interrupted, progress is saved in the checkpoint")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
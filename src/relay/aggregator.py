@@ -0,0 +1,401 @@
+"""수집기 line protocol 병합 및 배치 전송 모듈"""
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.relay.instrumentation import RelayInstrumentation
+from src.relay.upstream import (
+    CONFIG_ERROR_STATUS,
+    DATA_ERROR_STATUS,
+    TOO_LARGE_STATUS,
+    InfluxUpstream,
+    upstream_status,
+)
+
+logger = logging.getLogger(__name__)
+
+# offer() 거부 사유
+REJECT_SOURCE_QUOTA = "source_quota"
+REJECT_BUFFER_FULL = "buffer_full"
+REJECT_INVALID = "invalid"
+# upstream이 데이터 오류(400/422)나 크기 초과(413)로 거부한 줄
+REJECT_UPSTREAM = "upstream_rejected"
+
+# measurement[,tags] 다음 공백 뒤에 field=value가 있는 줄 (이스케이프된 공백/쉼표 허용)
+_LINE_PATTERN = re.compile(rb"(?:[^ \\]|\\.)+ (?:[^ =\\]|\\.)+=")
+
+
+def split_lines(body: bytes) -> List[bytes]:
+    """
+    요청 본문을 line protocol 줄로 분리 (빈 줄과 주석 제외)
+
+    Args:
+        body: 개행으로 구분된 line protocol
+
+    Returns:
+        List[bytes]: 줄 목록
+    """
+    lines = []
+    for line in body.split(b"\n"):
+        line = line.rstrip(b"\r")
+        if line and not line.startswith(b"#"):
+            lines.append(line)
+    return lines
+
+
+def invalid_lines(lines: List[bytes]) -> List[bytes]:
+    """
+    line protocol 형식이 아닌 줄 찾기 (measurement와 field set 존재 여부만 빠르게 확인)
+
+    Args:
+        lines: split_lines 결과
+
+    Returns:
+        List[bytes]: 형식이 잘못된 줄
+    """
+    return [line for line in lines if _LINE_PATTERN.match(line) is None]
+
+
+def split_batch(
+    chunks: List[Tuple[str, List[bytes]]],
+) -> Tuple[List[Tuple[str, List[bytes]]], List[Tuple[str, List[bytes]]]]:
+    """
+    배치를 반으로 나누기 (소스 묶음이 하나면 그 묶음의 줄을 나눔)
+
+    Args:
+        chunks: (source, 줄 목록) 묶음 목록 (전체 줄이 2개 이상)
+
+    Returns:
+        (앞쪽, 뒤쪽) 묶음 목록 튜플
+    """
+    if len(chunks) > 1:
+        middle = len(chunks) // 2
+        return chunks[:middle], chunks[middle:]
+    source, lines = chunks[0]
+    middle = len(lines) // 2
+    return [(source, lines[:middle])], [(source, lines[middle:])]
+
+
+class SourceState:
+    """소스(수집기)별 backpressure 상태"""
+
+    __slots__ = ("pending", "received", "rejected", "last_seen")
+
+    def __init__(self, now: float):
+        self.pending = 0
+        self.received = 0
+        self.rejected = 0
+        self.last_seen = now
+
+
+class RelayAggregator:
+    """
+    여러 수집기의 줄을 (bucket, precision)별로 합쳐 큰 배치로 upstream에 쓰는 집계기
+
+    - 배치: batch_size줄이 모이거나 가장 오래된 줄이 flush_interval초를 기다리면 전송
+    - backpressure: 소스별로 아직 upstream에 쓰이지 않은 줄이 source_max_pending을,
+      전체 버퍼가 max_buffer를 넘으면 새 줄을 거부한다 (HTTP는 429로 재시도 유도)
+    - upstream 실패: 배치를 버퍼 앞에 되돌리고 retry_interval부터 max_retry_interval까지
+      두 배씩 늘려 재시도한다. 버퍼가 차면 backpressure가 수집기로 전파된다.
+    - upstream 데이터 오류(400/422): 합친 배치를 소스 묶음별로 다시 써서 거부된 소스의 줄만
+      버리고 rejected_lines{reason="upstream_rejected"}로 센다.
+    - upstream 본문 크기 초과(413): 배치를 반으로 나눠 다시 쓴다 (줄 하나도 크면 그 줄만 버림).
+    - upstream 인증/버킷 오류(401/403/404): relay 설정 문제이므로 다른 실패와 같이 재시도하며
+      버퍼를 채워 수집기에 429를 돌려주고, 오류 로그를 남긴다.
+    """
+
+    def __init__(
+        self,
+        upstream: InfluxUpstream,
+        batch_size: int = 10000,
+        flush_interval: float = 1.0,
+        max_buffer: int = 1_000_000,
+        source_max_pending: int = 50_000,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+        instrumentation: Optional[RelayInstrumentation] = None,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            upstream: InfluxDB 쓰기 클라이언트
+            batch_size: upstream 쓰기 한 번의 최대 줄 수
+            flush_interval: 줄이 버퍼에서 기다리는 최대 시간 (초)
+            max_buffer: 전체 버퍼 최대 줄 수
+            source_max_pending: 소스별 미전송 최대 줄 수
+            retry_interval: upstream 실패 후 첫 재시도 대기 시간 (초)
+            max_retry_interval: 재시도 대기 시간 상한 (초)
+            instrumentation: 자체 계측 지표 (None이면 전용 레지스트리로 생성)
+            clock: 시계 함수
+        """
+        self.upstream = upstream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.source_max_pending = source_max_pending
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.instrumentation = instrumentation or RelayInstrumentation()
+        self._clock = clock
+
+        # (bucket, precision) -> [(source, 줄 목록)]
+        self._queues: Dict[Tuple[str, str], Deque[Tuple[str, List[bytes]]]] = {}
+        self.sources: Dict[str, SourceState] = {}
+        self.buffered = 0
+        self._first_enqueued = 0.0
+        self._backoff = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self.lines_written = 0
+        self.batches_written = 0
+        self.upstream_errors = 0
+
+        self.instrumentation.buffered_lines.set_function(lambda: self.buffered)
+        self.instrumentation.active_sources.set_function(lambda: len(self.sources))
+
+    def offer(
+        self,
+        source: str,
+        lines: List[bytes],
+        bucket: str,
+        precision: str = "ns",
+        transport: str = "http",
+    ) -> Optional[str]:
+        """
+        소스의 줄을 버퍼에 추가
+
+        Args:
+            source: 소스 식별자 (수집기 주소)
+            lines: line protocol 줄
+            bucket: 대상 버킷
+            precision: 타임스탬프 정밀도
+            transport: 수신 경로 ("http" 또는 "udp")
+
+        Returns:
+            Optional[str]: 수락하면 None, 거부하면 사유 (REJECT_SOURCE_QUOTA, REJECT_BUFFER_FULL)
+        """
+        now = self._clock()
+        state = self.sources.get(source)
+        if state is not None:
+            state.last_seen = now
+
+        count = len(lines)
+        if not count:
+            return None
+
+        # 소스 상태는 줄을 받아들일 때만 만들어 거부된 소스로 sources가 늘어나지 않게 함
+        reason = None
+        if (state.pending if state is not None else 0) + count > self.source_max_pending:
+            reason = REJECT_SOURCE_QUOTA
+        elif self.buffered + count > self.max_buffer:
+            reason = REJECT_BUFFER_FULL
+        if reason is not None:
+            if state is not None:
+                state.rejected += count
+            self.instrumentation.rejected_lines.labels(reason=reason).inc(count)
+            return reason
+
+        if state is None:
+            state = self.sources[source] = SourceState(now)
+
+        if self._wakeup is None:
+            self.start()
+        if not self.buffered:
+            self._first_enqueued = now
+            self._wakeup.set()
+
+        self._queues.setdefault((bucket, precision), deque()).append((source, lines))
+        state.pending += count
+        state.received += count
+        self.buffered += count
+        self.instrumentation.received_lines.labels(transport=transport).inc(count)
+
+        if self.buffered >= self.batch_size:
+            self._wakeup.set()
+        return None
+
+    def start(self):
+        """현재 이벤트 루프에서 flush 태스크 시작 (이미 실행 중이면 무시)"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """크기/시간 조건에 따라 upstream으로 flush하는 백그라운드 루프"""
+        while self.buffered or not self._closing:
+            if not self._closing and self.buffered < self.batch_size:
+                timeout = None
+                if self.buffered:
+                    timeout = self._first_enqueued + self.flush_interval - self._clock()
+                if timeout is None or timeout > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            for key, queue in list(self._queues.items()):
+                if queue:
+                    await self._flush(key, self._take(queue))
+
+            if self.buffered:
+                self._first_enqueued = self._clock()
+            if self._backoff:
+                await asyncio.sleep(self._backoff)
+
+    def _take(self, queue: Deque[Tuple[str, List[bytes]]]) -> List[Tuple[str, List[bytes]]]:
+        """큐 앞쪽에서 batch_size줄까지 소스 묶음 꺼내기 (한 묶음은 나누지 않음)"""
+        chunks = []
+        count = 0
+        while queue and (not chunks or count + len(queue[0][1]) <= self.batch_size):
+            chunk = queue.popleft()
+            chunks.append(chunk)
+            count += len(chunk[1])
+        return chunks
+
+    async def _flush(self, key: Tuple[str, str], chunks: List[Tuple[str, List[bytes]]]):
+        """
+        여러 소스의 줄을 하나의 요청 본문으로 합쳐 upstream에 쓰기
+
+        데이터 오류면 어느 소스의 줄이 거부됐는지 모르므로 소스 묶음별로 다시 써서 거부된
+        묶음만 버리고, 크기 초과면 반으로 나눠 다시 쓴다. 그 밖의 오류(연결 실패, 5xx,
+        인증/버킷 오류)는 남은 묶음을 버퍼 앞에 되돌리고 backoff한다.
+        """
+        todo = [chunks]
+        while todo:
+            batch = todo.pop()
+            error = await self._write(key, batch)
+            if error is None:
+                continue
+            status = upstream_status(error)
+            if status == TOO_LARGE_STATUS and sum(len(lines) for _, lines in batch) > 1:
+                first, second = split_batch(batch)
+                todo.extend((second, first))
+            elif status in DATA_ERROR_STATUS and len(batch) > 1:
+                logger.warning(f"Upstream rejected a merged batch from {len(batch)} sources, retrying per source: {error}")
+                todo.extend([chunk] for chunk in reversed(batch))
+            elif status in DATA_ERROR_STATUS or status == TOO_LARGE_STATUS:
+                self._reject(batch, error)
+            else:
+                self._retry_later(key, batch + [chunk for rest in reversed(todo) for chunk in rest], error)
+                return
+
+    async def _write(self, key: Tuple[str, str], chunks: List[Tuple[str, List[bytes]]]) -> Optional[Exception]:
+        """소스 묶음을 한 요청으로 쓰기 (성공하면 버퍼에서 빼고 None, 실패하면 예외 반환)"""
+        bucket, precision = key
+        count = sum(len(lines) for _, lines in chunks)
+        body = b"\n".join(line for _, lines in chunks for line in lines)
+
+        start = time.perf_counter()
+        try:
+            sent_bytes = await self.upstream.write(bucket, precision, body)
+        except Exception as e:
+            self.upstream_errors += 1
+            self.instrumentation.upstream_errors.inc()
+            return e
+
+        self._backoff = 0.0
+        self.instrumentation.observe_upstream(time.perf_counter() - start, count, sent_bytes)
+        self.lines_written += count
+        self.batches_written += 1
+        self._release(chunks)
+        return None
+
+    def _retry_later(self, key: Tuple[str, str], chunks: List[Tuple[str, List[bytes]]], error: Exception):
+        """재시도할 오류: 소스 묶음을 버퍼 앞에 되돌리고 backoff 늘리기"""
+        count = sum(len(lines) for _, lines in chunks)
+        self._queues[key].extendleft(reversed(chunks))
+        self._backoff = min(max(self._backoff * 2, self.retry_interval), self.max_retry_interval)
+        if upstream_status(error) in CONFIG_ERROR_STATUS:
+            # 토큰 만료/교체나 버킷 삭제: 데이터를 버리지 않고 버퍼가 차면 수집기가 429를 받음
+            logger.error(
+                f"Upstream refused the relay's credentials or bucket {key[0]!r} ({error}); "
+                f"holding {self.buffered} buffered lines, retrying in {self._backoff:.1f}s. "
+                f"Check INFLUXDB_TOKEN/INFLUXDB_ORG and the bucket"
+            )
+        else:
+            logger.warning(f"Upstream write of {count} lines failed, retrying in {self._backoff:.1f}s: {error}")
+
+    def _reject(self, chunks: List[Tuple[str, List[bytes]]], error: Exception):
+        """upstream이 데이터 오류/크기 초과로 거부한 소스 묶음을 버퍼에서 버리고 거부로 집계"""
+        count = sum(len(lines) for _, lines in chunks)
+        self.instrumentation.rejected_lines.labels(reason=REJECT_UPSTREAM).inc(count)
+        for source, lines in chunks:
+            state = self.sources.get(source)
+            if state is not None:
+                state.rejected += len(lines)
+            logger.error(f"Upstream permanently rejected {len(lines)} lines from {source}, dropping: {error}")
+        self._release(chunks)
+
+    def _release(self, chunks: List[Tuple[str, List[bytes]]]):
+        """처리가 끝난 소스 묶음을 버퍼/소스별 미전송 줄 수에서 빼기"""
+        for source, lines in chunks:
+            self.buffered -= len(lines)
+            state = self.sources.get(source)
+            if state is not None:
+                state.pending -= len(lines)
+
+    def prune(self, idle_seconds: float = 300):
+        """
+        미전송 줄이 없고 idle_seconds 동안 보이지 않은 소스 정리
+
+        Args:
+            idle_seconds: 소스 유지 시간 (초)
+        """
+        threshold = self._clock() - idle_seconds
+        for source in [s for s, state in self.sources.items() if not state.pending and state.last_seen < threshold]:
+            del self.sources[source]
+
+    async def close(self, timeout: Optional[float] = 10.0):
+        """
+        남은 줄을 upstream에 쓴 뒤 종료
+
+        Args:
+            timeout: 드레인 대기 최대 시간 (초), 초과하면 남은 줄은 버림
+        """
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Relay drain timed out, {self.buffered} lines discarded")
+        await self.upstream.close()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        relay 통계 조회
+
+        Returns:
+            Dict[str, float]: 버퍼 줄 수, 소스 수, 전송 줄/배치 수, upstream 오류 수
+        """
+        return {
+            "buffered_lines": self.buffered,
+            "sources": len(self.sources),
+            "lines_written": self.lines_written,
+            "batches_written": self.batches_written,
+            "upstream_errors": self.upstream_errors,
+            "retry_backoff_seconds": self._backoff,
+        }
+
+    def source_stats(self, limit: int = 50) -> List[Dict[str, float]]:
+        """
+        미전송 줄이 많은 순서로 소스별 통계 조회
+
+        Args:
+            limit: 최대 소스 수
+
+        Returns:
+            List[Dict[str, float]]: source, pending, received, rejected
+        """
+        ranked = sorted(self.sources.items(), key=lambda item: item[1].pending, reverse=True)[:limit]
+        return [
+            {"source": source, "pending": state.pending, "received": state.received, "rejected": state.rejected}
+            for source, state in ranked
+        ]
@@ -0,0 +1,57 @@
+"""relay 자체 계측 (Prometheus) 모듈"""
+from typing import Optional
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+from src.collector.instrumentation import BATCH_SIZE_BUCKETS, LATENCY_BUCKETS
+
+BODY_SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class RelayInstrumentation:
+    """
+    relay 처리량/backpressure/upstream 지표
+
+    수천 개 소스의 라벨 폭증을 피하기 위해 소스별 값은 Prometheus가 아니라
+    RelayAggregator.source_stats()(/stats 엔드포인트)로 제공한다.
+    """
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None):
+        self.registry = registry or CollectorRegistry()
+        registry = self.registry
+
+        self.received_lines = Counter(
+            "relay_received_lines_total", "Lines accepted from collectors",
+            ["transport"], registry=registry,
+        )
+        self.rejected_lines = Counter(
+            "relay_rejected_lines_total", "Lines rejected by backpressure or validation",
+            ["reason"], registry=registry,
+        )
+        self.buffered_lines = Gauge(
+            "relay_buffered_lines", "Lines waiting to be written upstream", registry=registry,
+        )
+        self.active_sources = Gauge(
+            "relay_active_sources", "Collectors seen since the last prune", registry=registry,
+        )
+        self.upstream_duration = Histogram(
+            "relay_upstream_write_duration_seconds", "Time to write one merged batch upstream",
+            buckets=LATENCY_BUCKETS, registry=registry,
+        )
+        self.upstream_batch_lines = Histogram(
+            "relay_upstream_batch_lines", "Lines per upstream write",
+            buckets=BATCH_SIZE_BUCKETS, registry=registry,
+        )
+        self.upstream_batch_bytes = Histogram(
+            "relay_upstream_batch_bytes", "Compressed request body size per upstream write",
+            buckets=BODY_SIZE_BUCKETS, registry=registry,
+        )
+        self.upstream_errors = Counter(
+            "relay_upstream_errors_total", "Failed upstream writes (retried, split, or dropped when upstream rejects the data)", registry=registry,
+        )
+
+    def observe_upstream(self, elapsed: float, lines: int, body_bytes: int):
+        """upstream 쓰기 지연 시간 및 배치 크기 기록"""
+        self.upstream_duration.observe(elapsed)
+        self.upstream_batch_lines.observe(lines)
+        self.upstream_batch_bytes.observe(body_bytes)
@@ -0,0 +1,185 @@
+"""수집기 fan-in relay 메인 모듈
+
+여러 수집기가 InfluxDB 대신 relay로 line protocol을 보내면(HTTP /api/v2/write 또는 UDP),
+relay가 이를 합쳐 큰 gzip 배치로 InfluxDB에 쓴다. 수집기 쪽은 INFLUXDB_URL만 relay 주소로
+바꾸면 된다.
+"""
+import asyncio
+import logging
+import os
+import zlib
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import make_asgi_app
+
+from src.relay.aggregator import REJECT_INVALID, RelayAggregator, invalid_lines, split_lines
+from src.relay.upstream import InfluxUpstream
+
+# 환경 변수에서 로그 레벨 가져오기
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+logging.basicConfig(
+    level=getattr(logging, log_level),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PRECISIONS = ("ns", "us", "ms", "s")
+
+
+class RelayUDPProtocol(asyncio.DatagramProtocol):
+    """UDP 데이터그램 한 개 = line protocol 여러 줄 (거부된 줄은 집계만 하고 버림)"""
+
+    def __init__(self, aggregator: RelayAggregator, bucket: str, precision: str = "ns"):
+        self.aggregator = aggregator
+        self.bucket = bucket
+        self.precision = precision
+
+    def datagram_received(self, data: bytes, addr):
+        lines = split_lines(data)
+        invalid = invalid_lines(lines)
+        if invalid:
+            # UDP는 응답이 없으므로 잘못된 줄만 버림
+            self.aggregator.instrumentation.rejected_lines.labels(reason=REJECT_INVALID).inc(len(invalid))
+            lines = [line for line in lines if line not in invalid]
+        self.aggregator.offer(addr[0], lines, self.bucket, self.precision, transport="udp")
+
+
+def create_app(
+    aggregator: RelayAggregator,
+    bucket: str,
+    token: Optional[str] = None,
+    max_body_bytes: int = 16 * 1024 * 1024,
+    retry_after: int = 5,
+    udp_port: int = 0,
+    prune_interval: float = 60,
+) -> FastAPI:
+    """
+    relay FastAPI 애플리케이션 생성
+
+    Args:
+        aggregator: 줄 병합/전송 집계기
+        bucket: 요청에 bucket이 없을 때 사용할 버킷
+        token: 수집기 인증 토큰 ("Authorization: Token ..."), None이면 인증 없음
+        max_body_bytes: 요청 본문 최대 크기 (압축 해제 후)
+        retry_after: backpressure 응답의 Retry-After (초)
+        udp_port: UDP 수신 포트 (0이면 비활성화)
+        prune_interval: 유휴 소스 정리 주기 (초)
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """relay 생명주기 관리"""
+        logger.info("Starting metrics relay")
+        aggregator.start()
+        transport = None
+        if udp_port:
+            loop = asyncio.get_running_loop()
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: RelayUDPProtocol(aggregator, bucket), local_addr=("0.0.0.0", udp_port)
+            )
+            logger.info(f"Relay listening for UDP line protocol on port {udp_port}")
+
+        async def prune_loop():
+            while True:
+                await asyncio.sleep(prune_interval)
+                aggregator.prune()
+
+        pruner = asyncio.create_task(prune_loop())
+        yield
+        logger.info("Shutting down metrics relay")
+        pruner.cancel()
+        if transport is not None:
+            transport.close()
+        await aggregator.close()
+
+    app = FastAPI(
+        title="System Metrics Relay",
+        description="수집기 line protocol fan-in relay",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    @app.post("/api/v2/write", status_code=204)
+    async def write(request: Request, precision: str = "ns"):
+        """InfluxDB v2 호환 쓰기 엔드포인트"""
+        if token and request.headers.get("authorization") != f"Token {token}":
+            return JSONResponse({"code": "unauthorized", "message": "invalid token"}, status_code=401)
+        if precision not in PRECISIONS:
+            return JSONResponse({"code": "invalid", "message": f"invalid precision: {precision}"}, status_code=400)
+
+        body = await request.body()
+        if request.headers.get("content-encoding", "").lower() == "gzip":
+            try:
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                body = decompressor.decompress(body, max_body_bytes + 1)
+            except zlib.error:
+                return JSONResponse({"code": "invalid", "message": "invalid gzip body"}, status_code=400)
+        if len(body) > max_body_bytes:
+            return JSONResponse({"code": "too large", "message": "request body too large"}, status_code=413)
+
+        source = request.client.host if request.client else "unknown"
+        target = request.query_params.get("bucket") or bucket
+        lines = split_lines(body)
+        invalid = invalid_lines(lines)
+        if invalid:
+            # 잘못된 줄이 병합 배치에 섞여 다른 소스의 쓰기까지 실패시키지 않도록 요청 단위로 거부
+            aggregator.instrumentation.rejected_lines.labels(reason=REJECT_INVALID).inc(len(lines))
+            message = f"unable to parse '{invalid[0][:200].decode(errors='replace')}'"
+            return JSONResponse({"code": "invalid", "message": message}, status_code=400)
+        reason = aggregator.offer(source, lines, target, precision)
+        if reason is not None:
+            return JSONResponse(
+                {"code": "too many requests", "message": reason},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+        return Response(status_code=204)
+
+    @app.get("/health")
+    async def health():
+        """헬스체크 (InfluxDB /health와 같은 형태)"""
+        return {"status": "pass", **aggregator.get_stats()}
+
+    @app.get("/stats")
+    async def stats(limit: int = 50):
+        """미전송 줄이 많은 소스 순서의 소스별 통계"""
+        return {"relay": aggregator.get_stats(), "sources": aggregator.source_stats(limit)}
+
+    app.mount("/metrics", make_asgi_app(registry=aggregator.instrumentation.registry))
+    return app
+
+
+def create_app_from_env() -> FastAPI:
+    """환경 변수 설정으로 relay 애플리케이션 생성"""
+    upstream = InfluxUpstream(gzip_level=int(os.getenv("RELAY_GZIP_LEVEL", "6")))
+    aggregator = RelayAggregator(
+        upstream,
+        batch_size=int(os.getenv("RELAY_BATCH_SIZE", "10000")),
+        flush_interval=float(os.getenv("RELAY_FLUSH_INTERVAL", "1")),
+        max_buffer=int(os.getenv("RELAY_MAX_BUFFER", "1000000")),
+        source_max_pending=int(os.getenv("RELAY_SOURCE_MAX_PENDING", "50000")),
+    )
+    return create_app(
+        aggregator,
+        bucket=os.getenv("INFLUXDB_BUCKET", "system-metrics"),
+        token=os.getenv("RELAY_TOKEN") or None,
+        udp_port=int(os.getenv("RELAY_UDP_PORT", "8089")),
+    )
+
+
+def main():
+    """메인 실행 함수"""
+    import uvicorn
+
+    uvicorn.run(
+        create_app_from_env(),
+        host=os.getenv("RELAY_HOST", "0.0.0.0"),
+        port=int(os.getenv("RELAY_PORT", "8087")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""relay -> InfluxDB upstream 쓰기 모듈"""
+import asyncio
+import gzip
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 소스가 보낸 줄 때문에 다시 보내도 실패하는 응답 (문법 오류, 필드 타입 충돌 등)
+DATA_ERROR_STATUS = (400, 422)
+# 요청 본문이 너무 큼 (나눠서 다시 보냄)
+TOO_LARGE_STATUS = 413
+# relay 자신의 토큰/버킷 설정 오류 (어느 소스 탓도 아니므로 재시도하며 backpressure로 전파)
+CONFIG_ERROR_STATUS = (401, 403, 404)
+
+
+def upstream_status(error: Exception) -> Optional[int]:
+    """upstream 오류의 HTTP 상태 코드 (연결 실패 등 응답이 없으면 None)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+class InfluxUpstream:
+    """InfluxDB v2 /api/v2/write HTTP 클라이언트 (gzip 요청 본문)"""
+
+    def __init__(
+        self,
+        url: str = None,
+        token: str = None,
+        org: str = None,
+        gzip_level: int = 6,
+        timeout: float = 10.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            url: InfluxDB 주소 (None이면 INFLUXDB_URL)
+            token: 인증 토큰 (None이면 INFLUXDB_TOKEN)
+            org: 조직 (None이면 INFLUXDB_ORG)
+            gzip_level: gzip 압축 수준 (0이면 압축하지 않음)
+            timeout: 요청 타임아웃 (초)
+            transport: httpx transport (테스트용 대체 서버 연결)
+        """
+        self.url = url or os.getenv("INFLUXDB_URL", "http://localhost:8086")
+        self.token = token or os.getenv("INFLUXDB_TOKEN", "")
+        self.org = org or os.getenv("INFLUXDB_ORG", "my-org")
+        self.gzip_level = gzip_level
+        self.client = httpx.AsyncClient(
+            base_url=self.url,
+            timeout=timeout,
+            transport=transport,
+            headers={"Authorization": f"Token {self.token}"},
+        )
+
+    async def write(self, bucket: str, precision: str, body: bytes) -> int:
+        """
+        line protocol 본문 저장
+
+        Args:
+            bucket: 버킷
+            precision: 타임스탬프 정밀도
+            body: 개행으로 구분된 line protocol
+
+        Returns:
+            int: 전송한 (압축된) 본문 바이트 수
+
+        Raises:
+            httpx.HTTPError: 연결 실패 또는 2xx가 아닌 응답
+        """
+        headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if self.gzip_level:
+            body = await asyncio.to_thread(gzip.compress, body, self.gzip_level)
+            headers["Content-Encoding"] = "gzip"
+
+        response = await self.client.post(
+            "/api/v2/write",
+            params={"org": self.org, "bucket": bucket, "precision": precision},
+            content=body,
+            headers=headers,
+        )
+        response.raise_for_status()
+        return len(body)
+
+    async def close(self):
+        """HTTP 연결 종료"""
+        await self.client.aclose()
@@ -0,0 +1,473 @@
+"""메트릭 저장소 인터페이스 모듈"""
+import bisect
+import math
+import os
+import re
+import socket
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from src.storage.line_protocol import CORE_MEASUREMENT
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_DURATION_UNITS = {
+    "us": timedelta(microseconds=1),
+    "ms": timedelta(milliseconds=1),
+    "s": timedelta(seconds=1),
+    "m": timedelta(minutes=1),
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "w": timedelta(weeks=1),
+}
+_DURATION_PART = re.compile(r"(\d+)(us|ms|s|m|h|d|w)")
+
+# aggregateWindow 집계 함수
+AGGREGATES = ("mean", "max", "min", "last")
+
+# 자동 집계 간격 후보 (이보다 긴 간격은 일 단위로 올림)
+WINDOW_STEPS = tuple(
+    timedelta(seconds=seconds) for seconds in (
+        1, 2, 5, 10, 15, 30,
+        60, 120, 300, 600, 900, 1800,
+        3600, 7200, 10800, 21600, 43200,
+        86400,
+    )
+)
+
+
+class MetricsStorage(ABC):
+    """
+    수집기와 API가 사용하는 메트릭 저장소 인터페이스
+
+    구현체: InfluxDBClient (외부 InfluxDB), EmbeddedStorage (로컬 압축 저장소)
+    """
+
+    # 코어별 값 스키마 ("wide" 또는 "narrow", line_protocol.SCHEMAS)
+    schema = "wide"
+
+    @abstractmethod
+    async def write_metrics(self, metrics: Dict[str, Any]) -> int:
+        """
+        수집 샘플 저장
+
+        Args:
+            metrics: collect_all_metrics 결과
+
+        Returns:
+            int: 저장(또는 저장 대기열에 추가)한 Point 수
+        """
+
+    @abstractmethod
+    async def query_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        measurement의 시간 구간 조회
+
+        every를 지정하면 시리즈마다 epoch 기준 every 간격 창으로 집계한 값을 돌려준다
+        (InfluxDB aggregateWindow와 같이 time은 창의 끝, 빈 창은 생략).
+
+        Args:
+            measurement: 측정 이름 (cpu, memory 등)
+            start: 시작 시간 (-1h 같은 상대 시간 또는 RFC3339)
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            every: 집계 간격 (예: "1m", None이면 원본 점)
+            fn: 집계 함수 (AGGREGATES)
+
+        Returns:
+            List[Dict]: time, measurement, field, value, tags 레코드 목록
+        """
+
+    async def stream_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> AsyncIterator[Dict]:
+        """
+        query_metrics와 같은 레코드를 하나씩 내보내는 스트리밍 조회
+
+        기본 구현은 query_metrics 결과를 나눠 내보낼 뿐이다. 결과를 메모리에 모으지 않고
+        읽을 수 있는 저장소는 재정의한다.
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            every: 집계 간격 (None이면 원본 점)
+            fn: 집계 함수 (AGGREGATES)
+
+        Yields:
+            Dict: time, measurement, field, value, tags 레코드
+        """
+        for record in await self.query_metrics(measurement, start, stop, filters, every, fn):
+            yield record
+
+    async def query_columns(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        시리즈별 열 형식 조회 (measurement/field/tags를 점마다 반복하지 않음)
+
+        기본 구현은 query_metrics 레코드를 시리즈별로 모은다. 저장소가 시리즈 단위 배열을
+        직접 만들 수 있으면 재정의한다.
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            every: 집계 간격 (None이면 원본 점)
+            fn: 집계 함수 (AGGREGATES)
+
+        Returns:
+            List[Dict]: 시리즈마다 field, tags, time(epoch 밀리초 정수 배열), value(값 배열)
+        """
+        series: Dict[Any, Dict] = {}
+        for record in await self.query_metrics(measurement, start, stop, filters, every, fn):
+            key = (record["field"], tuple(sorted(record["tags"].items())))
+            columns = series.get(key)
+            if columns is None:
+                columns = series[key] = {"field": record["field"], "tags": dict(record["tags"]), "time": [], "value": []}
+            columns["time"].append(epoch_ms(record["time"]))
+            columns["value"].append(record["value"])
+        return list(series.values())
+
+    async def query_per_core(
+        self,
+        field: str = "cpu_percent",
+        start: str = "-1h",
+        stop: str = "now()",
+        core: Optional[int] = None,
+    ) -> Dict[int, List[Dict]]:
+        """
+        코어별 값 조회 (스키마와 무관하게 같은 결과)
+
+        wide 스키마는 cpu measurement의 "<field>_per_core_core<N>" 필드를,
+        narrow 스키마는 cpu_core measurement의 core 태그별 "<field>" 필드를 읽는다.
+        wide 스키마에서 core를 지정하지 않으면 cpu measurement의 모든 필드를 읽은 뒤 거른다.
+
+        Args:
+            field: 코어별 값 이름 (cpu_percent_per_core의 경우 cpu_percent)
+            start: 시작 시간
+            stop: 종료 시간
+            core: 특정 코어 번호 (None이면 전체)
+
+        Returns:
+            Dict[int, List[Dict]]: 코어 번호 -> time, value 레코드 목록
+        """
+        cores: Dict[int, List[Dict]] = {}
+        if self.schema == "narrow":
+            filters = {"_field": field}
+            if core is not None:
+                filters["core"] = str(core)
+            for record in await self.query_metrics(CORE_MEASUREMENT, start, stop, filters):
+                number = record.get("tags", {}).get("core")
+                if number is not None:
+                    cores.setdefault(int(number), []).append({"time": record["time"], "value": record["value"]})
+        else:
+            prefix = f"{field}_per_core_core"
+            filters = {"_field": f"{prefix}{core}"} if core is not None else None
+            for record in await self.query_metrics("cpu", start, stop, filters):
+                suffix = record["field"][len(prefix):]
+                if record["field"].startswith(prefix) and suffix.isdigit():
+                    cores.setdefault(int(suffix), []).append({"time": record["time"], "value": record["value"]})
+        return dict(sorted(cores.items()))
+
+    async def summarize_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        quantile: float = 0.95,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        필드별 통계 (count, mean, min, max, quantile)
+
+        기본 구현은 query_metrics 결과로 계산한다. 저장소가 직접 집계할 수 있으면 재정의한다.
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            quantile: 분위수 (0~1)
+
+        Returns:
+            Dict[str, Dict[str, float]]: 필드 -> count, mean, min, max, quantile (숫자 값이 있는 필드만)
+        """
+        if not 0 < quantile < 1:
+            raise ValueError(f"Invalid quantile: {quantile}")
+        sketches: Dict[str, SummarySketch] = {}
+        for record in await self.query_metrics(measurement, start, stop, filters):
+            value = record["value"]
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                sketches.setdefault(record["field"], SummarySketch()).add_many((value,))
+        return {field: sketch.result(quantile) for field, sketch in sketches.items()}
+
+    async def close(self):
+        """저장소 종료"""
+
+
+class SummarySketch:
+    """
+    값을 모아 두지 않고 count, mean, min, max, quantile을 계산하는 스트리밍 요약
+
+    count/합계/min/max는 정확히 누적하고, 분위수는 t-digest 중심점(평균, 가중치)으로 추정한다.
+    값은 버퍼에 모았다가 가득 차면 정렬해 기존 중심점과 병합하므로 메모리는 값 개수와 무관하게
+    compression에 비례한다. 압축 전(값이 버퍼보다 적을 때)의 분위수는 최근접 순위 값 그대로다.
+    """
+
+    # 압축 전 버퍼 크기 (compression의 배수)
+    BUFFER_FACTOR = 10
+
+    def __init__(self, compression: int = 200):
+        """
+        Args:
+            compression: 중심점 수 기준 (클수록 정확하고 메모리를 더 씀)
+        """
+        self.compression = compression
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: List[float] = []
+        self._weights: List[int] = []
+        self._buffer: List[float] = []
+
+    def add_many(self, values: Sequence[float]):
+        """값 묶음 추가 (저장소 청크 하나 등)"""
+        if not values:
+            return
+        self.count += len(values)
+        self.total += sum(values)
+        self.min = min(self.min, min(values))
+        self.max = max(self.max, max(values))
+        self._buffer.extend(values)
+        if len(self._buffer) >= self.compression * self.BUFFER_FACTOR:
+            self._compress()
+
+    def _compress(self):
+        """버퍼와 중심점을 평균 순으로 병합 (분위수 양 끝일수록 중심점이 덮는 범위를 좁게 제한)"""
+        points = sorted(zip(
+            self._means + self._buffer, self._weights + [1] * len(self._buffer),
+        ))
+        self._buffer = []
+        means: List[float] = []
+        weights: List[int] = []
+        before = 0
+        limit = 0.0
+        for mean, weight in points:
+            if weights and before + weights[-1] + weight <= limit:
+                weights[-1] += weight
+                means[-1] += (mean - means[-1]) * weight / weights[-1]
+                continue
+            if weights:
+                before += weights[-1]
+            means.append(mean)
+            weights.append(weight)
+            limit = self.count * self._next_quantile(before / self.count)
+        self._means, self._weights = means, weights
+
+    def _next_quantile(self, q: float) -> float:
+        """q에서 시작한 중심점이 넓힐 수 있는 분위수 끝 (t-digest k1 척도로 1만큼)"""
+        scale = self.compression / (2 * math.pi)
+        k = scale * math.asin(2 * q - 1) + 1
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k / scale) + 1) / 2
+
+    def quantile(self, quantile: float) -> float:
+        """
+        분위수 추정 (가중치 1인 중심점만 있으면 최근접 순위 값과 같음)
+
+        중심점 평균을 그 중심점이 차지하는 순위 구간의 가운데에 두고, 양 끝은 min/max로 잡아
+        이웃한 두 점 사이를 선형 보간한다.
+        """
+        points = sorted(zip(
+            self._means + self._buffer, self._weights + [1] * len(self._buffer),
+        ))
+        rank = min(int(self.count * quantile), self.count - 1)
+        positions = [0.0]
+        values = [self.min]
+        before = 0
+        for mean, weight in points:
+            positions.append(before + (weight - 1) / 2)
+            values.append(mean)
+            before += weight
+        positions.append(self.count - 1)
+        values.append(self.max)
+
+        upper = bisect.bisect_right(positions, rank)
+        lower = upper - 1
+        if positions[lower] == rank or upper == len(positions):
+            return values[lower]
+        ratio = (rank - positions[lower]) / (positions[upper] - positions[lower])
+        return values[lower] + (values[upper] - values[lower]) * ratio
+
+    def result(self, quantile: float = 0.95) -> Dict[str, float]:
+        """
+        count, mean, min, max, quantile
+
+        Raises:
+            ValueError: 값이 없거나 quantile이 (0, 1) 밖인 경우
+        """
+        if not self.count:
+            raise ValueError("No values to summarize")
+        if not 0 < quantile < 1:
+            raise ValueError(f"Invalid quantile: {quantile}")
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "quantile": self.quantile(quantile),
+        }
+
+
+def default_tags() -> Dict[str, str]:
+    """
+    모든 Point에 붙일 수집기 식별 태그
+
+    host는 COLLECTOR_HOST(없으면 호스트 이름), instance는 COLLECTOR_INSTANCE가 있을 때만 붙는다.
+    여러 수집기가 같은 버킷(또는 relay)에 쓸 때 시계열을 구분하는 데 사용한다.
+
+    Returns:
+        Dict[str, str]: 태그 이름 -> 값
+    """
+    tags = {"host": os.getenv("COLLECTOR_HOST") or socket.gethostname()}
+    instance = os.getenv("COLLECTOR_INSTANCE")
+    if instance:
+        tags["instance"] = instance
+    return tags
+
+
+def parse_duration(text: str) -> timedelta:
+    """
+    Flux 형식 기간 파싱 (예: "1h30m", "14d")
+
+    Raises:
+        ValueError: 형식이 올바르지 않은 경우
+    """
+    parts = _DURATION_PART.findall(text)
+    if not parts or "".join(number + unit for number, unit in parts) != text:
+        raise ValueError(f"Invalid duration: {text}")
+    return sum((int(number) * _DURATION_UNITS[unit] for number, unit in parts), timedelta())
+
+
+def format_duration(duration: timedelta) -> str:
+    """
+    timedelta를 Flux 기간 문자열로 변환 (나누어 떨어지는 가장 큰 단위, 예: 300초 -> "5m")
+
+    Raises:
+        ValueError: 1마이크로초보다 짧은 경우
+    """
+    micros = duration // timedelta(microseconds=1)
+    if micros <= 0:
+        raise ValueError(f"Invalid duration: {duration}")
+    for unit in ("w", "d", "h", "m", "s", "ms", "us"):
+        size = _DURATION_UNITS[unit] // timedelta(microseconds=1)
+        if micros % size == 0:
+            return f"{micros // size}{unit}"
+
+
+def auto_window(start: datetime, stop: datetime, max_points: int) -> timedelta:
+    """
+    시리즈당 점이 max_points개를 넘지 않는 가장 작은 집계 간격 (WINDOW_STEPS 또는 일 단위)
+
+    Args:
+        start: 시작 시각
+        stop: 종료 시각
+        max_points: 시리즈당 최대 점 수
+    """
+    needed = (stop - start) / max(max_points, 1)
+    for step in WINDOW_STEPS:
+        if step >= needed:
+            return step
+    day = timedelta(days=1)
+    return -(-needed // day) * day
+
+
+def resolve_window(
+    start: str,
+    stop: str,
+    every: Optional[str] = None,
+    max_points: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> Optional[timedelta]:
+    """
+    조회 구간의 집계 간격 결정
+
+    every를 지정해도 시리즈당 max_points를 넘으면 자동 간격으로 늘린다.
+
+    Args:
+        start: 시작 시간
+        stop: 종료 시간
+        every: 요청한 집계 간격 (None이면 자동)
+        max_points: 시리즈당 최대 점 수 (None이면 제한 없음)
+        now: 상대 시간 기준 시각
+
+    Returns:
+        Optional[timedelta]: 집계 간격 (every와 max_points가 모두 없으면 None, 원본 점)
+
+    Raises:
+        ValueError: 시간 또는 간격 형식이 올바르지 않은 경우
+    """
+    step = parse_duration(every) if every else None
+    if max_points:
+        if now is None:
+            now = datetime.now(timezone.utc)
+        minimum = auto_window(parse_time(start, now), parse_time(stop, now), max_points)
+        step = max(step or minimum, minimum)
+    return step
+
+
+def epoch_ms(moment: datetime) -> int:
+    """datetime을 epoch 밀리초 정수로 변환 (naive는 UTC로 간주)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - EPOCH) // timedelta(milliseconds=1)
+
+
+def parse_time(text: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Flux range() 시간 표현을 UTC datetime으로 변환
+
+    Args:
+        text: "now()", "-1h" 같은 상대 시간, 또는 RFC3339 시각
+        now: 기준 시각 (None이면 현재 시각)
+
+    Returns:
+        datetime: tz-aware UTC datetime
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    text = text.strip()
+    if text == "now()":
+        return now
+    if text.startswith("-"):
+        return now - parse_duration(text[1:])
+    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
@@ -0,0 +1,237 @@
+"""InfluxDB 백그라운드 배치 쓰기 모듈"""
+import asyncio
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    제한된 큐를 거쳐 Point를 모아 쓰는 백그라운드 writer
+
+    submit()은 큐에 넣기만 하고 즉시 반환한다. 백그라운드 태스크가 batch_size개가
+    모이거나 가장 오래된 Point가 flush_interval초를 기다리면 한 번에 flush하며,
+    HTTP 요청은 전용 스레드에서 실행되어 수집 루프와 겹쳐 진행된다.
+    큐가 max_queue를 넘으면 가장 오래된 Point부터 버린다 (최신 값 우선).
+    저장에 실패한 배치는 fallback_fn(디스크 스풀 등)이 있으면 넘기고, 없으면 버린다.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[List[Any]], None],
+        batch_size: int = 5000,
+        flush_interval: float = 1.0,
+        max_queue: int = 100000,
+        fallback_fn: Optional[Callable[[List[Any]], None]] = None,
+        clock=time.monotonic,
+        thread_name: str = "influxdb-writer",
+    ):
+        """
+        Args:
+            write_fn: Point 목록을 저장하는 동기 함수 (writer 스레드에서 호출)
+            batch_size: 한 번에 쓰는 최대 Point 수
+            flush_interval: Point가 큐에서 기다리는 최대 시간 (초)
+            max_queue: 큐에 보관하는 최대 Point 수
+            fallback_fn: 저장 실패한 배치를 받는 동기 함수 (writer 스레드에서 호출)
+            clock: 시계 함수
+            thread_name: writer 스레드 이름 접두사
+        """
+        if batch_size <= 0 or max_queue <= 0:
+            raise ValueError("batch_size and max_queue must be positive")
+
+        self.write_fn = write_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.fallback_fn = fallback_fn
+        self._clock = clock
+
+        self._queue: Deque[Any] = deque()
+        self._first_enqueued = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+
+        # flush 결과 콜백 (elapsed 초, Point 수, 실패 여부) 및 버린 Point 수 콜백
+        self.on_flush: Optional[Callable[[float, int, bool], None]] = None
+        self.on_drop: Optional[Callable[[int], None]] = None
+
+        self.flushes = 0
+        self.errors = 0
+        self.points_written = 0
+        self.points_dropped = 0
+        self.points_spooled = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """큐에서 기다리는 Point 수"""
+        return len(self._queue)
+
+    def submit(self, points: List[Any]) -> int:
+        """
+        Point를 큐에 추가 (이벤트 루프 안에서 호출)
+
+        Args:
+            points: 저장할 Point 목록
+
+        Returns:
+            int: 큐에 추가한 Point 수
+
+        Raises:
+            RuntimeError: close() 이후 호출한 경우
+        """
+        if self._closing:
+            raise RuntimeError("BatchWriter is closed")
+        if not points:
+            return 0
+
+        self._start()
+        if not self._queue:
+            self._first_enqueued = self._clock()
+            self._wakeup.set()
+        self._queue.extend(points)
+
+        overflow = len(self._queue) - self.max_queue
+        if overflow > 0:
+            for _ in range(overflow):
+                self._queue.popleft()
+            logger.warning(f"Write queue full, dropped {overflow} oldest points")
+            self._record_drop(overflow)
+
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return len(points)
+
+    def _start(self):
+        """첫 submit 시 현재 이벤트 루프에 flush 태스크 생성"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """크기/시간 조건에 따라 flush하는 백그라운드 루프"""
+        while self._queue or not self._closing:
+            if not self._closing and len(self._queue) < self.batch_size:
+                timeout = None
+                if self._queue:
+                    timeout = self._first_enqueued + self.flush_interval - self._clock()
+                if timeout is None or timeout > 0:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+            await self._flush(self._take())
+
+    def _take(self) -> List[Any]:
+        """큐 앞쪽에서 최대 batch_size개 꺼내기"""
+        count = min(len(self._queue), self.batch_size)
+        batch = [self._queue.popleft() for _ in range(count)]
+        if self._queue:
+            self._first_enqueued = self._clock()
+        return batch
+
+    async def _flush(self, batch: List[Any]):
+        """배치 한 건을 writer 스레드에서 저장"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        failed = False
+        try:
+            await loop.run_in_executor(self._executor, self.write_fn, batch)
+        except Exception as e:
+            failed = True
+            logger.error(f"Failed to flush {len(batch)} points: {e}")
+
+        elapsed = time.perf_counter() - start
+        elapsed_ms = elapsed * 1000
+        self.flushes += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        if failed:
+            self.errors += 1
+            await self._fallback(batch)
+        else:
+            self.points_written += len(batch)
+
+        if self.on_flush is not None:
+            self.on_flush(elapsed, len(batch), failed)
+
+    async def _fallback(self, batch: List[Any]):
+        """저장 실패한 배치를 fallback_fn으로 넘기고, 불가능하면 버림"""
+        if self.fallback_fn is not None:
+            try:
+                await asyncio.get_running_loop().run_in_executor(self._executor, self.fallback_fn, batch)
+                self.points_spooled += len(batch)
+                return
+            except Exception as e:
+                logger.error(f"Failed to spool {len(batch)} points: {e}")
+        self._record_drop(len(batch))
+
+    def _record_drop(self, count: int):
+        """버린 Point 수 기록"""
+        self.points_dropped += count
+        if self.on_drop is not None:
+            self.on_drop(count)
+
+    async def flush(self):
+        """
+        큐에 남은 Point를 지금 저장하고, 백그라운드 태스크가 진행 중인 flush까지 끝날 때까지 대기
+
+        writer 스레드는 하나이므로 빈 작업을 뒤에 넣어 앞선 저장이 모두 끝났음을 확인한다.
+        """
+        if self._closing:
+            return
+        while self._queue:
+            await self._flush(self._take())
+        await asyncio.get_running_loop().run_in_executor(self._executor, lambda: None)
+
+    async def close(self, timeout: Optional[float] = None):
+        """
+        남은 Point를 모두 flush한 뒤 종료
+
+        Args:
+            timeout: 드레인 대기 최대 시간 (초), None이면 끝날 때까지 대기
+        """
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Write queue drain timed out, {len(self._queue)} points discarded")
+                self._record_drop(len(self._queue))
+                self._queue.clear()
+        self._executor.shutdown(wait=True)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        writer 통계 조회
+
+        Returns:
+            Dict[str, float]: 큐 깊이, flush 횟수/지연 시간, 배치 크기, 저장/스풀/버린 Point 수
+        """
+        return {
+            "queue_depth": len(self._queue),
+            "flushes": self.flushes,
+            "errors": self.errors,
+            "points_written": self.points_written,
+            "points_dropped": self.points_dropped,
+            "points_spooled": self.points_spooled,
+            "last_batch_size": self.last_batch_size,
+            "flush_last_ms": self.last_flush_ms,
+            "flush_max_ms": self.max_flush_ms,
+            "flush_avg_ms": self._total_flush_ms / self.flushes if self.flushes else 0.0,
+        }
@@ -0,0 +1,441 @@
+"""시간 버킷 정렬 조회 결과 캐시 모듈"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Gauge
+
+from src.storage.base import MetricsStorage, auto_window, parse_duration, parse_time
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+# 조회 레코드 하나의 대략적인 메모리 크기 (dict, datetime, tags 포함, 바이트)
+RECORD_BYTES = 400
+# 열 형식 결과의 점 하나(time int + value) 대략적인 메모리 크기 (바이트)
+COLUMN_POINT_BYTES = 64
+
+
+class QueryCacheInstrumentation:
+    """조회 캐시 적중/미적중/병합 및 메모리 사용량 지표"""
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None):
+        self.registry = registry or CollectorRegistry()
+        registry = self.registry
+
+        self.requests = Counter(
+            "query_cache_requests_total", "Cache lookups by entry kind and result (hit, miss, coalesced)",
+            ["kind", "result"], registry=registry,
+        )
+        self.backend_queries = Counter(
+            "query_cache_backend_queries_total", "Queries sent to the underlying storage",
+            registry=registry,
+        )
+        self.evictions = Counter(
+            "query_cache_evictions_total", "Entries evicted to stay within the memory budget",
+            registry=registry,
+        )
+        self.bytes = Gauge("query_cache_bytes", "Estimated memory used by cached results", registry=registry)
+        self.entries = Gauge("query_cache_entries", "Cached result entries", registry=registry)
+
+
+class CachedStorage(MetricsStorage):
+    """
+    조회 결과 캐시를 붙인 저장소 래퍼
+
+    query_metrics는 조회 구간을 epoch 기준 고정 크기 버킷으로 나눠 버킷별 결과를 캐시한다.
+    "-1h" 같은 상대 구간도 같은 버킷 경계로 정규화되므로 새로 고칠 때마다 바뀌는 것은
+    현재 시각이 들어 있는 마지막 버킷뿐이다.
+
+    - settle보다 오래전에 끝난 버킷은 바뀌지 않는 것으로 보고 만료 없이 캐시 (LRU로만 제거)
+    - 최근 버킷(live)은 tail_ttl 동안만 캐시해 많은 viewer가 같은 꼬리 조회를 나눠 씀
+    - 연속으로 비어 있는 버킷은 한 번의 저장소 조회로 가져와 버킷별로 나눔
+    - 같은 조회가 동시에 들어오면 저장소 조회 하나를 함께 기다림 (single-flight)
+
+    집계 조회(every)는 버킷 크기를 every의 배수로 맞춰 창 경계가 버킷과 어긋나지 않게 하며,
+    구간 시작이 창 중간이면 첫 창은 창 전체의 값을 돌려준다. settle 이후에 늦게 도착한
+    점(spool 재전송 등)은 해당 버킷이 LRU로 밀려날 때까지 보이지 않는다.
+    query_columns는 감싼 저장소의 열 형식 조회를 그대로 쓰고 결과를 구간 단위로 캐시한다.
+    """
+
+    def __init__(
+        self,
+        storage: MetricsStorage,
+        max_bytes: int = 64 * 1024 * 1024,
+        bucket: timedelta = timedelta(minutes=5),
+        max_buckets: int = 64,
+        settle: timedelta = timedelta(minutes=1),
+        tail_ttl: float = 2.0,
+        instrumentation: Optional[QueryCacheInstrumentation] = None,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """
+        Args:
+            storage: 실제 저장소
+            max_bytes: 캐시 메모리 예산 (바이트, 추정치)
+            bucket: 최소 버킷 크기
+            max_buckets: 조회 하나가 나뉘는 최대 버킷 수 (긴 구간은 버킷을 키움)
+            settle: 끝난 뒤 이 시간이 지난 버킷만 불변으로 캐시
+            tail_ttl: 최근 버킷/요약 결과 재사용 시간 (초)
+            instrumentation: 적중률 지표 (None이면 기록하지 않음)
+            now: 현재 시각 함수 (테스트용)
+        """
+        self.storage = storage
+        self.schema = storage.schema
+        self.max_bytes = max_bytes
+        self.bucket = bucket
+        self.max_buckets = max_buckets
+        self.settle = settle
+        self.tail_ttl = timedelta(seconds=tail_ttl)
+        self.instrumentation = instrumentation
+        self._now = now
+
+        # key -> (값, 추정 바이트, 만료 시각 또는 None)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, Optional[datetime]]]" = OrderedDict()
+        self._bytes = 0
+        # key -> [진행 중인 조회 task, 기다리는 요청 수]
+        self._inflight: Dict[Hashable, List] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @classmethod
+    def from_env(
+        cls,
+        storage: MetricsStorage,
+        instrumentation: Optional[QueryCacheInstrumentation] = None,
+    ) -> MetricsStorage:
+        """환경 변수로 캐시 생성 (API_QUERY_CACHE_MB가 0이면 storage를 그대로 반환)"""
+        max_mb = float(os.getenv("API_QUERY_CACHE_MB", "64"))
+        if max_mb <= 0:
+            return storage
+        return cls(
+            storage,
+            max_bytes=int(max_mb * 1024 * 1024),
+            bucket=parse_duration(os.getenv("API_QUERY_CACHE_BUCKET", "5m")),
+            settle=parse_duration(os.getenv("API_QUERY_CACHE_SETTLE", "1m")),
+            tail_ttl=float(os.getenv("API_QUERY_CACHE_TAIL_TTL", "2")),
+            instrumentation=instrumentation,
+        )
+
+    async def write_metrics(self, metrics: Dict[str, Any]) -> int:
+        return await self.storage.write_metrics(metrics)
+
+    async def query_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        버킷 캐시를 거쳐 조회 (결과 형태는 감싼 저장소와 같음)
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            every: 집계 간격 (None이면 원본 점)
+            fn: 집계 함수
+
+        Returns:
+            List[Dict]: 시리즈별 시간순 레코드
+        """
+        now = self._now()
+        start_dt, stop_dt = parse_time(start, now), parse_time(stop, now)
+        if stop_dt <= start_dt:
+            return []
+        step = parse_duration(every) if every else None
+        size = self._bucket_size(start_dt, stop_dt, step)
+        size_us = size // MICROSECOND
+        base_key = ("query", measurement, tuple(sorted((filters or {}).items())), every, fn if every else None, size_us)
+
+        first = self._to_us(start_dt) // size_us
+        last = -(-self._to_us(stop_dt) // size_us)
+        settled = now - self.settle
+
+        # 캐시에 없는 버킷을 (불변 여부가 같은) 연속 구간으로 묶어 한 번에 조회
+        buckets: Dict[int, List[Dict]] = {}
+        pending: List[Tuple[int, int, bool]] = []
+        for index in range(first, last):
+            live = self._bucket_time(index + 1, size_us) > settled
+            cached = self._get(base_key + (index,), "live" if live else "bucket")
+            if cached is not None:
+                buckets[index] = cached
+            elif pending and pending[-1][1] == index and pending[-1][2] == live:
+                pending[-1] = (pending[-1][0], index + 1, live)
+            else:
+                pending.append((index, index + 1, live))
+
+        if pending:
+            fetched = await asyncio.gather(*(
+                self._single_flight(
+                    base_key + (lo, hi, live),
+                    lambda lo=lo, hi=hi, live=live: self._fetch_buckets(
+                        base_key, measurement, filters, every, fn, lo, hi, size_us, live,
+                    ),
+                )
+                for lo, hi, live in pending
+            ))
+            for result in fetched:
+                buckets.update(result)
+
+        # 버킷 순서대로 합친 뒤 시리즈별로 묶고 요청 구간으로 자르기
+        series: Dict[Tuple, List[Dict]] = {}
+        for index in range(first, last):
+            for record in buckets[index]:
+                time = record["time"]
+                if step is None:
+                    if not start_dt <= time < stop_dt:
+                        continue
+                elif not (start_dt < time and time - step < stop_dt):
+                    continue
+                key = (record["measurement"], record["field"], tuple(sorted(record["tags"].items())))
+                series.setdefault(key, []).append(record)
+        return [record for records in series.values() for record in records]
+
+    async def stream_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> AsyncIterator[Dict]:
+        """스트리밍 조회는 캐시하지 않음 (대용량 export가 대시보드 캐시를 밀어내지 않도록)"""
+        async for record in self.storage.stream_metrics(measurement, start, stop, filters, every, fn):
+            yield record
+
+    async def summarize_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        quantile: float = 0.95,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        필드별 통계 캐시 조회
+
+        분위수는 버킷별 결과로 합칠 수 없으므로 구간 전체 결과를 캐시한다 (_range_slot).
+        """
+        start_dt, stop_dt, range_key, expires = self._range_slot(start, stop)
+        key = ("summary", measurement, tuple(sorted((filters or {}).items())), quantile) + range_key
+        cached = self._get(key, "summary")
+        if cached is not None:
+            return cached
+
+        async def fetch():
+            self._count_backend_query()
+            summary = await self.storage.summarize_metrics(
+                measurement, start_dt.isoformat(), stop_dt.isoformat(), filters, quantile,
+            )
+            self._put(key, summary, RECORD_BYTES * (len(summary) + 1), expires)
+            return summary
+
+        return await self._single_flight(key, fetch)
+
+    async def query_columns(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        열 형식 조회 캐시
+
+        감싼 저장소의 query_columns(Flux 테이블/scan 배열에서 바로 만든 열)를 그대로 쓰고,
+        레코드로 풀지 않도록 버킷 대신 summarize_metrics와 같은 구간 단위로 캐시한다.
+        """
+        start_dt, stop_dt, range_key, expires = self._range_slot(start, stop)
+        if stop_dt <= start_dt:
+            return []
+        key = (
+            "columns", measurement, tuple(sorted((filters or {}).items())), every, fn if every else None,
+        ) + range_key
+        cached = self._get(key, "columns")
+        if cached is not None:
+            return cached
+
+        async def fetch():
+            self._count_backend_query()
+            series = await self.storage.query_columns(
+                measurement, start_dt.isoformat(), stop_dt.isoformat(), filters, every, fn,
+            )
+            points = sum(len(item["time"]) for item in series)
+            self._put(key, series, COLUMN_POINT_BYTES * points + RECORD_BYTES * (len(series) + 1), expires)
+            return series
+
+        return await self._single_flight(key, fetch)
+
+    async def close(self):
+        """캐시를 비우고 감싼 저장소 종료"""
+        self._entries.clear()
+        self._bytes = 0
+        await self.storage.close()
+
+    def get_stats(self) -> Dict[str, float]:
+        """캐시 상태 (적중률, 항목 수, 추정 메모리)"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    # ------------------------------------------------------------------ 내부
+
+    def _bucket_size(self, start: datetime, stop: datetime, step: Optional[timedelta]) -> timedelta:
+        """구간 길이에 맞춘 버킷 크기 (집계 조회는 step의 배수)"""
+        size = max(self.bucket, auto_window(start, stop, self.max_buckets))
+        if step:
+            size = -(-size // step) * step
+        return size
+
+    def _range_slot(self, start: str, stop: str) -> Tuple[datetime, datetime, Tuple, Optional[datetime]]:
+        """
+        구간 전체 결과 캐시의 (start, stop, key 접미사, 만료 시각)
+
+        settle 이전에 끝난 구간은 절대 시각으로 만료 없이, 현재 시각이 들어 있는 구간은
+        구간 길이의 1/500(최소 tail_ttl) 간격으로 정렬해 그 간격 동안만 재사용한다.
+        """
+        now = self._now()
+        start_dt, stop_dt = parse_time(start, now), parse_time(stop, now)
+        if stop_dt <= now - self.settle:
+            return start_dt, stop_dt, (start_dt, stop_dt), None
+        resolution = max(auto_window(start_dt, stop_dt, 500), self.tail_ttl)
+        slot = self._to_us(now) // (resolution // MICROSECOND)
+        return start_dt, stop_dt, (start, stop, slot), self._bucket_time(slot + 1, resolution // MICROSECOND)
+
+    async def _fetch_buckets(
+        self,
+        base_key: Tuple,
+        measurement: str,
+        filters: Optional[Dict[str, str]],
+        every: Optional[str],
+        fn: str,
+        lo: int,
+        hi: int,
+        size_us: int,
+        live: bool,
+    ) -> Dict[int, List[Dict]]:
+        """버킷 [lo, hi)를 한 번에 조회해 버킷별로 나눠 캐시"""
+        self._count_backend_query()
+        start, stop = self._bucket_time(lo, size_us), self._bucket_time(hi, size_us)
+        records = await self.storage.query_metrics(
+            measurement, start.isoformat(), stop.isoformat(), filters, every=every, fn=fn,
+        )
+
+        buckets: Dict[int, List[Dict]] = {index: [] for index in range(lo, hi)}
+        for record in records:
+            offset = self._to_us(record["time"])
+            if every:
+                # aggregateWindow의 time은 창의 끝이므로 (start, stop] 버킷에 속함
+                offset -= 1
+            index = min(max(offset // size_us, lo), hi - 1)
+            buckets[index].append(record)
+
+        expires = self._now() + self.tail_ttl if live else None
+        for index, bucket_records in buckets.items():
+            self._put(base_key + (index,), bucket_records, RECORD_BYTES * (len(bucket_records) + 1), expires)
+        return buckets
+
+    async def _single_flight(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        같은 key의 동시 조회를 하나로 합침
+
+        기다리던 요청이 모두 취소되면 저장소 조회도 취소한다.
+        """
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(factory())
+            entry = self._inflight[key] = [task, 0]
+
+            def release(_):
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+
+            task.add_done_callback(release)
+        else:
+            self.coalesced += 1
+            if self.instrumentation is not None:
+                self.instrumentation.requests.labels(kind=key[0], result="coalesced").inc()
+
+        entry[1] += 1
+        try:
+            return await asyncio.shield(entry[0])
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not entry[0].done():
+                entry[0].cancel()
+            raise
+        finally:
+            entry[1] -= 1
+
+    def _get(self, key: Hashable, kind: str) -> Optional[Any]:
+        """캐시 조회 (만료된 항목은 제거)"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= self._now():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        if self.instrumentation is not None:
+            self.instrumentation.requests.labels(kind=kind, result="miss" if entry is None else "hit").inc()
+        return None if entry is None else entry[0]
+
+    def _put(self, key: Hashable, value: Any, nbytes: int, expires: Optional[datetime]):
+        """캐시 저장 후 예산을 넘으면 오래 쓰지 않은 항목부터 제거"""
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, nbytes, expires)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            if self.instrumentation is not None:
+                self.instrumentation.evictions.inc()
+        self._update_gauges()
+
+    def _remove(self, key: Hashable):
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+        self._update_gauges()
+
+    def _update_gauges(self):
+        if self.instrumentation is not None:
+            self.instrumentation.bytes.set(self._bytes)
+            self.instrumentation.entries.set(len(self._entries))
+
+    def _count_backend_query(self):
+        if self.instrumentation is not None:
+            self.instrumentation.backend_queries.inc()
+
+    @staticmethod
+    def _to_us(moment: datetime) -> int:
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return (moment - EPOCH) // MICROSECOND
+
+    @staticmethod
+    def _bucket_time(index: int, size_us: int) -> datetime:
+        return EPOCH + timedelta(microseconds=index * size_us)
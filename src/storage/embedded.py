@@ -0,0 +1,865 @@
+"""로컬 압축 시계열 저장소 모듈 (InfluxDB 대체 내장 백엔드)"""
+import asyncio
+import bisect
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from struct import Struct
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from src.storage.base import (
+    AGGREGATES,
+    MetricsStorage,
+    SummarySketch,
+    default_tags,
+    parse_duration,
+    parse_time,
+)
+from src.storage.batch_writer import BatchWriter
+from src.storage.gorilla import GorillaEncoder, decode
+from src.storage.line_protocol import LineProtocolSerializer
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+SERIES_FILE = "series.jsonl"
+INDEX_FILE = "index.bin"
+WAL_FILE = "head.wal"
+SEGMENT_PREFIX = "chunks-"
+SEGMENT_SUFFIX = ".dat"
+
+# 청크 인덱스 레코드: series_id, segment, offset, length, count, start_ns, end_ns
+INDEX_RECORD = Struct("<IIQIIqq")
+
+# 봉인 전 점 WAL: 파일 머리의 세대 번호 (다시 쓸 때마다 바뀜) + 점 레코드 (series_id, ts_ns, 값)
+WAL_HEADER = Struct("<Q")
+WAL_RECORD = Struct("<Iqd")
+
+# (measurement, ((태그, 값), ...), field)
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...], str]
+
+
+class ChunkRef:
+    """봉인된 청크 위치"""
+
+    __slots__ = ("segment", "offset", "length", "count", "start", "end")
+
+    def __init__(self, segment: int, offset: int, length: int, count: int, start: int, end: int):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.count = count
+        self.start = start
+        self.end = end
+
+
+def aggregate_window(
+    timestamps: List[int],
+    values: List[float],
+    step_ns: int,
+    stop_ns: int,
+    fn: str = "mean",
+) -> Tuple[List[int], List[float]]:
+    """
+    시간순 점을 epoch 기준 step_ns 창으로 집계 (Flux aggregateWindow와 같은 창/시각)
+
+    Args:
+        timestamps: 시간순 타임스탬프 (ns)
+        values: 값 목록
+        step_ns: 창 크기 (ns)
+        stop_ns: 조회 종료 시각 (마지막 창의 시각은 여기서 잘림)
+        fn: 집계 함수 (mean, max, min, last)
+
+    Returns:
+        (창 끝 시각 목록, 집계 값 목록) 튜플 (빈 창은 생략)
+    """
+    window_times: List[int] = []
+    window_values: List[float] = []
+    i, count = 0, len(timestamps)
+    while i < count:
+        window_stop = (timestamps[i] // step_ns + 1) * step_ns
+        j = bisect.bisect_left(timestamps, window_stop, i)
+        window = values[i:j]
+        if fn == "mean":
+            value = sum(window) / len(window)
+        elif fn == "max":
+            value = max(window)
+        elif fn == "min":
+            value = min(window)
+        else:
+            value = window[-1]
+        window_times.append(min(window_stop, stop_ns))
+        window_values.append(value)
+        i = j
+    return window_times, window_values
+
+
+class EmbeddedStorage(MetricsStorage):
+    """
+    외부 서비스 없이 동작하는 로컬 시계열 저장소
+
+    InfluxDB와 같은 measurement/태그/필드 매핑(LineProtocolSerializer.points)으로 숫자 필드마다
+    시리즈를 만들고, 시리즈별 현재 청크를 Gorilla 방식(delta-of-delta 타임스탬프, XOR 값)으로
+    압축한다. chunk_size개가 차면 청크를 세그먼트 파일(chunks-N.dat)에 덧붙이고 고정 크기 인덱스
+    레코드(index.bin)를 기록한다. 조회는 시리즈별 청크 시작/끝 시각 인덱스를 이분 탐색해 겹치는
+    청크만 mmap으로 읽어 복원한다.
+
+    - 정렬된 1초 tick에서 변하지 않는 값은 점 하나당 약 2비트만 차지한다.
+    - 문자열 필드(host_info의 목록 등)는 저장하지 않는다.
+    - write_metrics는 점을 BatchWriter 큐에 넣기만 하고, 청크 추가/봉인/WAL/fsync는 전용 writer
+      스레드가 배치 단위로 수행한다 (정렬된 tick에서 모든 시리즈가 함께 봉인되어도 수집 루프는
+      멈추지 않음). 큐 깊이와 flush 지연 시간은 InfluxDB와 같은 writer 지표로 노출된다.
+    - 봉인 전 점은 배치마다 WAL(head.wal)에 덧붙인다. 쓰는 프로세스가 재시작하면 WAL에서 현재
+      청크를 복구하고, WAL은 봉인된 점이 살아 있는 점보다 많아지면 살아 있는 점만 남겨 다시 쓴다.
+      WAL은 배치마다 flush하고 fsync는 청크 봉인 때 함께 한다 (프로세스 장애 시 아직 큐에 있던
+      flush_interval 이내의 점만 잃음).
+    - read_only 인스턴스(API 서버)는 조회할 때마다 다른 프로세스가 추가한 시리즈/인덱스/WAL을
+      이어서 읽으므로 봉인 전 최신 점도 보인다.
+    - 세그먼트 교체 시 retention보다 오래된 세그먼트를 삭제한다.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        chunk_size: int = None,
+        segment_bytes: int = 64 * 1024 * 1024,
+        retention: timedelta = None,
+        tags: Optional[Dict[str, str]] = None,
+        read_only: bool = False,
+        fsync: bool = True,
+        schema: str = None,
+    ):
+        """
+        Args:
+            path: 저장 디렉터리 (None이면 STORAGE_PATH)
+            chunk_size: 청크당 점 수 (None이면 STORAGE_CHUNK_POINTS)
+            segment_bytes: 세그먼트 파일 교체 크기 (바이트)
+            retention: 보관 기간 (None이면 STORAGE_RETENTION)
+            tags: 모든 시리즈에 붙일 태그 (None이면 default_tags())
+            read_only: 조회 전용 (다른 프로세스가 쓰는 디렉터리 공유)
+            fsync: 청크 봉인 후 fsync 여부
+            schema: 코어별 값 스키마 "wide" 또는 "narrow" (None이면 STORAGE_SCHEMA)
+        """
+        self.path = path or os.getenv("STORAGE_PATH", "./data/metrics")
+        self.chunk_size = chunk_size or int(os.getenv("STORAGE_CHUNK_POINTS", "720"))
+        self.segment_bytes = segment_bytes
+        self.retention = retention or parse_duration(os.getenv("STORAGE_RETENTION", "14d"))
+        self.read_only = read_only
+        self.fsync = fsync
+        self.tags = default_tags() if tags is None else dict(tags)
+        self.schema = schema or os.getenv("STORAGE_SCHEMA", "wide")
+        self.serializer = LineProtocolSerializer(tags=self.tags, schema=self.schema)
+        self._lock = threading.RLock()
+
+        self._series: Dict[SeriesKey, int] = {}
+        self._series_keys: List[SeriesKey] = []
+        self._chunks: Dict[int, List[ChunkRef]] = {}
+        self._chunk_ends: Dict[int, List[int]] = {}
+        self._active: Dict[int, GorillaEncoder] = {}
+        self._active_points = 0
+        # read_only: 다른 프로세스 WAL에서 읽은 봉인 전 점 (series_id -> (타임스탬프, 값))
+        self._tail: Dict[int, Tuple[List[int], List[float]]] = {}
+        self._maps: Dict[int, Tuple[Any, mmap.mmap]] = {}
+
+        self._series_pos = 0
+        self._index_pos = 0
+        self._index_inode = None
+        self._segment = 0
+        self._segment_file = None
+        self._series_file = None
+        self._index_file = None
+        self._wal_file = None
+        self._wal_records = 0
+        self._wal_generation = None
+        self._wal_pos = 0
+
+        self.points_written = 0
+        self.chunks_sealed = 0
+
+        # 청크 추가/봉인/WAL/fsync는 전용 writer 스레드에서 수행 (수집 루프는 큐에 넣기만 함)
+        self.writer: Optional[BatchWriter] = None
+        if not read_only:
+            self.writer = BatchWriter(
+                self._write_records,
+                batch_size=int(os.getenv("STORAGE_BATCH_SIZE", "5000")),
+                flush_interval=float(os.getenv("STORAGE_FLUSH_INTERVAL", "1")),
+                max_queue=int(os.getenv("STORAGE_QUEUE_SIZE", "100000")),
+                thread_name="embedded-writer",
+            )
+
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+        if not read_only:
+            self._open_for_write()
+
+    # ------------------------------------------------------------------ 쓰기
+
+    async def write_metrics(self, metrics: Dict[str, Any]) -> int:
+        """
+        샘플의 숫자 필드를 쓰기 큐에 추가 (청크 추가/봉인/WAL/fsync는 writer 스레드가 수행)
+
+        Args:
+            metrics: collect_all_metrics 결과
+
+        Returns:
+            int: 큐에 추가한 Point(measurement 행) 수
+        """
+        if self.read_only:
+            raise RuntimeError("EmbeddedStorage opened read-only")
+
+        ts = self.serializer.timestamp(metrics.get("timestamp") or datetime.utcnow())
+        points = 0
+        records: List[Tuple[SeriesKey, int, float]] = []
+        for measurement, tags, fields in self.serializer.points(metrics):
+            merged = dict(self.tags)
+            merged.update(tags)
+            tag_key = tuple(sorted((k, str(v)) for k, v in merged.items() if v is not None))
+            count = len(records)
+            for field, value in fields.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                value = float(value)
+                if math.isfinite(value):
+                    records.append(((measurement, tag_key, field), ts, value))
+            points += len(records) > count
+
+        self.writer.submit(records)
+        self.points_written += points
+        return points
+
+    def _write_records(self, records: List[Tuple[SeriesKey, int, float]]):
+        """
+        점 레코드를 시리즈별 현재 청크에 추가 (writer 스레드에서 호출)
+
+        청크가 차면 봉인하고 fsync하며, 봉인 전 점은 WAL에 덧붙인다.
+        """
+        sealed = False
+        wal: List[bytes] = []
+
+        with self._lock:
+            for key, ts, value in records:
+                sid = self._series_id(key)
+                encoder = self._active.get(sid)
+                if encoder is None:
+                    encoder = self._active[sid] = GorillaEncoder()
+                elif encoder.timestamps[-1] > ts:
+                    # 시계가 뒤로 간 경우 새 청크에서 다시 시작
+                    self._seal(sid)
+                    encoder = self._active[sid] = GorillaEncoder()
+                encoder.append(ts, value)
+                self._active_points += 1
+                wal.append(WAL_RECORD.pack(sid, ts, value))
+                if len(encoder) >= self.chunk_size:
+                    self._seal(sid)
+                    sealed = True
+
+            if sealed:
+                self._sync()
+            if wal:
+                self._wal_file.write(b"".join(wal))
+                self._wal_file.flush()
+                self._wal_records += len(wal)
+                if self._wal_records > max(2 * self._active_points, self.chunk_size):
+                    self._rewrite_wal()
+
+    def _series_id(self, key: SeriesKey) -> int:
+        """시리즈 번호 조회 (처음 보는 시리즈는 series.jsonl에 추가)"""
+        sid = self._series.get(key)
+        if sid is None:
+            sid = len(self._series_keys)
+            self._series[key] = sid
+            self._series_keys.append(key)
+            measurement, tags, field = key
+            self._series_file.write(json.dumps([sid, measurement, [list(tag) for tag in tags], field]) + "\n")
+            self._series_file.flush()
+        return sid
+
+    def _seal(self, sid: int):
+        """현재 청크를 세그먼트 파일에 기록하고 인덱스 레코드 추가"""
+        encoder = self._active.pop(sid, None)
+        if encoder is None or not len(encoder):
+            return
+        self._active_points -= len(encoder)
+
+        if self._segment_file.tell() >= self.segment_bytes:
+            self._rotate()
+
+        blob = encoder.to_bytes()
+        offset = self._segment_file.tell()
+        self._segment_file.write(blob)
+        chunk = ChunkRef(self._segment, offset, len(blob), len(encoder), encoder.timestamps[0], encoder.timestamps[-1])
+        self._index_file.write(INDEX_RECORD.pack(
+            sid, chunk.segment, chunk.offset, chunk.length, chunk.count, chunk.start, chunk.end
+        ))
+        self._add_chunk(sid, chunk)
+        self.chunks_sealed += 1
+
+    def _sync(self):
+        """세그먼트/인덱스/WAL 파일 flush (fsync는 봉인이 있었던 tick당 한 번)"""
+        for f in (self._segment_file, self._index_file, self._wal_file):
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _rotate(self):
+        """새 세그먼트 파일로 교체하고 보관 기간이 지난 세그먼트 삭제"""
+        self._sync()
+        self._segment_file.close()
+        self._segment += 1
+        self._segment_file = open(self._segment_path(self._segment), "ab")
+        self._apply_retention()
+
+    def _apply_retention(self):
+        """retention보다 오래된 청크만 담은 세그먼트를 삭제하고 인덱스를 다시 씀"""
+        cutoff = int((datetime.now(timezone.utc) - EPOCH - self.retention) / timedelta(microseconds=1)) * 1000
+        latest_end: Dict[int, int] = {}
+        for chunks in self._chunks.values():
+            for chunk in chunks:
+                latest_end[chunk.segment] = max(latest_end.get(chunk.segment, chunk.end), chunk.end)
+        expired = {segment for segment, end in latest_end.items() if end < cutoff and segment != self._segment}
+        if not expired:
+            return
+
+        records = []
+        for sid, chunks in self._chunks.items():
+            kept = [chunk for chunk in chunks if chunk.segment not in expired]
+            self._chunks[sid] = kept
+            self._chunk_ends[sid] = [chunk.end for chunk in kept]
+            records.extend(
+                INDEX_RECORD.pack(sid, c.segment, c.offset, c.length, c.count, c.start, c.end) for c in kept
+            )
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(records))
+            f.flush()
+            os.fsync(f.fileno())
+        self._index_file.close()
+        os.replace(tmp_path, index_path)
+        self._index_file = open(index_path, "ab")
+
+        for segment in expired:
+            self._unmap(segment)
+            try:
+                os.remove(self._segment_path(segment))
+            except FileNotFoundError:
+                pass
+        logger.info(f"Embedded storage retention removed {len(expired)} segments")
+
+    def _rewrite_wal(self):
+        """현재 청크의 점만 담은 새 세대 WAL로 교체 (봉인된 점 제거)"""
+        wal_path = os.path.join(self.path, WAL_FILE)
+        tmp_path = wal_path + ".tmp"
+        self._wal_generation = time.time_ns()
+        records = [
+            WAL_RECORD.pack(sid, ts, value)
+            for sid, encoder in self._active.items()
+            for ts, value in zip(encoder.timestamps, encoder.values)
+        ]
+        with open(tmp_path, "wb") as f:
+            f.write(WAL_HEADER.pack(self._wal_generation) + b"".join(records))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        if self._wal_file is not None:
+            self._wal_file.close()
+        os.replace(tmp_path, wal_path)
+        self._wal_file = open(wal_path, "ab")
+        self._wal_records = len(records)
+
+    def _read_wal(self) -> List[Tuple[int, int, float]]:
+        """
+        WAL에서 아직 읽지 않은 점 레코드 읽기 (다른 세대로 바뀌었으면 처음부터)
+
+        Returns:
+            List[Tuple[int, int, float]]: (series_id, ts_ns, 값). 세대가 바뀌었으면 self._tail을 비운다.
+        """
+        wal_path = os.path.join(self.path, WAL_FILE)
+        try:
+            f = open(wal_path, "rb")
+        except FileNotFoundError:
+            return []
+        with f:
+            header = f.read(WAL_HEADER.size)
+            if len(header) < WAL_HEADER.size:
+                return []
+            generation = WAL_HEADER.unpack(header)[0]
+            if generation != self._wal_generation:
+                self._wal_generation = generation
+                self._wal_pos = WAL_HEADER.size
+                self._tail.clear()
+            f.seek(self._wal_pos)
+            data = f.read()
+        usable = len(data) - len(data) % WAL_RECORD.size
+        self._wal_pos += usable
+        return list(WAL_RECORD.iter_unpack(data[:usable]))
+
+    def _recover_wal(self):
+        """이전 프로세스의 WAL에서 봉인되지 않은 점을 현재 청크로 복구"""
+        recovered = 0
+        for sid, ts, value in self._read_wal():
+            ends = self._chunk_ends.get(sid)
+            if ends and ts <= ends[-1]:
+                continue
+            encoder = self._active.get(sid)
+            if encoder is None:
+                encoder = self._active[sid] = GorillaEncoder()
+            elif encoder.timestamps[-1] > ts:
+                self._seal(sid)
+                encoder = self._active[sid] = GorillaEncoder()
+            encoder.append(ts, value)
+            self._active_points += 1
+            recovered += 1
+            if len(encoder) >= self.chunk_size:
+                self._seal(sid)
+        self._tail.clear()
+        if recovered:
+            logger.info(f"Embedded storage recovered {recovered} unsealed points from WAL")
+
+    # ------------------------------------------------------------------ 로드
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, f"{SEGMENT_PREFIX}{segment:06d}{SEGMENT_SUFFIX}")
+
+    def _add_chunk(self, sid: int, chunk: ChunkRef):
+        chunks = self._chunks.setdefault(sid, [])
+        ends = self._chunk_ends.setdefault(sid, [])
+        position = bisect.bisect_right(ends, chunk.end)
+        chunks.insert(position, chunk)
+        ends.insert(position, chunk.end)
+
+    def _load(self):
+        """시리즈 목록과 청크 인덱스 읽기 (다른 프로세스가 추가한 부분만 이어서 읽음)"""
+        series_path = os.path.join(self.path, SERIES_FILE)
+        if os.path.exists(series_path):
+            with open(series_path, "rb") as f:
+                f.seek(self._series_pos)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break
+                    self._series_pos += len(raw)
+                    sid, measurement, tags, field = json.loads(raw)
+                    key = (measurement, tuple(tuple(tag) for tag in tags), field)
+                    self._series[key] = sid
+                    while len(self._series_keys) <= sid:
+                        self._series_keys.append(None)
+                    self._series_keys[sid] = key
+
+        if self.read_only:
+            for sid, ts, value in self._read_wal():
+                timestamps, values = self._tail.setdefault(sid, ([], []))
+                timestamps.append(ts)
+                values.append(value)
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        stat = os.stat(index_path)
+        if self._index_inode is not None and (stat.st_ino != self._index_inode or stat.st_size < self._index_pos):
+            # retention으로 인덱스가 다시 쓰였으면 처음부터 읽음
+            self._chunks.clear()
+            self._chunk_ends.clear()
+            self._index_pos = 0
+        self._index_inode = stat.st_ino
+
+        with open(index_path, "rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for sid, segment, offset, length, count, start, end in INDEX_RECORD.iter_unpack(data[:usable]):
+            self._add_chunk(sid, ChunkRef(segment, offset, length, count, start, end))
+            self._segment = max(self._segment, segment)
+        self._index_pos += usable
+
+    def _open_for_write(self):
+        """쓰기용 파일 열기 (잘린 인덱스 레코드 정리 후 새 세그먼트에서 시작)"""
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r+b") as f:
+                f.truncate(self._index_pos)
+        self._series_file = open(os.path.join(self.path, SERIES_FILE), "a")
+        self._index_file = open(index_path, "ab")
+        self._segment += 1
+        self._segment_file = open(self._segment_path(self._segment), "ab")
+        self._recover_wal()
+        self._rewrite_wal()
+        self._sync()
+        self._apply_retention()
+
+    # ------------------------------------------------------------------ 조회
+
+    async def query_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        measurement의 시간 구간 조회 (InfluxDBClient.query_metrics와 같은 레코드 형태)
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간 (-1h 같은 상대 시간 또는 RFC3339)
+            stop: 종료 시간
+            filters: 태그 또는 "_field" 조건
+            every: 집계 간격 (예: "1m", None이면 원본 점)
+            fn: 집계 함수 (mean, max, min, last)
+
+        Returns:
+            List[Dict]: 시리즈별 시간순 time, measurement, field, value, tags 레코드
+        """
+        start_ns, stop_ns, step_ns = self._query_range(start, stop, every, fn)
+        await self.flush()
+        # 청크 복원은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._records, measurement, start_ns, stop_ns, filters, step_ns, fn,
+        )
+
+    async def stream_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> AsyncIterator[Dict]:
+        """
+        시리즈 하나씩 복원해 레코드를 내보냄 (메모리에는 시리즈 하나의 점만 올라감)
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그 또는 "_field" 조건
+            every: 집계 간격 (None이면 원본 점)
+            fn: 집계 함수 (mean, max, min, last)
+
+        Yields:
+            Dict: time, measurement, field, value, tags 레코드
+        """
+        start_ns, stop_ns, step_ns = self._query_range(start, stop, every, fn)
+        await self.flush()
+
+        loop = asyncio.get_running_loop()
+        series = self.scan(measurement, start_ns, stop_ns, filters)
+        while True:
+            item = await loop.run_in_executor(None, next, series, None)
+            if item is None:
+                break
+            key, timestamps, values = item
+            if step_ns:
+                timestamps, values = aggregate_window(timestamps, values, step_ns, stop_ns, fn)
+            for record in self._series_records(measurement, key, timestamps, values):
+                yield record
+
+    async def query_columns(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        시리즈별 열 형식 조회 (scan의 타임스탬프/값 배열을 레코드 dict 없이 그대로 사용)
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그 또는 "_field" 조건
+            every: 집계 간격 (None이면 원본 점)
+            fn: 집계 함수 (mean, max, min, last)
+
+        Returns:
+            List[Dict]: 시리즈마다 field, tags, time(epoch 밀리초), value 배열
+        """
+        start_ns, stop_ns, step_ns = self._query_range(start, stop, every, fn)
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._columns, measurement, start_ns, stop_ns, filters, step_ns, fn,
+        )
+
+    def _columns(
+        self,
+        measurement: str,
+        start_ns: int,
+        stop_ns: int,
+        filters: Optional[Dict[str, str]],
+        step_ns: int,
+        fn: str,
+    ) -> List[Dict]:
+        """scan 결과를 시리즈별 열로 변환"""
+        series = []
+        for key, timestamps, values in self.scan(measurement, start_ns, stop_ns, filters):
+            if step_ns:
+                timestamps, values = aggregate_window(timestamps, values, step_ns, stop_ns, fn)
+            series.append({
+                "field": key[2],
+                "tags": dict(key[1]),
+                "time": [ts // 1_000_000 for ts in timestamps],
+                "value": list(values),
+            })
+        return series
+
+    async def flush(self):
+        """
+        쓰기 큐에 남은 점을 지금 저장 (조회 전에 호출되어 자신이 쓴 점이 결과에 반영됨)
+
+        저장이 끝나면 WAL도 flush되어 있으므로 다른 프로세스의 read_only 인스턴스에서도 보인다.
+        """
+        if self.writer is not None:
+            await self.writer.flush()
+
+    def _query_range(self, start: str, stop: str, every: Optional[str], fn: str) -> Tuple[int, int, int]:
+        """조회 인자를 (start_ns, stop_ns, 집계 창 ns 또는 0)으로 변환"""
+        if every and fn not in AGGREGATES:
+            raise ValueError(f"Unsupported aggregate: {fn}")
+        step_ns = parse_duration(every) // timedelta(microseconds=1) * 1000 if every else 0
+        now = datetime.now(timezone.utc)
+        return self._to_ns(parse_time(start, now)), self._to_ns(parse_time(stop, now)), step_ns
+
+    def _records(
+        self,
+        measurement: str,
+        start_ns: int,
+        stop_ns: int,
+        filters: Optional[Dict[str, str]],
+        step_ns: int = 0,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """scan 결과를 조회 레코드로 변환 (step_ns가 있으면 창별 집계)"""
+        records = []
+        for key, timestamps, values in self.scan(measurement, start_ns, stop_ns, filters):
+            if step_ns:
+                timestamps, values = aggregate_window(timestamps, values, step_ns, stop_ns, fn)
+            records.extend(self._series_records(measurement, key, timestamps, values))
+        return records
+
+    @staticmethod
+    def _series_records(measurement: str, key: SeriesKey, timestamps: List[int], values: List[float]):
+        """시리즈 하나의 점을 조회 레코드로 변환"""
+        field = key[2]
+        tags = dict(key[1])
+        for ts, value in zip(timestamps, values):
+            yield {
+                "time": EPOCH + timedelta(microseconds=ts // 1000),
+                "measurement": measurement,
+                "field": field,
+                "value": value,
+                "tags": tags,
+            }
+
+    async def summarize_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        quantile: float = 0.95,
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        필드별 통계 (조회 레코드를 만들지 않고 청크 값 배열에서 바로 계산, quantile은 t-digest 추정값)
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그 또는 "_field" 조건
+            quantile: 분위수 (0~1)
+
+        Returns:
+            Dict[str, Dict[str, float]]: 필드 -> count, mean, min, max, quantile
+        """
+        if not 0 < quantile < 1:
+            raise ValueError(f"Invalid quantile: {quantile}")
+        now = datetime.now(timezone.utc)
+        start_ns = self._to_ns(parse_time(start, now))
+        stop_ns = self._to_ns(parse_time(stop, now))
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._summary, measurement, start_ns, stop_ns, filters, quantile,
+        )
+
+    def _summary(
+        self,
+        measurement: str,
+        start_ns: int,
+        stop_ns: int,
+        filters: Optional[Dict[str, str]],
+        quantile: float,
+    ) -> Dict[str, Dict[str, float]]:
+        """청크를 읽는 대로 필드별 SummarySketch에 넣어 통계 계산 (원본 값을 모으지 않음)"""
+        sketches: Dict[str, SummarySketch] = {}
+        for key, _, values in self.scan_chunks(measurement, start_ns, stop_ns, filters):
+            sketches.setdefault(key[2], SummarySketch()).add_many(values)
+        return {field: sketch.result(quantile) for field, sketch in sketches.items()}
+
+    def scan(
+        self,
+        measurement: str,
+        start_ns: int,
+        stop_ns: int,
+        filters: Optional[Dict[str, str]] = None,
+    ):
+        """
+        조건에 맞는 시리즈의 [start_ns, stop_ns) 구간 점 조회
+
+        Yields:
+            (시리즈 키, 타임스탬프 목록, 값 목록) 튜플
+        """
+        current = None
+        timestamps: List[int] = []
+        values: List[float] = []
+        for key, chunk_ts, chunk_values in self.scan_chunks(measurement, start_ns, stop_ns, filters):
+            if key != current:
+                if timestamps:
+                    yield current, timestamps, values
+                current, timestamps, values = key, [], []
+            timestamps.extend(chunk_ts)
+            values.extend(chunk_values)
+        if timestamps:
+            yield current, timestamps, values
+
+    def scan_chunks(
+        self,
+        measurement: str,
+        start_ns: int,
+        stop_ns: int,
+        filters: Optional[Dict[str, str]] = None,
+    ):
+        """
+        scan과 같은 점을 청크(봉인 전 점은 한 묶음) 단위로 조회
+
+        시리즈 하나를 통째로 모으지 않으므로 메모리가 청크 크기로 제한된다.
+        같은 시리즈의 청크는 시간 순서로 연달아 나온다.
+
+        Yields:
+            (시리즈 키, 타임스탬프 목록, 값 목록) 튜플 (빈 구간은 건너뜀)
+        """
+        with self._lock:
+            if self.read_only:
+                self._load()
+            selected = [
+                (sid, key) for sid, key in enumerate(self._series_keys)
+                if key is not None and key[0] == measurement and self._matches(key, filters)
+            ]
+
+        for sid, key in selected:
+            with self._lock:
+                chunks = self._chunks.get(sid, [])
+                ends = self._chunk_ends.get(sid, [])
+                first = bisect.bisect_left(ends, start_ns)
+                overlapping = [chunk for chunk in chunks[first:] if chunk.start < stop_ns]
+                # 봉인 전 점은 write_metrics가 덧붙이는 중일 수 있으므로 lock 안에서 복사
+                active = self._active.get(sid)
+                if active is not None:
+                    head_ts, head_values, lo = active.timestamps, active.values, 0
+                else:
+                    head_ts, head_values = self._tail.get(sid, ((), ()))
+                    # WAL에는 이미 봉인된 점도 남아 있을 수 있음
+                    lo = bisect.bisect_right(head_ts, ends[-1]) if ends else 0
+                lo = max(lo, bisect.bisect_left(head_ts, start_ns))
+                hi = bisect.bisect_left(head_ts, stop_ns)
+                head = (head_ts[lo:hi], head_values[lo:hi])
+
+            for chunk in overlapping:
+                chunk_ts, chunk_values = decode(self._read_chunk(chunk))
+                lo = bisect.bisect_left(chunk_ts, start_ns)
+                hi = bisect.bisect_left(chunk_ts, stop_ns)
+                if lo < hi:
+                    yield key, chunk_ts[lo:hi], chunk_values[lo:hi]
+            if head[0]:
+                yield key, list(head[0]), list(head[1])
+
+    @staticmethod
+    def _matches(key: SeriesKey, filters: Optional[Dict[str, str]]) -> bool:
+        if not filters:
+            return True
+        tags = dict(key[1])
+        for name, expected in filters.items():
+            actual = key[2] if name == "_field" else tags.get(name)
+            if actual != expected:
+                return False
+        return True
+
+    @staticmethod
+    def _to_ns(value: datetime) -> int:
+        return (value - EPOCH) // timedelta(microseconds=1) * 1000
+
+    def _read_chunk(self, chunk: ChunkRef) -> bytes:
+        """mmap된 세그먼트에서 청크 바이트 읽기"""
+        with self._lock:
+            mapped = self._maps.get(chunk.segment)
+            if mapped is None or len(mapped[1]) < chunk.offset + chunk.length:
+                self._unmap(chunk.segment)
+                f = open(self._segment_path(chunk.segment), "rb")
+                mapped = (f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+                self._maps[chunk.segment] = mapped
+            return mapped[1][chunk.offset:chunk.offset + chunk.length]
+
+    def _unmap(self, segment: int):
+        mapped = self._maps.pop(segment, None)
+        if mapped is not None:
+            mapped[1].close()
+            mapped[0].close()
+
+    # ------------------------------------------------------------------ 기타
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        저장소 통계 조회
+
+        Returns:
+            Dict[str, float]: 시리즈/청크 수, 디스크 사용량, 저장한 Point 수
+        """
+        with self._lock:
+            chunks = sum(len(chunks) for chunks in self._chunks.values())
+            points = sum(chunk.count for chunks in self._chunks.values() for chunk in chunks)
+        disk_bytes = sum(
+            os.path.getsize(os.path.join(self.path, name)) for name in os.listdir(self.path)
+        )
+        return {
+            "series": len(self._series),
+            "chunks": chunks,
+            "sealed_points": points,
+            "active_points": sum(len(encoder) for encoder in self._active.values()),
+            "disk_bytes": disk_bytes,
+            "bytes_per_point": disk_bytes / points if points else 0.0,
+            "points_written": self.points_written,
+        }
+
+    async def close(self):
+        """쓰기 큐를 비운 뒤 현재 청크를 모두 봉인하고 파일 닫기"""
+        if self.writer is not None:
+            await self.writer.close()
+        await asyncio.get_running_loop().run_in_executor(None, self._close_files)
+        logger.info("Embedded storage closed")
+
+    def _close_files(self):
+        """현재 청크 봉인, WAL 정리, 파일/매핑 닫기"""
+        with self._lock:
+            if not self.read_only:
+                for sid in list(self._active):
+                    self._seal(sid)
+                self._sync()
+                self._rewrite_wal()
+                for f in (self._segment_file, self._index_file, self._series_file, self._wal_file):
+                    f.close()
+            for segment in list(self._maps):
+                self._unmap(segment)
@@ -0,0 +1,38 @@
+"""저장소 백엔드 생성 모듈"""
+import logging
+import os
+
+from src.storage.base import MetricsStorage
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("influxdb", "embedded")
+
+
+def create_storage(backend: str = None, read_only: bool = False) -> MetricsStorage:
+    """
+    설정된 저장소 백엔드 생성
+
+    Args:
+        backend: "influxdb" 또는 "embedded" (None이면 STORAGE_BACKEND)
+        read_only: 조회 전용 여부 (API 서버). embedded 백엔드에서만 의미가 있다.
+
+    Returns:
+        MetricsStorage: 저장소 인스턴스
+
+    Raises:
+        ValueError: 알 수 없는 백엔드인 경우
+    """
+    backend = (backend or os.getenv("STORAGE_BACKEND", "influxdb")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend} (expected one of {', '.join(BACKENDS)})")
+
+    logger.info(f"Using {backend} storage backend")
+    if backend == "embedded":
+        from src.storage.embedded import EmbeddedStorage
+
+        return EmbeddedStorage(read_only=read_only)
+
+    from src.storage.influxdb_client import InfluxDBClient
+
+    return InfluxDBClient()
@@ -0,0 +1,215 @@
+"""Gorilla 방식 시계열 압축 모듈 (delta-of-delta 타임스탬프 + XOR 실수 값)"""
+import struct
+from typing import List, Tuple
+
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+_HEADER = struct.Struct(">I")
+
+# delta-of-delta 구간: (제어 비트, 제어 비트 수, 값 비트 수)
+_DOD_BUCKETS = (
+    (0b10, 2, 7),
+    (0b110, 3, 9),
+    (0b1110, 4, 12),
+)
+
+
+def _float_bits(value: float) -> int:
+    return _UINT64.unpack(_DOUBLE.pack(value))[0]
+
+
+def _bits_float(bits: int) -> float:
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0]
+
+
+class BitWriter:
+    """MSB 우선 비트 스트림 작성기"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._acc = 0
+        self._bits = 0
+
+    @property
+    def bit_length(self) -> int:
+        return len(self.buffer) * 8 + self._bits
+
+    def write(self, value: int, nbits: int):
+        """value의 하위 nbits 비트 기록"""
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._bits += nbits
+        while self._bits >= 8:
+            self._bits -= 8
+            self.buffer.append((self._acc >> self._bits) & 0xFF)
+        self._acc &= (1 << self._bits) - 1
+
+    def getvalue(self) -> bytes:
+        """남은 비트를 0으로 채운 바이트열"""
+        if self._bits:
+            return bytes(self.buffer) + bytes([(self._acc << (8 - self._bits)) & 0xFF])
+        return bytes(self.buffer)
+
+
+class BitReader:
+    """MSB 우선 비트 스트림 판독기"""
+
+    def __init__(self, data: bytes, offset: int = 0):
+        self.data = data
+        self.pos = offset * 8
+
+    def read(self, nbits: int) -> int:
+        start = self.pos >> 3
+        end = (self.pos + nbits + 7) >> 3
+        chunk = int.from_bytes(self.data[start:end], "big")
+        shift = (end - start) * 8 - (self.pos & 7) - nbits
+        self.pos += nbits
+        return (chunk >> shift) & ((1 << nbits) - 1)
+
+
+class GorillaEncoder:
+    """
+    청크 하나를 점진적으로 압축하는 인코더
+
+    - 타임스탬프: 첫 값 64비트, 첫 delta 64비트, 이후 delta-of-delta를 0/7/9/12/64비트 구간으로
+      기록한다. 정렬된 tick(일정 간격)에서는 점 하나당 1비트다.
+    - 값: 직전 값과 XOR한 결과의 의미 있는 비트만 기록한다. 변하지 않은 값은 1비트다.
+
+    타임스탬프는 단조 증가해야 한다. 현재 청크의 원본 값도 함께 보관해 봉인 전 조회에 사용한다.
+    """
+
+    def __init__(self):
+        self.writer = BitWriter()
+        self.timestamps: List[int] = []
+        self.values: List[float] = []
+        self._prev_delta = 0
+        self._prev_bits = 0
+        self._leading = -1
+        self._trailing = 0
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def append(self, timestamp: int, value: float):
+        """
+        점 하나 추가
+
+        Args:
+            timestamp: 정수 타임스탬프 (직전 값 이상)
+            value: 실수 값
+
+        Raises:
+            ValueError: 타임스탬프가 직전 값보다 작은 경우
+        """
+        count = len(self.timestamps)
+        writer = self.writer
+        bits = _float_bits(value)
+
+        if count == 0:
+            writer.write(timestamp, 64)
+            writer.write(bits, 64)
+        else:
+            delta = timestamp - self.timestamps[-1]
+            if delta < 0:
+                raise ValueError("timestamps must be non-decreasing")
+            if count == 1:
+                writer.write(delta, 64)
+            else:
+                self._write_dod(delta - self._prev_delta)
+            self._prev_delta = delta
+            self._write_value(bits)
+
+        self._prev_bits = bits
+        self.timestamps.append(timestamp)
+        self.values.append(value)
+
+    def _write_dod(self, dod: int):
+        writer = self.writer
+        if dod == 0:
+            writer.write(0, 1)
+            return
+        for control, control_bits, value_bits in _DOD_BUCKETS:
+            limit = 1 << (value_bits - 1)
+            if -limit <= dod < limit:
+                writer.write(control, control_bits)
+                writer.write(dod, value_bits)
+                return
+        writer.write(0b1111, 4)
+        writer.write(dod, 64)
+
+    def _write_value(self, bits: int):
+        writer = self.writer
+        xor = bits ^ self._prev_bits
+        if xor == 0:
+            writer.write(0, 1)
+            return
+
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+        if self._leading >= 0 and leading >= self._leading and trailing >= self._trailing:
+            # 직전 의미 비트 구간 재사용
+            writer.write(0b10, 2)
+            writer.write(xor >> self._trailing, 64 - self._leading - self._trailing)
+        else:
+            significant = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            writer.write(significant - 1, 6)
+            writer.write(xor >> trailing, significant)
+            self._leading = leading
+            self._trailing = trailing
+
+    def to_bytes(self) -> bytes:
+        """점 개수 헤더 + 비트 스트림"""
+        return _HEADER.pack(len(self.timestamps)) + self.writer.getvalue()
+
+
+def decode(blob: bytes) -> Tuple[List[int], List[float]]:
+    """
+    GorillaEncoder.to_bytes() 결과 복원
+
+    Args:
+        blob: 압축된 청크
+
+    Returns:
+        (타임스탬프 목록, 값 목록) 튜플
+    """
+    count = _HEADER.unpack_from(blob)[0]
+    timestamps: List[int] = []
+    values: List[float] = []
+    if count == 0:
+        return timestamps, values
+
+    reader = BitReader(blob, _HEADER.size)
+    timestamp = reader.read(64)
+    bits = reader.read(64)
+    timestamps.append(timestamp)
+    values.append(_bits_float(bits))
+
+    delta = 0
+    leading = trailing = 0
+    for i in range(1, count):
+        if i == 1:
+            delta = reader.read(64)
+        elif reader.read(1):
+            for _, control_bits, value_bits in _DOD_BUCKETS:
+                if not reader.read(1):
+                    dod = reader.read(value_bits)
+                    break
+            else:
+                value_bits = 64
+                dod = reader.read(64)
+            if dod >= 1 << (value_bits - 1):
+                dod -= 1 << value_bits
+            delta += dod
+        timestamp += delta
+        timestamps.append(timestamp)
+
+        if reader.read(1):
+            if reader.read(1):
+                leading = reader.read(5)
+                significant = reader.read(6) + 1
+                trailing = 64 - leading - significant
+            bits ^= reader.read(64 - leading - trailing) << trailing
+        values.append(_bits_float(bits))
+
+    return timestamps, values
@@ -1,16 +1,34 @@
 """InfluxDB 클라이언트 모듈"""
+import asyncio
+import csv
+import itertools
 import os
 import logging
-from typing import Dict, Any, List
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime, timezone
 
-from influxdb_client import InfluxDBClient as InfluxClient, Point
+from influxdb_client import InfluxDBClient as InfluxClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 
+try:
+    from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
+except ImportError:  # aiohttp는 선택 의존성 (influxdb-client[async])
+    InfluxDBClientAsync = None
+
+from src.storage.base import AGGREGATES, MetricsStorage, default_tags, parse_duration, parse_time
+from src.storage.batch_writer import BatchWriter
+from src.storage.line_protocol import CORE_MEASUREMENT, STATIC_FIELDS, LineProtocolSerializer, core_field
+from src.storage.spool import SpoolReplayer, WriteSpool
+
 logger = logging.getLogger(__name__)
 
+# 동기 스트리밍 조회에서 조회 스레드가 한 번에 읽는 레코드 수
+STREAM_BATCH_SIZE = 1000
 
-class InfluxDBClient:
+
+class InfluxDBClient(MetricsStorage):
     """InfluxDB 연동 클라이언트"""
 
     def __init__(
@@ -19,52 +37,165 @@ class InfluxDBClient:
         token: str = None,
         org: str = None,
         bucket: str = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+        queue_size: int = None,
+        spool_dir: str = None,
+        precision: str = None,
+        enable_gzip: bool = None,
+        tags: Optional[Dict[str, str]] = None,
+        schema: str = None,
+        query_timeout: float = None,
+        query_pool_size: int = None,
+        stream_timeout: float = None,
     ):
+        """
+        Args:
+            url: InfluxDB 주소
+            token: 인증 토큰
+            org: 조직
+            bucket: 버킷
+            batch_size: 한 번에 쓰는 최대 Point 수 (None이면 INFLUXDB_BATCH_SIZE)
+            flush_interval: Point가 큐에서 기다리는 최대 시간 (초, None이면 INFLUXDB_FLUSH_INTERVAL)
+            queue_size: 쓰기 큐 최대 Point 수 (None이면 INFLUXDB_QUEUE_SIZE)
+            spool_dir: 저장 실패 배치를 보관할 디렉터리 (None이면 INFLUXDB_SPOOL_DIR, 비어 있으면 사용 안 함)
+            precision: 타임스탬프 정밀도 "ns" 또는 "s" (None이면 INFLUXDB_PRECISION)
+            enable_gzip: 쓰기 요청 본문 gzip 압축 여부 (None이면 INFLUXDB_GZIP)
+            tags: 모든 Point에 붙일 태그 (None이면 default_tags())
+            schema: 코어별 값 스키마 "wide" 또는 "narrow" (None이면 STORAGE_SCHEMA)
+            query_timeout: 조회 요청 하나의 최대 시간 (초, None이면 INFLUXDB_QUERY_TIMEOUT)
+            query_pool_size: 동시 조회 연결 수 (None이면 INFLUXDB_QUERY_POOL)
+            stream_timeout: 스트리밍 조회 하나의 최대 시간 (초, None이면 INFLUXDB_STREAM_TIMEOUT)
+        """
         self.url = url or os.getenv("INFLUXDB_URL", "http://localhost:8086")
         self.token = token or os.getenv("INFLUXDB_TOKEN", "")
         self.org = org or os.getenv("INFLUXDB_ORG", "my-org")
         self.bucket = bucket or os.getenv("INFLUXDB_BUCKET", "system-metrics")
 
-        self.client = InfluxClient(url=self.url, token=self.token, org=self.org)
+        self.precision = precision or os.getenv("INFLUXDB_PRECISION", "ns")
+        if enable_gzip is None:
+            enable_gzip = os.getenv("INFLUXDB_GZIP", "false").lower() == "true"
+        self.tags = default_tags() if tags is None else dict(tags)
+        self.schema = schema or os.getenv("STORAGE_SCHEMA", "wide")
+        self.serializer = LineProtocolSerializer(self.precision, tags=self.tags, schema=self.schema)
+        self.write_precision = WritePrecision.S if self.precision == "s" else WritePrecision.NS
+
+        self.client = InfluxClient(url=self.url, token=self.token, org=self.org, enable_gzip=enable_gzip)
         self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
         self.query_api = self.client.query_api()
 
+        # 조회는 이벤트 루프를 막지 않도록 비동기 클라이언트(aiohttp 연결 풀)로 수행.
+        # 비동기 클라이언트는 실행 중인 루프 안에서 처음 조회할 때 생성한다.
+        self.query_timeout = query_timeout or float(os.getenv("INFLUXDB_QUERY_TIMEOUT", "30"))
+        self.query_pool_size = query_pool_size or int(os.getenv("INFLUXDB_QUERY_POOL", "10"))
+        self.stream_timeout = stream_timeout or float(os.getenv("INFLUXDB_STREAM_TIMEOUT", "3600"))
+        self._async_client = None
+        # 스트리밍 조회는 응답 전체 시간 제한이 query_timeout보다 길어야 하므로 별도 클라이언트
+        self._stream_client = None
+        self._query_executor = None
+        if InfluxDBClientAsync is None:
+            # aiohttp가 없으면 크기가 제한된 스레드 풀에서 동기 조회
+            self._query_executor = ThreadPoolExecutor(
+                max_workers=self.query_pool_size, thread_name_prefix="influxdb-query",
+            )
+
+        # 장애 중 저장하지 못한 배치는 디스크 스풀에 보관했다가 복구 후 재전송
+        self.spool = None
+        self.replayer = None
+        spool_dir = spool_dir or os.getenv("INFLUXDB_SPOOL_DIR", "")
+        if spool_dir:
+            self.spool = WriteSpool(
+                spool_dir,
+                max_bytes=int(float(os.getenv("INFLUXDB_SPOOL_MAX_MB", "256")) * 1024 * 1024),
+            )
+            self.replayer = SpoolReplayer(
+                self.spool,
+                self._write_lines,
+                rate=float(os.getenv("INFLUXDB_REPLAY_RATE", "5000")),
+            )
+
+        # 쓰기는 백그라운드 writer가 배치로 수행 (수집 루프는 큐에 넣기만 함)
+        self.writer = BatchWriter(
+            self._write_lines,
+            batch_size=batch_size or int(os.getenv("INFLUXDB_BATCH_SIZE", "5000")),
+            flush_interval=flush_interval or float(os.getenv("INFLUXDB_FLUSH_INTERVAL", "1")),
+            max_queue=queue_size or int(os.getenv("INFLUXDB_QUEUE_SIZE", "100000")),
+            fallback_fn=self.spool.append if self.spool else None,
+        )
+
         logger.info(f"InfluxDB client initialized: {self.url}, bucket: {self.bucket}")
 
-    async def write_metrics(self, metrics: Dict[str, Any]):
+    async def write_metrics(self, metrics: Dict[str, Any]) -> int:
         """
-        메트릭을 InfluxDB에 저장
+        메트릭을 line protocol로 직렬화해 쓰기 큐에 추가 (실제 저장은 백그라운드 writer가 배치로 수행)
 
         Args:
             metrics: 수집된 메트릭 데이터
+
+        Returns:
+            int: 큐에 추가한 Point(줄) 수
         """
-        points = self._convert_to_points(metrics)
-        try:
-            self.write_api.write(bucket=self.bucket, record=points)
-        except Exception as e:
-            logger.error(f"Failed to write metrics to InfluxDB: {e}")
-            raise
+        lines = self.serializer.serialize(metrics)
+        if self.replayer is not None:
+            self.replayer.start()
+        return self.writer.submit(lines)
+
+    def _write_lines(self, lines: List[str]):
+        """line protocol 배치를 요청 본문 그대로 저장 (writer/재전송 스레드에서 호출)"""
+        body = "\n".join(lines).encode()
+        self.write_api.write(bucket=self.bucket, record=body, write_precision=self.write_precision)
 
     def _convert_to_points(self, metrics: Dict[str, Any]) -> List[Point]:
-        """메트릭 데이터를 InfluxDB Point로 변환"""
+        """
+        메트릭 데이터를 InfluxDB Point로 변환
+
+        쓰기 경로는 같은 결과를 내는 LineProtocolSerializer를 사용하며, 이 함수는
+        Point 객체가 필요한 호출자와 직렬화 결과 검증용으로 유지한다.
+        정적 필드(STATIC_FIELDS)는 고빈도 measurement에서 제외하고 host_info에만 기록한다.
+        """
         points = []
         timestamp = metrics.get("timestamp", datetime.utcnow())
 
         # CPU 메트릭
         if "cpu" in metrics:
-            point = Point("cpu").time(timestamp)
+            fields = {}
+            cores: Dict[int, Dict[str, Any]] = {}
             for key, value in metrics["cpu"].items():
+                if key in STATIC_FIELDS:
+                    continue
                 if isinstance(value, (int, float)):
-                    point = point.field(key, value)
+                    fields[key] = value
                 elif isinstance(value, list):
                     for i, v in enumerate(value):
-                        point = point.field(f"{key}_core{i}", v)
-            points.append(point)
+                        if self.schema == "narrow":
+                            cores.setdefault(i, {})[core_field(key)] = v
+                        else:
+                            fields[f"{key}_core{i}"] = v
+            if fields:
+                point = Point("cpu").time(timestamp)
+                for key, value in fields.items():
+                    point = point.field(key, value)
+                points.append(point)
+            # narrow 스키마: 코어별 값은 core 태그가 붙은 별도 measurement
+            for i, core in cores.items():
+                point = Point(CORE_MEASUREMENT).time(timestamp).tag("core", str(i))
+                for key, value in core.items():
+                    point = point.field(key, value)
+                points.append(point)
 
         # 메모리 메트릭
         if "memory" in metrics:
-            point = Point("memory").time(timestamp)
-            for key, value in metrics["memory"].items():
+            fields = {key: value for key, value in metrics["memory"].items() if key not in STATIC_FIELDS}
+            if fields:
+                point = Point("memory").time(timestamp)
+                for key, value in fields.items():
+                    point = point.field(key, value)
+                points.append(point)
+
+        # 정적 호스트 정보 (저빈도)
+        if metrics.get("host_info"):
+            point = Point("host_info").time(timestamp)
+            for key, value in metrics["host_info"].items():
                 point = point.field(key, value)
             points.append(point)
 
@@ -90,6 +221,14 @@ class InfluxDBClient:
                 )
                 points.append(point)
 
+        # 장치별 디스크 I/O 변화율
+        for device in metrics.get("disk_devices", []):
+            point = Point("disk_device").time(timestamp).tag("device", device.get("device", "unknown"))
+            for key, value in device.items():
+                if key != "device":
+                    point = point.field(key, value)
+            points.append(point)
+
         # 네트워크 I/O 메트릭
         if "network_io" in metrics:
             point = Point("network_io").time(timestamp)
@@ -97,6 +236,14 @@ class InfluxDBClient:
                 point = point.field(key, value)
             points.append(point)
 
+        # 인터페이스별 네트워크 I/O 변화율
+        for interface in metrics.get("network_interfaces", []):
+            point = Point("network_interface").time(timestamp).tag("interface", interface.get("interface", "unknown"))
+            for key, value in interface.items():
+                if key != "interface":
+                    point = point.field(key, value)
+            points.append(point)
+
         # 네트워크 연결 메트릭
         if "network_connections" in metrics and metrics["network_connections"]:
             point = Point("network_connections").time(timestamp)
@@ -104,6 +251,11 @@ class InfluxDBClient:
                 point = point.field(key, value)
             points.append(point)
 
+        # 수집기 식별 태그 (host, instance)
+        for point in points:
+            for key, value in self.tags.items():
+                point.tag(key, value)
+
         return points
 
     async def query_metrics(
@@ -112,46 +264,392 @@ class InfluxDBClient:
         start: str = "-1h",
         stop: str = "now()",
         filters: Dict[str, str] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
     ) -> List[Dict]:
         """
         InfluxDB에서 메트릭 조회
 
+        이벤트 루프를 막지 않으며, query_timeout을 넘기거나 호출 task가 취소되면
+        진행 중인 HTTP 요청을 닫아 InfluxDB 쪽 조회도 중단된다.
+        every를 지정하면 aggregateWindow로 InfluxDB 안에서 집계한다.
+
         Args:
             measurement: 측정 이름 (cpu, memory 등)
             start: 시작 시간
             stop: 종료 시간
             filters: 추가 필터
+            every: 집계 간격 (예: "1m", None이면 원본 점)
+            fn: 집계 함수 (mean, max, min, last)
+
+        Returns:
+            조회된 메트릭 데이터 리스트 (tags에는 host, core 같은 태그)
+
+        Raises:
+            asyncio.TimeoutError: query_timeout 안에 끝나지 않은 경우
+        """
+        query = self._metrics_query(measurement, start, stop, filters, every, fn)
+        result = await self._run_query(query, f"{measurement} {start}..{stop}")
+        return [self._to_record(record) for table in result for record in table.records]
+
+    async def stream_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> AsyncIterator[Dict]:
+        """
+        query_metrics와 같은 레코드를 InfluxDB 응답을 읽는 대로 하나씩 내보냄
+
+        결과 전체를 메모리에 올리지 않는다. 소비자가 느리면 응답 읽기도 멈춰 TCP 흐름 제어로
+        InfluxDB까지 backpressure가 전달된다. 응답 시작까지 query_timeout, 전체 스트림에는
+        stream_timeout을 적용하고, 소비자가 중간에 멈추면(aclose/취소) HTTP 응답을 닫는다.
+
+        Raises:
+            asyncio.TimeoutError: 응답이 query_timeout 안에 시작되지 않은 경우
+        """
+        query = self._metrics_query(measurement, start, stop, filters, every, fn)
+        stream = await self._run_query(query, f"stream {measurement} {start}..{stop}", mode="stream")
+
+        if self._query_executor is not None:
+            # 동기 스트림은 조회 스레드에서 STREAM_BATCH_SIZE개씩 읽음.
+            # 취소 시 읽는 중인 스레드와 겹치지 않도록 닫기도 같은 lock 안에서 수행
+            loop = asyncio.get_running_loop()
+            lock = threading.Lock()
+
+            def read_batch():
+                with lock:
+                    return list(itertools.islice(stream, STREAM_BATCH_SIZE))
+
+            def close_stream():
+                with lock:
+                    stream.close()
+
+            try:
+                while True:
+                    batch = await loop.run_in_executor(self._query_executor, read_batch)
+                    if not batch:
+                        break
+                    for record in batch:
+                        yield self._to_record(record)
+            finally:
+                self._query_executor.submit(close_stream)
+            return
+
+        try:
+            async for record in stream:
+                yield self._to_record(record)
+        finally:
+            await stream.aclose()
+
+    async def query_columns(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        every: Optional[str] = None,
+        fn: str = "mean",
+    ) -> List[Dict]:
+        """
+        시리즈별 열 형식 조회
+
+        Flux 테이블 하나가 시리즈 하나이므로 annotated CSV 응답을 FluxRecord로 만들지 않고
+        테이블별 time/value 배열로 바로 모은다. 필요 없는 _start/_stop/_measurement 열은
+        InfluxDB에서 빼서 응답 크기도 줄인다.
 
         Returns:
-            조회된 메트릭 데이터 리스트
+            List[Dict]: 시리즈마다 field, tags, time(epoch 밀리초), value 배열
+
+        Raises:
+            asyncio.TimeoutError: query_timeout 안에 끝나지 않은 경우
+        """
+        query = self._metrics_query(measurement, start, stop, filters, every, fn)
+        query += '\n  |> drop(columns: ["_start", "_stop", "_measurement"])'
+        text = await self._run_query(query, f"columns {measurement} {start}..{stop}", mode="csv")
+        return flux_csv_columns(text)
+
+    async def summarize_metrics(
+        self,
+        measurement: str,
+        start: str = "-1h",
+        stop: str = "now()",
+        filters: Optional[Dict[str, str]] = None,
+        quantile: float = 0.95,
+    ) -> Dict[str, Dict[str, float]]:
         """
+        필드별 통계를 InfluxDB 안에서 계산 (mean, min, max, count, quantile)
+
+        원본 점을 받아오지 않으므로 조회 기간과 무관하게 응답 크기가 필드 수에 비례한다.
+        quantile은 InfluxDB의 t-digest 추정값이다.
+
+        Args:
+            measurement: 측정 이름
+            start: 시작 시간
+            stop: 종료 시간
+            filters: 태그/_field 조건
+            quantile: 분위수 (0~1)
+
+        Returns:
+            Dict[str, Dict[str, float]]: 필드 -> count, mean, min, max, quantile
+
+        Raises:
+            asyncio.TimeoutError: query_timeout 안에 끝나지 않은 경우
+        """
+        if not 0 < quantile < 1:
+            raise ValueError(f"Invalid quantile: {quantile}")
+        source = self._flux_source(measurement, start, stop, filters)
         query = f'''
-        from(bucket: "{self.bucket}")
-          |> range(start: {start}, stop: {stop})
-          |> filter(fn: (r) => r["_measurement"] == "{measurement}")
+        import "types"
+
+        data = {source.strip()}
+          |> filter(fn: (r) => types.isNumeric(v: r._value))
+          |> group(columns: ["_field"])
+
+        data |> count() |> yield(name: "count")
+        data |> mean() |> yield(name: "mean")
+        data |> min() |> yield(name: "min")
+        data |> max() |> yield(name: "max")
+        data |> quantile(q: {float(quantile)}, method: "estimate_tdigest") |> yield(name: "quantile")
         '''
 
+        result = await self._run_query(query, f"summary {measurement} {start}..{stop}")
+        summary: Dict[str, Dict[str, float]] = {}
+        for table in result:
+            for record in table.records:
+                summary.setdefault(record.get_field(), {})[record.values["result"]] = record.get_value()
+        return summary
+
+    def _metrics_query(
+        self,
+        measurement: str,
+        start: str,
+        stop: str,
+        filters: Optional[Dict[str, str]],
+        every: Optional[str],
+        fn: str,
+    ) -> str:
+        """query_metrics/stream_metrics의 Flux 쿼리 (every가 있으면 aggregateWindow)"""
+        query = self._flux_source(measurement, start, stop, filters)
+        if every:
+            if fn not in AGGREGATES:
+                raise ValueError(f"Unsupported aggregate: {fn}")
+            parse_duration(every)  # Flux 쿼리에 넣기 전 형식 검증
+            query += f'\n  |> aggregateWindow(every: {every}, fn: {fn}, createEmpty: false)'
+        return query
+
+    @staticmethod
+    def _to_record(record) -> Dict:
+        """FluxRecord -> time, measurement, field, value, tags 레코드"""
+        return {
+            "time": record.get_time(),
+            "measurement": record.get_measurement(),
+            "field": record.get_field(),
+            "value": record.get_value(),
+            "tags": {
+                key: value for key, value in record.values.items()
+                if not key.startswith("_") and key not in ("result", "table")
+            },
+        }
+
+    def _flux_source(
+        self,
+        measurement: str,
+        start: str,
+        stop: str,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        bucket/range/measurement/필터까지의 Flux 파이프라인
+
+        문자열 값은 flux_string으로 이스케이프하고, range 시각은 Flux 식으로 그대로 들어가므로
+        parse_time으로 형식을 검증한다.
+
+        Raises:
+            ValueError: start/stop이 상대 시간, now(), RFC3339 시각이 아닌 경우
+        """
+        for moment in (start, stop):
+            parse_time(moment)
+        query = f'''
+        from(bucket: {flux_string(self.bucket)})
+          |> range(start: {start}, stop: {stop})
+          |> filter(fn: (r) => r["_measurement"] == {flux_string(measurement)})
+        '''
         if filters:
             for key, value in filters.items():
-                query += f'\n  |> filter(fn: (r) => r["{key}"] == "{value}")'
+                query += f'\n  |> filter(fn: (r) => r[{flux_string(key)}] == {flux_string(value)})'
+        return query
 
+    async def _run_query(self, query: str, label: str, mode: str = "tables"):
+        """query_timeout을 적용해 Flux 조회 실행 (시간 초과/취소/오류 로그)"""
         try:
-            result = self.query_api.query(query=query)
-            records = []
-            for table in result:
-                for record in table.records:
-                    records.append({
-                        "time": record.get_time(),
-                        "measurement": record.get_measurement(),
-                        "field": record.get_field(),
-                        "value": record.get_value(),
-                    })
-            return records
+            return await asyncio.wait_for(self._query(query, mode), self.query_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"InfluxDB query timed out after {self.query_timeout}s: {label}")
+            raise
+        except asyncio.CancelledError:
+            logger.info(f"InfluxDB query cancelled: {label}")
+            raise
         except Exception as e:
             logger.error(f"Failed to query metrics from InfluxDB: {e}")
             raise
 
+    async def _query(self, query: str, mode: str = "tables"):
+        """
+        Flux 조회 실행 (비동기 클라이언트 또는 조회 스레드 풀)
+
+        mode가 "tables"이면 FluxTable 목록, "stream"이면 레코드 스트림(동기 generator 또는
+        async generator), "csv"이면 파싱하지 않은 annotated CSV 문자열을 반환한다.
+        """
+        if self._query_executor is not None:
+            loop = asyncio.get_running_loop()
+            if mode == "csv":
+                return await loop.run_in_executor(self._query_executor, self._query_csv, query)
+            method = self.query_api.query_stream if mode == "stream" else self.query_api.query
+            return await loop.run_in_executor(self._query_executor, method, query)
+
+        if mode == "csv":
+            if self._async_client is None:
+                self._async_client = self._create_async_client(self.query_timeout)
+            return await self._async_client.query_api().query_raw(query)
+
+        if mode == "stream":
+            if self._stream_client is None:
+                self._stream_client = self._create_async_client(self.stream_timeout)
+            return await self._stream_client.query_api().query_stream(query)
+
+        if self._async_client is None:
+            self._async_client = self._create_async_client(self.query_timeout)
+        return await self._async_client.query_api().query(query)
+
+    def _query_csv(self, query: str) -> str:
+        """동기 클라이언트로 annotated CSV 응답 본문 읽기 (조회 스레드에서 실행)"""
+        response = self.query_api.query_raw(query)
+        try:
+            return response.data.decode("utf-8")
+        finally:
+            response.release_conn()
+
+    def _create_async_client(self, timeout: float):
+        return InfluxDBClientAsync(
+            url=self.url,
+            token=self.token,
+            org=self.org,
+            timeout=int(timeout * 1000),
+            connection_pool_maxsize=self.query_pool_size,
+        )
+
     async def close(self):
-        """클라이언트 연결 종료"""
+        """쓰기 큐를 비운 뒤 클라이언트 연결 종료"""
+        await self.writer.close()
+        if self.replayer is not None:
+            await self.replayer.close()
+            self.spool.close()
+        for client in (self._async_client, self._stream_client):
+            if client is not None:
+                await client.close()
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=False, cancel_futures=True)
         self.client.close()
         logger.info("InfluxDB client closed")
+
+
+def flux_string(value: str) -> str:
+    """Flux 문자열 리터럴로 변환 (역슬래시, 따옴표, 보간 기호 이스케이프)"""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("${", "\\${")
+    return f'"{escaped}"'
+
+
+# Flux annotated CSV #datatype -> 값 변환
+_CSV_TYPES = {
+    "double": float,
+    "long": int,
+    "unsignedLong": int,
+    "boolean": lambda text: text == "true",
+}
+
+
+def flux_csv_columns(text: str) -> List[Dict]:
+    """
+    Flux annotated CSV 응답을 시리즈(테이블)별 열로 변환
+
+    빈 줄마다 새 헤더가 시작되고, 같은 result/table 값의 연속된 행이 한 시리즈이다.
+    행마다 dict를 만들지 않고 블록 단위로 행을 열로 전치(zip)한 뒤 테이블 구간을 잘라
+    열 전체에 변환 함수를 map으로 적용한다. _time/_value/_field 외의 "_"로 시작하지 않는
+    열은 태그로 본다.
+
+    Args:
+        text: query_raw 응답 본문 (기본 dialect: #datatype/#group/#default 주석 포함)
+
+    Returns:
+        List[Dict]: 시리즈마다 field, tags, time(epoch 밀리초), value 배열
+
+    Raises:
+        RuntimeError: 응답에 Flux 오류 테이블이 있는 경우
+    """
+    series: List[Dict] = []
+    datatypes: List[str] = []
+    block: List[List[str]] = []
+    for row in itertools.chain(csv.reader(text.splitlines()), [[]]):
+        if not row or not any(row):
+            if block:
+                series.extend(_csv_block_columns(block[0], block[1:], datatypes))
+            block = []
+            continue
+        if row[0].startswith("#"):
+            if row[0] == "#datatype":
+                datatypes = row
+            continue
+        block.append(row)
+    return series
+
+
+def _csv_block_columns(header: List[str], rows: List[List[str]], datatypes: List[str]) -> List[Dict]:
+    """헤더 하나를 공유하는 CSV 블록을 테이블별 열로 변환"""
+    index = {name: i for i, name in enumerate(header)}
+    if not {"_time", "_value", "_field"} <= index.keys():
+        # 응답 도중 실패하면 error 열만 있는 테이블이 온다
+        if "error" in index and rows:
+            raise RuntimeError(f"Flux query failed: {rows[0][index['error']]}")
+        return []
+    if not rows:
+        return []
+
+    columns = list(zip(*rows))
+    value_i = index["_value"]
+    convert = _CSV_TYPES.get(datatypes[value_i] if value_i < len(datatypes) else "", str)
+    tag_columns = [
+        (name, i) for i, name in enumerate(header)
+        if name and not name.startswith("_") and name not in ("result", "table")
+    ]
+    # result/table 열이 같은 연속 구간이 한 테이블 (Flux는 테이블 단위로 행을 내보냄)
+    key_columns = [columns[index[name]] for name in ("result", "table") if name in index]
+    keys = zip(*key_columns) if key_columns else itertools.repeat((), len(rows))
+    times, values, fields = columns[index["_time"]], columns[value_i], columns[index["_field"]]
+
+    result = []
+    offset = 0
+    for _, group in itertools.groupby(keys):
+        end = offset + len(list(group))
+        first = rows[offset]
+        raw = values[offset:end]
+        result.append({
+            "field": fields[offset],
+            "tags": {name: first[i] for name, i in tag_columns if first[i]},
+            "time": list(map(_rfc3339_ms, times[offset:end])),
+            "value": list(map(convert, raw)) if all(raw) else [convert(v) if v else None for v in raw],
+        })
+        offset = end
+    return result
+
+
+def _rfc3339_ms(text: str) -> int:
+    """InfluxDB RFC3339(UTC, 'Z') 시각 -> epoch 밀리초 (초 이하 자릿수는 직접 처리)"""
+    seconds = int(datetime.fromisoformat(text[:19]).replace(tzinfo=timezone.utc).timestamp())
+    if len(text) > 20 and text[19] == ".":
+        fraction = text[20:].rstrip("Z")[:3]
+        return seconds * 1000 + int(fraction.ljust(3, "0"))
+    return seconds * 1000
@@ -0,0 +1,278 @@
+"""수집 샘플 -> InfluxDB line protocol 직접 직렬화 모듈"""
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+
+# influxdb_client.Point와 같은 이스케이프 규칙
+_ESCAPE_MEASUREMENT = str.maketrans({",": r"\,", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"})
+_ESCAPE_KEY = str.maketrans({",": r"\,", "=": r"\=", " ": r"\ ", "\n": r"\n", "\t": r"\t", "\r": r"\r"})
+_ESCAPE_STRING = str.maketrans({'"': r"\"", "\\": r"\\"})
+
+PRECISIONS = {"ns": 1, "s": 10 ** 9}
+
+# 고빈도 measurement에서 제외하고 host_info measurement로만 저장하는 필드
+STATIC_FIELDS = frozenset({
+    "cpu_count_logical",
+    "cpu_count_physical",
+    "cpu_freq_min",
+    "cpu_freq_max",
+    "memory_total",
+    "swap_total",
+})
+
+# 코어별 값 스키마: wide는 cpu measurement의 "<키>_core<N>" 필드,
+# narrow는 core 태그가 붙은 cpu_core measurement의 "<키에서 _per_core를 뺀 이름>" 필드
+SCHEMAS = ("wide", "narrow")
+CORE_MEASUREMENT = "cpu_core"
+
+
+def core_field(key: str) -> str:
+    """narrow 스키마의 코어별 필드 이름 (cpu_percent_per_core -> cpu_percent)"""
+    return key[:-len("_per_core")] if key.endswith("_per_core") else key
+
+
+class LineProtocolSerializer:
+    """
+    _convert_to_points + Point.to_line_protocol()과 같은 결과를 내는 전용 직렬화기
+
+    measurement/태그 접두사, 이스케이프된 필드 키("key="), 코어별 필드 이름과
+    필드 정렬 순서를 한 번만 계산해 캐시하고, 타임스탬프는 샘플당 한 번 정수로 변환한다.
+    """
+
+    def __init__(self, precision: str = "ns", tags: Optional[Dict[str, str]] = None, schema: str = "wide"):
+        """
+        Args:
+            precision: 타임스탬프 정밀도 ("ns" 또는 "s")
+            tags: 모든 줄에 붙일 태그 (host, instance 등)
+            schema: 코어별 값 스키마 ("wide" 또는 "narrow")
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unsupported precision: {precision}")
+        if schema not in SCHEMAS:
+            raise ValueError(f"Unsupported schema: {schema}")
+        self.precision = precision
+        self.schema = schema
+        self._divisor = PRECISIONS[precision]
+        self.tags = tuple((tags or {}).items())
+
+        self._prefixes: Dict[Tuple[str, Tuple], str] = {}
+        self._field_keys: Dict[str, str] = {}
+        self._core_keys: Dict[Tuple[str, int], List[str]] = {}
+        self._core_tags: List[Tuple] = []
+        self._orders: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def points(self, metrics: Dict[str, Any]) -> List[Tuple[str, Tuple, Dict[str, Any]]]:
+        """
+        샘플을 (measurement, 태그, 필드) 목록으로 변환 (InfluxDB와 같은 스키마)
+
+        line protocol 직렬화와 내장 저장소가 같은 measurement/태그/필드 매핑을 공유한다.
+        태그에는 생성자에서 받은 공통 태그가 포함되지 않는다.
+
+        Args:
+            metrics: 수집된 메트릭 데이터
+
+        Returns:
+            List[Tuple[str, Tuple, Dict[str, Any]]]: (measurement, ((태그, 값), ...), 필드) 목록
+        """
+        points: List[Tuple[str, Tuple, Dict[str, Any]]] = []
+
+        # CPU 메트릭 (리스트는 wide면 코어별 필드, narrow면 코어별 cpu_core Point로 펼침)
+        if "cpu" in metrics:
+            fields = {}
+            cores: List[Dict[str, Any]] = []
+            for key, value in metrics["cpu"].items():
+                if key in STATIC_FIELDS:
+                    continue
+                if isinstance(value, (int, float)):
+                    fields[key] = value
+                elif isinstance(value, list):
+                    if self.schema == "narrow":
+                        name = core_field(key)
+                        cores.extend({} for _ in range(len(value) - len(cores)))
+                        for core, v in zip(cores, value):
+                            core[name] = v
+                    else:
+                        for core_key, v in zip(self._per_core_keys(key, len(value)), value):
+                            fields[core_key] = v
+            points.append(("cpu", (), fields))
+            for tags, core in zip(self._core_tag_list(len(cores)), cores):
+                points.append((CORE_MEASUREMENT, tags, core))
+
+        # 메모리 메트릭
+        if "memory" in metrics:
+            fields = {key: value for key, value in metrics["memory"].items() if key not in STATIC_FIELDS}
+            points.append(("memory", (), fields))
+
+        # 정적 호스트 정보
+        if metrics.get("host_info"):
+            points.append(("host_info", (), metrics["host_info"]))
+
+        # 디스크 I/O 메트릭
+        if metrics.get("disk_io"):
+            points.append(("disk_io", (), metrics["disk_io"]))
+
+        # 디스크 사용량 메트릭
+        for disk in metrics.get("disk_usage", []):
+            tags = (("device", disk.get("device", "unknown")), ("mountpoint", disk.get("mountpoint", "unknown")))
+            fields = {
+                "total": disk.get("total", 0),
+                "used": disk.get("used", 0),
+                "free": disk.get("free", 0),
+                "percent": disk.get("percent", 0),
+            }
+            points.append(("disk_usage", tags, fields))
+
+        # 장치별 디스크 I/O 변화율
+        for device in metrics.get("disk_devices", []):
+            fields = {key: value for key, value in device.items() if key != "device"}
+            points.append(("disk_device", (("device", device.get("device", "unknown")),), fields))
+
+        # 네트워크 I/O 메트릭
+        if "network_io" in metrics:
+            points.append(("network_io", (), metrics["network_io"]))
+
+        # 인터페이스별 네트워크 I/O 변화율
+        for interface in metrics.get("network_interfaces", []):
+            fields = {key: value for key, value in interface.items() if key != "interface"}
+            tags = (("interface", interface.get("interface", "unknown")),)
+            points.append(("network_interface", tags, fields))
+
+        # 네트워크 연결 메트릭
+        if metrics.get("network_connections"):
+            points.append(("network_connections", (), metrics["network_connections"]))
+
+        return points
+
+    def serialize(self, metrics: Dict[str, Any]) -> List[str]:
+        """
+        샘플을 line protocol 줄 목록으로 변환
+
+        Args:
+            metrics: 수집된 메트릭 데이터
+
+        Returns:
+            List[str]: line protocol 줄 (필드가 없는 measurement는 제외)
+        """
+        timestamp = metrics.get("timestamp") or datetime.utcnow()
+        suffix = f" {self.timestamp(timestamp)}"
+        lines: List[str] = []
+        for measurement, tags, fields in self.points(metrics):
+            encoded = self._fields(fields)
+            if encoded:
+                lines.append(f"{self._prefix(measurement, tags)}{encoded}{suffix}")
+        return lines
+
+    def encode(self, measurement: str, tags: Dict[str, Any], fields: Dict[str, Any], timestamp: Any) -> Optional[str]:
+        """
+        임의의 measurement/태그/필드를 line protocol 한 줄로 변환 (가져오기 도구 등)
+
+        Args:
+            measurement: measurement 이름
+            tags: 태그 (생성자의 공통 태그와 합쳐짐)
+            fields: 필드
+            timestamp: naive UTC datetime 또는 정수 타임스탬프
+
+        Returns:
+            Optional[str]: line protocol 줄 (기록할 필드가 없으면 None)
+        """
+        encoded = self._fields(fields)
+        if not encoded:
+            return None
+        return f"{self._prefix(measurement, tuple(sorted(tags.items())))}{encoded} {self.timestamp(timestamp)}"
+
+    def to_bytes(self, metrics: Dict[str, Any]) -> bytes:
+        """샘플을 요청 본문용 line protocol 바이트로 변환"""
+        return "\n".join(self.serialize(metrics)).encode()
+
+    def timestamp(self, timestamp: Any) -> int:
+        """naive UTC datetime(또는 정수 타임스탬프)을 precision 단위 정수 타임스탬프로 변환"""
+        if isinstance(timestamp, int):
+            return timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        ns = (timestamp - EPOCH) // timedelta(microseconds=1) * 1000
+        return ns // self._divisor
+
+    def _prefix(self, measurement: str, tags: Tuple) -> str:
+        """이스케이프된 "measurement,tag=value " 접두사 (캐시)"""
+        key = (measurement, tags)
+        prefix = self._prefixes.get(key)
+        if prefix is None:
+            parts = []
+            merged = dict(self.tags)
+            merged.update(tags)
+            for tag_key, tag_value in sorted(merged.items()):
+                if tag_value is None:
+                    continue
+                tag = str(tag_key).translate(_ESCAPE_KEY)
+                value = str(tag_value).translate(_ESCAPE_KEY)
+                if value.endswith("\\"):
+                    value += " "
+                if tag and value:
+                    parts.append(f"{tag}={value}")
+            prefix = measurement.translate(_ESCAPE_MEASUREMENT)
+            prefix = f"{prefix}{',' if parts else ''}{','.join(parts)} "
+            if len(self._prefixes) < 4096:
+                self._prefixes[key] = prefix
+        return prefix
+
+    def _per_core_keys(self, key: str, count: int) -> List[str]:
+        """코어별 필드 이름 목록 (캐시)"""
+        names = self._core_keys.get((key, count))
+        if names is None:
+            names = [f"{key}_core{i}" for i in range(count)]
+            self._core_keys[(key, count)] = names
+        return names
+
+    def _core_tag_list(self, count: int) -> List[Tuple]:
+        """코어 번호 태그 목록 (캐시)"""
+        while len(self._core_tags) < count:
+            self._core_tags.append((("core", str(len(self._core_tags))),))
+        return self._core_tags[:count]
+
+    def _fields(self, fields: Dict[str, Any]) -> str:
+        """필드 키 정렬 순서대로 "key=value,..." 생성"""
+        keys = tuple(fields)
+        order = self._orders.get(keys)
+        if order is None:
+            order = tuple(sorted(keys))
+            if len(self._orders) < 4096:
+                self._orders[keys] = order
+
+        parts = []
+        for key in order:
+            encoded = self._field(key, fields[key])
+            if encoded is not None:
+                parts.append(encoded)
+        return ",".join(parts)
+
+    def _field(self, key: str, value: Any) -> Optional[str]:
+        """필드 하나 인코딩 (None, NaN, inf는 생략)"""
+        prefix = self._field_keys.get(key)
+        if prefix is None:
+            prefix = f"{str(key).translate(_ESCAPE_KEY)}="
+            self._field_keys[key] = prefix
+
+        value_type = type(value)
+        if value_type is float:
+            if not math.isfinite(value):
+                return None
+            text = str(value)
+            if text.endswith(".0"):
+                text = text[:-2]
+            return prefix + text
+        if value_type is int:
+            return f"{prefix}{value}i"
+        if value is None:
+            return None
+        if isinstance(value, bool):
+            return prefix + ("true" if value else "false")
+        if isinstance(value, float):
+            return self._field(key, float(value))
+        if isinstance(value, int):
+            return f"{prefix}{int(value)}i"
+        if isinstance(value, str):
+            return f'{prefix}"{value.translate(_ESCAPE_STRING)}"'
+        raise ValueError(f'Type: "{type(value)}" of field: "{key}" is not supported.')
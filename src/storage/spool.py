@@ -0,0 +1,309 @@
+"""InfluxDB 장애 대비 디스크 스풀 모듈"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".lp"
+
+
+class WriteSpool:
+    """
+    전송하지 못한 배치를 line protocol로 보관하는 append-only 세그먼트 스풀
+
+    directory 아래에 "<순번>.lp" 세그먼트 파일을 만들어 추가만 하고, segment_bytes를 넘으면
+    새 세그먼트로 교체한다. 전체 크기가 max_bytes를 넘으면 가장 오래된 세그먼트부터 삭제한다.
+    fsync는 append마다가 아니라 fsync_interval초마다 한 번 수행한다.
+    각 줄은 명시적 나노초 타임스탬프를 가지므로 같은 줄을 다시 보내도 InfluxDB에서는
+    같은 Point를 덮어쓸 뿐이다 (재전송 멱등성).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 4 * 1024 * 1024,
+        max_bytes: int = 256 * 1024 * 1024,
+        fsync_interval: float = 1.0,
+        clock=time.monotonic,
+    ):
+        """
+        Args:
+            directory: 세그먼트 저장 디렉터리 (재시작 시 남은 세그먼트를 이어서 재전송)
+            segment_bytes: 세그먼트 교체 크기 (바이트)
+            max_bytes: 스풀 최대 크기 (바이트)
+            fsync_interval: fsync 간격 (초)
+            clock: 시계 함수
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        # [순번, 경로, 크기] - 오래된 순
+        self._segments: Deque[List] = deque()
+        self._active = None
+        self._active_seq = 0
+        self._read_offset = 0
+        self._last_fsync = clock()
+
+        self.total_bytes = 0
+        self.appended_lines = 0
+        self.replayed_lines = 0
+        self.replayed_bytes = 0
+        self.evicted_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(SEGMENT_SUFFIX) or not name[:-len(SEGMENT_SUFFIX)].isdigit():
+                continue
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            self._segments.append([int(name[:-len(SEGMENT_SUFFIX)]), path, size])
+            self.total_bytes += size
+        if self._segments:
+            self._active_seq = self._segments[-1][0]
+            logger.info(f"Recovered write spool: {len(self._segments)} segments, {self.total_bytes} bytes pending")
+
+    @property
+    def pending_bytes(self) -> int:
+        """아직 재전송하지 않은 바이트 수"""
+        return self.total_bytes - self._read_offset
+
+    def append(self, lines: Iterable[str]) -> int:
+        """
+        line protocol 줄 추가
+
+        Args:
+            lines: 개행 없는 line protocol 문자열
+
+        Returns:
+            int: 추가한 줄 수
+        """
+        lines = list(lines)
+        if not lines:
+            return 0
+        data = ("\n".join(lines) + "\n").encode()
+
+        with self._lock:
+            if self._active is None or (
+                self._segments[-1][2] > 0 and self._segments[-1][2] + len(data) > self.segment_bytes
+            ):
+                self._rotate()
+            self._active.write(data)
+            self._active.flush()
+            self._segments[-1][2] += len(data)
+            self.total_bytes += len(data)
+            self.appended_lines += len(lines)
+
+            now = self._clock()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._active.fileno())
+                self._last_fsync = now
+
+            self._evict()
+        return len(lines)
+
+    def _rotate(self):
+        """현재 세그먼트를 닫고 새 세그먼트 생성 (lock 보유 상태에서 호출)"""
+        self._seal()
+        self._active_seq += 1
+        path = os.path.join(self.directory, f"{self._active_seq:012d}{SEGMENT_SUFFIX}")
+        self._active = open(path, "ab")
+        self._segments.append([self._active_seq, path, 0])
+
+    def _seal(self):
+        """쓰기 중인 세그먼트 fsync 후 닫기"""
+        if self._active is not None:
+            os.fsync(self._active.fileno())
+            self._active.close()
+            self._active = None
+            self._last_fsync = self._clock()
+
+    def _evict(self):
+        """max_bytes를 넘으면 가장 오래된 세그먼트부터 삭제 (쓰기 중인 세그먼트는 유지)"""
+        while self.total_bytes > self.max_bytes and len(self._segments) > 1:
+            _, path, size = self._segments.popleft()
+            self._remove(path)
+            self.total_bytes -= size
+            self.evicted_bytes += size - self._read_offset
+            logger.warning(f"Write spool over {self.max_bytes} bytes, evicted {size - self._read_offset} oldest bytes")
+            self._read_offset = 0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def read_batch(self, max_lines: int) -> Tuple[List[str], Tuple[int, int]]:
+        """
+        가장 오래된 세그먼트에서 재전송할 줄 읽기
+
+        쓰기 중인 세그먼트를 읽어야 하면 먼저 닫아 새 append와 섞이지 않게 한다.
+
+        Args:
+            max_lines: 최대 줄 수
+
+        Returns:
+            (줄 목록, 커서) 튜플. 전송에 성공하면 커서를 commit()에 넘긴다
+        """
+        with self._lock:
+            if not self._segments or self.pending_bytes <= 0:
+                return [], (0, 0)
+            seq, path, size = self._segments[0]
+            if self._active is not None and seq == self._active_seq:
+                self._seal()
+            offset = self._read_offset
+
+        lines = []
+        consumed = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                consumed += len(raw)
+                line = raw[:-1]
+                if line:
+                    lines.append(line.decode())
+                if len(lines) >= max_lines:
+                    break
+
+        if not lines and offset + consumed < size:
+            # 비정상 종료로 잘린 마지막 줄은 건너뜀
+            logger.warning(f"Skipping {size - offset - consumed} bytes of torn data in {path}")
+            consumed = size - offset
+        return lines, (seq, consumed)
+
+    def commit(self, cursor: Tuple[int, int], lines: int = 0):
+        """
+        재전송 완료 위치 반영 (다 읽은 세그먼트는 삭제)
+
+        Args:
+            cursor: read_batch가 반환한 커서
+            lines: 전송한 줄 수
+        """
+        seq, consumed = cursor
+        with self._lock:
+            if not self._segments or self._segments[0][0] != seq:
+                # 읽는 동안 세그먼트가 삭제(eviction)된 경우
+                return
+            self._read_offset += consumed
+            self.replayed_lines += lines
+            self.replayed_bytes += consumed
+
+            _, path, size = self._segments[0]
+            if self._read_offset >= size and not (self._active is not None and seq == self._active_seq):
+                self._segments.popleft()
+                self._remove(path)
+                self.total_bytes -= size
+                self._read_offset = 0
+
+    def close(self):
+        """쓰기 중인 세그먼트 fsync 후 닫기"""
+        with self._lock:
+            self._seal()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        스풀 통계 조회
+
+        Returns:
+            Dict[str, int]: 남은 바이트/세그먼트 수, 추가/재전송 줄 수, 삭제된 바이트 수
+        """
+        return {
+            "pending_bytes": self.pending_bytes,
+            "segments": len(self._segments),
+            "appended_lines": self.appended_lines,
+            "replayed_lines": self.replayed_lines,
+            "replayed_bytes": self.replayed_bytes,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+
+class SpoolReplayer:
+    """
+    스풀에 쌓인 줄을 오래된 순서로 초당 rate줄 이하로 재전송하는 백그라운드 태스크
+
+    전송이 실패하면 retry_interval초 뒤에 같은 위치부터 다시 시도한다.
+    """
+
+    def __init__(
+        self,
+        spool: WriteSpool,
+        write_fn: Callable[[List[str]], None],
+        rate: float = 5000,
+        batch_size: int = 5000,
+        retry_interval: float = 5.0,
+    ):
+        """
+        Args:
+            spool: 재전송할 스풀
+            write_fn: line protocol 줄 목록을 저장하는 동기 함수
+            rate: 초당 최대 재전송 줄 수 (0이면 제한 없음)
+            batch_size: 한 번에 재전송하는 최대 줄 수
+            retry_interval: 스풀이 비어 있거나 전송이 실패했을 때 대기 시간 (초)
+        """
+        self.spool = spool
+        self.write_fn = write_fn
+        self.rate = rate
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self.failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+        # 재전송한 줄 수 콜백
+        self.on_replay: Optional[Callable[[int], None]] = None
+
+    def start(self):
+        """현재 이벤트 루프에서 재전송 태스크 시작 (이미 실행 중이면 무시)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        replaying = False
+        while True:
+            if self.spool.pending_bytes <= 0:
+                if replaying:
+                    logger.info(f"Write spool replay complete ({self.spool.replayed_lines} lines)")
+                    replaying = False
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            lines, cursor = await loop.run_in_executor(None, self.spool.read_batch, self.batch_size)
+            if lines:
+                try:
+                    await loop.run_in_executor(None, self.write_fn, lines)
+                except Exception as e:
+                    self.failures += 1
+                    logger.debug(f"Spool replay failed, retrying in {self.retry_interval}s: {e}")
+                    await asyncio.sleep(self.retry_interval)
+                    continue
+                if not replaying:
+                    logger.info(f"Replaying write spool ({self.spool.pending_bytes} bytes pending)")
+                    replaying = True
+
+            self.spool.commit(cursor, len(lines))
+            if lines and self.on_replay is not None:
+                self.on_replay(len(lines))
+            if self.rate:
+                await asyncio.sleep(len(lines) / self.rate)
+
+    async def close(self):
+        """재전송 태스크 중지 (남은 줄은 스풀에 유지)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
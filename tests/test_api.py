@@ -1,7 +1,19 @@
 """API 엔드포인트 테스트"""
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import httpx
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from src.api import formats
 from src.api.main import app
+from src.api.routes import metrics as metrics_routes
+from src.api.routes.metrics import get_db_client
+from src.storage.base import MetricsStorage
+from src.storage.embedded import EmbeddedStorage
 
 client = TestClient(app)
 
@@ -66,3 +78,228 @@ class TestMetricsHistory:
         """통계 요약 조회 시 metric 파라미터 필수 테스트"""
         response = client.get("/api/v1/metrics/summary")
         assert response.status_code == 422  # Validation error
+
+
+class SlowStorage(MetricsStorage):
+    """조회마다 delay초 걸리는 테스트용 저장소"""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.cancelled = 0
+
+    async def write_metrics(self, metrics):
+        return 0
+
+    async def query_metrics(self, measurement, start="-1h", stop="now()", filters=None, every=None, fn="mean"):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return [{"time": "2024-01-01T00:00:00Z", "measurement": measurement, "field": "v", "value": 1.0, "tags": {}}]
+
+
+class TestAsyncQueries:
+    """저장소 조회가 이벤트 루프를 막지 않는지 테스트"""
+
+    @pytest.fixture
+    def use_storage(self):
+        def install(storage):
+            app.dependency_overrides[get_db_client] = lambda: storage
+            return storage
+        yield install
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_do_not_block(self, use_storage):
+        """느린 조회 여러 개가 동시에 진행되고 /health가 바로 응답하는지 테스트"""
+        use_storage(SlowStorage(delay=0.3))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as http:
+            start = time.perf_counter()
+            queries = [
+                asyncio.ensure_future(http.get("/api/v1/metrics/summary", params={"metric": "cpu"}))
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0.05)
+            health = await http.get("/health")
+            health_elapsed = time.perf_counter() - start
+            responses = await asyncio.gather(*queries)
+            elapsed = time.perf_counter() - start
+
+        assert health.status_code == 200 and health_elapsed < 0.25
+        assert [r.status_code for r in responses] == [200] * 5
+        assert elapsed < 0.9
+
+    def test_history_pushes_window_to_storage(self, use_storage):
+        """/history가 interval(생략 시 자동 간격)과 집계 함수를 저장소에 넘기는지 테스트"""
+        storage = use_storage(SlowStorage())
+        calls = []
+        query_metrics = storage.query_metrics
+
+        async def record_call(measurement, start="-1h", stop="now()", filters=None, every=None, fn="mean"):
+            calls.append((start, every, fn))
+            return await query_metrics(measurement, start, stop, filters, every, fn)
+
+        storage.query_metrics = record_call
+        response = client.get("/api/v1/metrics/history", params={"metric": "cpu", "start_time": "-24h"})
+        assert response.status_code == 200
+        assert response.json()["interval"] == "2m"
+        response = client.get(
+            "/api/v1/metrics/history", params={"metric": "cpu", "interval": "5m", "fn": "max", "max_points": 500},
+        )
+        assert response.json()["interval"] == "5m"
+        assert calls == [("-24h", "2m", "mean"), ("-1h", "5m", "max")]
+
+        assert client.get("/api/v1/metrics/history", params={"metric": "cpu", "interval": "soon"}).status_code == 400
+        assert client.get("/api/v1/metrics/history", params={"metric": "cpu", "fn": "median"}).status_code == 422
+
+    def test_summary_per_field(self, use_storage):
+        """/summary가 저장소의 필드별 통계를 필드마다 돌려주고 field 선택을 넘기는지 테스트"""
+        storage = use_storage(SlowStorage())
+        calls = []
+
+        async def summarize_metrics(measurement, start="-1h", stop="now()", filters=None, quantile=0.95):
+            calls.append(filters)
+            stats = {"count": 10, "mean": 2.5, "min": 1.0, "max": 4.0, "quantile": 3.9}
+            return {"user": stats, "system": stats} if filters is None else {filters["_field"]: stats}
+
+        storage.summarize_metrics = summarize_metrics
+        body = client.get("/api/v1/metrics/summary", params={"metric": "cpu", "period": "-30d"}).json()
+        assert list(body["summary"]) == ["system", "user"]
+        assert body["summary"]["user"] == {"count": 10, "avg": 2.5, "min": 1.0, "max": 4.0, "p95": 3.9}
+
+        body = client.get("/api/v1/metrics/summary", params={"metric": "cpu", "field": "user"}).json()
+        assert list(body["summary"]) == ["user"]
+        assert calls == [None, {"_field": "user"}]
+
+    @pytest.mark.asyncio
+    async def test_history_ndjson_stream(self, use_storage, tmp_path):
+        """Accept: application/x-ndjson이면 레코드를 한 줄씩 스트리밍하고 max_points를 적용하지 않는지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=8, tags={"host": "h1"}, fsync=False)
+        for second in range(30):
+            await storage.write_metrics({"timestamp": datetime(2024, 1, 1, 0, 0, second), "memory": {"memory_percent": second}})
+        use_storage(storage)
+        params = {"metric": "memory", "start_time": "2024-01-01T00:00:00Z", "end_time": "2024-01-01T00:01:00Z"}
+        headers = {"Accept": "application/x-ndjson"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as http:
+            response = await http.get("/api/v1/metrics/history", params={**params, "max_points": 5}, headers=headers)
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.text.splitlines()]
+            assert [line["value"] for line in lines] == list(range(30))
+            assert lines[0]["time"] == "2024-01-01T00:00:00+00:00" and lines[0]["tags"] == {"host": "h1"}
+
+            response = await http.get(
+                "/api/v1/metrics/history", params={**params, "interval": "10s", "fn": "max"}, headers=headers,
+            )
+            assert response.headers["x-metrics-interval"] == "10s"
+            assert [json.loads(line)["value"] for line in response.text.splitlines()] == [9, 19, 29]
+        await storage.close()
+
+    def test_history_stream_errors(self, use_storage):
+        """첫 레코드 전 오류는 상태 코드로, 스트리밍 중 오류는 마지막 error 줄로 알리는지 테스트"""
+        headers = {"Accept": "application/x-ndjson"}
+        use_storage(SlowStorage(error=asyncio.TimeoutError()))
+        assert client.get("/api/v1/metrics/history", params={"metric": "cpu"}, headers=headers).status_code == 504
+
+        class BrokenStream(SlowStorage):
+            async def stream_metrics(self, measurement, start="-1h", stop="now()", filters=None, every=None, fn="mean"):
+                yield {"time": "2024-01-01T00:00:00Z", "measurement": measurement, "field": "v", "value": 1.0, "tags": {}}
+                raise ConnectionError("connection reset")
+
+        use_storage(BrokenStream())
+        response = client.get("/api/v1/metrics/history", params={"metric": "cpu"}, headers=headers)
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0]["value"] == 1.0
+        assert lines[-1] == {"error": "Failed to query metrics: connection reset"}
+
+    @pytest.mark.asyncio
+    async def test_history_columnar(self, use_storage, tmp_path):
+        """열 형식 JSON이 시리즈별 time(epoch 밀리초)/value 배열로 레코드 응답과 같은 값을 주는지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=8, tags={"host": "h1"}, fsync=False)
+        for second in range(30):
+            await storage.write_metrics({
+                "timestamp": datetime(2024, 1, 1, 0, 0, second),
+                "cpu": {"cpu_percent": second, "cpu_count": 4},
+            })
+        use_storage(storage)
+        params = {"metric": "cpu", "start_time": "2024-01-01T00:00:00Z", "end_time": "2024-01-01T00:01:00Z", "interval": "10s"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api") as http:
+            records = (await http.get("/api/v1/metrics/history", params=params)).json()
+            response = await http.get(
+                "/api/v1/metrics/history", params=params,
+                headers={"Accept": "application/json;q=0.5, application/vnd.metrics.columnar+json"},
+            )
+        assert response.headers["content-type"] == "application/vnd.metrics.columnar+json"
+        body = response.json()
+        assert body["interval"] == records["interval"] == "10s" and body["time_unit"] == "ms"
+
+        series = {item["field"]: item for item in body["series"]}
+        assert series["cpu_percent"]["tags"] == {"host": "h1"}
+        assert series["cpu_percent"]["time"] == [1704067210000, 1704067220000, 1704067230000]
+        expected = [r["value"] for r in records["data"] if r["field"] == "cpu_percent"]
+        assert series["cpu_percent"]["value"] == expected == [4.5, 14.5, 24.5]
+        await storage.close()
+
+    def test_history_format_negotiation(self, use_storage, monkeypatch):
+        """Accept q 값으로 형식을 고르고, 인코딩 라이브러리가 없는 형식은 406인지 테스트"""
+        assert formats.negotiate("") == formats.JSON_MEDIA_TYPE
+        assert formats.negotiate("text/html, */*") == formats.JSON_MEDIA_TYPE
+        assert formats.negotiate("application/json;q=0.9, application/x-msgpack") == formats.MSGPACK_MEDIA_TYPE
+        assert formats.negotiate(
+            "application/vnd.apache.arrow.stream;q=0, application/json;q=0.1"
+        ) == formats.JSON_MEDIA_TYPE
+
+        use_storage(SlowStorage())
+        monkeypatch.setattr(formats, "msgpack", None)
+        response = client.get("/api/v1/metrics/history", params={"metric": "cpu"}, headers={"Accept": "application/msgpack"})
+        assert response.status_code == 406
+
+    def test_timeout_returns_504(self, use_storage):
+        """저장소 조회 시간 초과가 504로 응답되는지 테스트"""
+        use_storage(SlowStorage(error=asyncio.TimeoutError()))
+        response = client.get("/api/v1/metrics/history", params={"metric": "cpu"})
+        assert response.status_code == 504
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_cancels_query(self, monkeypatch):
+        """클라이언트 연결이 끊기면 진행 중인 조회를 취소하는지 테스트"""
+        monkeypatch.setattr(metrics_routes, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+        class DisconnectedRequest:
+            url = httpx.URL("http://api/api/v1/metrics/history")
+
+            async def is_disconnected(self):
+                return True
+
+        storage = SlowStorage(delay=5)
+        with pytest.raises(HTTPException) as excinfo:
+            await metrics_routes.run_query(DisconnectedRequest(), storage.query_metrics("cpu"))
+        await asyncio.sleep(0)
+        assert excinfo.value.status_code == 499
+        assert storage.cancelled == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_disconnect_before_first_record(self, monkeypatch):
+        """스트리밍 조회에서 첫 레코드 전에 연결이 끊기면 스트림을 정리하고 499로 응답하는지 테스트"""
+        monkeypatch.setattr(metrics_routes, "DISCONNECT_POLL_INTERVAL", 0.01)
+
+        class DisconnectedRequest:
+            url = httpx.URL("http://api/api/v1/metrics/history")
+
+            async def is_disconnected(self):
+                return True
+
+        storage = SlowStorage(delay=5)
+        with pytest.raises(HTTPException) as excinfo:
+            await metrics_routes.stream_history(DisconnectedRequest(), storage, "cpu", "-1h", "now()", None, "mean")
+        assert excinfo.value.status_code == 499
+        assert storage.cancelled == 1
@@ -1,9 +1,24 @@
 """메트릭 수집기 테스트"""
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
 import pytest
-from src.collector.cpu import get_cpu_metrics, get_cpu_times
+from src.collector import procfs
+from src.alert.alertmanager import AlertManager
+from src.collector.backpressure import BackpressurePolicy, storage_pressure
+from src.collector.buffer import SampleBuffer
+from src.collector.cpu import CPUSampler, get_cpu_metrics, get_cpu_times
 from src.collector.memory import get_memory_metrics
-from src.collector.disk import get_disk_usage, get_disk_io
-from src.collector.network import get_network_io
+from src.collector.disk import get_disk_usage, get_disk_io, get_disk_io_per_device
+from src.collector.emission import EmissionPolicy, thresholds_from_rules
+from src.collector.network import get_network_io, get_network_connections, get_network_io_per_interface
+from src.collector.rates import CounterRates, DeviceFilter
+from src.collector.instrumentation import CollectorInstrumentation
+from src.collector.main import MetricsCollector
+from src.collector.metadata import HostMetadata
+from src.collector.scheduler import CadenceGate, TickScheduler
 
 
 class TestCPUCollector:
@@ -23,6 +38,29 @@ class TestCPUCollector:
         assert "cpu_time_system" in times
         assert isinstance(times["cpu_time_user"], float)
 
+    def test_get_cpu_metrics_does_not_block(self):
+        """CPU 메트릭 수집이 sleep 없이 반환되는지 테스트"""
+        start = time.perf_counter()
+        metrics = get_cpu_metrics()
+        assert time.perf_counter() - start < 0.5
+        assert len(metrics["cpu_percent_per_core"]) == metrics["cpu_count_logical"]
+        for key in ("cpu_user_percent", "cpu_system_percent", "cpu_iowait_percent", "cpu_steal_percent"):
+            assert 0 <= metrics[key] <= 100
+
+    def test_cpu_sampler_delta(self):
+        """cpu_times 델타 기반 사용률 계산 테스트"""
+        Times = namedtuple("Times", ["user", "system", "idle", "iowait", "steal", "guest"])
+        sampler = CPUSampler()
+        sampler.update([Times(100, 50, 800, 10, 0, 5), Times(100, 50, 800, 10, 0, 5)])
+        metrics = sampler.update([Times(150, 75, 850, 20, 5, 40), Times(100, 50, 900, 10, 0, 5)])
+
+        # core0: busy 80 / elapsed 140, core1: idle only
+        assert metrics["cpu_percent_per_core"] == [57.1, 0.0]
+        assert metrics["cpu_percent"] == 33.3
+        assert metrics["cpu_user_percent"] == 20.8
+        assert metrics["cpu_iowait_percent"] == 4.2
+        assert metrics["cpu_steal_percent"] == 2.1
+
 
 class TestMemoryCollector:
     """메모리 메트릭 수집 테스트"""
@@ -67,3 +105,462 @@ class TestNetworkCollector:
         assert "network_bytes_sent" in metrics
         assert "network_bytes_recv" in metrics
         assert isinstance(metrics["network_bytes_sent"], int)
+
+
+class FakeClock:
+    """테스트용 가짜 시계"""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float):
+        self.now += delay
+
+
+class TestTickScheduler:
+    """고정 주기 스케줄러 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_aligned_deadlines(self):
+        """tick이 interval 경계에 정렬되는지 테스트"""
+        clock = FakeClock(1000.3)
+        scheduler = TickScheduler(1, clock=clock, sleep=clock.sleep)
+        assert await scheduler.wait_next() == 1001.0
+
+        clock.now += 0.2  # 수집 소요 시간
+        assert await scheduler.wait_next() == 1002.0
+        assert scheduler.missed_ticks == 0
+
+    @pytest.mark.asyncio
+    async def test_missed_ticks_are_skipped(self):
+        """deadline 초과 시 밀린 tick을 건너뛰는지 테스트"""
+        clock = FakeClock(1000.0)
+        scheduler = TickScheduler(1, clock=clock, sleep=clock.sleep)
+        await scheduler.wait_next()
+
+        clock.now += 2.5  # 1001, 1002 deadline 초과
+        assert await scheduler.wait_next() == 1003.0
+        stats = scheduler.get_stats()
+        assert stats["missed_ticks"] == 2
+        assert stats["overruns"] == 1
+
+    def test_cadence_gate(self):
+        """그룹별 수집 주기 판정 테스트"""
+        gate = CadenceGate({"disk_io": 5})
+        due = [t for t in range(1000, 1012) if gate.is_due("disk_io", float(t))]
+        assert due == [1000, 1005, 1010]
+        assert gate.is_due("cpu", 1000.0)
+
+
+class TestConcurrentProbes:
+    """프로브 동시 실행 테스트"""
+
+    @pytest.fixture
+    def collector(self):
+        """테스트용 dry-run 수집기"""
+        collector = MetricsCollector(dry_run=True)
+        yield collector
+        collector.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_probe_marked_stale(self, collector):
+        """타임아웃을 넘긴 프로브가 stale로 표시되는지 테스트"""
+        collector.probes["disk_usage"] = lambda: time.sleep(0.5) or []
+        collector.probe_timeouts["disk_usage"] = 0.05
+
+        start = time.perf_counter()
+        metrics = await collector.collect_all_metrics()
+        assert time.perf_counter() - start < 0.4
+
+        assert metrics["stale"] == ["disk_usage"]
+        assert "disk_usage" not in metrics
+        assert "cpu" in metrics and "memory" in metrics
+        assert collector.probe_stats["disk_usage"]["timeouts"] == 1
+        assert collector.probe_stats["cpu"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_is_omitted(self, collector):
+        """실패한 프로브가 다른 프로브에 영향을 주지 않는지 테스트"""
+        def broken():
+            raise PermissionError("denied")
+
+        collector.probes["network_connections"] = broken
+        metrics = await collector.collect_all_metrics()
+        assert "network_connections" not in metrics
+        assert "stale" not in metrics
+        assert collector.probe_stats["network_connections"]["errors"] == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="procfs backend requires Linux")
+class TestProcfsBackend:
+    """procfs 백엔드 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def restore_backend(self):
+        """테스트 후 psutil 백엔드로 복구"""
+        yield
+        procfs.set_backend("psutil")
+
+    def test_output_shapes_match_psutil(self):
+        """procfs 백엔드 출력 형태가 psutil 경로와 같은지 테스트"""
+        collectors = (get_cpu_metrics, get_cpu_times, get_memory_metrics, get_network_io, get_disk_io)
+        expected = [func() for func in collectors]
+
+        procfs.set_backend("procfs")
+        for func, psutil_result in zip(collectors, expected):
+            result = func()
+            assert result.keys() == psutil_result.keys(), func.__name__
+
+    def test_memory_totals_match_psutil(self):
+        """procfs 메모리 총량이 psutil과 같은지 테스트"""
+        expected = get_memory_metrics()
+        procfs.set_backend("procfs")
+        metrics = get_memory_metrics()
+        assert metrics["memory_total"] == expected["memory_total"]
+        assert metrics["swap_total"] == expected["swap_total"]
+
+    def test_reader_reuses_buffer(self):
+        """버퍼보다 큰 파일을 읽을 때 버퍼가 늘어나는지 테스트"""
+        proc = procfs.ProcFile("/proc/self/status", size=16)
+        try:
+            length = proc.read()
+            assert length > 16
+            assert proc.buffer[:length].startswith(b"Name:")
+            assert proc.read() > 0
+        finally:
+            proc.close()
+
+
+class TestNetworkConnections:
+    """TCP 연결 상태 집계 테스트"""
+
+    def test_get_network_connections(self):
+        """모든 TCP 상태가 집계되는지 테스트"""
+        stats = get_network_connections()
+        assert len(stats) == len(procfs.TCP_STATES)
+        assert "network_conn_established" in stats
+        assert "network_conn_syn_recv" in stats
+        assert all(isinstance(v, int) and v >= 0 for v in stats.values())
+
+    def test_count_tcp_states_from_proc_files(self, tmp_path):
+        """/proc/net/tcp(6) 상태 열 집계 테스트"""
+        net = tmp_path / "net"
+        net.mkdir()
+        (net / "tcp").write_text(
+            "  sl  local_address rem_address   st tx_queue rx_queue\n"
+            "   0: 00000000:07E8 00000000:0000 0A 00000000:00000000\n"
+            "   1: 0100007F:BC8F 0100007F:07E8 01 00000000:00000000\n"
+            "12345: 0100007F:BC90 0100007F:07E8 06 00000000:00000000\n"
+        )
+        (net / "tcp6").write_text(
+            "  sl  local_address                         remote_address                        st\n"
+            "   0: 00000000000000000000000000000000:0050 00000000000000000000000000000000:0000 0A 0\n"
+        )
+        counts = procfs.count_tcp_states(str(tmp_path))
+        assert counts[0x0A] == 2
+        assert counts[0x01] == 1
+        assert counts[0x06] == 1
+
+    def test_count_tcp_states_misaligned_columns(self, tmp_path):
+        """열 폭이 예상과 다르면 상태 열을 직접 파싱하는지 테스트"""
+        net = tmp_path / "net"
+        net.mkdir()
+        # 공백이 두 칸이라 고정 오프셋이 맞지 않고, 주소 안에도 상태 값(01, 0A)이 들어 있음
+        (net / "tcp").write_text(
+            "  sl  local_address rem_address   st tx_queue rx_queue\n"
+            "   0:  0A01000A:0A01  0100007F:07E8 06 00000000:00000000\n"
+            "   1:  0100007F:BC8F  0A00000A:07E8 01 00000000:00000000\n"
+        )
+        counts = procfs.count_tcp_states(str(tmp_path))
+        assert counts[0x06] == 1
+        assert counts[0x01] == 1
+        assert sum(counts) == 2
+
+
+class TestCounterRates:
+    """카운터 변화율 계산 테스트"""
+
+    def test_rates_from_previous_snapshot(self):
+        """이전 스냅샷 대비 변화량 계산 테스트"""
+        rates = CounterRates()
+        assert rates.update("eth0", {"bytes": 1000}, now=10.0) is None
+        deltas, elapsed = rates.update("eth0", {"bytes": 3000}, now=12.0)
+        assert deltas == {"bytes": 2000}
+        assert elapsed == 2.0
+
+    def test_counter_wrap_and_reset(self):
+        """32비트 래핑 보정 및 재설정 처리 테스트"""
+        rates = CounterRates()
+        rates.update("eth0", {"bytes": 2 ** 32 - 100}, now=0.0)
+        deltas, _ = rates.update("eth0", {"bytes": 50}, now=1.0)
+        assert deltas["bytes"] == 150
+
+        rates.update("sda", {"reads": 10 ** 12}, now=0.0)
+        assert rates.update("sda", {"reads": 5}, now=1.0) is None
+        deltas, _ = rates.update("sda", {"reads": 15}, now=2.0)
+        assert deltas["reads"] == 10
+
+    def test_device_filter(self):
+        """가상 장치 제외 패턴 테스트"""
+        device_filter = DeviceFilter(["lo", "veth*", "loop*"])
+        assert device_filter.select(["lo", "eth0", "veth1a2b", "loop0", "sda"]) == ["eth0", "sda"]
+
+    def test_per_device_samplers(self):
+        """인터페이스/장치별 변화율 샘플러 테스트"""
+        get_network_io_per_interface()
+        get_disk_io_per_device()
+        for interface in get_network_io_per_interface():
+            assert "interface" in interface
+            assert interface["bytes_recv_per_sec"] >= 0
+        for device in get_disk_io_per_device():
+            assert "device" in device
+            assert 0 <= device["util_percent"] <= 100
+
+
+class TestHostMetadata:
+    """정적 호스트 메타데이터 캐시 테스트"""
+
+    def test_facts_cached_until_change(self, tmp_path):
+        """변경 신호가 없으면 다시 조회하지 않는지 테스트"""
+        net = tmp_path / "net"
+        (net / "eth0").mkdir(parents=True)
+        clock = FakeClock(0.0)
+        metadata = HostMetadata(revalidate_interval=60, net_class_path=str(net), clock=clock)
+        try:
+            assert metadata.facts["cpu_count_logical"] >= 1
+            assert metadata.interfaces == ["eth0"]
+            version = metadata.version
+
+            clock.now = 10.0
+            assert metadata.check() is False
+            assert metadata.version == version
+
+            # 인터페이스 hotplug
+            (net / "eth1").mkdir()
+            assert metadata.check() is True
+            assert metadata.to_fields()["interfaces"] == "eth0,eth1"
+            assert metadata.version == version + 1
+        finally:
+            metadata.close()
+
+
+class TestSampleBuffer:
+    """컬럼형 링 버퍼 테스트"""
+
+    def test_ring_buffer_window_and_stats(self):
+        """용량 초과 시 오래된 샘플을 덮어쓰고 최근 구간 통계를 계산하는지 테스트"""
+        buffer = SampleBuffer(capacity=4)
+        for second in range(6):
+            buffer.append(second * 10 ** 9, {"cpu.cpu_percent": float(second * 10)})
+
+        assert len(buffer) == 4
+        timestamps, values = buffer.window("cpu.cpu_percent")
+        assert list(timestamps) == [2 * 10 ** 9, 3 * 10 ** 9, 4 * 10 ** 9, 5 * 10 ** 9]
+        assert list(values) == [20.0, 30.0, 40.0, 50.0]
+
+        stats = buffer.stats("cpu.cpu_percent", seconds=1)
+        assert stats == {"count": 2, "min": 40.0, "max": 50.0, "mean": 45.0}
+
+    def test_sample_adapter_round_trip(self):
+        """메트릭 dict 평탄화/복원 어댑터 테스트"""
+        buffer = SampleBuffer(capacity=8)
+        metrics = {
+            "timestamp": datetime(2026, 1, 1, 0, 0, 1),
+            "cpu": {"cpu_percent": 12.5, "cpu_percent_per_core": [10.0, 15.0]},
+            "disk_devices": [{"device": "sda", "util_percent": 3.0}],
+        }
+        buffer.append_sample(metrics)
+        buffer.append_sample({"timestamp": datetime(2026, 1, 1, 0, 0, 2), "cpu": {"cpu_percent": 20.0}})
+
+        assert buffer.to_metrics(offset=1) == metrics
+        latest = buffer.to_metrics()
+        assert latest["cpu"] == {"cpu_percent": 20.0}
+        assert "disk_devices" not in latest
+
+    def test_adapter_keeps_types_and_extras(self):
+        """정수/문자열/stale 값과 컬럼 한도를 넘은 값을 그대로 복원하는지 테스트"""
+        buffer = SampleBuffer(capacity=4, max_columns=3)
+        metrics = {
+            "timestamp": datetime(2026, 1, 1, 0, 0, 1),
+            "network_io": {"bytes_sent": 2 ** 60, "errin": 0},
+            "disk_usage": [{"device": "/dev/sda1", "mountpoint": "/", "fstype": "ext4", "total": 100, "percent": 5.0}],
+            "host_info": {"cpu_count_logical": 8, "interfaces": "eth0,lo"},
+            "stale": ["disk_io"],
+        }
+        buffer.append_sample(metrics)
+
+        assert buffer.columns["network_io.bytes_sent"].typecode == "q"
+        restored = buffer.to_metrics()
+        assert restored == metrics
+        assert isinstance(restored["network_io"]["errin"], int)
+        assert isinstance(restored["disk_usage"][0]["percent"], float)
+
+        # 정수 컬럼에 들어온 실수 값은 형식을 바꾸지 않고 extras로 보관
+        buffer.append_sample({"timestamp": datetime(2026, 1, 1, 0, 0, 2), "network_io": {"bytes_sent": 1.5}})
+        assert buffer.to_metrics()["network_io"] == {"bytes_sent": 1.5}
+        assert buffer.stats("network_io.bytes_sent") == {"count": 1, "min": 2 ** 60, "max": 2 ** 60, "mean": 2.0 ** 60}
+
+    @pytest.mark.asyncio
+    async def test_collector_uses_buffer_as_sample_store(self):
+        """수집 결과가 버퍼에 기록되고 반환 dict와 최근 구간 통계가 버퍼에서 나오는지 테스트"""
+        collector = MetricsCollector(dry_run=True, buffer_capacity=16)
+        try:
+            metrics = await collector.collect_all_metrics(tick_time=1000.0)
+            metrics = await collector.collect_all_metrics(tick_time=1001.0)
+            assert len(collector.buffer) == 2
+            assert metrics == collector.buffer.to_metrics()
+            assert metrics["timestamp"] == datetime(1970, 1, 1, 0, 16, 41)
+
+            stats = collector.recent_stats("cpu.cpu_percent", seconds=60)
+            assert stats["count"] == 2
+            assert stats["min"] <= metrics["cpu"]["cpu_percent"] <= stats["max"]
+            assert collector.recent_stats("cpu.missing")["count"] == 0
+        finally:
+            collector.close()
+
+
+class TestCollectorInstrumentation:
+    """수집기 자체 계측 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_probe_and_collection_metrics(self):
+        """프로브 지연 시간과 수집 시간이 기록되는지 테스트"""
+        collector = MetricsCollector(dry_run=True)
+        try:
+            await collector.collect_all_metrics()
+        finally:
+            collector.close()
+
+        registry = collector.instrumentation.registry
+        assert registry.get_sample_value("collector_probe_duration_seconds_count", {"probe": "cpu"}) == 1
+        assert registry.get_sample_value("collector_collection_duration_seconds_count") == 1
+        assert registry.get_sample_value("collector_samples_total") == 1
+
+    def test_process_metrics_exposed(self):
+        """수집기 RSS/CPU 시간과 tick 지표가 노출되는지 테스트"""
+        instrumentation = CollectorInstrumentation()
+        instrumentation.observe_tick(0.002, missed=3)
+        instrumentation.observe_write(0.01, points=7)
+
+        registry = instrumentation.registry
+        assert registry.get_sample_value("collector_missed_ticks_total") == 3
+        assert registry.get_sample_value("collector_write_batch_points_sum") == 7
+        if sys.platform.startswith("linux"):
+            assert registry.get_sample_value("process_resident_memory_bytes") > 0
+
+
+class TestEmissionPolicy:
+    """데드밴드/적응형 해상도 전송 정책 테스트"""
+
+    def test_deadband_and_heartbeat(self):
+        """데드밴드 이내 변화는 생략하고 heartbeat마다 전송하는지 테스트"""
+        policy = EmissionPolicy(heartbeat=10, adaptive=False)
+        first = policy.filter({"memory": {"memory_percent": 50.0, "swap_used": 0}}, now=0)
+        assert first["memory"] == {"memory_percent": 50.0, "swap_used": 0}
+
+        quiet = policy.filter({"memory": {"memory_percent": 50.2, "swap_used": 0}}, now=1)
+        assert "memory" not in quiet
+
+        moved = policy.filter({"memory": {"memory_percent": 51.0, "swap_used": 0}}, now=2)
+        assert moved["memory"] == {"memory_percent": 51.0}
+
+        heartbeat = policy.filter({"memory": {"memory_percent": 51.0, "swap_used": 0}}, now=10)
+        assert heartbeat["memory"] == {"swap_used": 0}
+        assert policy.compression_ratio == 2.0
+
+    def test_adaptive_backoff(self):
+        """안정 상태에서 샘플링 간격이 늘어나고 변동 시 복귀하는지 테스트"""
+        policy = EmissionPolicy(heartbeat=60, max_interval=8)
+        policy.filter({"disk_io": {"disk_read_count": 1}}, now=0)
+        for now in (1, 3, 7, 15):
+            assert policy.is_due("disk_io", now)
+            policy.filter({"disk_io": {"disk_read_count": 1}}, now=now)
+        assert not policy.is_due("disk_io", 22)
+        assert policy.is_due("disk_io", 23)
+
+        policy.filter({"disk_io": {"disk_read_count": 2}}, now=23)
+        assert policy.is_due("disk_io", 24)
+
+    def test_near_threshold_keeps_full_resolution(self):
+        """알림 임계값 근처에서는 백오프하지 않는지 테스트"""
+        policy = EmissionPolicy(thresholds=thresholds_from_rules(AlertManager().rules))
+        for now in range(5):
+            assert policy.is_due("cpu", now)
+            emitted = policy.filter({"cpu": {"cpu_percent": 79.0}}, now=now)
+            assert emitted["cpu"] == {"cpu_percent": 79.0}
+
+
+class TestBackpressurePolicy:
+    """저장소 부하 기반 우선순위 부하 차단 테스트"""
+
+    def test_levels_with_hysteresis(self):
+        """watermark를 넘으면 단계가 오르고, release 기준 아래에서만 복귀하는지 테스트"""
+        policy = BackpressurePolicy()
+        assert policy.update(0.3) == 0
+        assert policy.update(0.8) == 2
+        assert [policy.stride(g) for g in ("disk_usage", "disk_devices", "network_io")] == [16, 4, 1]
+        assert policy.update(0.95) == 3
+        assert [policy.stride(g) for g in ("disk_usage", "disk_devices", "network_io")] == [64, 16, 4]
+        assert policy.stride("cpu") == 1 and policy.stride("memory") == 1
+
+        assert policy.update(0.85) == 3  # 0.9 * 0.8 = 0.72 미만이어야 복귀
+        assert policy.update(0.65) == 2
+        assert policy.update(0.5) == 1
+        assert policy.update(0.1) == 0
+        assert policy.shed_groups() == []
+        assert policy.transitions == 5
+
+    @pytest.mark.asyncio
+    async def test_collector_sheds_low_priority_groups(self):
+        """차단 중 낮은 우선순위 그룹만 간격 경계에서 수집되고 지표가 기록되는지 테스트"""
+        policy = BackpressurePolicy(priorities={"network_connections": 3})
+        collector = MetricsCollector(dry_run=True, backpressure=policy)
+        for name in collector.probes:
+            collector.probes[name] = lambda: {}
+        try:
+            policy.update(0.6)
+            collected = [
+                "network_connections" in await collector.collect_all_metrics(tick_time=1000.0 + i)
+                for i in range(8)
+            ]
+            cpu = await collector.collect_all_metrics(tick_time=1008.0)
+        finally:
+            collector.close()
+
+        assert collected == [True, False, False, False, True, False, False, False]
+        assert "cpu" in cpu
+        registry = collector.instrumentation.registry
+        assert registry.get_sample_value("collector_backpressure_level") == 1
+        assert registry.get_sample_value("collector_shed_samples_total", {"group": "network_connections"}) == 6
+
+    @pytest.mark.asyncio
+    async def test_shed_stride_uses_group_cadence(self):
+        """주기가 있는 그룹(disk_usage 30초)은 그 주기의 stride배 간격으로 수집되고 생략 수가 기록되는지 테스트"""
+        policy = BackpressurePolicy()
+        collector = MetricsCollector(dry_run=True, backpressure=policy)
+        for name in collector.probes:
+            collector.probes[name] = lambda: {}
+        try:
+            policy.update(0.6)
+            assert policy.stride("disk_usage") == 4
+            collected = [
+                tick for tick in range(1200, 1440, 5)
+                if "disk_usage" in await collector.collect_all_metrics(tick_time=float(tick))
+            ]
+        finally:
+            collector.close()
+
+        # 30초 주기 x 4 = 120초마다, 생략된 주기 슬롯 6개 (1230, 1260, 1290, 1350, 1380, 1410)
+        assert collected == [1200, 1320]
+        assert policy.get_stats()["shed_samples"]["disk_usage"] == 6
+
+    def test_storage_pressure(self):
+        """쓰기 큐와 스풀 사용률 중 큰 값을 부하로 쓰는지 테스트"""
+        writer = namedtuple("Writer", "depth max_queue")(250, 1000)
+        spool = namedtuple("Spool", "pending_bytes max_bytes")(600, 1000)
+        storage = namedtuple("Storage", "writer spool")(writer, spool)
+        assert storage_pressure(storage) == 0.6
+        assert storage_pressure(None) == 0.0
@@ -0,0 +1,175 @@
+"""과거 데이터 일괄 가져오기 테스트"""
+import gzip
+import json
+import os
+from datetime import datetime
+
+import httpx
+import pytest
+
+from src.collector.buffer import flatten_sample
+from src.importer import main as importer
+from src.importer.checkpoint import ImportCheckpoint
+from src.importer.formats import RecordConverter, detect_format, parse_timestamp
+
+
+def make_sample():
+    """가져오기 테스트용 수집 샘플"""
+    return {
+        "timestamp": datetime(2024, 1, 1, 0, 0, 1),
+        "cpu": {"cpu_percent": 12.5, "cpu_percent_per_core": [10.0, 15.0]},
+        "memory": {"memory_percent": 40.0},
+        "disk_devices": [{"device": "sda", "util_percent": 3.0}],
+    }
+
+
+class TestImportFormats:
+    """입력 형식 판별/변환 테스트"""
+
+    def test_detect_and_timestamp(self):
+        """확장자 판별과 타임스탬프 단위 추정"""
+        assert detect_format("export/host.csv.gz") == "csv"
+        assert detect_format("dump.lp") == "lp"
+        assert detect_format("telegraf.ndjson") == "jsonl"
+        with pytest.raises(ValueError):
+            detect_format("data.parquet")
+
+        ns = 1704067201 * 10**9
+        assert parse_timestamp(1704067201) == ns
+        assert parse_timestamp("1704067201000") == ns
+        assert parse_timestamp(1704067201000000) == ns
+        assert parse_timestamp(ns) == ns
+        assert parse_timestamp("2024-01-01T00:00:01Z") == ns
+        assert parse_timestamp("2024-01-01T09:00:01+09:00") == ns
+
+    def test_convert_records(self):
+        """CSV(SampleBuffer 컬럼)/Telegraf JSON/line protocol 레코드 변환"""
+        sample = make_sample()
+        values = flatten_sample(sample)
+        header = ["timestamp"] + list(values)
+        row = "2024-01-01T00:00:01Z," + ",".join(str(v) for v in values.values())
+
+        converter = RecordConverter("csv", header=header, tags={"host": "old-01"})
+        lines = converter.convert(row.encode())
+        assert lines == converter.serializer.serialize({**sample, "timestamp": 1704067201 * 10**9})
+        assert any(line.startswith("cpu,host=old-01 ") and "cpu_percent_per_core_core1=15 " in line for line in lines)
+        assert any(line.startswith("disk_device,device=sda,host=old-01 ") for line in lines)
+        with pytest.raises(ValueError):
+            converter.convert(b"2024-01-01T00:00:01Z,1")
+
+        converter = RecordConverter("jsonl", tags={"host": "old-01"})
+        record = {"name": "mem", "tags": {"env": "prod"}, "fields": {"used": 5, "ok": True}, "timestamp": 1704067201}
+        assert converter.convert(json.dumps(record).encode()) == [
+            "mem,env=prod,host=old-01 ok=true,used=5i 1704067201000000000"
+        ]
+
+        converter = RecordConverter("lp")
+        assert converter.convert(b"cpu,host=a cpu_percent=1 1\n") == ["cpu,host=a cpu_percent=1 1"]
+        assert converter.convert(b"# comment") == []
+        with pytest.raises(ValueError):
+            converter.convert(b"garbage")
+
+
+class TestImportCheckpoint:
+    """checkpoint 진행/재시작 테스트"""
+
+    def test_contiguous_offsets(self, tmp_path):
+        """순서 없이 끝난 청크는 연속 구간까지만 반영되고, 실패한 청크에서 멈춤"""
+        path = str(tmp_path / "import.ckpt")
+        checkpoint = ImportCheckpoint(path, save_interval=0)
+        assert checkpoint.start_offset("/data/a.lp", 300, 1.0) == 0
+
+        checkpoint.complete("/data/a.lp", 1, 200, points=10)
+        assert checkpoint.files["/data/a.lp"]["offset"] == 0
+        checkpoint.complete("/data/a.lp", 0, 100, points=10)
+        assert checkpoint.files["/data/a.lp"]["offset"] == 200
+        checkpoint.complete("/data/a.lp", 2, None)
+        checkpoint.finish("/data/a.lp", 3)
+
+        reopened = ImportCheckpoint(path)
+        assert reopened.files["/data/a.lp"]["done"] is False
+        assert reopened.start_offset("/data/a.lp", 300, 1.0) == 200
+        reopened.complete("/data/a.lp", 0, 300, points=5)
+        reopened.finish("/data/a.lp", 1)
+        assert reopened.files["/data/a.lp"]["points"] == 25
+
+        # 끝난 파일은 건너뛰고, 크기가 바뀐 파일은 처음부터
+        reopened = ImportCheckpoint(path)
+        assert reopened.start_offset("/data/a.lp", 300, 1.0) is None
+        assert reopened.start_offset("/data/a.lp", 400, 2.0) == 0
+
+    def test_read_chunks_resume(self, tmp_path):
+        """CSV 헤더는 재시작 시에도 읽고, 청크는 오프셋부터 이어짐 (gzip 포함)"""
+        path = str(tmp_path / "metrics.csv.gz")
+        with gzip.open(path, "wb") as f:
+            f.write(b"timestamp,memory.memory_percent\n")
+            for i in range(5):
+                f.write(f"{1704067200 + i},{i}.0\n".encode())
+
+        chunks = list(importer.read_chunks(path, "csv", 0, 2))
+        assert [data.count(b"\n") for _, data, _ in chunks] == [2, 2, 1]
+        assert chunks[0][0] == ["timestamp", "memory.memory_percent"]
+
+        resumed = list(importer.read_chunks(path, "csv", chunks[0][2], 2))
+        assert resumed[0][0] == chunks[0][0]
+        assert b"".join(data for _, data, _ in resumed) == b"".join(data for _, data, _ in chunks[1:])
+
+
+class TestImportWorker:
+    """워커 변환/쓰기 테스트"""
+
+    def test_import_chunk_retries(self, monkeypatch):
+        """일시 오류는 재시도하고, 400은 재시도 없이 실패로 집계"""
+        monkeypatch.setattr(importer.time, "sleep", lambda seconds: None)
+        responses = [503, 204, 400]
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(gzip.decompress(request.content).decode().split("\n"))
+            return httpx.Response(responses.pop(0))
+
+        importer._init_worker("http://influxdb", "token", "org", "backfill", 0, 6, dry_run=True)
+        importer._worker["client"] = httpx.Client(base_url="http://influxdb", transport=httpx.MockTransport(handler))
+
+        data = b"".join(f"mem,host=a used={i}i {i}\n".encode() for i in range(3)) + b"garbage\n"
+        result = importer.import_chunk("lp", None, {}, "wide", "s", data, 2, 3)
+        assert result == {"points": 2, "invalid": 1, "failed": 1, "error": "HTTP 400: "}
+        assert requests[0] == requests[1] == ["mem,host=a used=0i 0", "mem,host=a used=1i 1"]
+        assert len(requests) == 3
+
+    def test_dry_run_end_to_end(self, tmp_path):
+        """드라이런으로 여러 파일을 워커 풀에서 변환하고, checkpoint는 기록하지 않아 실제 가져오기를 막지 않는지 테스트"""
+        inputs = []
+        for name in ("a", "b"):
+            path = tmp_path / f"{name}.lp"
+            path.write_text("".join(f"mem,host={name} used={i}i {i}\n" for i in range(25)))
+            inputs.append(str(path))
+        checkpoint = str(tmp_path / "import.ckpt")
+        argv = inputs + ["--workers", "2", "--chunk-lines", "10", "--checkpoint", checkpoint, "--dry-run"]
+
+        job = importer.ImportJob(importer.parse_args(argv))
+        assert job.run() == 0
+        assert job.stats["points"] == 50
+        assert job.stats["chunks"] == 6
+        assert job.stats["files"] == 2
+        assert not os.path.exists(checkpoint)
+
+        job = importer.ImportJob(importer.parse_args(argv))
+        assert job.run() == 0
+        assert job.stats["points"] == 50
+
+    def test_failed_chunk_does_not_abort(self, tmp_path):
+        """워커 예외가 난 파일은 실패로 기록하고 나머지 파일은 계속 가져오기"""
+        bad = tmp_path / "bad.csv"
+        bad.write_text("host,cpu_percent\na,1.0\n")
+        good = tmp_path / "good.lp"
+        good.write_text("".join(f"mem,host=a used={i}i {i}\n" for i in range(5)))
+        argv = [str(bad), str(good), "--workers", "1", "--dry-run"]
+
+        job = importer.ImportJob(importer.parse_args(argv))
+        assert job.run() == 1
+        assert job.stats["failed_chunks"] == 1
+        assert job.stats["points"] == 5
+        files = job.checkpoint.files
+        assert not files[str(bad)]["done"]
+        assert files[str(good)]["done"]
@@ -0,0 +1,215 @@
+"""수집기 fan-in relay 테스트"""
+import asyncio
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request, Response
+
+from src.relay.aggregator import REJECT_SOURCE_QUOTA, RelayAggregator, invalid_lines, split_lines
+from src.relay.main import RelayUDPProtocol, create_app
+from src.relay.upstream import InfluxUpstream
+
+
+def create_standin_influxdb():
+    """
+    /api/v2/write만 구현한 InfluxDB 대체 서버
+
+    Returns:
+        (FastAPI 앱, 수신 기록 리스트, 상태 dict) 튜플. 상태의 "fail"이 True면 503 응답,
+        "status"가 있으면 그 상태 코드로 응답 (401 등), "reject"가 본문에 들어 있으면 400 응답
+        (필드 타입 충돌 등), 본문이 "max_lines"줄을 넘으면 413 응답
+    """
+    app = FastAPI()
+    writes = []
+    state = {"fail": False, "status": None, "reject": None, "max_lines": None}
+
+    @app.post("/api/v2/write")
+    async def write(request: Request):
+        if state["fail"]:
+            return Response(status_code=503)
+        if state["status"]:
+            return Response(status_code=state["status"])
+        body = await request.body()
+        if request.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        if state["reject"] and state["reject"] in body:
+            return Response(status_code=400)
+        if state["max_lines"] and body.count(b"\n") >= state["max_lines"]:
+            return Response(status_code=413)
+        writes.append({
+            "bucket": request.query_params["bucket"],
+            "precision": request.query_params["precision"],
+            "authorization": request.headers.get("authorization"),
+            "lines": body.decode().split("\n"),
+        })
+        return Response(status_code=204)
+
+    return app, writes, state
+
+
+def make_aggregator(influxdb_app, **kwargs) -> RelayAggregator:
+    """대체 InfluxDB로 쓰는 집계기 생성"""
+    upstream = InfluxUpstream(
+        url="http://influxdb", token="upstream-token", org="test-org",
+        transport=httpx.ASGITransport(app=influxdb_app),
+    )
+    return RelayAggregator(upstream, **kwargs)
+
+
+async def wait_until(condition, timeout: float = 2.0):
+    """조건이 참이 될 때까지 대기"""
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+class TestRelay:
+    """relay 병합/backpressure/재시도 테스트"""
+
+    def test_split_lines(self):
+        """빈 줄, 주석, CRLF 처리 테스트"""
+        assert split_lines(b"cpu v=1 1\r\n\n# comment\nmem v=2 2") == [b"cpu v=1 1", b"mem v=2 2"]
+
+    @pytest.mark.asyncio
+    async def test_merges_sources_into_one_gzip_write(self):
+        """여러 수집기(HTTP/UDP)의 줄이 하나의 gzip upstream 쓰기로 합쳐지는지 테스트"""
+        influxdb, writes, _ = create_standin_influxdb()
+        aggregator = make_aggregator(influxdb, batch_size=100, flush_interval=0.05)
+        app = create_app(aggregator, bucket="metrics", token="agent-token")
+
+        for host in ("10.0.0.1", "10.0.0.2"):
+            transport = httpx.ASGITransport(app=app, client=(host, 5000))
+            async with httpx.AsyncClient(transport=transport, base_url="http://relay") as client:
+                response = await client.post(
+                    "/api/v2/write",
+                    params={"org": "o", "bucket": "metrics", "precision": "ns"},
+                    content=gzip.compress(f"cpu,host={host} v=1 1\n".encode()),
+                    headers={"Authorization": "Token agent-token", "Content-Encoding": "gzip"},
+                )
+                assert response.status_code == 204
+        RelayUDPProtocol(aggregator, "metrics").datagram_received(b"cpu,host=udp v=1 1", ("10.0.0.3", 8089))
+
+        await wait_until(lambda: writes)
+        assert writes == [{
+            "bucket": "metrics",
+            "precision": "ns",
+            "authorization": "Token upstream-token",
+            "lines": ["cpu,host=10.0.0.1 v=1 1", "cpu,host=10.0.0.2 v=1 1", "cpu,host=udp v=1 1"],
+        }]
+        assert aggregator.get_stats()["buffered_lines"] == 0
+        registry = aggregator.instrumentation.registry
+        assert registry.get_sample_value("relay_received_lines_total", {"transport": "udp"}) == 1
+        assert registry.get_sample_value("relay_upstream_batch_lines_sum") == 3
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_per_source_backpressure(self):
+        """소스별 미전송 한도를 넘으면 해당 소스만 429를 받는지 테스트"""
+        influxdb, writes, state = create_standin_influxdb()
+        state["fail"] = True
+        aggregator = make_aggregator(
+            influxdb, batch_size=1000, flush_interval=0.02, source_max_pending=2, retry_interval=0.01,
+        )
+        app = create_app(aggregator, bucket="metrics")
+
+        async def post(host: str, body: bytes) -> httpx.Response:
+            transport = httpx.ASGITransport(app=app, client=(host, 5000))
+            async with httpx.AsyncClient(transport=transport, base_url="http://relay") as client:
+                return await client.post("/api/v2/write", content=body)
+
+        assert (await post("10.0.0.1", b"m v=1 1\nm v=2 2")).status_code == 204
+        rejected = await post("10.0.0.1", b"m v=3 3")
+        assert rejected.status_code == 429
+        assert rejected.headers["Retry-After"] == "5"
+        assert (await post("10.0.0.2", b"m v=4 4")).status_code == 204
+
+        # upstream 장애 동안 재시도하고 복구되면 순서대로 전송
+        await wait_until(lambda: aggregator.upstream_errors > 0)
+        state["fail"] = False
+        await wait_until(lambda: aggregator.buffered == 0)
+
+        assert [line for write in writes for line in write["lines"]] == ["m v=1 1", "m v=2 2", "m v=4 4"]
+        assert aggregator.sources["10.0.0.1"].rejected == 1
+        assert aggregator.offer("10.0.0.1", [b"m v=5 5"] * 3, "metrics") == REJECT_SOURCE_QUOTA
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_permanent_rejection_drops_only_offending_source(self):
+        """upstream 400은 재시도하지 않고 소스별로 다시 써서 문제 소스의 줄만 버리는지 테스트"""
+        influxdb, writes, state = create_standin_influxdb()
+        state["reject"] = b'v="text"'
+        aggregator = make_aggregator(influxdb, batch_size=1000, flush_interval=0.02, retry_interval=0.01)
+        assert aggregator.offer("10.0.0.1", [b"m v=1 1"], "metrics") is None
+        assert aggregator.offer("10.0.0.2", [b'm v="text" 2'], "metrics") is None
+        assert aggregator.offer("10.0.0.3", [b"m v=3 3"], "metrics") is None
+
+        await wait_until(lambda: aggregator.buffered == 0)
+        assert [line for write in writes for line in write["lines"]] == ["m v=1 1", "m v=3 3"]
+        assert aggregator.sources["10.0.0.2"].rejected == 1
+        assert aggregator.get_stats()["retry_backoff_seconds"] == 0
+        registry = aggregator.instrumentation.registry
+        assert registry.get_sample_value("relay_rejected_lines_total", {"reason": "upstream_rejected"}) == 1
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_upstream_auth_error_is_retried_with_backpressure(self):
+        """relay 토큰/버킷 오류(401/404)는 줄을 버리지 않고 재시도하며 버퍼가 차면 수집기가 429를 받는지 테스트"""
+        influxdb, writes, state = create_standin_influxdb()
+        state["status"] = 401
+        aggregator = make_aggregator(influxdb, batch_size=1000, flush_interval=0.02, max_buffer=3, retry_interval=0.01)
+        assert aggregator.offer("10.0.0.1", [b"m v=1 1"], "metrics") is None
+        assert aggregator.offer("10.0.0.2", [b"m v=2 2"], "metrics") is None
+
+        await wait_until(lambda: aggregator.upstream_errors >= 2)
+        state["status"] = 404
+        await wait_until(lambda: aggregator.upstream_errors >= 4)
+        assert aggregator.buffered == 2
+        assert aggregator.sources["10.0.0.1"].rejected == 0
+        app = create_app(aggregator, bucket="metrics")
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.3", 5000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://relay") as client:
+            assert (await client.post("/api/v2/write", content=b"m v=3 3\nm v=4 4")).status_code == 429
+
+        state["status"] = None
+        await wait_until(lambda: aggregator.buffered == 0)
+        assert [line for write in writes for line in write["lines"]] == ["m v=1 1", "m v=2 2"]
+        registry = aggregator.instrumentation.registry
+        assert registry.get_sample_value("relay_rejected_lines_total", {"reason": "upstream_rejected"}) is None
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_too_large_batch_is_split(self):
+        """413이면 배치를 반으로 나눠 다시 쓰고 소스 묶음 하나도 줄 단위로 나누는지 테스트"""
+        influxdb, writes, state = create_standin_influxdb()
+        state["max_lines"] = 2
+        aggregator = make_aggregator(influxdb, batch_size=1000, flush_interval=0.02, retry_interval=0.01)
+        assert aggregator.offer("10.0.0.1", [b"m v=1 1", b"m v=2 2", b"m v=3 3"], "metrics") is None
+        assert aggregator.offer("10.0.0.2", [b"m v=4 4"], "metrics") is None
+
+        await wait_until(lambda: aggregator.buffered == 0)
+        assert [line for write in writes for line in write["lines"]] == ["m v=1 1", "m v=2 2", "m v=3 3", "m v=4 4"]
+        assert all(len(write["lines"]) <= 2 for write in writes)
+        assert aggregator.sources["10.0.0.1"].rejected == 0
+        await aggregator.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_lines_and_rejected_sources(self):
+        """형식이 잘못된 요청은 버퍼에 넣기 전에 400, 거부된 새 소스는 소스 상태를 만들지 않는지 테스트"""
+        assert invalid_lines([b"cpu,host=a v=1 1", b"my\\ m,t=a\\ b f=\"x y\"", b"garbage", b"cpu v"]) == [
+            b"garbage", b"cpu v",
+        ]
+        influxdb, writes, _ = create_standin_influxdb()
+        aggregator = make_aggregator(influxdb, flush_interval=0.02, max_buffer=2)
+        app = create_app(aggregator, bucket="metrics")
+        transport = httpx.ASGITransport(app=app, client=("10.0.0.1", 5000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://relay") as client:
+            response = await client.post("/api/v2/write", content=b"m v=1 1\nbroken")
+        assert response.status_code == 400 and "broken" in response.json()["message"]
+        assert aggregator.buffered == 0 and aggregator.sources == {}
+
+        assert aggregator.offer("10.0.0.9", [b"m v=1 1"] * 3, "metrics") is not None
+        assert aggregator.sources == {}
+        await aggregator.close()
@@ -1,7 +1,19 @@
 """InfluxDB 클라이언트 테스트"""
+import asyncio
+import os
+import threading
+
 import pytest
-from datetime import datetime
-from src.storage.influxdb_client import InfluxDBClient
+from datetime import datetime, timedelta, timezone
+from src.collector.backpressure import storage_pressure
+from src.storage.base import SummarySketch, format_duration, parse_duration, parse_time, resolve_window
+from src.storage.embedded import EmbeddedStorage
+from src.storage.cache import CachedStorage, QueryCacheInstrumentation
+from src.storage.gorilla import GorillaEncoder, decode
+from src.storage.influxdb_client import InfluxDBClient, flux_csv_columns
+from src.storage.batch_writer import BatchWriter
+from src.storage.spool import SpoolReplayer, WriteSpool
+from src.storage.line_protocol import LineProtocolSerializer
 
 
 class TestInfluxDBClient:
@@ -15,6 +27,7 @@ class TestInfluxDBClient:
             token="test-token",
             org="test-org",
             bucket="test-bucket",
+            tags={"host": "test-host"},
         )
 
     def test_client_initialization(self, client):
@@ -52,6 +65,28 @@ class TestInfluxDBClient:
         points = client._convert_to_points(metrics)
         assert len(points) > 0
 
+    def test_per_device_rates_are_tagged(self, client):
+        """인터페이스/장치별 변화율이 태그된 Point로 변환되는지 테스트"""
+        metrics = {
+            "timestamp": datetime.utcnow(),
+            "network_interfaces": [{"interface": "eth0", "bytes_recv_per_sec": 1024.0}],
+            "disk_devices": [{"device": "sda", "read_iops": 12.5, "util_percent": 3.0}],
+        }
+        lines = [point.to_line_protocol() for point in client._convert_to_points(metrics)]
+        assert lines[0].startswith("disk_device,device=sda,host=test-host read_iops=12.5,util_percent=3")
+        assert lines[1].startswith("network_interface,host=test-host,interface=eth0 bytes_recv_per_sec=1024")
+
+    def test_static_fields_go_to_host_info(self, client):
+        """정적 필드가 고빈도 Point에서 빠지고 host_info로 기록되는지 테스트"""
+        metrics = {
+            "timestamp": datetime.utcnow(),
+            "cpu": {"cpu_percent": 12.5, "cpu_count_logical": 8, "cpu_freq_max": 3000.0},
+            "host_info": {"cpu_count_logical": 8, "interfaces": "eth0"},
+        }
+        lines = [point.to_line_protocol() for point in client._convert_to_points(metrics)]
+        assert lines[0].startswith("cpu,host=test-host cpu_percent=12.5 ")
+        assert lines[1].startswith('host_info,host=test-host cpu_count_logical=8i,interfaces="eth0" ')
+
     def test_empty_metrics(self, client):
         """빈 메트릭 처리 테스트"""
         metrics = {"timestamp": datetime.utcnow()}
@@ -82,3 +117,628 @@ class TestInfluxDBQueries:
         # 쿼리 생성 확인만 수행 (실제 실행 없이)
         assert measurement == "cpu"
         assert start == "-1h"
+
+    def test_filter_values_are_escaped(self, client):
+        """사용자 입력 필터 값의 따옴표/역슬래시가 Flux 문자열 밖으로 나가지 않고, 잘못된 시각은 거부하는지 테스트"""
+        query = client._flux_source("cpu", "-1h", "now()", {"_field": 'x") or true or ("', "path": "C:\\"})
+        assert 'r["_field"] == "x\\") or true or (\\""' in query
+        assert 'r["path"] == "C:\\\\"' in query
+        with pytest.raises(ValueError):
+            client._flux_source("cpu", "-1h) |> drop(columns: [\"host\"]", "now()")
+
+    def test_flux_csv_columns(self):
+        """annotated CSV 응답을 테이블(시리즈)별 time/value 배열로 변환하는지 테스트"""
+        text = (
+            "#group,false,false,true,true,false,false,true\r\n"
+            "#datatype,string,long,string,string,dateTime:RFC3339,double,string\r\n"
+            "#default,_result,,,,,,\r\n"
+            ",result,table,_field,host,_time,_value,core\r\n"
+            ",,0,cpu_percent,h1,2024-01-01T00:00:00Z,1.5,\r\n"
+            ",,0,cpu_percent,h1,2024-01-01T00:00:01.25Z,,\r\n"
+            ",,1,cpu_percent,h1,2024-01-01T00:00:00.123456789Z,3,0\r\n"
+            "\r\n"
+            "#group,false,false,true,false,false\r\n"
+            "#datatype,string,long,string,dateTime:RFC3339,long\r\n"
+            "#default,_result,,,,\r\n"
+            ",result,table,_field,_time,_value\r\n"
+            ",,2,cpu_count,2024-01-01T00:00:00Z,4\r\n"
+        )
+        assert flux_csv_columns(text) == [
+            {"field": "cpu_percent", "tags": {"host": "h1"}, "time": [1704067200000, 1704067201250], "value": [1.5, None]},
+            {"field": "cpu_percent", "tags": {"host": "h1", "core": "0"}, "time": [1704067200123], "value": [3.0]},
+            {"field": "cpu_count", "tags": {}, "time": [1704067200000], "value": [4]},
+        ]
+
+        error = "#datatype,string,string\r\n#group,true,true\r\n#default,,\r\n,error,reference\r\n,out of memory,\r\n"
+        with pytest.raises(RuntimeError, match="out of memory"):
+            flux_csv_columns(error)
+
+    @pytest.mark.asyncio
+    async def test_summary_is_computed_in_influxdb(self, client):
+        """/summary 통계를 원본 점 없이 Flux 집계(t-digest 분위수)로 받아 필드별로 모으는지 테스트"""
+        class Record:
+            def __init__(self, field, result, value):
+                self.values = {"_field": field, "result": result, "_value": value}
+
+            def get_field(self):
+                return self.values["_field"]
+
+            def get_value(self):
+                return self.values["_value"]
+
+        class Table:
+            def __init__(self, *records):
+                self.records = list(records)
+
+        queries = []
+
+        async def run_query(query, label, mode="tables"):
+            queries.append(query)
+            return [
+                Table(Record("user", "count", 10), Record("system", "count", 4)),
+                Table(Record("user", "quantile", 3.9), Record("user", "max", 4.0)),
+            ]
+
+        client._run_query = run_query
+        summary = await client.summarize_metrics("cpu", "-30d", filters={"host": "h1"})
+        assert summary == {"user": {"count": 10, "quantile": 3.9, "max": 4.0}, "system": {"count": 4}}
+        assert 'quantile(q: 0.95, method: "estimate_tdigest")' in queries[0]
+        assert 'r["host"] == "h1"' in queries[0]
+        with pytest.raises(ValueError):
+            await client.summarize_metrics("cpu", quantile=1.5)
+
+
+class TestBatchWriter:
+    """백그라운드 배치 writer 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_flush_by_size_and_time(self):
+        """batch_size에 도달하거나 flush_interval이 지나면 flush되는지 테스트"""
+        batches = []
+        writer = BatchWriter(batches.append, batch_size=3, flush_interval=0.05)
+
+        assert writer.submit([1, 2, 3, 4]) == 4
+        await asyncio.sleep(0.01)
+        assert batches == [[1, 2, 3]]
+
+        await asyncio.sleep(0.1)
+        assert batches == [[1, 2, 3], [4]]
+        assert writer.depth == 0
+        await writer.close()
+
+    @pytest.mark.asyncio
+    async def test_submit_does_not_wait_for_slow_write(self):
+        """느린 저장소가 submit을 막지 않고 close()가 남은 Point를 모두 비우는지 테스트"""
+        release = threading.Event()
+        batches = []
+
+        def slow_write(batch):
+            release.wait(1)
+            batches.append(batch)
+
+        writer = BatchWriter(slow_write, batch_size=2, flush_interval=10)
+        writer.submit([1, 2])
+        await asyncio.sleep(0.01)
+        writer.submit([3])
+        assert writer.depth == 1
+
+        release.set()
+        await writer.close()
+        assert batches == [[1, 2], [3]]
+        with pytest.raises(RuntimeError):
+            writer.submit([4])
+
+    @pytest.mark.asyncio
+    async def test_overflow_and_failure_are_counted(self):
+        """큐 초과 시 오래된 Point를 버리고 실패한 배치를 집계하는지 테스트"""
+        def failing_write(batch):
+            raise ConnectionError("influxdb down")
+
+        flushes = []
+        writer = BatchWriter(failing_write, batch_size=10, flush_interval=10, max_queue=3)
+        writer.on_flush = lambda elapsed, points, failed: flushes.append((points, failed))
+
+        writer.submit([1, 2, 3, 4, 5])
+        assert list(writer._queue) == [3, 4, 5]
+        await writer.close()
+
+        stats = writer.get_stats()
+        assert flushes == [(3, True)]
+        assert stats["errors"] == 1
+        assert stats["points_dropped"] == 5
+        assert stats["points_written"] == 0
+
+
+class TestWriteSpool:
+    """디스크 스풀 및 재전송 테스트"""
+
+    def test_rotation_eviction_and_recovery(self, tmp_path):
+        """세그먼트 교체, 오래된 세그먼트 삭제, 재시작 후 복구 테스트"""
+        spool = WriteSpool(str(tmp_path), segment_bytes=32, max_bytes=64, fsync_interval=0)
+        for i in range(6):
+            spool.append([f"cpu cpu_percent={i} {i}000000000"])
+        spool.close()
+
+        stats = spool.get_stats()
+        assert stats["pending_bytes"] <= 64
+        assert stats["evicted_bytes"] > 0
+
+        # 한 줄(29바이트)씩 세그먼트가 나뉘고 최근 두 세그먼트만 남음
+        recovered = WriteSpool(str(tmp_path))
+        assert recovered.pending_bytes == stats["pending_bytes"] == 58
+        lines, cursor = recovered.read_batch(100)
+        assert lines == ["cpu cpu_percent=4 4000000000"]
+
+    def test_replay_oldest_first(self, tmp_path):
+        """재전송이 오래된 순서로 진행되고 커밋된 세그먼트가 삭제되는지 테스트"""
+        spool = WriteSpool(str(tmp_path), segment_bytes=40)
+        spool.append(["m v=1 1", "m v=2 2"])
+        spool.append(["m v=3 3"])
+
+        sent = []
+        while spool.pending_bytes:
+            lines, cursor = spool.read_batch(2)
+            sent.extend(lines)
+            spool.commit(cursor, len(lines))
+
+        assert sent == ["m v=1 1", "m v=2 2", "m v=3 3"]
+        assert spool.get_stats()["replayed_lines"] == 3
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_spooled_and_replayed(self, tmp_path):
+        """저장 실패 배치가 스풀에 보관되었다가 복구 후 재전송되는지 테스트"""
+        spool = WriteSpool(str(tmp_path))
+        available = False
+        stored = []
+
+        def write(lines):
+            if not available:
+                raise ConnectionError("influxdb down")
+            stored.extend(lines)
+
+        writer = BatchWriter(write, batch_size=2, flush_interval=10, fallback_fn=spool.append)
+        writer.submit(["m v=1 1", "m v=2 2"])
+        await writer.close()
+        assert writer.get_stats()["points_spooled"] == 2
+        assert writer.get_stats()["points_dropped"] == 0
+
+        available = True
+        replayer = SpoolReplayer(spool, write, rate=0, retry_interval=0.01)
+        replayer.start()
+        for _ in range(100):
+            if not spool.pending_bytes:
+                break
+            await asyncio.sleep(0.01)
+        await replayer.close()
+
+        assert stored == ["m v=1 1", "m v=2 2"]
+        assert spool.pending_bytes == 0
+
+
+class TestLineProtocolSerializer:
+    """line protocol 직접 직렬화 테스트"""
+
+    @pytest.fixture
+    def client(self):
+        return InfluxDBClient(
+            url="http://localhost:8086",
+            token="test-token",
+            org="test-org",
+            bucket="test-bucket",
+            tags={"host": "web 01", "instance": "a=b"},
+        )
+
+    def test_matches_point_conversion(self, client):
+        """Point 기반 변환과 같은 줄을 생성하는지 테스트 (정렬, 이스케이프, NaN 생략 포함)"""
+        metrics = {
+            "timestamp": datetime(2024, 1, 2, 3, 4, 5, 678901),
+            "cpu": {
+                "cpu_percent": 12.0,
+                "cpu_percent_per_core": [float(i) + 0.25 for i in range(12)],
+                "cpu_count_logical": 12,
+                "cpu_freq_current": 2400.5,
+            },
+            "memory": {"memory_percent": float("nan"), "memory_used": 123, "swap_total": 1},
+            "host_info": {"interfaces": 'eth0,"wl an"', "cpu_count_logical": 12},
+            "disk_io": {"disk_read_bytes": 10},
+            "disk_usage": [{"device": "/dev/sda 1", "mountpoint": "C:\\", "total": 5, "used": 2.5, "free": 2, "percent": 50.0}],
+            "disk_devices": [{"device": "sda", "util_percent": 1e-7, "read_iops": 3.5}],
+            "network_io": {"bytes_sent": 1, "dropout": 0},
+            "network_interfaces": [{"interface": "eth,0", "bytes_recv_per_sec": 1e20}],
+            "network_connections": {"network_conn_established": 4},
+        }
+        expected = [line for line in (p.to_line_protocol() for p in client._convert_to_points(metrics)) if line]
+        assert expected[0].startswith("cpu,host=web\\ 01,instance=a\\=b ")
+        assert LineProtocolSerializer(tags=client.tags).serialize(metrics) == expected
+        assert client.serializer.to_bytes(metrics) == "\n".join(expected).encode()
+
+    def test_narrow_schema(self):
+        """narrow 스키마에서 코어별 값이 core 태그가 붙은 cpu_core 줄로 나뉘는지 테스트"""
+        client = InfluxDBClient(token="test-token", tags={"host": "h"}, schema="narrow")
+        metrics = {
+            "timestamp": datetime(2024, 1, 1),
+            "cpu": {"cpu_percent": 5.0, "cpu_percent_per_core": [1.5, 2.0], "cpu_iowait_per_core": [0.0, 0.5]},
+        }
+        lines = client.serializer.serialize(metrics)
+        assert lines == [
+            "cpu,host=h cpu_percent=5 1704067200000000000",
+            "cpu_core,core=0,host=h cpu_iowait=0,cpu_percent=1.5 1704067200000000000",
+            "cpu_core,core=1,host=h cpu_iowait=0.5,cpu_percent=2 1704067200000000000",
+        ]
+        assert [p.to_line_protocol() for p in client._convert_to_points(metrics)] == lines
+        with pytest.raises(ValueError):
+            LineProtocolSerializer(schema="tall")
+
+    def test_second_precision(self):
+        """초 단위 정밀도에서 정수 초 타임스탬프를 쓰는지 테스트"""
+        metrics = {"timestamp": datetime(2024, 1, 1, 0, 0, 1, 999999), "memory": {"memory_percent": 1.5}}
+        assert LineProtocolSerializer("s").serialize(metrics) == ["memory memory_percent=1.5 1704067201"]
+
+
+class TestSummarySketch:
+    """스트리밍 통계 요약 테스트"""
+
+    def test_exact_until_compressed(self):
+        """버퍼 안의 값은 최근접 순위 분위수를 그대로 돌려주는지 테스트"""
+        sketch = SummarySketch()
+        sketch.add_many([5.0, 1.0, 3.0])
+        sketch.add_many([2.0, 4.0])
+        assert sketch.result(0.5) == {"count": 5, "mean": 3.0, "min": 1.0, "max": 5.0, "quantile": 3.0}
+        assert sketch.result(0.99)["quantile"] == 5.0
+        with pytest.raises(ValueError):
+            SummarySketch().result()
+
+    def test_bounded_and_accurate(self):
+        """값이 많아도 중심점 수가 제한되고 분위수 오차가 작은지 테스트"""
+        import random
+
+        rng = random.Random(7)
+        values = [rng.gauss(50, 10) for _ in range(200000)]
+        sketch = SummarySketch()
+        for start in range(0, len(values), 1000):
+            sketch.add_many(values[start:start + 1000])
+
+        assert len(sketch._means) <= sketch.compression
+        assert len(sketch._buffer) < sketch.compression * SummarySketch.BUFFER_FACTOR
+        ordered = sorted(values)
+        result = sketch.result(0.95)
+        assert result["count"] == len(values)
+        assert result["min"] == ordered[0] and result["max"] == ordered[-1]
+        assert abs(result["mean"] - sum(values) / len(values)) < 1e-9
+        for q in (0.5, 0.95, 0.99, 0.999):
+            exact = ordered[int(len(ordered) * q)]
+            assert abs(sketch.quantile(q) - exact) < 0.1
+
+
+class TestEmbeddedStorage:
+    """내장 압축 저장소 테스트"""
+
+    @staticmethod
+    def sample(second: int, percent: float) -> dict:
+        return {
+            "timestamp": datetime(2024, 1, 1, 0, 0, second),
+            "cpu": {"cpu_percent": percent, "cpu_percent_per_core": [percent, 1.0]},
+            "disk_devices": [{"device": "sda", "util_percent": 2.5}],
+            "host_info": {"interfaces": "eth0"},
+        }
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_range_query(self, tmp_path):
+        """봉인된 청크와 현재 청크를 합쳐 구간/필터 조회하는지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False)
+        for second in range(10):
+            assert await storage.write_metrics(self.sample(second, second * 1.5)) == 2
+
+        records = await storage.query_metrics(
+            "cpu", start="2024-01-01T00:00:03Z", stop="2024-01-01T00:00:09Z", filters={"_field": "cpu_percent"},
+        )
+        assert [r["value"] for r in records] == [4.5, 6.0, 7.5, 9.0, 10.5, 12.0]
+        assert records[0]["time"] == datetime(2024, 1, 1, 0, 0, 3, tzinfo=timezone.utc)
+        assert records[0]["field"] == "cpu_percent"
+
+        disk = await storage.query_metrics("disk_device", start="2024-01-01T00:00:00Z", filters={"device": "sda", "host": "h1"})
+        assert len(disk) == 10
+        assert await storage.query_metrics("host_info", start="2024-01-01T00:00:00Z") == []
+        assert await storage.query_metrics("disk_device", start="2024-01-01T00:00:00Z", filters={"device": "sdb"}) == []
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_writes_run_on_writer_thread(self, tmp_path):
+        """write_metrics는 큐에만 넣고 봉인/fsync는 writer 스레드에서 하며 큐 깊이가 부하로 보이는지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False)
+        threads = []
+        sync = storage._sync
+        storage._sync = lambda: threads.append(threading.current_thread().name) or sync()
+
+        for second in range(8):
+            await storage.write_metrics(self.sample(second, float(second)))
+        assert threads == []
+        assert storage.writer.depth == 8 * 4
+        assert storage_pressure(storage) > 0
+
+        await storage.flush()
+        assert threads and all(name.startswith("embedded-writer") for name in threads)
+        assert storage.writer.depth == 0
+        assert storage.get_stats()["chunks"] == 8
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_windowed_aggregation(self, tmp_path):
+        """every 지정 시 epoch 기준 창별로 집계하고 time은 창의 끝(구간 끝에서 잘림)인지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False)
+        for second in range(10):
+            await storage.write_metrics(self.sample(second, float(second)))
+
+        query = dict(start="2024-01-01T00:00:00Z", stop="2024-01-01T00:00:09Z", filters={"_field": "cpu_percent"})
+        expected = {"mean": [1.5, 5.5, 8.0], "max": [3.0, 7.0, 8.0], "min": [0.0, 4.0, 8.0], "last": [3.0, 7.0, 8.0]}
+        for fn, values in expected.items():
+            records = await storage.query_metrics("cpu", every="4s", fn=fn, **query)
+            assert [r["value"] for r in records] == values
+        assert [r["time"].second for r in records] == [4, 8, 9]
+
+        with pytest.raises(ValueError):
+            await storage.query_metrics("cpu", every="4s", fn="median", **query)
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_summarize_per_field(self, tmp_path):
+        """필드별 count/mean/min/max/quantile을 저장소에서 계산하는지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False)
+        for second in range(20):
+            await storage.write_metrics(self.sample(second, float(second)))
+
+        summary = await storage.summarize_metrics("cpu", start="2024-01-01T00:00:00Z", stop="2024-01-01T00:01:00Z")
+        assert set(summary) == {"cpu_percent", "cpu_percent_per_core_core0", "cpu_percent_per_core_core1"}
+        assert summary["cpu_percent"] == {"count": 20, "mean": 9.5, "min": 0.0, "max": 19.0, "quantile": 19.0}
+        assert summary["cpu_percent_per_core_core1"]["max"] == 1.0
+
+        only = await storage.summarize_metrics(
+            "cpu", start="2024-01-01T00:00:00Z", filters={"_field": "cpu_percent"}, quantile=0.5,
+        )
+        assert list(only) == ["cpu_percent"] and only["cpu_percent"]["quantile"] == 10.0
+        assert await storage.summarize_metrics("memory", start="2024-01-01T00:00:00Z") == {}
+        await storage.close()
+
+    def test_window_selection(self):
+        """시리즈당 최대 점 수에 맞춘 자동 집계 간격 선택"""
+        now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        assert resolve_window("-1h", "now()") is None
+        assert resolve_window("-1h", "now()", "30s") == timedelta(seconds=30)
+        assert resolve_window("-24h", "now()", max_points=1000, now=now) == timedelta(minutes=2)
+        assert resolve_window("-24h", "now()", "10s", max_points=1000, now=now) == timedelta(minutes=2)
+        assert resolve_window("-24h", "now()", "1h", max_points=1000, now=now) == timedelta(hours=1)
+        assert resolve_window("-5m", "now()", max_points=1000, now=now) == timedelta(seconds=1)
+        assert resolve_window("-3650d", "now()", max_points=1000, now=now) == timedelta(days=4)
+        assert [format_duration(timedelta(seconds=s)) for s in (1, 120, 5400, 86400)] == ["1s", "2m", "90m", "1d"]
+        with pytest.raises(ValueError):
+            resolve_window("-1h", "now()", "5 minutes")
+
+    @pytest.mark.asyncio
+    async def test_reader_sees_sealed_chunks_and_reopen(self, tmp_path):
+        """조회 전용 인스턴스가 봉인된 청크와 WAL의 봉인 전 점을 읽고, 재시작 후에도 데이터가 남는지 테스트"""
+        writer = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False)
+        reader = EmbeddedStorage(str(tmp_path), read_only=True)
+        start = "2024-01-01T00:00:00Z"
+
+        for second in range(6):
+            await writer.write_metrics(self.sample(second, float(second)))
+        await writer.flush()
+        # 봉인 전 점(4, 5초)도 WAL로 다른 프로세스에서 보이고, 봉인된 점과 중복되지 않음
+        values = [r["value"] for r in await reader.query_metrics("cpu", start=start, filters={"_field": "cpu_percent"})]
+        assert values == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+
+        await writer.close()
+        assert len(await reader.query_metrics("cpu", start=start, filters={"_field": "cpu_percent"})) == 6
+
+        reopened = EmbeddedStorage(
+            str(tmp_path), chunk_size=4, retention=timedelta(days=36500), tags={"host": "h1"}, fsync=False,
+        )
+        await reopened.write_metrics(self.sample(6, 6.0))
+        values = [r["value"] for r in await reopened.query_metrics("cpu", start=start, filters={"_field": "cpu_percent"})]
+        assert values == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        with pytest.raises(RuntimeError):
+            await reader.write_metrics(self.sample(7, 7.0))
+        await reopened.close()
+        await reader.close()
+
+        # 보관 기간이 지난 세그먼트는 다음 시작 때 삭제
+        expired = EmbeddedStorage(str(tmp_path), retention=timedelta(days=1), fsync=False)
+        assert await expired.query_metrics("cpu", start=start) == []
+        assert expired.get_stats()["chunks"] == 0
+        await expired.close()
+
+    @pytest.mark.asyncio
+    async def test_wal_recovers_unsealed_points(self, tmp_path):
+        """close 없이 종료된 쓰기 프로세스의 봉인 전 점을 재시작 시 WAL에서 복구하고 WAL을 압축하는지 테스트"""
+        crashed = EmbeddedStorage(str(tmp_path), chunk_size=8, tags={"host": "h1"}, fsync=False)
+        for second in range(11):
+            await crashed.write_metrics(self.sample(second, float(second)))
+        await crashed.flush()
+        assert crashed.get_stats()["active_points"] > 0
+        crashed.writer._task.cancel()
+
+        recovered = EmbeddedStorage(
+            str(tmp_path), chunk_size=8, retention=timedelta(days=36500), tags={"host": "h1"}, fsync=False,
+        )
+        await recovered.write_metrics(self.sample(11, 11.0))
+        records = await recovered.query_metrics("cpu", start="2024-01-01T00:00:00Z", filters={"_field": "cpu_percent"})
+        assert [r["value"] for r in records] == [float(second) for second in range(12)]
+
+        # 봉인된 점이 살아 있는 점보다 많아지면 살아 있는 점만 남김
+        for second in range(12, 40):
+            await recovered.write_metrics(self.sample(second, float(second)))
+        await recovered.flush()
+        assert recovered._wal_records <= max(2 * recovered._active_points, recovered.chunk_size)
+        await recovered.close()
+        assert os.path.getsize(os.path.join(str(tmp_path), "head.wal")) == 8
+
+    def test_gorilla_compression(self):
+        """정렬된 tick의 변하지 않는 값이 점당 수 비트로 압축되고 그대로 복원되는지 테스트"""
+        encoder = GorillaEncoder()
+        timestamps = [1_700_000_000_000_000_000 + i * 1_000_000_000 for i in range(1000)]
+        values = [42.0] * 500 + [float(i % 7) for i in range(500)]
+        for ts, value in zip(timestamps, values):
+            encoder.append(ts, value)
+        blob = encoder.to_bytes()
+        assert decode(blob) == (timestamps, values)
+        assert len(blob) < 1000 * 16 / 4
+        with pytest.raises(ValueError):
+            encoder.append(timestamps[0], 1.0)
+
+    def test_parse_time(self):
+        """Flux 시간 표현 파싱 테스트"""
+        now = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+        assert parse_time("now()", now) == now
+        assert parse_time("-1h30m", now) == datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+        assert parse_time("2024-01-01T09:00:00+09:00") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+        with pytest.raises(ValueError):
+            parse_duration("5x")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("schema", ["wide", "narrow"])
+    async def test_query_per_core(self, tmp_path, schema):
+        """스키마와 무관하게 코어별 조회 결과가 같은지 테스트"""
+        storage = EmbeddedStorage(str(tmp_path), chunk_size=4, tags={"host": "h1"}, fsync=False, schema=schema)
+        for second in range(3):
+            await storage.write_metrics(self.sample(second, float(second)))
+
+        cores = await storage.query_per_core("cpu_percent", start="2024-01-01T00:00:00Z")
+        assert {core: [r["value"] for r in records] for core, records in cores.items()} == {
+            0: [0.0, 1.0, 2.0], 1: [1.0, 1.0, 1.0],
+        }
+        single = await storage.query_per_core("cpu_percent", start="2024-01-01T00:00:00Z", core=1)
+        assert list(single) == [1]
+        measurements = {key[0] for key in storage._series}
+        assert ("cpu_core" in measurements) == (schema == "narrow")
+        await storage.close()
+
+
+class CountingStorage(EmbeddedStorage):
+    """저장소 조회 구간을 기록하는 테스트용 embedded 저장소"""
+
+    def __init__(self, *args, delay: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.queries = []
+
+    async def query_metrics(self, measurement, start="-1h", stop="now()", filters=None, every=None, fn="mean"):
+        self.queries.append((start, stop))
+        await asyncio.sleep(self.delay)
+        return await super().query_metrics(measurement, start, stop, filters, every, fn)
+
+
+class TestQueryCache:
+    """시간 버킷 조회 캐시 테스트"""
+
+    @staticmethod
+    async def make_storage(tmp_path) -> CountingStorage:
+        """2024-01-01 00:00부터 30분 동안 10초 간격 memory_percent (0~179)"""
+        storage = CountingStorage(str(tmp_path), chunk_size=16, tags={"host": "h1"}, fsync=False)
+        start = datetime(2024, 1, 1)
+        for i in range(180):
+            await storage.write_metrics({"timestamp": start + timedelta(seconds=10 * i), "memory": {"memory_percent": i}})
+        return storage
+
+    @pytest.mark.asyncio
+    async def test_relative_range_refetches_only_live_tail(self, tmp_path):
+        """상대 구간 새로 고침 시 지난 버킷은 캐시에서, 최근 버킷만 저장소에서 읽는지 테스트"""
+        storage = await self.make_storage(tmp_path)
+        now = [datetime(2024, 1, 1, 0, 30, 2, tzinfo=timezone.utc)]
+        instrumentation = QueryCacheInstrumentation()
+        cache = CachedStorage(storage, instrumentation=instrumentation, now=lambda: now[0])
+
+        expected = await storage.query_metrics("memory", "2024-01-01T00:10:02Z", "2024-01-01T00:30:02Z")
+        storage.queries.clear()
+        assert await cache.query_metrics("memory", "-20m") == expected
+        # 00:10~00:25 (불변) + 00:25~00:30 이후 (live)를 각각 한 번에 조회
+        assert len(storage.queries) == 2
+
+        storage.queries.clear()
+        now[0] += timedelta(seconds=5)
+        assert await cache.query_metrics("memory", "-20m") == await storage.query_metrics(
+            "memory", "2024-01-01T00:10:07Z", "2024-01-01T00:30:07Z",
+        )
+        # settle(1분) 안에 끝난 버킷까지 live로 다시 조회
+        assert storage.queries[0] == ("2024-01-01T00:25:00+00:00", "2024-01-01T00:35:00+00:00")
+
+        # tail_ttl 안에서는 live 버킷도 캐시 적중
+        storage.queries.clear()
+        await cache.query_metrics("memory", "-20m")
+        assert storage.queries == []
+        assert instrumentation.requests.labels(kind="bucket", result="hit")._value.get() > 0
+        assert cache.get_stats()["hit_ratio"] > 0.5
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_aggregated_and_summary(self, tmp_path):
+        """집계 조회와 요약이 원본 저장소 결과와 같고 요약은 정렬 간격 동안 재사용되는지 테스트"""
+        storage = await self.make_storage(tmp_path)
+        now = [datetime(2024, 1, 2, tzinfo=timezone.utc)]
+        cache = CachedStorage(storage, now=lambda: now[0])
+        query = ("memory", "2024-01-01T00:00:00Z", "2024-01-01T00:30:00Z")
+        assert await cache.query_metrics(*query, every="1m", fn="max") == await storage.query_metrics(
+            *query, every="1m", fn="max",
+        )
+        assert await cache.summarize_metrics(*query) == await storage.summarize_metrics(*query)
+
+        storage.queries.clear()
+        now[0] = datetime(2024, 1, 1, 0, 30, 0, tzinfo=timezone.utc)
+        first = await cache.summarize_metrics("memory", "-30m")
+        now[0] += timedelta(seconds=1)
+        assert await cache.summarize_metrics("memory", "-30m") == first
+        assert first["memory_percent"]["count"] == 180
+        assert cache.get_stats()["hits"] == 1
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_columns_use_backend_columnar_query(self, tmp_path):
+        """열 형식 조회가 레코드 조회를 거치지 않고 저장소의 query_columns 결과를 구간 단위로 캐시하는지 테스트"""
+        storage = await self.make_storage(tmp_path)
+        now = [datetime(2024, 1, 1, 0, 30, 0, tzinfo=timezone.utc)]
+        cache = CachedStorage(storage, now=lambda: now[0])
+        columns = storage.query_columns
+        calls = []
+
+        async def record_columns(*args, **kwargs):
+            calls.append(args[1:3])
+            return await columns(*args, **kwargs)
+
+        storage.query_columns = record_columns
+        query = ("memory", "2024-01-01T00:00:00Z", "2024-01-01T00:20:00Z")
+        expected = await columns(*query, every="1m", fn="max")
+        assert await cache.query_columns(*query, every="1m", fn="max") == expected
+        assert await cache.query_columns(*query, every="1m", fn="max") == expected
+        assert calls == [("2024-01-01T00:00:00+00:00", "2024-01-01T00:20:00+00:00")]
+        assert storage.queries == []
+
+        # 현재 시각이 들어 있는 구간은 정렬 간격이 지나면 다시 조회
+        live = await cache.query_columns("memory", "-10m")
+        assert live[0]["time"][0] == 1704068400000 and len(live[0]["time"]) == 60
+        now[0] += timedelta(seconds=1)
+        await cache.query_columns("memory", "-10m")
+        now[0] += timedelta(seconds=5)
+        await cache.query_columns("memory", "-10m")
+        assert len(calls) == 3
+        await storage.close()
+
+    @pytest.mark.asyncio
+    async def test_single_flight_and_memory_budget(self, tmp_path):
+        """동시 동일 조회는 저장소 조회 하나로 합치고, 예산을 넘으면 LRU로 제거하는지 테스트"""
+        storage = await self.make_storage(tmp_path)
+        now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        storage.delay = 0.05
+        cache = CachedStorage(storage, now=lambda: now)
+        results = await asyncio.gather(*(
+            cache.query_metrics("memory", "2024-01-01T00:00:00Z", "2024-01-01T00:20:00Z") for _ in range(5)
+        ))
+        assert len(storage.queries) == 1
+        assert cache.coalesced == 4
+        assert all(result == results[0] and len(result) == 120 for result in results)
+
+        small = CachedStorage(storage, max_bytes=40 * 400, now=lambda: now)
+        await small.query_metrics("memory", "2024-01-01T00:00:00Z", "2024-01-01T00:10:00Z")
+        await small.query_metrics("memory", "2024-01-01T00:10:00Z", "2024-01-01T00:20:00Z")
+        assert small.get_stats()["bytes"] <= 40 * 400
+        assert small.get_stats()["entries"] == 1
+        await storage.close()